@@ -0,0 +1,6 @@
+#!/bin/bash
+# file name: compile_client.sh
+# Compile on a running compile server (python -m teaal serve), or locally if
+# none is running
+
+python -m teaal.serve "$@"
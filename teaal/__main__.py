@@ -32,19 +32,74 @@ if __name__ == "__main__":  # pragma: no cover
         sys.path.append(path)
 
     # Import the necessary classes
-    from teaal.parse import *
-    from teaal.trans.hifiber import HiFiber
+    from teaal.serve import PORT
+    from teaal.trans.kernel import Kernel
 
-    # Make sure we are given exactly one argument
-    if len(sys.argv) != 2:
-        print("Usage: python -m teaal [input file]")
+    # Options are given as flags, e.g. --del; --live is only used here
+    opts = [arg[2:] for arg in sys.argv[1:] if arg.startswith("--")]
+    live = "live" in opts
+    opts = [opt for opt in opts if opt != "live"]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    # Serve compilations until interrupted
+    if args == ["serve"]:
+        from teaal.serve.server import CompileServer
+
+        params = dict(opt.split("=", 1) for opt in opts if "=" in opt)
+        server = CompileServer(
+            host=params.get("host", "localhost"),
+            port=int(params["port"]) if "port" in params else PORT,
+            workers=int(params["workers"]) if "workers" in params else None,
+            time_limit=float(params["time"]) if "time" in params else None,
+            cache_size=int(params.get("cache", 256)),
+            queue_size=int(params.get("queue", 64)))
+
+        host, port = server.get_address()
+        print("Serving on " + host + ":" + str(port), file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    # Make sure we are given exactly one input file
+    elif len(args) != 1:
+        print(
+            "Usage: python -m teaal [--batch] [--checkpoint=file [--checkpoint-every=n] [--checkpoint-seconds=s]] [--compress-traces] [--del] [--dump-workers=n] [--flattening=eager|lazy] [--fuse] [--func] [--halo=copy|view] [--live] [--load] [--online-intersect] [--opt[=passes]] [--progress[=file]] [--snapshot=file] [--trace-format=csv|binary] [input file]")
+        print(
+            "       python -m teaal serve [--host=host] [--port=n] [--workers=n] [--time=seconds] [--cache=n] [--queue=n]")
+
+    # Translate, reusing the snapshot of the input file if it is current
+    elif any(opt.startswith("snapshot=") for opt in opts):
+        from teaal.trans.snapshot import Snapshot
+
+        filename = [opt for opt in opts if opt.startswith(
+            "snapshot=")][0][len("snapshot="):]
+        opts = [opt for opt in opts if not opt.startswith("snapshot=")]
+
+        with open(args[0], "r") as f:
+            snapshot = Snapshot.from_cache(filename, f.read())
+
+        analyzed = snapshot.is_analyzed()
+        hifiber = snapshot.translate(opts)
+        if not analyzed:
+            snapshot.to_file(filename)
+
+        print(hifiber)
+
+        # Report the estimated peak number of live tensors
+        if live:
+            print(
+                "Peak live tensors: " + str(hifiber.get_peak_live()),
+                file=sys.stderr)
 
     # Translate
     else:
-        einsum = Einsum.from_file(sys.argv[1])
-        mapping = Mapping.from_file(sys.argv[1])
-        arch = Architecture.from_file(sys.argv[1])
-        bindings = Bindings.from_file(sys.argv[1])
-        format_ = Format.from_file(sys.argv[1])
-        hifiber = HiFiber(einsum, mapping, arch, bindings, format_)
+        with open(args[0], "r") as f:
+            hifiber = Kernel.translate(f.read(), opts)
         print(hifiber)
+
+        # Report the estimated peak number of live tensors
+        if live:
+            print(
+                "Peak live tensors: " + str(hifiber.get_peak_live()),
+                file=sys.stderr)
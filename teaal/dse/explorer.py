@@ -0,0 +1,169 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Design-space exploration driver
+"""
+
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from teaal.dse.journal import Journal
+from teaal.dse.ordering import Orderer, resolve
+from teaal.dse.space import SearchSpace
+from teaal.model import *
+from teaal.parse import *
+from teaal.parse.yaml import YamlParser
+from teaal.trans.hifiber import HiFiber
+
+
+def model_cost(yaml: dict) -> float:
+    """
+    Estimate the execution time of a specification with the analytical model
+    """
+    model = Model(
+        Einsum(yaml),
+        Mapping(yaml),
+        Architecture(yaml),
+        Bindings(yaml),
+        Format(yaml),
+        Stats(yaml))
+    return model.get_metrics()["time"]
+
+
+def evaluate(yaml: dict, candidate: dict,
+             cost: Callable[[dict], float]) -> dict:
+    """
+    Compile and evaluate a single candidate
+
+    Candidates that cannot be compiled or costed are recorded with their
+    error instead of a cost, so that one bad candidate does not end the run
+    """
+    try:
+        SearchSpace.check(yaml, candidate)
+
+        spec = resolve(SearchSpace.apply(yaml, candidate))
+        HiFiber(
+            Einsum(spec),
+            Mapping(spec),
+            Architecture(spec),
+            Bindings(spec),
+            Format(spec))
+        return {"candidate": candidate, "cost": cost(spec), "error": None}
+
+    except (ValueError, TypeError, NotImplementedError) as err:
+        return {"candidate": candidate, "cost": None, "error": str(err)}
+
+    except Exception as err:
+        error = type(err).__name__ + ": " + str(err)
+        return {"candidate": candidate, "cost": None, "error": error}
+
+
+class Explorer:
+    """
+    Explore the space of mappings of a specification
+    """
+
+    def __init__(self,
+                 yaml: dict,
+                 space: SearchSpace,
+                 cost: Callable[[dict], float] = model_cost,
+                 workers: Optional[int] = None,
+                 checkpoint: Optional[str] = None) -> None:
+        """
+        Construct a new Explorer
+
+        The cost function must be picklable (e.g., defined at the top level
+        of a module) if more than one worker is used
+        """
+        # The loop orders left to the compiler do not depend on the candidate
+        self.yaml = yaml
+        if "auto" in Mapping(yaml).get_loop_orders().values():
+            self.yaml = Orderer(yaml).apply()
+
+        self.space = space
+        self.cost = cost
+        self.workers = workers
+        self.checkpoint = checkpoint
+
+        self.journal = Journal(
+            checkpoint, lambda result: Explorer.__key(result["candidate"]))
+        self.results = self.journal.get_results()
+
+    @classmethod
+    def from_file(cls, filename: str, **kwargs: Any) -> "Explorer":
+        """
+        Construct a new Explorer from a YAML file
+        """
+        yaml = YamlParser.parse_file(filename)
+        return cls(yaml, SearchSpace(yaml), **kwargs)
+
+    def get_results(self) -> List[dict]:
+        """
+        Get all results, the legal candidates ranked by cost followed by the
+        illegal candidates
+        """
+        # Break ties by the candidate so the order is deterministic
+        legal = [res for res in self.results.values()
+                 if res["cost"] is not None]
+        legal.sort(key=lambda res: (
+            res["cost"], Explorer.__key(res["candidate"])))
+
+        illegal = [res for res in self.results.values() if res["cost"] is None]
+        illegal.sort(key=lambda res: Explorer.__key(res["candidate"]))
+
+        return legal + illegal
+
+    def run(self) -> List[dict]:
+        """
+        Evaluate all candidates not yet evaluated, and return the ranked
+        results
+        """
+        todo = []
+        for candidate in self.space.get_candidates(self.yaml):
+            if Explorer.__key(candidate) not in self.results.keys():
+                todo.append(candidate)
+
+        if self.workers == 1:
+            for candidate in todo:
+                self.journal.record(evaluate(self.yaml, candidate, self.cost))
+
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(
+                        evaluate,
+                        self.yaml,
+                        candidate,
+                        self.cost) for candidate in todo]
+                for future in as_completed(futures):
+                    self.journal.record(future.result())
+
+        return self.get_results()
+
+    @staticmethod
+    def __key(candidate: dict) -> str:
+        """
+        Get the canonical key for a candidate
+        """
+        return json.dumps(candidate, sort_keys=True)
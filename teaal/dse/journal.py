@@ -0,0 +1,90 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+An append-only JSONL log of results, used to resume interrupted runs
+"""
+
+import json
+import os
+from typing import Callable, Dict, Optional
+
+
+class Journal:
+    """
+    The results of a run, keyed by the job that produced them, and
+    (optionally) logged to a JSONL file as they arrive
+    """
+
+    def __init__(self, path: Optional[str],
+                 key: Callable[[dict], str]) -> None:
+        """
+        Construct a new Journal, loading the results of an interrupted run
+        from the path if it exists
+        """
+        self.path = path
+        self.key = key
+
+        self.results: Dict[str, dict] = {}
+        if path is not None and os.path.exists(path):
+            self.__load()
+
+    def get_results(self) -> Dict[str, dict]:
+        """
+        Get the latest result of each job
+        """
+        return self.results
+
+    def record(self, result: dict) -> None:
+        """
+        Record (and log) a new result
+        """
+        self.results[self.key(result)] = result
+        if self.path is None:
+            return
+
+        with open(self.path, "a") as stream:
+            stream.write(json.dumps(result, sort_keys=True) + "\n")
+
+    def __load(self) -> None:
+        """
+        Load the results of an interrupted run
+        """
+        assert self.path is not None
+        truncated = False
+        with open(self.path, "r") as stream:
+            for line in stream:
+                # The last line may have been cut off
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    truncated = True
+                    continue
+
+                # Later results (e.g., retries) replace earlier ones
+                self.results[self.key(result)] = result
+
+        # Drop the partial line so that new results can be appended
+        if truncated:
+            with open(self.path, "w") as stream:
+                for result in self.results.values():
+                    stream.write(json.dumps(result, sort_keys=True) + "\n")
@@ -0,0 +1,228 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Automatic selection of loop orders from the structure of the loop nest
+"""
+
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
+
+from teaal.dse.tiling import Tiler
+from teaal.ir.iter_graph import IterationGraph
+from teaal.ir.program import Program
+from teaal.parse import *
+from teaal.parse.yaml import YamlParser
+from teaal.trans.header import Header
+from teaal.trans.partitioner import Partitioner
+from teaal.trans.utils import TransUtils
+
+
+def resolve(yaml: dict) -> dict:
+    """
+    Select the loop orders and then the tile sizes left to the compiler
+    """
+    mapping = Mapping(yaml)
+    if "auto" in mapping.get_loop_orders().values():
+        yaml = Orderer(yaml).apply()
+        mapping = Mapping(yaml)
+
+    if "auto" in mapping.get_tile_sizes().values():
+        yaml = Tiler(yaml).apply()
+
+    return yaml
+
+
+class Orderer:
+    """
+    Select the loop orders marked auto that minimize the swizzled tensors,
+    discordant traversals, and projections of the output
+
+    The loop orders are built one rank at a time with a beam search, rather
+    than by costing every permutation of the loop ranks
+    """
+
+    # The number of partial loop orders kept at each step
+    BEAM = 4
+
+    # The maximum number of loop orders costed for a single Einsum
+    MAX_CANDIDATES = 1000
+
+    def __init__(self, yaml: dict) -> None:
+        """
+        Construct a new Orderer
+        """
+        self.yaml = yaml
+        self.orders: Optional[Dict[str, List[str]]] = None
+
+        # Parse the specification once for all candidates
+        self.einsum = Einsum(yaml)
+        self.mapping = Mapping(yaml)
+        self.program = Program(self.einsum, self.mapping)
+
+        self.auto = [einsum for einsum, order in self.mapping.get_loop_orders(
+        ).items() if order == "auto"]
+
+    @classmethod
+    def from_file(cls, filename: str) -> "Orderer":
+        """
+        Construct a new Orderer from a YAML file
+        """
+        return cls(YamlParser.parse_file(filename))
+
+    @classmethod
+    def from_str(cls, string: str) -> "Orderer":
+        """
+        Construct a new Orderer from a string in the YAML format
+        """
+        return cls(YamlParser.parse_str(string))
+
+    def apply(self) -> dict:
+        """
+        Build the specification with the selected loop orders
+        """
+        yaml = deepcopy(self.yaml)
+        yaml["mapping"]["loop-order"].update(deepcopy(self.get_loop_orders()))
+        return yaml
+
+    def get_loop_orders(self) -> Dict[str, List[str]]:
+        """
+        Get the selected loop orders
+        """
+        if self.orders is None:
+            self.orders = {einsum: self.__search(einsum)
+                           for einsum in self.auto}
+
+        return self.orders
+
+    def __build_program(self, einsum: str, order: List[str]) -> Program:
+        """
+        Configure the program for the Einsum with the given loop order
+        """
+        self.program.reset()
+        self.program.add_einsum(
+            self.program.get_all_einsums().index(einsum), order)
+        return self.program
+
+    def __cost(self, einsum: str, order: List[str]) -> Optional[int]:
+        """
+        Estimate the cost of a loop order as the number of swizzled tensors,
+        discordant traversals, and projections of the output; returns None if
+        the loop order cannot be used
+        """
+        try:
+            program = self.__build_program(einsum, order)
+            header = Header(
+                program, None, Partitioner(
+                    program, TransUtils(program)))
+
+            # Swizzle each tensor as the loop order requires
+            cost = 0
+            tensors = program.get_equation().get_tensors()
+            for tensor in tensors:
+                program.apply_all_partitioning(tensor)
+                if header.make_swizzle(tensor, [], "loop-order").gen(0):
+                    cost += 1
+
+            # Traverse the loop nest
+            graph = IterationGraph(program)
+            output = program.get_equation().get_output()
+            reduced = False
+            while graph.peek_concord()[0] is not None:
+                _, concord = graph.pop_concord()
+                populate = any(tensor is output for tensor in concord)
+
+                for ranks, _ in graph.pop_discord():
+                    cost += len(ranks)
+
+                # Populating the output below a reduced rank requires
+                # projecting into the output
+                if populate and reduced:
+                    cost += 1
+                elif not populate and output.peek() is not None:
+                    reduced = True
+
+        except ValueError:
+            return None
+
+        # All ranks of all tensors must be traversed
+        if any(tensor.peek() is not None for tensor in tensors):
+            return None
+
+        return cost
+
+    def __search(self, einsum: str) -> List[str]:
+        """
+        Search for the cheapest of the loop orders permitted by the
+        partitioning, preferring the default loop order on ties
+
+        Each partial loop order is costed by completing it with the remaining
+        ranks in their default order
+        """
+        yaml = deepcopy(self.yaml)
+        del yaml["mapping"]["loop-order"][einsum]
+        program = Program(self.einsum, Mapping(yaml))
+        program.add_einsum(program.get_all_einsums().index(einsum))
+
+        default = program.get_loop_order().get_ranks()
+        partitioning = program.get_partitioning()
+
+        costs: Dict[Tuple[str, ...], Optional[int]] = {}
+
+        def cost(order: List[str]) -> Tuple[bool, int, List[int]]:
+            key = tuple(order)
+            if key not in costs.keys():
+                if len(costs) >= Orderer.MAX_CANDIDATES:
+                    raise ValueError(
+                        "Loop order search for Einsum " +
+                        einsum +
+                        " exceeds " +
+                        str(Orderer.MAX_CANDIDATES) +
+                        " candidates; specify its loop order instead")
+                costs[key] = self.__cost(einsum, order)
+
+            # Unusable loop orders are ranked last, and ties are broken by
+            # the default loop order
+            return (costs[key] is None, costs[key] or 0,
+                    [default.index(rank) for rank in order])
+
+        beam: List[List[str]] = [[]]
+        for _ in default:
+            cands = []
+            for prefix in beam:
+                for rank in default:
+                    if rank in prefix:
+                        continue
+
+                    # The partitions of each rank must stay in order
+                    order = prefix + [rank] + \
+                        [other for other in default if other not in prefix and other != rank]
+                    if partitioning.is_ordered(order):
+                        cands.append((cost(order), prefix + [rank]))
+
+            cands.sort()
+            beam = [prefix for _, prefix in cands[:Orderer.BEAM]]
+
+        if costs[tuple(beam[0])] is None:
+            return default
+
+        return beam[0]
@@ -0,0 +1,247 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Parse the input YAML for the design-space exploration search space
+"""
+
+from copy import deepcopy
+from itertools import permutations, product
+from typing import Any, Dict, Iterator, List, Optional
+
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.parse.yaml import YamlParser
+
+
+class SearchSpace:
+    """
+    Parse the input YAML for the design-space exploration search space
+    """
+
+    def __init__(self, yaml: Optional[dict]) -> None:
+        """
+        Read the YAML input
+        """
+        self.loop_orders: Dict[str, Any] = {}
+        self.spacetimes: Dict[str, List[dict]] = {}
+        self.params: Dict[str, List[Any]] = {}
+
+        if yaml is None or "dse" not in yaml.keys() or yaml["dse"] is None:
+            return
+
+        dse = yaml["dse"]
+        if "loop-order" in dse.keys():
+            for einsum, orders in dse["loop-order"].items():
+                if orders != "all" and not isinstance(orders, list):
+                    raise ValueError(
+                        "Loop orders for Einsum " +
+                        einsum +
+                        " must be a list or all, given " +
+                        str(orders))
+
+                self.loop_orders[einsum] = orders
+
+        if "spacetime" in dse.keys():
+            for einsum, spacetimes in dse["spacetime"].items():
+                for spacetime in spacetimes:
+                    if "space" not in spacetime.keys():
+                        raise ValueError(
+                            "Space unspecified in spacetime for Einsum " +
+                            einsum)
+
+                self.spacetimes[einsum] = spacetimes
+
+        if "params" in dse.keys():
+            for param, values in dse["params"].items():
+                if not isinstance(values, list):
+                    values = [values]
+
+                self.params[param] = values
+
+    @classmethod
+    def from_file(cls, filename: str) -> "SearchSpace":
+        """
+        Construct a new SearchSpace from a YAML file
+        """
+        return cls(YamlParser.parse_file(filename))
+
+    @classmethod
+    def from_str(cls, string: str) -> "SearchSpace":
+        """
+        Construct a new SearchSpace from a string in the YAML format
+        """
+        return cls(YamlParser.parse_str(string))
+
+    @staticmethod
+    def apply(yaml: dict, candidate: dict) -> dict:
+        """
+        Build the specification for a candidate
+        """
+        yaml = deepcopy(yaml)
+        if "mapping" not in yaml.keys() or yaml["mapping"] is None:
+            yaml["mapping"] = {}
+        mapping = yaml["mapping"]
+
+        if "loop-order" in candidate.keys():
+            if "loop-order" not in mapping.keys():
+                mapping["loop-order"] = {}
+            mapping["loop-order"].update(deepcopy(candidate["loop-order"]))
+
+        if "spacetime" in candidate.keys():
+            if "spacetime" not in mapping.keys() or \
+                    mapping["spacetime"] is None:
+                mapping["spacetime"] = {}
+
+            for einsum, spacetime in candidate["spacetime"].items():
+                spacetime = deepcopy(spacetime)
+
+                # By default, all other ranks are temporal, in loop order
+                if "time" not in spacetime.keys():
+                    space = [rank.split(".")[0] for rank in spacetime["space"]]
+                    spacetime["time"] = [
+                        rank for rank in SearchSpace.__loop_order(
+                            yaml, einsum) if rank not in space]
+
+                mapping["spacetime"][einsum] = spacetime
+
+        if "params" in candidate.keys():
+            if "stats" not in yaml.keys() or yaml["stats"] is None:
+                yaml["stats"] = {}
+            if "shape" not in yaml["stats"].keys():
+                yaml["stats"]["shape"] = {}
+
+            yaml["stats"]["shape"].update(candidate["params"])
+
+            # Tile sizes in the mapping take precedence over the shapes, so
+            # they must be overridden too
+            if "tile-sizes" in mapping.keys() and \
+                    mapping["tile-sizes"] is not None:
+                for name, value in candidate["params"].items():
+                    if name in mapping["tile-sizes"].keys():
+                        mapping["tile-sizes"][name] = value
+
+        return yaml
+
+    @staticmethod
+    def check(yaml: dict, candidate: dict) -> None:
+        """
+        Check that the loop orders of the candidate are legal
+        """
+        if "loop-order" not in candidate.keys():
+            return
+
+        for einsum, order in candidate["loop-order"].items():
+            program = SearchSpace.__build_program(yaml, einsum)
+            if not SearchSpace.__is_legal(program, order):
+                raise ValueError(
+                    "Illegal loop order " +
+                    str(order) +
+                    " for Einsum " +
+                    einsum)
+
+    def get_candidates(self, yaml: dict) -> Iterator[dict]:
+        """
+        Enumerate the candidates in the search space of the given
+        specification
+        """
+        loop_orders = {}
+        for einsum, orders in self.loop_orders.items():
+            if orders == "all":
+                loop_orders[einsum] = self.__legal_loop_orders(yaml, einsum)
+            else:
+                loop_orders[einsum] = orders
+
+        choices: List[List[dict]] = []
+        for einsum, orders in loop_orders.items():
+            choices.append([{"loop-order": {einsum: order}}
+                           for order in orders])
+
+        for einsum, spacetimes in self.spacetimes.items():
+            choices.append([{"spacetime": {einsum: spacetime}}
+                           for spacetime in spacetimes])
+
+        if self.params:
+            names = list(self.params.keys())
+            choices.append([{"params": dict(zip(names, values))}
+                            for values in product(*self.params.values())])
+
+        for choice in product(*choices):
+            candidate: Dict[str, dict] = {}
+            for part in choice:
+                for key, value in part.items():
+                    if key not in candidate.keys():
+                        candidate[key] = {}
+                    candidate[key].update(value)
+
+            yield candidate
+
+    @staticmethod
+    def __build_program(yaml: dict, einsum: str) -> Program:
+        """
+        Build the program configured for the given Einsum
+        """
+        program = Program(Einsum(yaml), Mapping(yaml))
+        einsums = program.get_all_einsums()
+        if einsum not in einsums:
+            raise ValueError("Unknown Einsum " + einsum + " in search space")
+
+        program.add_einsum(einsums.index(einsum))
+        return program
+
+    @staticmethod
+    def __legal_loop_orders(yaml: dict, einsum: str) -> List[List[str]]:
+        """
+        Get all loop orders that traverse the partitions of each rank from
+        the top down
+        """
+        program = SearchSpace.__build_program(yaml, einsum)
+        ranks = program.get_loop_order().get_ranks()
+
+        orders = []
+        for order in permutations(ranks):
+            if SearchSpace.__is_legal(program, list(order)):
+                orders.append(list(order))
+
+        return orders
+
+    @staticmethod
+    def __is_legal(program: Program, order: List[str]) -> bool:
+        """
+        Returns true if the loop order is a permutation of the ranks of the
+        Einsum in which the partitions of each rank appear in descending
+        order
+        """
+        ranks = program.get_loop_order().get_ranks()
+        if sorted(order) != sorted(ranks):
+            return False
+
+        return program.get_partitioning().is_ordered(order)
+
+    @staticmethod
+    def __loop_order(yaml: dict, einsum: str) -> List[str]:
+        """
+        Get the loop order used by the given Einsum
+        """
+        program = SearchSpace.__build_program(yaml, einsum)
+        return program.get_loop_order().get_ranks()
@@ -0,0 +1,178 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Automatic selection of partition sizes from the buffer capacities
+"""
+
+from copy import deepcopy
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from teaal.model import *
+from teaal.parse import *
+from teaal.parse.utils import ParseUtils
+from teaal.parse.yaml import YamlParser
+
+
+class Tiler:
+    """
+    Select the partition sizes marked auto that minimize the DRAM traffic,
+    subject to the data bound to each buffer fitting in that buffer
+    """
+
+    def __init__(self, yaml: dict) -> None:
+        """
+        Construct a new Tiler
+        """
+        self.yaml = yaml
+        self.stats = Stats(yaml)
+        self.sizes: Optional[Dict[str, int]] = None
+
+        auto = [name for name, size in Mapping(
+            yaml).get_tile_sizes().items() if size == "auto"]
+
+        # Collect the partitionings that use each size
+        self.extents: Dict[str, int] = {}
+        self.nested: List[Tuple[str, str]] = []
+        for ranks in Mapping(yaml).get_partitioning().values():
+            for ranks_tree, parts in ranks.items():
+                extent = 1
+                for rank in ranks_tree.children:
+                    extent *= self.stats.get_shape(str(rank))
+
+                outer: Optional[Tuple[str, str]] = None
+                for part in parts:
+                    if not list(part.find_data("str_sz")):
+                        outer = None
+                        continue
+
+                    name = ParseUtils.find_str(part, "str_sz")
+                    if name in auto:
+                        self.extents[name] = max(
+                            self.extents.get(name, 0), extent)
+
+                    # Nested partitions must shrink
+                    if outer is not None and outer[1] == part.data and \
+                            part.data != "nway_shape":
+                        self.nested.append((outer[0], name))
+                    outer = (name, part.data)
+
+        for name in auto:
+            if name not in self.extents.keys():
+                raise ValueError("Tile size " + name + " is unused")
+
+    @classmethod
+    def from_file(cls, filename: str) -> "Tiler":
+        """
+        Construct a new Tiler from a YAML file
+        """
+        return cls(YamlParser.parse_file(filename))
+
+    @classmethod
+    def from_str(cls, string: str) -> "Tiler":
+        """
+        Construct a new Tiler from a string in the YAML format
+        """
+        return cls(YamlParser.parse_str(string))
+
+    def apply(self) -> dict:
+        """
+        Build the specification with the selected tile sizes
+        """
+        yaml = deepcopy(self.yaml)
+        yaml["mapping"]["tile-sizes"].update(self.get_tile_sizes())
+        return yaml
+
+    def get_tile_sizes(self) -> Dict[str, int]:
+        """
+        Get the selected tile sizes
+        """
+        if self.sizes is None:
+            self.sizes = self.__search()
+
+        return self.sizes
+
+    def __candidates(self) -> List[Dict[str, int]]:
+        """
+        Enumerate the power-of-two tile sizes (and the full extents) that
+        respect the nesting of the partitions
+        """
+        names = sorted(self.extents.keys())
+        choices: List[List[int]] = []
+        for name in names:
+            extent = self.extents[name]
+            options = []
+            size = 1
+            while size < extent:
+                options.append(size)
+                size *= 2
+            options.append(extent)
+            choices.append(options)
+
+        fixed = {name: size for name, size in Mapping(
+            self.yaml).get_tile_sizes().items() if isinstance(size, int)}
+
+        candidates: List[Dict[str, int]] = []
+        for values in product(*choices):
+            sizes = dict(zip(names, values))
+            all_sizes = {**fixed, **sizes}
+            if all(all_sizes[outer] > all_sizes[inner]
+                   for outer, inner in self.nested
+                   if outer in all_sizes.keys() and inner in all_sizes.keys()):
+                candidates.append(sizes)
+
+        return candidates
+
+    def __search(self) -> Dict[str, int]:
+        """
+        Search for the tile sizes with the least DRAM traffic (breaking ties
+        by execution time) that fit in the buffers
+        """
+        best: Optional[Dict[str, int]] = None
+        best_cost = (0., 0.)
+        for sizes in self.__candidates():
+            yaml = deepcopy(self.yaml)
+            yaml["mapping"]["tile-sizes"].update(sizes)
+            model = Model(
+                Einsum(yaml),
+                Mapping(yaml),
+                Architecture(yaml),
+                Bindings(yaml),
+                Format(yaml),
+                self.stats)
+
+            fits = all(footprint <= capacity
+                       for buffers in model.get_footprints().values()
+                       for footprint, capacity in buffers.values())
+            if not fits:
+                continue
+
+            cost = (model.get_traffic(), model.get_metrics()["time"])
+            if best is None or cost < best_cost:
+                best = sizes
+                best_cost = cost
+
+        if best is None:
+            raise ValueError("No tile sizes fit in the buffers")
+
+        return best
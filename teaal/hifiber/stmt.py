@@ -71,6 +71,22 @@ class SBlock(Statement):
             self.stmts.append(stmt)
 
 
+class SDel(Statement):
+    """
+    A del statement
+    """
+
+    def __init__(self, vars_: List[EVar]) -> None:
+        self.vars_ = vars_
+
+    def gen(self, depth: int) -> str:
+        """
+        Generate the HiFiber output for an SDel
+        """
+        return "    " * depth + "del " + \
+            ", ".join([var.gen() for var in self.vars_])
+
+
 class SExpr(Statement):
     """
     A statement that is an expression (usually because the expression has side effects)
@@ -182,6 +198,23 @@ class SIf(Statement):
         return out
 
 
+class SImport(Statement):
+    """
+    A from-import statement
+    """
+
+    def __init__(self, module: str, names: List[str]) -> None:
+        self.module = module
+        self.names = names
+
+    def gen(self, depth: int) -> str:
+        """
+        Generate the HiFiber output for an SImport
+        """
+        return "    " * depth + "from " + self.module + \
+            " import " + ", ".join(self.names)
+
+
 class SReturn(Statement):
     """
     A return statement for the end of a function
@@ -28,7 +28,7 @@ from itertools import chain
 
 from lark.tree import Tree
 from sympy import Basic, Symbol  # type: ignore
-from typing import Any, cast, Iterable, List, Optional, Set, Tuple
+from typing import Any, cast, Iterable, List, Optional, Set, Tuple, Union
 
 from teaal.ir.coord_math import CoordMath
 from teaal.ir.equation import Equation
@@ -55,12 +55,14 @@ class LoopOrder:
         self.partitioning: Optional[Partitioning] = None
 
     def add(self,
-            loop_order: Optional[List[str]],
+            loop_order: Optional[Union[List[str], str]],
             coord_math: CoordMath,
             partitioning: Partitioning) -> None:
         """
         Add the loop order information, selecting the default loop order if
         one was not provided
+
+        A loop order of "auto" must first be resolved (see teaal.dse.Orderer)
         """
         self.coord_math = coord_math
         self.partitioning = partitioning
@@ -68,6 +70,10 @@ class LoopOrder:
         # First build the final loop order
         if loop_order is None:
             self.ranks = self.__default_loop_order()
+        elif loop_order == "auto":
+            raise ValueError("Unresolved loop order: auto")
+        elif isinstance(loop_order, str):
+            raise ValueError("Unknown loop order: " + loop_order)
         else:
             self.ranks = loop_order
 
@@ -116,8 +116,10 @@ class Metrics:
                         else:
                             info.add((rank, style, False))
 
-        # Collect traces for intersection
-        if not tensor == einsum:
+        # Collect traces for intersection, unless the intersectors are
+        # updated during the iteration
+        if not tensor == einsum and not self.program.get_options().is_set(
+                "online-intersect"):
             tensor_ir = self.program.get_equation().get_tensor(tensor)
             part_ir = self.program.get_partitioning()
             final_ranks = part_ir.partition_ranks(
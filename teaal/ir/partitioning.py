@@ -362,6 +362,25 @@ class Partitioning:
         self.graph.nodes[node]["is_flattened"] = False
         return False
 
+    def is_ordered(self, order: List[str]) -> bool:
+        """
+        Return true if the partitions of each rank appear in descending order
+        in the given loop order
+        """
+        level = {}
+        for rank in order:
+            root = self.get_root_name(rank)
+            level[rank] = (root, self.partition_names(
+                (root,), True).index(rank))
+
+        for i, rank in enumerate(order):
+            for later in order[i + 1:]:
+                if level[rank][0] == level[later][0] and \
+                        level[rank][1] < level[later][1]:
+                    return False
+
+        return True
+
     def partition_names(self, ranks: Tuple[str, ...], all_: bool) -> List[str]:
         """
         Get the list of names that these ranks will be partitioned into
@@ -27,7 +27,8 @@ Top-level TeAAL program representation
 from collections import Counter
 
 from lark.tree import Tree
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sympy import Symbol  # type: ignore
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from teaal.ir.coord_math import CoordMath
 from teaal.ir.equation import Equation
@@ -37,6 +38,7 @@ from teaal.ir.spacetime import SpaceTime
 from teaal.ir.tensor import Tensor
 from teaal.parse.einsum import Einsum
 from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
 from teaal.parse.utils import ParseUtils
 
 
@@ -45,13 +47,19 @@ class Program:
     Top-level TeAAL program representation
     """
 
-    def __init__(self, einsum: Einsum, mapping: Mapping) -> None:
+    def __init__(self, einsum: Einsum, mapping: Mapping,
+                 options: Optional[Options] = None) -> None:
         """
         Construct the metadata for tensors and prepare for an einsum
         """
         self.einsum = einsum
         self.mapping = mapping
 
+        if options is None:
+            self.options = Options()
+        else:
+            self.options = options
+
         # Get all tensors
         self.decl_tensors = {}
         declaration = self.einsum.get_declaration()
@@ -84,10 +92,13 @@ class Program:
         self.loop_order: Optional[LoopOrder] = None
         self.partitioning: Optional[Partitioning] = None
         self.spacetime: Optional[SpaceTime] = None
+        self.halo_views: Dict[str, str] = {}
 
-    def add_einsum(self, i: int) -> None:
+    def add_einsum(self, i: int,
+                   loop_order: Optional[List[str]] = None) -> None:
         """
-        Configure the program for the i'th Einsum
+        Configure the program for the i'th Einsum, optionally overriding the
+        loop order given by the mapping
         """
         self.einsum_ind = i
         self.equation = Equation(
@@ -108,31 +119,50 @@ class Program:
         # Create the loop_order object
         self.loop_order = LoopOrder(self.equation)
 
+        # Get the loop order
+        loop_orders = self.mapping.get_loop_orders()
+        opt_loop_order: Optional[Union[List[str], str]] = None
+        if loop_order is not None:
+            opt_loop_order = loop_order
+        elif output.root_name() in loop_orders.keys():
+            opt_loop_order = loop_orders[output.root_name()]
+
+        # Get the spacetime information
+        spacetime: Optional[Dict[str, List[Tree]]] = None
+        if output.root_name() in self.mapping.get_spacetime().keys():
+            spacetime = self.mapping.get_spacetime()[output.root_name()]
+
         # Store the partitioning information
         partitioning = self.mapping.get_partitioning()
         ranks = self.__all_ranks()
+        parts: Dict[Tree, List[Tree]] = {}
         if output.root_name() in partitioning.keys():
-            self.partitioning = Partitioning(
-                partitioning[output.root_name()], ranks, self.coord_math)
-        else:
-            self.partitioning = Partitioning({}, ranks, self.coord_math)
+            parts = partitioning[output.root_name()]
+
+        self.halo_views = {}
+        if self.options.get_halo() == "view":
+            parts = self.__view_halos(parts, opt_loop_order, spacetime)
+
+        self.partitioning = Partitioning(parts, ranks, self.coord_math)
+
+        # Flattened ranks that are split by occupancy can be built lazily
+        lazy: Dict[str, List[str]] = {}
+        if self.options.get_flattening() == "lazy":
+            lazy = self.__lazy_flattening()
+
+        for tensor in self.tensors.values():
+            if tensor.root_name() == output.root_name():
+                tensor.set_lazy({})
+            else:
+                tensor.set_lazy(lazy)
 
         # Store the loop order
-        loop_orders = self.mapping.get_loop_orders()
-        opt_loop_order: Optional[List[str]] = None
-        if output.root_name() in loop_orders.keys():
-            opt_loop_order = loop_orders[output.root_name()]
 
         self.loop_order.add(opt_loop_order, self.coord_math, self.partitioning)
 
         # Prune the coord math with this loop order
         self.coord_math.prune(self.loop_order.get_available_roots())
 
-        # Get the spacetime information
-        spacetime: Optional[Dict[str, List[Tree]]] = None
-        if output.root_name() in self.mapping.get_spacetime().keys():
-            spacetime = self.mapping.get_spacetime()[output.root_name()]
-
         if spacetime is not None:
             # Build the spacetime object
             self.spacetime = SpaceTime(
@@ -231,6 +261,19 @@ class Program:
 
         return self.loop_order
 
+    def get_halo_views(self) -> Dict[str, str]:
+        """
+        Get the follower ranks accessed through a view of their leader's tile
+        (and its halo), mapped to their leader ranks
+        """
+        return self.halo_views
+
+    def get_options(self) -> Options:
+        """
+        Get the options of the translation
+        """
+        return self.options
+
     def get_partitioning(self) -> Partitioning:
         """
         Get the partitioning information for the current Einsum
@@ -267,6 +310,7 @@ class Program:
         self.loop_order = None
         self.partitioning = None
         self.spacetime = None
+        self.halo_views = {}
 
     def __add_ranks(self, tensor: Tensor, tensor_tree: Tree) -> None:
         """
@@ -294,3 +338,90 @@ class Program:
             ranks.update(tensor.get_ranks())
 
         return ranks
+
+    def __lazy_flattening(self) -> Dict[str, List[str]]:
+        """
+        Get the flattened ranks whose first partitioning is by occupancy, and
+        the ranks each is flattened from
+        """
+        # Note: this should always be called through add_einsum(), so we should
+        # never encounter this problem
+        if self.partitioning is None:
+            raise ValueError("Something is wrong...")  # pragma: no cover
+
+        all_parts = self.partitioning.get_all_parts()
+        lazy = {}
+        for ranks in all_parts:
+            flat_rank = "".join(ranks)
+            if len(ranks) < 2 or (flat_rank,) not in all_parts:
+                continue
+
+            spec = self.partitioning.get_part_spec((flat_rank,))
+            if spec and spec[0].data == "uniform_occupancy":
+                lazy[flat_rank] = list(ranks)
+
+        return lazy
+
+    def __view_halos(self,
+                     parts: Dict[Tree, List[Tree]],
+                     loop_order: Optional[Union[List[str], str]],
+                     spacetime: Optional[Dict[str, List[Tree]]]) -> Dict[Tree, List[Tree]]:
+        """
+        Drop the follower partitionings that would build overlapping (halo)
+        tiles, so that the rank is instead accessed through a window of the
+        unpartitioned tensor covering the leader's tile and its halo
+
+        A follower rank is kept if the loop order or the spacetime iterates
+        over its partitions, or if another partitioning refers to it
+        """
+        # Note: this should always be called through add_einsum(), so we should
+        # never encounter this problem
+        if self.coord_math is None or self.equation is None:
+            raise ValueError("Something is wrong...")  # pragma: no cover
+
+        # The ranks that must exist in their partitioned form
+        used: Set[str] = set()
+        if isinstance(loop_order, list):
+            used.update(loop_order)
+
+        if spacetime is not None:
+            for stamp in ["space", "time"]:
+                used.update(ParseUtils.next_str(tree)
+                            for tree in spacetime[stamp])
+
+        all_ranks = {ranks_tree: [str(child) for child in ranks_tree.children]
+                     for ranks_tree in parts.keys()}
+        refs: Set[str] = set()
+        for ranks_tree, part_list in parts.items():
+            if len(all_ranks[ranks_tree]) > 1:
+                refs.update(all_ranks[ranks_tree])
+
+            for part in part_list:
+                if part.data == "follow":
+                    refs.add(ParseUtils.next_str(part))
+
+        view = {}
+        for ranks_tree, part_list in parts.items():
+            ranks = all_ranks[ranks_tree]
+            if len(ranks) != 1 or len(part_list) != 1 or \
+                    part_list[0].data != "follow" or ranks[0] in refs:
+                view[ranks_tree] = part_list
+                continue
+
+            rank = ranks[0]
+            leader = Symbol(ParseUtils.next_str(part_list[0]).lower())
+            halo = any(
+                leader in expr.atoms(Symbol) and expr.subs(
+                    leader,
+                    0) != 0 for expr in self.coord_math.get_all_exprs(
+                    rank.lower()))
+
+            partitioned = any(used_rank != rank and used_rank.startswith(
+                rank) and used_rank[len(rank):].isdigit() for used_rank in used)
+
+            if not halo or partitioned:
+                view[ranks_tree] = part_list
+            else:
+                self.halo_views[rank] = ParseUtils.next_str(part_list[0])
+
+        return view
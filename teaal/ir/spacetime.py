@@ -24,7 +24,7 @@ SOFTWARE.
 Intermediate representation of the display information
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from teaal.ir.partitioning import Partitioning
 from teaal.parse.utils import ParseUtils
@@ -91,6 +91,27 @@ class SpaceTime:
                     " on output " +
                     out_name)
 
+        # Store the frames if the activity is streamed to disk
+        self.frames: Optional[Tuple[int, str]] = None
+        if "frames" in yaml.keys():
+            frames = yaml["frames"]
+            if not isinstance(frames, dict) or not isinstance(
+                    frames.get("file"), str):
+                raise ValueError(
+                    "SpaceTime frames must specify a file on output " +
+                    out_name)
+
+            every = frames.get("every")
+            if not isinstance(every, int) or isinstance(
+                    every, bool) or every <= 0:
+                raise ValueError(
+                    "SpaceTime frame interval must be a positive integer, given " +
+                    str(every) +
+                    " on output " +
+                    out_name)
+
+            self.frames = (every, frames["file"])
+
     def emit_pos(self, rank: str) -> bool:
         """
         Return true if the rank_pos variable needs to be emitted
@@ -100,6 +121,13 @@ class SpaceTime:
 
         return not self.get_slip() or rank in self.space
 
+    def get_frames(self) -> Optional[Tuple[int, str]]:
+        """
+        Get the number of time steps per frame and the file the frames are
+        streamed to, if the activity is streamed
+        """
+        return self.frames
+
     def get_offset(self, rank: str) -> Optional[str]:
         """
         Get the offset rank id associated with a given rank
@@ -133,6 +161,18 @@ class SpaceTime:
         """
         return self.time
 
+    def is_dense(self) -> bool:
+        """
+        Returns true if the space stamps are dense (i.e., positions or
+        coordinates relative to their partition)
+        """
+        for rank in self.space:
+            if self.get_style(rank) == "coord" and self.get_offset(
+                    rank) is None:
+                return False
+
+        return True
+
     def __eq__(self, other: object) -> bool:
         """
         The == operator for SpaceTimes
@@ -140,5 +180,6 @@ class SpaceTime:
         if isinstance(other, type(self)):
             return self.space == other.space and \
                 self.styles == other.styles and \
-                self.time == other.time
+                self.time == other.time and \
+                self.frames == other.frames
         return False
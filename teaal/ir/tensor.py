@@ -54,6 +54,9 @@ class Tensor:
         self.is_output = False
         self.is_flat = False
 
+        # Flattened ranks that are only built when they are split
+        self.lazy: Dict[str, List[str]] = {}
+
     def fiber_name(self) -> str:
         """
         Return the current fiber name for this tensor
@@ -94,6 +97,13 @@ class Tensor:
         """
         return self.is_output
 
+    def get_lazy(self, rank: str) -> Optional[List[str]]:
+        """
+        Get the ranks a lazily flattened rank is built from, None if the rank
+        is not lazily flattened
+        """
+        return self.lazy.get(rank)
+
     def get_prefix(self, rank: str) -> List[str]:
         """
         Get a list of ranks up to the current rank
@@ -106,6 +116,16 @@ class Tensor:
         i = self.ranks.index(rank)
         return self.ranks[self.rank_ptr:(i + 1)]
 
+    def get_rank_ids(self) -> List[str]:
+        """
+        Return the rank IDs of the fibertree tensor, where lazily flattened
+        ranks have not yet been flattened
+        """
+        rank_ids = []
+        for rank in self.get_ranks():
+            rank_ids += self.lazy.get(rank, [rank])
+        return rank_ids
+
     def get_ranks(self) -> List[str]:
         """
         Return a (capitalized) list of ranks for this tensor
@@ -157,6 +177,13 @@ class Tensor:
         """
         return self.name
 
+    def set_lazy(self, lazy: Dict[str, List[str]]) -> None:
+        """
+        Specify the flattened ranks that are built lazily, and the ranks each
+        is built from
+        """
+        self.lazy = lazy.copy()
+
     def set_is_output(self, is_output: bool) -> None:
         """
         Specify if this is the output tensor
@@ -0,0 +1,730 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Analytical (trace-free) model of the performance of an accelerator
+"""
+
+from math import ceil, log
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from lark.tree import Tree
+
+from teaal.ir.component import *
+from teaal.ir.fusion import Fusion
+from teaal.ir.hardware import Hardware
+from teaal.ir.iter_graph import IterationGraph
+from teaal.ir.metrics import Metrics
+from teaal.ir.program import Program
+from teaal.model.stats import Stats
+from teaal.parse import *
+from teaal.parse.utils import ParseUtils
+
+
+class Model:
+    """
+    Analytically estimate the metrics that the generated HiFiber would
+    collect, using tensor statistics instead of traces
+    """
+
+    def __init__(
+            self,
+            einsum: Einsum,
+            mapping: Mapping,
+            arch: Architecture,
+            bindings: Bindings,
+            format_: Format,
+            stats: Stats) -> None:
+        """
+        Construct a new Model and evaluate all Einsums
+        """
+        if not arch.get_spec():
+            raise ValueError("Architecture required for the analytical model")
+
+        self.program = Program(einsum, mapping)
+        self.hardware = Hardware(arch, bindings, self.program)
+        self.fusion = Fusion(self.hardware)
+        self.format = format_
+        self.stats = stats
+        self.tile_sizes = mapping.get_tile_sizes()
+
+        # Footprint and capacity of each buffer, in bits
+        self.footprints: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self.traffic = 0.
+
+        # Profiles of the tensors produced by earlier Einsums
+        self.derived: Dict[str, Tuple[List[str], List[float]]] = {}
+
+        self.result: Dict[str, Any] = {}
+        for i in range(len(einsum.get_expressions())):
+            self.__evaluate(i)
+
+        self.result["blocks"] = self.fusion.get_blocks()
+        self.result["time"] = self.__model_time()
+
+    def get_footprints(self) -> Dict[str, Dict[str, Tuple[float, float]]]:
+        """
+        Get the (footprint, capacity) in bits of each buffer, for each Einsum
+        """
+        return self.footprints
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the metrics dictionary, in the same form as the one built by the
+        generated HiFiber
+        """
+        return self.result
+
+    def get_traffic(self) -> float:
+        """
+        Get the total traffic to and from DRAM, in bits
+        """
+        return self.traffic
+
+    def __evaluate(self, i: int) -> None:
+        """
+        Evaluate a single Einsum
+        """
+        self.program.add_einsum(i)
+        self.metrics = Metrics(self.program, self.hardware, self.format)
+        self.fusion.add_einsum(self.program)
+
+        self.einsum = self.program.get_equation().get_output().root_name()
+        self.result[self.einsum] = {}
+
+        self.__walk()
+
+        # Same order as the generated dump()
+        self.__model_traffic()
+        self.__model_merges()
+        self.__model_compute()
+        self.__model_intersections()
+        self.__model_sequencers()
+
+        self.__save_output()
+        self.program.reset()
+
+    def __bits(self, binding: dict) -> int:
+        """
+        Get the number of bits per element of the binding, zero if the
+        binding does not correspond to any traffic
+        """
+        format_ = self.format.get_spec(
+            binding["tensor"])[binding["format"]][binding["rank"]]
+        type_ = binding["type"]
+
+        bits = 0
+        if type_ == "coord" or type_ == "elem":
+            if "cbits" not in format_ or format_["cbits"] == 0:
+                return 0
+            bits += format_["cbits"]
+
+        if type_ == "payload" or type_ == "elem":
+            if "pbits" not in format_ or format_["pbits"] == 0:
+                return 0
+            bits += format_["pbits"]
+
+        return bits
+
+    def __distinct(self, tensor: str, ranks: Set[str]) -> float:
+        """
+        Get the number of distinct points of the tensor projected onto the
+        given ranks
+        """
+        order, nnzs = self.__profile(tensor)
+        ranks = ranks.intersection(order)
+        if not ranks:
+            return 1.
+
+        # If the ranks are a prefix of the known order, the count is known
+        for i in range(len(order)):
+            if set(order[:i + 1]) == ranks:
+                return nnzs[i]
+
+        # Otherwise, assume the nonzeros are uniformly distributed
+        total = 1.
+        for rank in order:
+            total *= self.stats.get_shape(rank)
+
+        shape = 1.
+        for rank in ranks:
+            shape *= self.stats.get_shape(rank)
+
+        return shape * (1 - (1 - nnzs[-1] / total) ** (total / shape))
+
+    def __elems(self, tensor: str, ranks: List[str]) -> float:
+        """
+        Get the total number of elements at the bottom of the given ranks of
+        the tensor
+        """
+        elems = 1.
+        for rank in ranks:
+            elems *= self.__occupancy(tensor, rank)
+
+        return elems
+
+    def __elems_at(self, tensor: str, rank: str) -> float:
+        """
+        Get the total number of elements of the given rank of the tensor
+        """
+        ranks = self.ranks[tensor]
+        if rank in ranks:
+            return self.__elems(tensor, ranks[:ranks.index(rank) + 1])
+
+        return self.__elems(tensor, ranks)
+
+    def __extent(self, rank: str) -> float:
+        """
+        Get the number of coordinates a fiber of this rank may contain
+        """
+        root = self.program.get_partitioning().get_root_name(rank)
+        return self.__split(None, root)[rank][1]
+
+    def __occupancy(self, tensor: str, rank: str) -> float:
+        """
+        Get the expected occupancy of a (nonempty) fiber of the given rank of
+        the tensor
+        """
+        if tensor == self.einsum and rank in self.out_occ.keys():
+            return self.out_occ[rank]
+
+        root = self.program.get_partitioning().get_root_name(rank)
+        return self.__split(tensor, root)[rank][0]
+
+    def __profile(self, tensor: str) -> Tuple[List[str], List[float]]:
+        """
+        Get the ranks of the tensor and the number of nonzeros of each of
+        those ranks, in the order they are known
+        """
+        if self.stats.has_tensor(tensor) or tensor not in self.derived.keys():
+            order = self.stats.get_ranks(tensor)
+            return order, [self.stats.get_nnz(tensor, rank) for rank in order]
+
+        return self.derived[tensor]
+
+    def __root(self, tensor: Optional[str], root: str) -> Tuple[float, float]:
+        """
+        Get the (occupancy, extent) of an unpartitioned rank
+        """
+        part_ir = self.program.get_partitioning()
+        if part_ir.is_flattened(root):
+            occ = 1.
+            extent = 1.
+            for rank in part_ir.unpack(root):
+                extent *= self.__extent(rank)
+                if tensor is not None:
+                    occ *= self.__occupancy(tensor, rank)
+
+            if tensor is None:
+                return extent, extent
+            return occ, extent
+
+        extent = float(self.stats.get_shape(root))
+        if tensor is None:
+            return extent, extent
+
+        # The occupancy depends on the ranks above this one in the current
+        # order of the tensor
+        order = self.__root_order(tensor)
+        prefix = order[:order.index(root) + 1] if root in order else [root]
+        above = self.__distinct(tensor, set(prefix[:-1]))
+        if above == 0:
+            return 0., extent
+
+        return self.__distinct(tensor, set(prefix)) / above, extent
+
+    def __root_order(self, tensor: str) -> List[str]:
+        """
+        Get the unpartitioned and unflattened ranks of the tensor, in their
+        current order
+        """
+        part_ir = self.program.get_partitioning()
+
+        def roots(rank: str) -> List[str]:
+            root = part_ir.get_root_name(rank)
+            if not part_ir.is_flattened(root):
+                return [root]
+            return [r for unpacked in part_ir.unpack(
+                root) for r in roots(unpacked)]
+
+        order: List[str] = []
+        for rank in self.ranks[tensor]:
+            for root in roots(rank):
+                if root not in order:
+                    order.append(root)
+
+        return order
+
+    def __size(self, part: Tree) -> int:
+        """
+        Get the size parameter of a partitioning
+        """
+        if list(part.find_data("int_sz")):
+            return ParseUtils.find_int(part, "int_sz")
+
+        name = ParseUtils.find_str(part, "str_sz")
+        size = self.tile_sizes.get(name)
+        if isinstance(size, int):
+            return size
+
+        return self.stats.get_shape(name)
+
+    def __split(self, tensor: Optional[str],
+                root: str) -> Dict[str, Tuple[float, float]]:
+        """
+        Get the (occupancy, extent) of every partition of the root rank,
+        assuming the nonzeros are uniformly distributed
+
+        If the tensor is None, the fibers are assumed to be dense
+        """
+        part_ir = self.program.get_partitioning()
+        names = part_ir.partition_names((root,), True)
+        names.reverse()
+
+        occ, extent = self.__root(tensor, root)
+        if len(names) == 1:
+            return {root: (occ, extent)}
+
+        def prob(density: float, coords: float) -> float:
+            # Probability that a region of coords coordinates is nonempty
+            return 1 - (1 - density) ** coords
+
+        density = min(occ / extent, 1.) if extent else 0.
+
+        # The number of coordinates covered by the current parent, and the
+        # expected number of nonzeros of this tensor and the leader below it
+        cover = extent
+        nnz = occ
+        leader_nnz: Optional[float] = None
+
+        split = {}
+        for name, part in zip(names, part_ir.get_part_spec((root,))):
+            if part.data == "uniform_occupancy":
+                if leader_nnz is None:
+                    leader = ParseUtils.find_str(part, "leader")
+                    leader_occ, _ = self.__root(leader, root)
+                    leader_density = min(leader_occ / extent, 1.)
+                    leader_nnz = cover * leader_density / \
+                        prob(leader_density, cover) if leader_density else 0.
+
+                size = self.__size(part)
+                chunks = float(max(ceil(leader_nnz / size), 1))
+                if tensor is None or tensor == leader:
+                    part_occ = chunks
+                else:
+                    part_occ = chunks * (1 - (1 - 1 / chunks) ** nnz)
+
+                split[name] = (part_occ, chunks)
+                nnz = nnz / part_occ if part_occ else 0.
+                leader_nnz = min(leader_nnz, float(size))
+                continue
+
+            if part.data == "nway_shape":
+                child = float(ceil(cover / self.__size(part)))
+            else:
+                child = float(self.__size(part))
+
+            part_extent = float(ceil(cover / child))
+            parent_prob = prob(density, cover)
+            if parent_prob:
+                part_occ = part_extent * prob(density, child) / parent_prob
+            else:
+                part_occ = 0.
+
+            split[name] = (part_occ, part_extent)
+            nnz = nnz / part_occ if part_occ else 0.
+            cover = child
+
+        if leader_nnz is None:
+            split[names[-1]] = (nnz, cover)
+        else:
+            split[names[-1]] = (nnz, leader_nnz)
+
+        return split
+
+    def __walk(self) -> None:
+        """
+        Walk the loop nest, estimating the number of iterations of each loop
+
+        self.iters: Dict[loop rank, total iterations]
+        self.loops: Dict[(tensor, rank), loop rank at which it is accessed]
+        self.touched: Dict[(tensor, rank), coordinates touched]
+        self.coiters: Dict[loop rank, (invocations, Dict[tensor, occupancy])]
+        """
+        equation = self.program.get_equation()
+        loop_order = self.program.get_loop_order()
+        for tensor in equation.get_tensors():
+            self.program.apply_all_partitioning(tensor)
+            loop_order.apply(tensor)
+
+        self.ranks = {tensor.root_name(): tensor.get_ranks().copy()
+                      for tensor in equation.get_tensors()}
+        self.reduction = self.ranks[self.einsum] != loop_order.get_ranks()
+
+        self.out_occ: Dict[str, float] = {}
+        self.iters: Dict[str, float] = {"root": 1.}
+        self.loops: Dict[Tuple[str, str], str] = {}
+        self.touched: Dict[Tuple[str, str], float] = {}
+        self.coiters: Dict[str, Tuple[float, Dict[str, float]]] = {}
+
+        iter_graph = IterationGraph(self.program)
+        iters = 1.
+        # Number of iterations reduced into each output fiber
+        reduced = 1.
+
+        rank, tensors = iter_graph.peek_concord()
+        while rank:
+            output, inputs = equation.get_iter(tensors)
+            extent = self.__extent(rank)
+
+            # Intersect the tensors within a term and union the terms
+            empty = 1. if inputs else 0.
+            for term in inputs:
+                occs = {}
+                density = 1.
+                for tensor in term:
+                    trank = tensor.peek_clean()
+                    occs[tensor.root_name()] = self.__occupancy(
+                        tensor.root_name(), trank)
+                    self.touched[(tensor.root_name(), trank)] = iters * \
+                        occs[tensor.root_name()]
+                    tensor_extent = self.__extent(trank)
+                    if tensor_extent:
+                        density *= min(occs[tensor.root_name()] /
+                                       tensor_extent, 1.)
+                    else:
+                        density = 0.
+
+                if len(term) > 1:
+                    self.coiters[rank] = (iters, occs)
+
+                empty *= 1 - density
+
+            occ = extent * (1 - empty)
+            if output:
+                # Populating the output fiber across the reduced iterations
+                out_density = 1 - empty ** reduced
+                self.out_occ[output.peek_clean()] = extent * out_density
+                self.touched[(self.einsum, output.peek_clean())] = iters * occ
+                reduced = 1.
+            else:
+                reduced *= occ
+
+            iters *= occ
+            self.iters[rank] = iters
+            for tensor in tensors:
+                self.loops[(tensor.root_name(), tensor.peek_clean())] = rank
+
+            iter_graph.pop_concord()
+            for ranks, tensor in iter_graph.pop_discord():
+                for trank in ranks:
+                    self.loops[(tensor.root_name(), trank)] = rank
+
+            rank, tensors = iter_graph.peek_concord()
+
+        self.body = iters
+
+        # Reset all tensors
+        for tensor in equation.get_tensors():
+            is_output = tensor.get_is_output()
+            tensor.reset()
+            tensor.set_is_output(is_output)
+
+    def __model_compute(self) -> None:
+        """
+        Estimate the compute operations
+        """
+        equation = self.program.get_equation()
+        in_update = equation.get_in_update()
+
+        ops = {"mul": 0., "add": 0.}
+        for i, term in enumerate(equation.get_term_tensors()):
+            factors = len(equation.get_term_vars()[i]) + \
+                len([j for j in range(len(term)) if in_update[i][j]])
+            ops["mul"] += max(factors - 1, 0)
+
+        ops["add"] = len(equation.get_term_tensors()) - 1.
+        if self.reduction:
+            ops["add"] += 1
+
+        freq = self.hardware.get_frequency(self.einsum)
+        for fu in self.hardware.get_components(self.einsum, ComputeComponent):
+            metrics_fu: Dict[str, float] = {}
+            fu_ops = []
+            for binding in fu.get_bindings()[self.einsum]:
+                op = binding["op"]
+                fu_ops.append(op)
+                metrics_fu[op] = ops[op] * self.body
+
+            # TODO: Handle multi-op functional units
+            assert len(fu_ops) == 1
+
+            metrics_fu["time"] = metrics_fu[fu_ops[0]] / \
+                (freq * fu.get_num_instances())
+            self.result[self.einsum][fu.get_name()] = metrics_fu
+            self.fusion.add_component(self.einsum, fu.get_name())
+
+    def __model_intersections(self) -> None:
+        """
+        Estimate the intersection operations
+        """
+        freq = self.hardware.get_frequency(self.einsum)
+        for intersector in self.hardware.get_components(
+                self.einsum, IntersectorComponent):
+            isects = 0.
+            for binding in intersector.get_bindings()[self.einsum]:
+                rank = binding["rank"]
+                if rank not in self.coiters.keys():
+                    continue
+
+                invocations, occs = self.coiters[rank]
+                if isinstance(intersector, LeaderFollowerComponent):
+                    isects += invocations * occs[binding["leader"]]
+                elif isinstance(intersector, SkipAheadComponent):
+                    isects += invocations * 2 * min(occs.values())
+                else:
+                    isects += invocations * sum(occs.values())
+
+            self.result[self.einsum][intersector.get_name()] = {
+                "intersect": isects,
+                "time": isects / (freq * intersector.get_num_instances())}
+            self.fusion.add_component(self.einsum, intersector.get_name())
+
+    def __model_merges(self) -> None:
+        """
+        Estimate the merge operations
+        """
+        freq = self.hardware.get_frequency(self.einsum)
+        for merger in self.hardware.get_components(
+                self.einsum, MergerComponent):
+            metrics_merger: Dict[str, float] = {}
+            inputs = []
+            for binding in merger.get_bindings()[self.einsum]:
+                init_ranks = binding["init-ranks"]
+                final_ranks = binding["final-ranks"]
+
+                input_ = binding["tensor"] + "_" + "".join(init_ranks)
+                inputs.append(input_)
+
+                depth = [i == f for i, f in zip(
+                    init_ranks, final_ranks)].index(False)
+
+                # Every element passes through a tree of comparators, merging
+                # the fibers of the rank being moved
+                elems = self.__elems(binding["tensor"], init_ranks)
+                ways = self.__occupancy(binding["tensor"], init_ranks[depth])
+                radix = merger.get_comparator_radix()
+                if radix == float("inf") or ways <= 1:
+                    levels = 1
+                else:
+                    levels = max(ceil(log(ways) / log(radix)), 1)
+
+                metrics_merger[input_] = elems * levels
+
+            # TODO: Support more than one tensor per merger
+            assert len(inputs) == 1
+
+            metrics_merger["time"] = metrics_merger[inputs[0]] / \
+                (freq * merger.get_num_instances())
+            self.result[self.einsum][merger.get_name()] = metrics_merger
+            self.fusion.add_component(self.einsum, merger.get_name())
+
+    def __model_sequencers(self) -> None:
+        """
+        Estimate the iterations performed by the sequencers
+        """
+        freq = self.hardware.get_frequency(self.einsum)
+        for seq in self.hardware.get_components(
+                self.einsum, SequencerComponent):
+            metrics_seq: Dict[str, float] = {}
+            for rank in seq.get_ranks(self.einsum):
+                metrics_seq[rank] = self.iters.get(rank, 0.)
+
+            steps = sum(metrics_seq.values())
+            metrics_seq["time"] = steps / (freq * seq.get_num_instances())
+            self.result[self.einsum][seq.get_name()] = metrics_seq
+            self.fusion.add_component(self.einsum, seq.get_name())
+
+    def __model_time(self) -> float:
+        """
+        Compute the final execution time
+        """
+        time = 0.
+        for block in self.fusion.get_blocks():
+            component_time: Dict[str, float] = {}
+            for einsum in block:
+                for comp in self.fusion.get_components(einsum):
+                    component_time[comp] = component_time.get(comp, 0.) + \
+                        self.result[einsum][comp]["time"]
+
+            # The block time is the time of its slowest component
+            if component_time:
+                time += max(component_time.values())
+
+        return time
+
+    def __model_traffic(self) -> None:
+        """
+        Estimate the traffic into each of the buffers
+        """
+        part_ir = self.program.get_partitioning()
+        metrics_einsum = self.result[self.einsum]
+
+        traffic_srcs = set()
+        self.footprints[self.einsum] = {}
+        for buffer_ in self.hardware.get_components(
+                self.einsum, BufferComponent):
+            # Compute the data filled into the buffer for each binding,
+            # assuming the buffer is large enough
+            fills: List[Tuple[dict, int, float, float, float]] = []
+            footprint = 0.
+            for binding in buffer_.get_bindings()[self.einsum]:
+                bits = self.__bits(binding)
+                if bits == 0:
+                    continue
+
+                tensor = binding["tensor"]
+                rank = binding["rank"]
+
+                # Coordinates are read even if the intersection fails
+                elems = self.__elems_at(tensor, rank)
+                if (tensor, rank) in self.touched.keys():
+                    accesses = self.touched[(tensor, rank)]
+                    if binding["type"] == "payload":
+                        accesses = min(
+                            accesses, self.iters[self.loops[(tensor, rank)]])
+                elif (tensor, rank) in self.loops.keys():
+                    accesses = self.iters[self.loops[(tensor, rank)]]
+                else:
+                    accesses = elems
+
+                evict_on = binding.get("evict-on", "root")
+                if isinstance(buffer_, BuffetComponent) and evict_on != "root":
+                    evict_on = part_ir.get_final_rank_id([evict_on], evict_on)
+                    epochs = self.iters.get(evict_on, 1.)
+
+                    # If the evict-on rank indexes the tensor, each epoch only
+                    # holds the subtree below the corresponding element
+                    ranks = self.ranks[tensor]
+                    above = ranks[:ranks.index(rank)] if rank in ranks else []
+                    indexed = [r for r in above if self.loops.get(
+                        (tensor, r)) == evict_on]
+                    if indexed:
+                        per_epoch = elems / \
+                            max(self.__elems_at(tensor, indexed[-1]), 1.)
+                    else:
+                        per_epoch = elems
+
+                    fill = min(accesses, epochs * per_epoch)
+                    footprint += per_epoch * bits
+                else:
+                    fill = min(accesses, elems)
+                    footprint += elems * bits
+
+                fills.append((binding, bits, fill, accesses, elems))
+
+            # If the data does not fit, assume the hit rate is proportional to
+            # the fraction that does
+            capacity = buffer_.get_width() * buffer_.get_depth()
+            self.footprints[self.einsum][buffer_.get_name()] = (
+                footprint, capacity)
+            miss = 0.
+            if footprint > capacity:
+                miss = 1 - capacity / footprint
+
+            srcs: Dict[str, str] = {}
+            traffic: Dict[str, Dict[str, float]] = {}
+            for binding, bits, fill, accesses, elems in fills:
+                tensor = binding["tensor"]
+                fill += (accesses - fill) * miss
+
+                if tensor not in traffic.keys():
+                    traffic[tensor] = {"read": 0., "write": 0.}
+
+                if tensor == self.einsum:
+                    traffic[tensor]["read"] += max(fill - elems, 0.) * bits
+                    traffic[tensor]["write"] += fill * bits
+                else:
+                    traffic[tensor]["read"] += fill * bits
+
+                src_component = self.metrics.get_source_memory(
+                    buffer_.get_name(), tensor, binding["rank"], binding["type"])
+                if src_component is not None and tensor not in srcs.keys():
+                    srcs[tensor] = src_component.get_name()
+
+            # Attribute the traffic to the source memory
+            for tensor, src in srcs.items():
+                traffic_srcs.add(src)
+                if src not in metrics_einsum.keys():
+                    metrics_einsum[src] = {}
+
+                if tensor not in metrics_einsum[src].keys():
+                    metrics_einsum[src][tensor] = {"read": 0.}
+                    if tensor == self.einsum:
+                        metrics_einsum[src][tensor]["write"] = 0.
+
+                for type_, type_bits in traffic[tensor].items():
+                    if type_ in metrics_einsum[src][tensor].keys():
+                        metrics_einsum[src][tensor][type_] += type_bits
+
+        # Compute the time it took to perform this traffic
+        for src in sorted(traffic_srcs):
+            total = 0.
+            for tensor, tensor_traffic in metrics_einsum[src].items():
+                total += tensor_traffic["read"]
+                if tensor == self.einsum:
+                    total += tensor_traffic["write"]
+
+            component = self.hardware.get_component(src)
+            assert isinstance(component, MemoryComponent)
+            if isinstance(component, DRAMComponent):
+                self.traffic += total
+
+            # Note: the current model assumes perfect load balance
+            metrics_einsum[src]["time"] = total / \
+                (component.get_bandwidth() * component.get_num_instances())
+            self.fusion.add_component(self.einsum, src)
+
+    def __save_output(self) -> None:
+        """
+        Save the occupancy of the output for later Einsums
+        """
+        part_ir = self.program.get_partitioning()
+
+        order: List[str] = []
+        occs: Dict[str, float] = {}
+        for rank in self.ranks[self.einsum]:
+            if rank not in self.out_occ.keys():
+                continue
+
+            root = part_ir.get_root_name(rank)
+            if root not in order:
+                order.append(root)
+            occs[root] = occs.get(root, 1.) * self.out_occ[rank]
+
+        nnzs = []
+        nnz = 1.
+        for root in order:
+            nnz *= occs[root]
+            nnzs.append(nnz)
+
+        self.derived[self.einsum] = (order, nnzs)
@@ -0,0 +1,160 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Parse the input YAML for the tensor statistics used by the analytical model
+"""
+
+from typing import Dict, List, Optional
+
+from teaal.parse.yaml import YamlParser
+
+
+class Stats:
+    """
+    Parse the input YAML for the tensor statistics used by the analytical
+    model
+    """
+
+    def __init__(self, yaml: Optional[dict]) -> None:
+        """
+        Read the YAML input
+        """
+        self.shapes: Dict[str, int] = {}
+        self.fibers: Dict[str, Dict[str, float]] = {}
+        self.nnzs: Dict[str, Dict[str, float]] = {}
+
+        if yaml is None or "stats" not in yaml.keys():
+            return
+
+        stats = yaml["stats"]
+        if "shape" in stats.keys():
+            for rank, shape in stats["shape"].items():
+                self.shapes[rank] = int(shape)
+
+        if "occupancy" not in stats.keys():
+            return
+
+        for tensor, ranks in stats["occupancy"].items():
+            self.fibers[tensor] = {}
+            self.nnzs[tensor] = {}
+
+            # The ranks are listed from the top of the tensor down, so the
+            # number of fibers of each rank is the number of elements of the
+            # rank above it
+            fibers = 1.
+            for rank, occ in ranks.items():
+                # A histogram maps the number of nonzeros in a fiber to the
+                # number of fibers with that many nonzeros
+                if isinstance(occ, dict):
+                    fibers = float(sum(occ.values()))
+                    nnz = float(sum(k * v for k, v in occ.items()))
+
+                elif isinstance(occ, (int, float)):
+                    nnz = fibers * occ
+
+                else:
+                    raise ValueError(
+                        "Unknown occupancy specification for rank " +
+                        rank +
+                        " of tensor " +
+                        tensor +
+                        ": " +
+                        str(occ))
+
+                self.fibers[tensor][rank] = fibers
+                self.nnzs[tensor][rank] = nnz
+                fibers = nnz
+
+    @classmethod
+    def from_file(cls, filename: str) -> "Stats":
+        """
+        Construct a new Stats from a YAML file
+        """
+        return cls(YamlParser.parse_file(filename))
+
+    @classmethod
+    def from_str(cls, string: str) -> "Stats":
+        """
+        Construct a new Stats from a string in the YAML format
+        """
+        return cls(YamlParser.parse_str(string))
+
+    def get_nnz(self, tensor: str, rank: str) -> float:
+        """
+        Get the total number of nonzeros of the given rank of the tensor
+        """
+        self.__check(tensor, rank)
+        return self.nnzs[tensor][rank]
+
+    def get_occupancy(self, tensor: str, rank: str) -> float:
+        """
+        Get the mean occupancy of a (nonempty) fiber of the given rank of the
+        tensor
+        """
+        self.__check(tensor, rank)
+        if self.fibers[tensor][rank] == 0:
+            return 0.
+
+        return self.nnzs[tensor][rank] / self.fibers[tensor][rank]
+
+    def get_ranks(self, tensor: str) -> List[str]:
+        """
+        Get the ranks of the tensor, in the order their occupancies were
+        specified
+        """
+        if not self.has_tensor(tensor):
+            raise ValueError("Occupancy unspecified for tensor " + tensor)
+
+        return list(self.nnzs[tensor].keys())
+
+    def get_shape(self, rank: str) -> int:
+        """
+        Get the shape of a rank or the value of a partitioning parameter
+        """
+        if rank not in self.shapes.keys():
+            raise ValueError("Shape unspecified for rank " + rank)
+
+        return self.shapes[rank]
+
+    def has_occupancy(self, tensor: str, rank: str) -> bool:
+        """
+        Returns true if the occupancy of the rank of the tensor is specified
+        """
+        return self.has_tensor(tensor) and rank in self.nnzs[tensor].keys()
+
+    def has_tensor(self, tensor: str) -> bool:
+        """
+        Returns true if the occupancies of the tensor are specified
+        """
+        return tensor in self.nnzs.keys()
+
+    def __check(self, tensor: str, rank: str) -> None:
+        """
+        Check that the occupancy of the rank of the tensor is specified
+        """
+        if not self.has_occupancy(tensor, rank):
+            raise ValueError(
+                "Occupancy unspecified for rank " +
+                rank +
+                " of tensor " +
+                tensor)
@@ -29,3 +29,4 @@ from .bindings import Bindings
 from .einsum import Einsum
 from .format import Format
 from .mapping import Mapping
+from .options import Options
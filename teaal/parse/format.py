@@ -76,3 +76,21 @@ class Format:
             return {}
 
         return self.yaml[tensor]
+
+    def is_uncompressed(self, tensor: str, rank: str) -> bool:
+        """
+        Returns True if every format of the tensor stores the given rank
+        uncompressed
+        """
+        formats = self.get_spec(tensor)
+        if not formats:
+            return False
+
+        for spec in formats.values():
+            if rank not in spec.keys() or "format" not in spec[rank].keys():
+                return False
+
+            if spec[rank]["format"] != "U":
+                return False
+
+        return True
@@ -46,6 +46,7 @@ class Mapping:
         rank_orders = None
         # Use type dict, since the dictionary is very heterogeneous
         spacetime: Optional[dict] = None
+        tile_sizes = None
 
         if yaml is not None and "mapping" in yaml.keys() and \
                 yaml["mapping"] is not None:
@@ -89,6 +90,20 @@ class Mapping:
                     if "opt" in info.keys():
                         spacetime[tensor]["opt"] = info["opt"]
 
+                    # Store the frame streaming information
+                    if "frames" in info.keys():
+                        spacetime[tensor]["frames"] = info["frames"]
+
+            if "tile-sizes" in mapping.keys():
+                tile_sizes = mapping["tile-sizes"]
+                for name, size in tile_sizes.items():
+                    if size != "auto" and not isinstance(size, int):
+                        raise ValueError(
+                            "Tile size " +
+                            name +
+                            " must be an integer or auto, given " +
+                            str(size))
+
         if loop_orders is None:
             self.loop_orders = {}
         else:
@@ -109,6 +124,11 @@ class Mapping:
         else:
             self.spacetime = spacetime
 
+        if tile_sizes is None:
+            self.tile_sizes = {}
+        else:
+            self.tile_sizes = tile_sizes
+
     @classmethod
     def from_file(cls, filename: str) -> "Mapping":
         """
@@ -123,7 +143,7 @@ class Mapping:
         """
         return cls(YamlParser.parse_str(string))
 
-    def get_loop_orders(self) -> Dict[str, List[str]]:
+    def get_loop_orders(self) -> Dict[str, Union[List[str], str]]:
         """
         Get the dictionary from output tensors to loop orders
         """
@@ -148,6 +168,12 @@ class Mapping:
         """
         return self.spacetime
 
+    def get_tile_sizes(self) -> Dict[str, Union[int, str]]:
+        """
+        Get the dictionary from partition size names to their values
+        """
+        return self.tile_sizes
+
     def __eq__(self, other: object) -> bool:
         """
         The == operator for Mappings
@@ -156,5 +182,6 @@ class Mapping:
             return self.spacetime == other.spacetime and \
                 self.loop_orders == other.loop_orders and \
                 self.partitioning == other.partitioning and \
-                self.rank_orders == other.rank_orders
+                self.rank_orders == other.rank_orders and \
+                self.tile_sizes == other.tile_sizes
         return False
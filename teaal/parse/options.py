@@ -0,0 +1,239 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Representation of the options of the translation to HiFiber
+"""
+
+from typing import Dict, List, Optional
+
+
+class Options:
+    """
+    The options of a translation, given as strings of the form "name" or
+    "name=value" (e.g., --name=value on the command line)
+
+    - "batch": build the bottom output fibers of Einsums without a reduction
+      from lists of their coordinates and payloads, instead of inserting one
+      element at a time
+    - "checkpoint=<file>", with the optional "checkpoint-every=<n>" and
+      "checkpoint-seconds=<s>": save the output of each Einsum to the file,
+      and its progress through its outer loop (every n iterations or s
+      seconds), so that a rerun skips the work already done
+    - "compress-traces": compress the binary traces (see "trace-format")
+    - "del": delete the swizzled and partitioned inputs and the intermediate
+      tensors once no later Einsum uses them, and the root fibers of each
+      Einsum once it is done
+    - "dump-workers=<n>": compute the metrics of each Einsum with a pool of n
+      processes instead of serially
+    - "flattening=<style>": build the flattened ranks that are then split by
+      occupancy by copying them with flattenRanks() ("eager", the default)
+      or while splitting them ("lazy")
+    - "fuse": fuse an Einsum with the next one, which consumes its output,
+      into one loop nest over their shared top loop ranks; a consumer that
+      takes a union with the output is only fused over the ranks where the
+      producer iterates over a single input
+    - "func": wrap the program in a function kernel(), which takes the inputs
+      and sizes and returns the outputs (and the metrics, if collected)
+    - "halo=<style>": build the halos of partitioned follower ranks by
+      copying them into overlapping tiles ("copy", the default) or by viewing
+      a window of the unpartitioned tensor from each tile of the leader
+      ("view")
+    - "load": count the work per space coordinate and time step of the
+      Einsums with a spacetime instead of drawing the canvas, and report the
+      load imbalance and utilization of each space rank (also stored with
+      the metrics, if collected)
+    - "online-intersect": update the intersectors as the loops intersect the
+      fibers instead of from the coiteration traces
+    - "opt" or "opt=<passes>": optimize the generated code with all of, or the
+      comma-separated list of, the Optimizer passes ("copy", "dead", "dup",
+      and "fold")
+    - "progress" or "progress=<file>": report the iteration rate, the fraction
+      of the top rank consumed, and the estimated time remaining of the outer
+      loop of each Einsum to stderr or the status file
+    - "trace-format=<format>": write the traces collected for the metrics as
+      CSV files ("csv", the default) or pack them into binary files
+      ("binary") before they are consumed
+    """
+
+    # The options that are either given or not
+    FLAGS = [
+        "batch",
+        "compress-traces",
+        "del",
+        "fuse",
+        "func",
+        "load",
+        "online-intersect"]
+
+    # The options that take a value, and whether the value is optional
+    VALUES = {
+        "checkpoint": False,
+        "checkpoint-every": False,
+        "checkpoint-seconds": False,
+        "dump-workers": False,
+        "flattening": False,
+        "halo": False,
+        "opt": True,
+        "progress": True,
+        "trace-format": False}
+
+    def __init__(self, opts: Optional[List[str]] = None) -> None:
+        """
+        Parse the options
+        """
+        self.flags: List[str] = []
+        self.values: Dict[str, str] = {}
+
+        if opts is None:
+            opts = []
+
+        for opt in opts:
+            name, eq, value = opt.partition("=")
+            if name in Options.FLAGS and not eq:
+                self.flags.append(name)
+            elif name in Options.VALUES.keys():
+                if not eq and not Options.VALUES[name]:
+                    raise ValueError("Option " + name + " requires a value")
+                self.values[name] = value
+            else:
+                raise ValueError("Unknown option: " + opt)
+
+        self.checkpoint: Optional[dict] = None
+        if "checkpoint" in self.values.keys():
+            self.checkpoint = {"file": self.values["checkpoint"]}
+
+            every = self.values.get("checkpoint-every")
+            if every is not None:
+                if not every.isdigit() or int(every) <= 0:
+                    raise ValueError(
+                        "Checkpoint interval must be a positive integer, given " + every)
+                self.checkpoint["every"] = int(every)
+
+            seconds = self.values.get("checkpoint-seconds")
+            if seconds is not None:
+                if not Options.__to_number(seconds) > 0:
+                    raise ValueError(
+                        "Checkpoint time must be a positive number, given " + seconds)
+                self.checkpoint["seconds"] = float(seconds)
+
+        elif "checkpoint-every" in self.values.keys() or \
+                "checkpoint-seconds" in self.values.keys():
+            raise ValueError("Checkpoint must specify a file")
+
+        self.dump_workers: Optional[int] = None
+        if "dump-workers" in self.values.keys():
+            workers = self.values["dump-workers"]
+            if not workers.isdigit() or int(workers) <= 0:
+                raise ValueError(
+                    "Dump workers must be a positive integer, given " + workers)
+            self.dump_workers = int(workers)
+
+        self.flattening = self.values.get("flattening", "eager")
+        if self.flattening not in ["eager", "lazy"]:
+            raise ValueError("Unknown flattening style: " + self.flattening)
+
+        self.halo = self.values.get("halo", "copy")
+        if self.halo not in ["copy", "view"]:
+            raise ValueError("Unknown halo style: " + self.halo)
+
+        self.trace_format = self.values.get("trace-format", "csv")
+        if self.trace_format not in ["csv", "binary"]:
+            raise ValueError("Unknown trace format: " + self.trace_format)
+
+        if self.is_set("compress-traces") and self.trace_format != "binary":
+            raise ValueError(
+                "Only binary traces can be compressed, given " +
+                self.trace_format)
+
+    def get_checkpoint(self) -> Optional[dict]:
+        """
+        Get the checkpointing information (file, and optional iteration
+        interval and wall time between checkpoints), if any
+        """
+        return self.checkpoint
+
+    def get_dump_workers(self) -> Optional[int]:
+        """
+        Get the number of processes used to compute the metrics, None if they
+        are computed serially
+        """
+        return self.dump_workers
+
+    def get_flattening(self) -> str:
+        """
+        Get how flattened ranks that are then split by occupancy are built:
+        "eager" (flattenRanks() copy) or "lazy" (flattened while splitting)
+        """
+        return self.flattening
+
+    def get_halo(self) -> str:
+        """
+        Get how the halos of partitioned follower ranks are built: "copy"
+        (overlapping tiles) or "view" (windows of the unpartitioned tensor)
+        """
+        return self.halo
+
+    def get_passes(self) -> Optional[List[str]]:
+        """
+        Get the comma-separated Optimizer passes to run, an empty list for
+        all of them, or None if the code should not be optimized
+        """
+        if "opt" not in self.values.keys():
+            return None
+
+        if not self.values["opt"]:
+            return []
+
+        return self.values["opt"].split(",")
+
+    def get_progress(self) -> Optional[str]:
+        """
+        Get the file to report the progress to, empty for stderr, or None if
+        the progress should not be reported
+        """
+        return self.values.get("progress")
+
+    def get_trace_format(self) -> str:
+        """
+        Get the format of the collected traces: "csv" or "binary"
+        """
+        return self.trace_format
+
+    def is_set(self, flag: str) -> bool:
+        """
+        Returns True if the flag was given
+        """
+        if flag not in Options.FLAGS:
+            raise ValueError("Unknown flag: " + flag)
+
+        return flag in self.flags
+
+    @staticmethod
+    def __to_number(value: str) -> float:
+        """
+        Convert the value to a number, NaN if it is not one
+        """
+        try:
+            return float(value)
+        except ValueError:
+            return float("nan")
@@ -0,0 +1,65 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Run a compiled input file over many datasets
+"""
+
+import csv  # pragma: no cover
+import os  # pragma: no cover
+import sys  # pragma: no cover
+
+if __name__ == "__main__":  # pragma: no cover
+    # Configure Python path
+    path = os.path.abspath(".")
+    if path not in sys.path:
+        sys.path.append(path)
+
+    # Import the necessary classes
+    from teaal.run import Runner
+
+    # Options are given as flags, e.g. --workers=4
+    opts = dict(arg[2:].split("=", 1)
+                for arg in sys.argv[1:] if arg.startswith("--"))
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    # Make sure we are given an input file, a checkpoint file, and datasets
+    if len(args) < 3:
+        print("Usage: python -m teaal.run [--cache=dir] [--workers=n] " +
+              "[--time=seconds] [--memory=bytes] [input file] " +
+              "[checkpoint file] [dataset]...")
+
+    # Run
+    else:
+        runner = Runner.from_file(
+            args[0],
+            opts.get("cache", "kernels"),
+            args[2:],
+            workers=int(opts["workers"]) if "workers" in opts else None,
+            time_limit=float(opts["time"]) if "time" in opts else None,
+            mem_limit=int(opts["memory"]) if "memory" in opts else None,
+            checkpoint=args[1])
+        table = runner.run()
+
+        writer = csv.writer(sys.stdout)
+        writer.writerow(table.keys())
+        writer.writerows(zip(*table.values()))
@@ -0,0 +1,135 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Save and restore the progress of a generated program
+"""
+
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+
+class Checkpoint:
+    """
+    The progress of a generated program: the values produced by the Einsums
+    it finished and the position in the outer loop of the Einsum it is in
+
+    The generated code skips the Einsums that are done(), load()ing their
+    values instead, and the outer loop iterations that are not todo(), so
+    that a restarted program picks up where the last step() saved it
+    """
+
+    def __init__(self,
+                 path: str,
+                 every: Optional[int] = None,
+                 seconds: Optional[float] = None) -> None:
+        """
+        Construct a new Checkpoint, resuming from the one saved at the path
+        if it exists
+        """
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+
+        self.state: Dict[str, Any] = {
+            "finished": [], "values": {}, "einsum": None, "pos": None,
+            "output": None}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.state = pickle.load(f)
+
+        self.count = 0
+        self.last = time.monotonic()
+
+    def done(self, einsum: str) -> bool:
+        """
+        Returns True if the Einsum was finished before the checkpoint
+        """
+        return einsum in self.state["finished"]
+
+    def finish(self, einsum: str, values: Dict[str, Any]) -> None:
+        """
+        Record that the Einsum is finished, along with the values it produced
+        """
+        self.state["finished"].append(einsum)
+        self.state["values"].update(values)
+        self.state["einsum"] = None
+        self.state["pos"] = None
+        self.state["output"] = None
+        self.__save()
+
+    def load(self, name: str) -> Any:
+        """
+        Load a value produced by a finished Einsum
+        """
+        return self.state["values"][name]
+
+    def restore(self, einsum: str, output: Any) -> Any:
+        """
+        Get the partially populated output of the Einsum if it was
+        interrupted, or the given (empty) output otherwise
+        """
+        if self.state["einsum"] == einsum:
+            return self.state["output"]
+
+        return output
+
+    def step(self, einsum: str, pos: Any, output: Any) -> None:
+        """
+        Record the end of an outer loop iteration, saving a checkpoint if one
+        is due
+        """
+        self.count += 1
+        due = self.every is not None and self.count % self.every == 0
+        if self.seconds is not None and time.monotonic() - self.last >= self.seconds:
+            due = True
+
+        if not due:
+            return
+
+        self.state["einsum"] = einsum
+        self.state["pos"] = pos
+        self.state["output"] = output
+        self.__save()
+
+    def todo(self, einsum: str, pos: Any) -> bool:
+        """
+        Returns True if the outer loop iteration still needs to be performed
+        """
+        return self.state["einsum"] != einsum or pos > self.state["pos"]
+
+    def __save(self) -> None:
+        """
+        Save the checkpoint, atomically, so that an interruption while saving
+        leaves the previous checkpoint intact
+        """
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+        self.last = time.monotonic()
@@ -0,0 +1,142 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Count the work assigned to each processing element of a spacetime mapping
+"""
+
+import numpy as np
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class LoadCounters:
+    """
+    Work per space coordinate and per time step of an Einsum, without
+    recording the individual activities (unlike the canvas)
+
+    The generated loop nest add()s one activity per space-time stamp, and
+    the load imbalance and utilization are displayed once the Einsum ends
+    """
+
+    def __init__(self, space: List[str],
+                 extents: Optional[List[Optional[int]]] = None) -> None:
+        """
+        Construct new LoadCounters for the given space ranks
+
+        The extents are the number of PEs along each space rank (None if
+        unknown); PEs that are never used still count towards the load
+        imbalance and the utilization
+        """
+        self.space_ranks = space
+        if extents is None:
+            self.extents: List[Optional[int]] = [None] * len(space)
+        else:
+            self.extents = extents
+        self.space: Dict[Tuple[Any, ...], int] = {}
+        self.time: Dict[Tuple[Any, ...], int] = {}
+
+    def add(self, space: Tuple[Any, ...], time: Tuple[Any, ...]) -> None:
+        """
+        Count one activity at the given space-time stamp
+        """
+        self.space[space] = self.space.get(space, 0) + 1
+        self.time[time] = self.time.get(time, 0) + 1
+
+    def display(self, einsum: str) -> None:
+        """
+        Print the load imbalance and utilization to stderr
+        """
+        report = self.report()
+        print(einsum + ": " + str(report["activities"]) + " activities on " +
+              str(report["pes"]) + " PEs over " + str(report["steps"]) +
+              " time steps, utilization " +
+              "{:.2f}".format(report["utilization"]), file=sys.stderr)
+
+        for rank in self.space_ranks:
+            print(
+                "  " +
+                rank +
+                ": imbalance " +
+                "{:.2f}".format(
+                    report[rank]["imbalance"]) +
+                ", utilization " +
+                "{:.2f}".format(
+                    report[rank]["utilization"]),
+                file=sys.stderr)
+
+    def histogram(self, rank: str) -> Tuple[List[Any], np.ndarray]:
+        """
+        Get the activities performed at each coordinate of the space rank
+        (including the unused coordinates within its extent), returned as
+        (coordinates, counts)
+        """
+        if rank not in self.space_ranks:
+            raise ValueError("Unknown space rank: " + rank)
+
+        i = self.space_ranks.index(rank)
+        used = set(stamp[i] for stamp in self.space.keys())
+        extent = self.extents[i]
+        if extent is not None:
+            used.update(range(extent))
+        coords = sorted(used)
+        index = {coord: j for j, coord in enumerate(coords)}
+
+        inds = np.array([index[stamp[i]]
+                        for stamp in self.space.keys()], dtype=np.int64)
+        counts = np.array(list(self.space.values()), dtype=np.int64)
+        return coords, np.bincount(
+            inds, weights=counts, minlength=len(coords)).astype(np.int64)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the load: the utilization of the PEs over the time steps,
+        and for each space rank, the imbalance (max / mean work per
+        coordinate) and the utilization (mean / max work per coordinate)
+        """
+        per_pe = np.array(list(self.space.values()), dtype=np.int64)
+        per_step = np.array(list(self.time.values()), dtype=np.int64)
+
+        activities = int(per_pe.sum())
+        pes = len(per_pe)
+        steps = len(per_step)
+        extents = [extent for extent in self.extents if extent is not None]
+        if len(extents) == len(self.extents):
+            pes = max(pes, int(np.prod(extents, dtype=np.int64)))
+
+        report: Dict[str, Any] = {
+            "activities": activities, "pes": pes, "steps": steps,
+            "utilization": activities / (pes * steps) if activities else 0.0,
+            "peak": int(per_step.max()) if steps else 0}
+
+        for rank in self.space_ranks:
+            coords, counts = self.histogram(rank)
+            mean = counts.mean() if len(counts) else 0.0
+            peak = counts.max() if len(counts) else 0
+            report[rank] = {
+                "coords": coords,
+                "counts": counts.tolist(),
+                "imbalance": float(peak / mean) if mean else 0.0,
+                "utilization": float(mean / peak) if peak else 0.0}
+
+        return report
@@ -0,0 +1,173 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Flatten the top ranks of a tensor while splitting them by occupancy
+"""
+
+from bisect import bisect_right
+from typing import Any, Iterator, List, Tuple
+
+
+class LazyFlatten:
+    """
+    A flattening of the top ranks of a tensor that is never built; its
+    elements are fed straight into the occupancy-based split that follows
+    it, avoiding the intermediate flattenRanks() copy
+
+    Only splitEqual() and splitNonUniform() are supported; the partitioner
+    builds one only for a flattened rank that is then split by occupancy
+    """
+
+    def __init__(self, tensor: Any, levels: int) -> None:
+        """
+        Construct a new LazyFlatten of the top levels + 1 ranks of the tensor
+        """
+        self.tensor = tensor
+        self.levels = levels
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+        """
+        Iterate over the (tuple coordinate, payload) pairs of the flattened
+        rank, in order
+        """
+        return LazyFlatten.flatten(self.tensor.getRoot(), self.levels)
+
+    @staticmethod
+    def flatten(fiber: Any,
+                levels: int) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+        """
+        Lazily flatten the top levels + 1 ranks of the fiber
+        """
+        for coord, payload in fiber:
+            if levels == 0:
+                yield (coord,), payload
+                continue
+
+            for rest, elem in LazyFlatten.flatten(payload, levels - 1):
+                yield (coord,) + rest, elem
+
+    @staticmethod
+    def group_equal(elems: Iterator[Tuple[Any, Any]],
+                    size: int) -> Iterator[List[Tuple[Any, Any]]]:
+        """
+        Group the elements into partitions of the given occupancy
+        """
+        group: List[Tuple[Any, Any]] = []
+        for elem in elems:
+            group.append(elem)
+            if len(group) == size:
+                yield group
+                group = []
+
+        if group:
+            yield group
+
+    @staticmethod
+    def group_split(elems: Iterator[Tuple[Any, Any]], splits: List[Any]
+                    ) -> Iterator[Tuple[Any, List[Tuple[Any, Any]]]]:
+        """
+        Group the elements into the partitions starting at the given
+        coordinates, returning (starting coordinate, elements); elements before
+        the first split belong to the first partition
+        """
+        start = None
+        group: List[Tuple[Any, Any]] = []
+        for coord, payload in elems:
+            i = max(bisect_right(splits, coord) - 1, 0)
+            if splits[i] != start and group:
+                yield start, group
+                group = []
+
+            start = splits[i]
+            group.append((coord, payload))
+
+        if group:
+            yield start, group
+
+    def splitEqual(self, size: int, pre_halo: Any = 0,
+                   post_halo: Any = 0) -> Any:
+        """
+        Split the flattened rank into partitions of the given occupancy
+
+        Partitions with a halo overlap, so they are split by fibertree after
+        flattening eagerly instead
+        """
+        if pre_halo or post_halo:
+            return self.__flatten().splitEqual(
+                size, pre_halo=pre_halo, post_halo=post_halo)
+
+        groups = LazyFlatten.group_equal(iter(self), size)
+        return self.__build((group[0][0], group) for group in groups)
+
+    def splitNonUniform(self, splits: Any, pre_halo: Any = 0,
+                        post_halo: Any = 0) -> Any:
+        """
+        Split the flattened rank at the coordinates of the given fiber (or
+        list)
+
+        Partitions with a halo overlap, so they are split by fibertree after
+        flattening eagerly instead
+        """
+        if pre_halo or post_halo:
+            return self.__flatten().splitNonUniform(
+                splits, pre_halo=pre_halo, post_halo=post_halo)
+
+        if hasattr(splits, "getCoords"):
+            splits = splits.getCoords()
+
+        if not splits:
+            return self.__build(iter([]))
+
+        return self.__build(LazyFlatten.group_split(iter(self), list(splits)))
+
+    def __build(
+            self, groups: Iterator[Tuple[Any, List[Tuple[Any, Any]]]]) -> Any:
+        """
+        Build the split tensor from the (upper coordinate, elements) partitions
+        """
+        from fibertree import Fiber, Tensor  # type: ignore
+
+        coords = []
+        payloads = []
+        for coord, group in groups:
+            coords.append(coord)
+            payloads.append(Fiber([elem[0] for elem in group],
+                                  [elem[1] for elem in group]))
+
+        rank_ids = self.tensor.getRankIds()
+        flat_rank = "".join(rank_ids[:self.levels + 1])
+        rank_ids = [flat_rank + "1", flat_rank + "0"] + \
+            rank_ids[self.levels + 1:]
+
+        return Tensor.fromFiber(
+            rank_ids=rank_ids,
+            fiber=Fiber(coords, payloads),
+            name=self.tensor.getName())
+
+    def __flatten(self) -> Any:
+        """
+        Flatten the tensor eagerly
+        """
+        return self.tensor.flattenRanks(
+            depth=0, levels=self.levels, coord_style="tuple")
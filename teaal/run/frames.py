@@ -0,0 +1,165 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Stream the activity of a spacetime mapping to disk, aggregated into frames
+"""
+
+import json
+import numpy as np
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class FrameCanvas:
+    """
+    A canvas that only keeps the number of activities per space stamp over
+    every given number of time steps (a frame), writing each frame to a JSON
+    lines file once it is complete
+
+    Without slip, a time step is a change in the time stamp; with slip, it
+    is the per-PE timestamp, tracked here in an array if the space stamps
+    are dense (non-negative positions), and in a dictionary otherwise
+
+    The frames can be read back one at a time with FrameCanvas.load(), so
+    that long runs can be animated without holding the whole canvas
+    """
+
+    def __init__(self,
+                 path: str,
+                 every: int,
+                 slip: bool = False,
+                 dense: bool = False) -> None:
+        """
+        Construct a new FrameCanvas, overwriting the frames at the path
+        """
+        self.path = path
+        self.every = every
+        self.slip = slip
+        self.dense = dense
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.stream = open(path, "w")
+
+        # Without slip, only the current frame is open
+        self.time: Any = None
+        self.step = -1
+        self.frame = 0
+        self.counts: Dict[Tuple[Any, ...], int] = {}
+
+        # With slip, every frame stays open until the end
+        self.frames: Dict[int, Dict[Tuple[Any, ...], int]] = {}
+        self.timestamps: Dict[Tuple[Any, ...], int] = {}
+        self.array: Optional[np.ndarray] = None
+
+    def add(self, space: Tuple[Any, ...], time: Tuple[Any, ...]) -> None:
+        """
+        Count one activity at the given space-time stamp
+        """
+        if time != self.time:
+            self.time = time
+            self.step += 1
+
+            frame = self.step // self.every
+            if frame != self.frame:
+                self.__write(self.frame, self.counts)
+                self.frame = frame
+                self.counts = {}
+
+        self.counts[space] = self.counts.get(space, 0) + 1
+
+    def add_slip(self, space: Tuple[Any, ...]) -> None:
+        """
+        Count one activity at the next timestamp of the given space stamp
+        """
+        frame = self.__tick(space) // self.every
+        if frame not in self.frames.keys():
+            self.frames[frame] = {}
+
+        counts = self.frames[frame]
+        counts[space] = counts.get(space, 0) + 1
+
+    def close(self) -> None:
+        """
+        Write the remaining frames and close the file
+        """
+        if self.counts:
+            self.__write(self.frame, self.counts)
+            self.counts = {}
+
+        for frame in sorted(self.frames.keys()):
+            self.__write(frame, self.frames[frame])
+        self.frames = {}
+
+        self.stream.close()
+
+    @staticmethod
+    def load(path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Read the frames back, one at a time, ignoring a final frame cut off
+        by an interruption
+        """
+        with open(path, "r") as stream:
+            for line in stream:
+                try:
+                    frame = json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+                frame["activity"] = {
+                    tuple(space): count for space, count in frame["activity"]}
+                yield frame
+
+    def __tick(self, space: Tuple[Any, ...]) -> int:
+        """
+        Increment the timestamp of the space stamp, returning its previous
+        value
+        """
+        if not self.dense:
+            time = self.timestamps.get(space, 0)
+            self.timestamps[space] = time + 1
+            return time
+
+        if self.array is None:
+            self.array = np.zeros([1] * len(space), dtype=np.int64)
+
+        # Grow the array to hold the new space stamp
+        if any(coord >= size for coord, size in zip(space, self.array.shape)):
+            pad = [(0, max(coord + 1, 2 * size) - size) if coord >= size
+                   else (0, 0) for coord, size in zip(space, self.array.shape)]
+            self.array = np.pad(self.array, pad)
+
+        time = int(self.array[space])
+        self.array[space] = time + 1
+        return time
+
+    def __write(self, frame: int, counts: Dict[Tuple[Any, ...], int]) -> None:
+        """
+        Write a frame
+        """
+        activity: List[Any] = [[list(space), count]
+                               for space, count in counts.items()]
+        line = {"frame": frame, "start": frame * self.every,
+                "activity": activity}
+        self.stream.write(json.dumps(line) + "\n")
+        self.stream.flush()
@@ -0,0 +1,114 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Count the steps of an intersector while the loop intersects its fibers
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import reduce
+from typing import Any, List
+
+
+class OnlineIntersector:
+    """
+    An intersector model that counts its steps as the generated loop
+    intersects the fibers, instead of from the coiteration traces
+
+    It stands in for the fibertree intersector of the same style, and the
+    generated loop calls its intersect() in place of Fiber.intersection() or
+    the & operator
+    """
+
+    def __init__(self, style: str) -> None:
+        """
+        Construct a new OnlineIntersector with the given style
+        (leader-follower, skip-ahead, or two-finger)
+        """
+        if style not in ["leader-follower", "skip-ahead", "two-finger"]:
+            raise ValueError("Unknown intersection style: " + style)
+
+        self.style = style
+        self.num_intersects = 0
+
+    def getNumIntersects(self) -> int:
+        """
+        Get the number of steps taken so far
+        """
+        return self.num_intersects
+
+    def intersect(self, *fibers: Any) -> Any:
+        """
+        Intersect the fibers and count the steps taken; for leader-follower
+        intersection, the first fiber is the leader
+        """
+        if self.style == "leader-follower":
+            self.num_intersects += len(fibers[0].getCoords())
+            return type(fibers[0]).intersection(
+                *fibers, style="leader-follower")
+
+        if len(fibers) != 2:
+            raise ValueError(
+                "Unable to intersect " + str(len(fibers)) + " fibers " +
+                self.style)
+
+        coords = [fiber.getCoords() for fiber in fibers]
+        if self.style == "skip-ahead":
+            self.num_intersects += OnlineIntersector.__skip_ahead(*coords)
+        else:
+            self.num_intersects += OnlineIntersector.__two_finger(*coords)
+
+        return reduce(lambda a, b: a & b, fibers)
+
+    @staticmethod
+    def __skip_ahead(a: List[Any], b: List[Any]) -> int:
+        """
+        Count the steps of a skip-ahead intersection, where each step either
+        matches the coordinates or skips the smaller one ahead to the larger
+        """
+        steps = 0
+        i = 0
+        j = 0
+        while i < len(a) and j < len(b):
+            steps += 1
+            if a[i] == b[j]:
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i = bisect_left(a, b[j], i)
+            else:
+                j = bisect_left(b, a[i], j)
+
+        return steps
+
+    @staticmethod
+    def __two_finger(a: List[Any], b: List[Any]) -> int:
+        """
+        Count the steps of a two-finger intersection, which visits every
+        coordinate up to the last coordinate of the shorter fiber once
+        """
+        if not a or not b:
+            return 0
+
+        last = min(a[-1], b[-1])
+        matches = len(set(a) & set(b))
+        return bisect_right(a, last) + bisect_right(b, last) - matches
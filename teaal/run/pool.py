@@ -0,0 +1,114 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+A process pool for the metrics dump that does not pickle its shared inputs
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional
+
+# The shared inputs of each open pool, inherited by its forked workers
+shared_inputs: Dict[int, List[Any]] = {}
+
+
+class SharedInput:
+    """
+    A reference to one of the shared inputs of a pool, sent to the workers
+    in place of the input itself
+    """
+
+    def __init__(self, key: int, index: int) -> None:
+        """
+        Construct a new SharedInput
+        """
+        self.key = key
+        self.index = index
+
+    def resolve(self) -> Any:
+        """
+        Get the input in the worker
+        """
+        return shared_inputs[self.key][self.index]
+
+
+def call_shared(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a function in a worker, resolving its shared inputs
+    """
+    resolved = [arg.resolve() if isinstance(arg, SharedInput) else arg
+                for arg in args]
+    return func(*resolved)
+
+
+class DumpPool:
+    """
+    Evaluate the metrics consumers of a dump (e.g., Traffic.buffetTraffic()
+    and Compute.numSwaps()) in parallel
+
+    The tensors and formats the consumers read are given to the pool when it
+    is created. Its workers are forked afterwards, so they inherit these
+    inputs instead of receiving a pickled copy with each call. Where fork is
+    unavailable, the inputs are pickled as usual.
+    """
+
+    def __init__(self, workers: int, inputs: List[Any]) -> None:
+        """
+        Construct a new DumpPool
+        """
+        self.key = id(self)
+        self.inputs = inputs
+
+        context: Optional[Any] = None
+        self.fork = "fork" in multiprocessing.get_all_start_methods()
+        if self.fork:
+            context = multiprocessing.get_context("fork")
+            shared_inputs[self.key] = inputs
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context)
+
+    def shutdown(self) -> None:
+        """
+        Wait for the workers to finish and release the shared inputs
+        """
+        self.executor.shutdown()
+        shared_inputs.pop(self.key, None)
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Start a call in a worker
+        """
+        if not self.fork:
+            return self.executor.submit(func, *args)
+
+        refs = []
+        for arg in args:
+            index = next((i for i, input_ in enumerate(self.inputs)
+                          if input_ is arg), None)
+            if index is None:
+                refs.append(arg)
+            else:
+                refs.append(SharedInput(self.key, index))
+
+        return self.executor.submit(call_shared, func, *refs)
@@ -0,0 +1,165 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Report the progress of a generated program while it runs
+"""
+
+import datetime
+import os
+import sys
+import time
+from typing import Any, Optional
+
+
+class Progress:
+    """
+    Counters on the outer loop of each Einsum, reporting the iteration rate,
+    the fraction of the top rank consumed, and the estimated time remaining
+
+    The generated code start()s and end()s it around the outer loop of each
+    Einsum and step()s it once per iteration; between reports, a step() only
+    costs a counter update and a clock read
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 seconds: float = 1.0) -> None:
+        """
+        Construct a new Progress, reporting to the status file at the path,
+        or to stderr if there is none, at most once every given seconds
+        """
+        self.path = path
+        self.seconds = seconds
+
+        self.einsum = ""
+        self.extent: Any = None
+        self.count = 0
+        self.coord: Any = None
+        self.prev: Any = None
+        self.start_time = time.monotonic()
+        self.last = self.start_time
+
+    def end(self) -> None:
+        """
+        Report that the current Einsum is done
+        """
+        elapsed = time.monotonic() - self.start_time
+        self.__report(
+            self.einsum + ": done, " + str(self.count) + " iterations in " +
+            Progress.__format_time(elapsed))
+
+    def fraction(self) -> Optional[float]:
+        """
+        Estimate the fraction of the top rank consumed, assuming the next
+        coordinate is as far from the current one as it is from the previous
+        one; None if the extent of the rank is unknown
+        """
+        coord = self.coord
+        prev = self.prev
+        extent = self.extent
+        if isinstance(coord, tuple):
+            coord = coord[0]
+            prev = prev[0] if isinstance(prev, tuple) else prev
+            extent = extent[0] if isinstance(extent, tuple) else extent
+
+        if not isinstance(coord, int) or not isinstance(
+                extent, int) or extent <= 0:
+            return None
+
+        step = 1
+        if isinstance(prev, int) and coord > prev:
+            step = coord - prev
+
+        return min((coord + step) / extent, 1.0)
+
+    def start(self, einsum: str, tensor: Any = None) -> None:
+        """
+        Start counting the outer loop of an Einsum, whose top rank has the
+        extent of the top rank of the given tensor
+        """
+        self.einsum = einsum
+        self.extent = None
+        if tensor is not None:
+            shape = tensor.getShape()
+            if shape:
+                self.extent = shape[0]
+
+        self.count = 0
+        self.coord = None
+        self.prev = None
+        self.start_time = time.monotonic()
+        self.last = self.start_time
+
+    def status(self) -> str:
+        """
+        Get the current status line
+        """
+        elapsed = time.monotonic() - self.start_time
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+
+        line = self.einsum + ": " + str(self.count) + \
+            " iterations, " + "{:.2f}".format(rate) + " it/s"
+
+        fraction = self.fraction()
+        if fraction is not None:
+            line += ", " + "{:.1f}".format(100 * fraction) + "%"
+            if fraction > 0:
+                eta = elapsed * (1 - fraction) / fraction
+                line += ", ETA " + Progress.__format_time(eta)
+
+        return line
+
+    def step(self, coord: Any) -> None:
+        """
+        Count an outer loop iteration, reporting if a report is due
+        """
+        self.count += 1
+        self.prev = self.coord
+        self.coord = coord
+
+        now = time.monotonic()
+        if now - self.last < self.seconds:
+            return
+
+        self.last = now
+        self.__report(self.status())
+
+    @staticmethod
+    def __format_time(seconds: float) -> str:
+        """
+        Format a duration as H:MM:SS
+        """
+        return str(datetime.timedelta(seconds=int(seconds)))
+
+    def __report(self, line: str) -> None:
+        """
+        Write the line to stderr, or replace the status file with it
+        """
+        if self.path is None:
+            print(line, file=sys.stderr)
+            return
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(line + "\n")
+        os.replace(tmp, self.path)
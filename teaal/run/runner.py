@@ -0,0 +1,253 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Run a compiled kernel over many datasets
+"""
+
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import inspect
+import os
+import resource
+import signal
+from typing import Any, Callable, Dict, List, Optional
+
+from teaal.dse.journal import Journal
+from teaal.trans.kernel import Kernel
+
+
+def load_tensor(dataset: str, name: str) -> Any:
+    """
+    Load a tensor from a dataset, stored as a directory of fibertree YAML
+    files named after the tensors
+    """
+    from fibertree import Tensor  # type: ignore
+    return Tensor.fromYAMLfile(os.path.join(dataset, name + ".yaml"))
+
+
+def run_job(kernel: Kernel,
+            dataset: str,
+            params: Dict[str, Any],
+            load: Callable[[str, str], Any],
+            time_limit: Optional[float],
+            mem_limit: Optional[int]) -> dict:
+    """
+    Run the kernel on a single dataset
+
+    Jobs that fail (including by exceeding their limits) are recorded with
+    their error instead of their metrics
+    """
+    def timeout(signum: int, frame: Any) -> None:
+        raise TimeoutError("Time limit exceeded")
+
+    try:
+        # Each job runs in its own process, so the limits only apply to it
+        if mem_limit is not None:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (mem_limit, hard))
+
+        if time_limit is not None:
+            signal.signal(signal.SIGALRM, timeout)
+            signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+        func = kernel.load()
+        args = Runner.bind(
+            func, dataset, params, load, kernel.get_tensors())
+        result = func(**args)
+
+        if time_limit is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+        metrics: Dict[str, Any] = {}
+        if isinstance(result, tuple) and result and isinstance(
+                result[-1], dict):
+            metrics = Runner.flatten(result[-1])
+
+        return {"dataset": dataset, "metrics": metrics, "error": None}
+
+    except MemoryError:
+        return {
+            "dataset": dataset,
+            "metrics": {},
+            "error": "Memory limit exceeded"}
+
+    except Exception as err:
+        return {"dataset": dataset, "metrics": {}, "error": str(err)}
+
+
+class Runner:
+    """
+    Run a compiled kernel over many datasets, collecting the metrics of each
+    into one table
+    """
+
+    def __init__(self,
+                 kernel: Kernel,
+                 datasets: List[str],
+                 params: Optional[Dict[str, Any]] = None,
+                 load: Callable[[str, str], Any] = load_tensor,
+                 workers: Optional[int] = None,
+                 time_limit: Optional[float] = None,
+                 mem_limit: Optional[int] = None,
+                 checkpoint: Optional[str] = None) -> None:
+        """
+        Construct a new Runner
+
+        The load function must be picklable (e.g., defined at the top level
+        of a module), since the jobs run in separate processes
+        """
+        self.kernel = kernel
+        self.datasets = datasets
+        self.params = params if params is not None else {}
+        self.load = load
+        self.workers = workers
+        self.time_limit = time_limit
+        self.mem_limit = mem_limit
+        self.checkpoint = checkpoint
+
+        self.journal = Journal(checkpoint, lambda result: result["dataset"])
+        self.results = self.journal.get_results()
+
+    @classmethod
+    def from_file(cls, filename: str, cache_dir: str,
+                  datasets: List[str], **kwargs: Any) -> "Runner":
+        """
+        Construct a new Runner from a YAML file
+        """
+        return cls(Kernel.from_file(filename, cache_dir), datasets, **kwargs)
+
+    @staticmethod
+    def bind(func: Callable[..., Any],
+             dataset: str,
+             params: Dict[str, Any],
+             load: Callable[[str, str], Any],
+             tensors: List[str]) -> Dict[str, Any]:
+        """
+        Build the arguments of the kernel for a dataset
+
+        Tensors (e.g., A_KM for the declared tensor A) are loaded from the
+        dataset, and sizes (e.g., K) are taken from the shapes of the
+        tensors, unless given in the params
+        """
+        names = list(inspect.signature(func).parameters.keys())
+
+        args: Dict[str, Any] = {}
+        sizes: Dict[str, Any] = {}
+        for name in names:
+            # Tensor names may themselves contain underscores
+            matches = [tensor for tensor in tensors
+                       if name.startswith(tensor + "_")]
+
+            if name in params.keys():
+                args[name] = params[name]
+
+            elif matches:
+                tensor = load(dataset, max(matches, key=len))
+                for rank, shape in zip(
+                        tensor.getRankIds(), tensor.getShape()):
+                    sizes.setdefault(rank, shape)
+                args[name] = tensor
+
+        for name in names:
+            if name in args.keys():
+                continue
+
+            if name not in sizes.keys():
+                raise ValueError("Unbound kernel parameter: " + name)
+            args[name] = sizes[name]
+
+        return args
+
+    @staticmethod
+    def flatten(metrics: Dict[Any, Any], prefix: str = "") -> Dict[str, Any]:
+        """
+        Flatten a nested metrics dictionary into columns named by their path
+        (e.g., Z.MainMemory.time)
+        """
+        flat: Dict[str, Any] = {}
+        for key, val in metrics.items():
+            name = prefix + str(key)
+            if isinstance(val, dict):
+                flat.update(Runner.flatten(val, name + "."))
+            else:
+                flat[name] = val
+
+        return flat
+
+    def get_table(self) -> Dict[str, List[Any]]:
+        """
+        Get the results as columns, one row per dataset (in the order given)
+
+        Metrics that a dataset did not produce are None
+        """
+        rows = [self.results[dataset]
+                for dataset in self.datasets if dataset in self.results.keys()]
+        names = sorted(
+            {name for row in rows for name in row["metrics"].keys()})
+
+        table: Dict[str, List[Any]] = {
+            "dataset": [row["dataset"] for row in rows],
+            "error": [row["error"] for row in rows]}
+        for name in names:
+            table[name] = [row["metrics"].get(name) for row in rows]
+
+        return table
+
+    def run(self) -> Dict[str, List[Any]]:
+        """
+        Run the kernel on all datasets not yet finished (including those
+        that failed before), and return the results table
+        """
+        todo = [dataset for dataset in self.datasets
+                if dataset not in self.results.keys() or
+                self.results[dataset]["error"] is not None]
+
+        # Compile the kernel once, before any job needs it
+        self.kernel.get_path()
+
+        # Use a fresh process per job, so that the limits and the memory of
+        # one job do not leak into the next
+        with ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1) as executor:
+            futures = {
+                executor.submit(
+                    run_job,
+                    self.kernel,
+                    dataset,
+                    self.params,
+                    self.load,
+                    self.time_limit,
+                    self.mem_limit): dataset for dataset in todo}
+            for future in as_completed(futures):
+                # A job that kills its worker (e.g., with a crash in native
+                # code) breaks the pool, failing all jobs still running
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    result = {
+                        "dataset": futures[future],
+                        "metrics": {},
+                        "error": "Worker process terminated abruptly"}
+
+                self.journal.record(result)
+
+        return self.get_table()
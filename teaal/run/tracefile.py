@@ -0,0 +1,223 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Binary columnar storage for the traces collected by the metrics
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class TraceFile:
+    """
+    A trace stored as fixed-width integer columns: a JSON header line naming
+    the columns, their types, and the number of rows, followed by the values
+    of each column in turn
+
+    Uncompressed traces can be read in place with numpy.memmap
+    """
+
+    VERSION = 1
+
+    @staticmethod
+    def find(csv_path: str) -> Optional[str]:
+        """
+        Get the packed trace that replaced the given CSV trace, if any
+        """
+        for ext in [".bin", ".bin.gz"]:
+            path = csv_path[:-len(".csv")] + ext
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    @staticmethod
+    def pack(csv_path: str, compress: bool = False) -> Optional[str]:
+        """
+        Replace a CSV trace with a (compressed) binary trace, returning its
+        path; traces that cannot be stored exactly (e.g., with non-integer
+        fields) are kept as CSV
+        """
+        with open(csv_path, "rb") as f:
+            text = f.read().decode("ascii", errors="replace")
+
+        newline = "\r\n" if text.endswith("\r\n") else "\n"
+        lines = text.split(newline)
+        if lines[-1] != "" or not lines[0]:
+            return None
+
+        names = lines[0].split(",")
+        rows = [line.split(",") for line in lines[1:-1]]
+        if any(len(row) != len(names) or not all(
+                TraceFile.__is_int(field) for field in row) for row in rows):
+            return None
+
+        values = np.array([[int(field) for field in row] for row in rows],
+                          dtype=np.int64).reshape(-1, len(names))
+        columns = {name: values[:, i] for i, name in enumerate(names)}
+
+        # Only replace the CSV if it can be rebuilt exactly
+        if TraceFile.__to_csv(names, columns, newline) != text:
+            return None
+
+        path = csv_path[:-len(".csv")] + (".bin.gz" if compress else ".bin")
+        TraceFile.write(path, columns, newline)
+        os.remove(csv_path)
+        return path
+
+    @staticmethod
+    def pack_all(prefix: str, compress: bool = False) -> List[str]:
+        """
+        Pack all CSV traces collected with the given prefix
+        """
+        paths = []
+        for csv_path in sorted(glob.glob(glob.escape(prefix) + "-*.csv")):
+            path = TraceFile.pack(csv_path, compress)
+            if path is not None:
+                paths.append(path)
+
+        return paths
+
+    @staticmethod
+    def read(path: str) -> Dict[str, np.ndarray]:
+        """
+        Read the columns of a binary trace
+        """
+        header, offset = TraceFile.__read_header(path)
+        rows = header["rows"]
+
+        data: Optional[bytes] = None
+        if path.endswith(".gz"):
+            with gzip.open(path, "rb") as f:
+                data = f.read()
+
+        columns = {}
+        for name, dtype in zip(header["columns"], header["dtypes"]):
+            if rows == 0:
+                columns[name] = np.zeros(0, dtype=dtype)
+            elif data is None:
+                columns[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=offset, shape=(rows,))
+            else:
+                columns[name] = np.frombuffer(
+                    data, dtype=dtype, count=rows, offset=offset)
+
+            offset += rows * np.dtype(dtype).itemsize
+
+        return columns
+
+    @staticmethod
+    def to_csv(path: str) -> bytes:
+        """
+        Rebuild the CSV trace that a binary trace replaced
+        """
+        header, _ = TraceFile.__read_header(path)
+        columns = TraceFile.read(path)
+        text = TraceFile.__to_csv(
+            header["columns"], columns, header["newline"])
+        return text.encode("ascii")
+
+    @staticmethod
+    def write(path: str, columns: Dict[str, np.ndarray],
+              newline: str = "\r\n") -> None:
+        """
+        Write the columns of a trace, compressed if the path ends in .gz
+        """
+        names = list(columns.keys())
+        rows = len(columns[names[0]]) if names else 0
+
+        # Store each column in the narrowest integer type that holds it
+        dtypes = []
+        for name in names:
+            values = columns[name]
+            for dtype in ["<i1", "<i2", "<i4", "<i8"]:
+                info = np.iinfo(dtype)
+                if rows == 0 or (
+                        values.min() >= info.min and values.max() <= info.max):
+                    break
+            dtypes.append(dtype)
+
+        header = json.dumps({"version": TraceFile.VERSION,
+                             "columns": names,
+                             "dtypes": dtypes,
+                             "rows": rows,
+                             "newline": newline})
+
+        # Align the start of the data for the memory map
+        size = len(header) + 1
+        header += " " * (-size % 8) + "\n"
+
+        data = header.encode("ascii") + b"".join(
+            np.asarray(columns[name], dtype=dtype).tobytes()
+            for name, dtype in zip(names, dtypes))
+
+        if path.endswith(".gz"):
+            with gzip.open(path, "wb") as f:
+                f.write(data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+
+    @staticmethod
+    def __is_int(field: str) -> bool:
+        """
+        Returns True if the field is an integer written in canonical form
+        """
+        return re.fullmatch(r"-?(0|[1-9][0-9]{0,17})", field) is not None
+
+    @staticmethod
+    def __read_header(path: str) -> Tuple[dict, int]:
+        """
+        Read the header of a binary trace, and the offset of its data
+        """
+        if path.endswith(".gz"):
+            with gzip.open(path, "rb") as f:
+                line = f.readline()
+        else:
+            with open(path, "rb") as f:
+                line = f.readline()
+
+        header = json.loads(line)
+        if header.get("version") != TraceFile.VERSION:
+            raise ValueError(
+                "Unknown trace version: " + str(header.get("version")))
+
+        return header, len(line)
+
+    @staticmethod
+    def __to_csv(names: List[str], columns: Dict[str, np.ndarray],
+                 newline: str) -> str:
+        """
+        Write the columns as CSV text
+        """
+        values = [columns[name].tolist() for name in names]
+        lines = [",".join(names)]
+        lines.extend(",".join(str(value) for value in row)
+                     for row in zip(*values))
+        return newline.join(lines) + newline
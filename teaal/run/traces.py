@@ -0,0 +1,141 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+A shared reader for the traces read by the metrics consumers
+"""
+
+import builtins
+import io
+import os
+from typing import Any, Callable, Dict, Optional
+
+from teaal.run.tracefile import TraceFile
+
+
+class TraceCache:
+    """
+    Keep the contents of the traces read by more than one of the metrics
+    consumers (e.g., Traffic.filterTrace() and Compute.numIters()) in memory,
+    so that each is read from disk once
+
+    Each trace is kept until it has been read as many times as planned by
+    the generated program. CSV traces that were packed into binary traces
+    (see TraceFile) are rebuilt for the consumers, which only read CSV
+    """
+
+    def __init__(self, reads: Dict[str, int]) -> None:
+        """
+        Construct a new TraceCache, given the number of times each shared
+        trace will be read
+        """
+        self.reads = {
+            os.path.abspath(path): num for path,
+            num in reads.items()}
+        self.contents: Dict[str, bytes] = {}
+        self.disk_reads = 0
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a metrics consumer, serving its reads of the shared traces from
+        memory
+        """
+        open_ = builtins.open
+
+        def cached_open(file: Any, mode: str = "r", *open_args: Any,
+                        **open_kwargs: Any) -> Any:
+            if not isinstance(file, (str, os.PathLike)):
+                return open_(file, mode, *open_args, **open_kwargs)
+
+            # Rewriting a trace invalidates its contents
+            path = os.path.abspath(file)
+            if any(char in mode for char in "wax+"):
+                self.contents.pop(path, None)
+                return open_(file, mode, *open_args, **open_kwargs)
+
+            packed: Optional[str] = None
+            if path.endswith(".csv") and not os.path.exists(path):
+                packed = TraceFile.find(path)
+
+            if path not in self.reads.keys() and packed is None:
+                return open_(file, mode, *open_args, **open_kwargs)
+
+            return self.__read(open_, path, packed, mode, *
+                               open_args, **open_kwargs)
+
+        builtins.open = cached_open
+        io.open = cached_open
+        try:
+            return func(*args, **kwargs)
+        finally:
+            builtins.open = open_
+            io.open = open_
+
+    def get_disk_reads(self) -> int:
+        """
+        Get the number of times a shared trace was read from disk
+        """
+        return self.disk_reads
+
+    def __read(self, open_: Callable[..., Any], path: str,
+               packed: Optional[str], mode: str, *args: Any,
+               **kwargs: Any) -> Any:
+        """
+        Open a trace from memory, freeing a shared trace after its last read
+        """
+        if path in self.contents.keys():
+            data = self.contents[path]
+        else:
+            if packed is None:
+                with open_(path, "rb") as f:
+                    data = f.read()
+            else:
+                data = TraceFile.to_csv(packed)
+            self.disk_reads += 1
+
+        if path in self.reads.keys():
+            self.contents[path] = data
+            self.reads[path] -= 1
+            if self.reads[path] <= 0:
+                del self.contents[path]
+
+        stream = io.BytesIO(data)
+        if "b" in mode:
+            return stream
+
+        # Decode as the file would be: the buffering is the only positional
+        # argument before the encoding, errors, and newline
+        names = ["buffering", "encoding", "errors", "newline"]
+        kwargs.update(zip(names, args))
+        return io.TextIOWrapper(
+            stream,
+            encoding=kwargs.get("encoding"),
+            errors=kwargs.get("errors"),
+            newline=kwargs.get("newline"))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Drop the contents when sent to another process
+        """
+        state = self.__dict__.copy()
+        state["contents"] = {}
+        return state
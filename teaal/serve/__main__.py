@@ -0,0 +1,82 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Compile an input file on a running compile server, or locally if none is
+running
+"""
+
+import os  # pragma: no cover
+import sys  # pragma: no cover
+import urllib.error  # pragma: no cover
+
+if __name__ == "__main__":  # pragma: no cover
+    # Configure Python path
+    path = os.path.abspath(".")
+    if path not in sys.path:
+        sys.path.append(path)
+
+    # Import only the client, so that the parsers are not built here
+    from teaal.serve import compile_remote, PORT
+
+    # Options are given as flags; those not for the client are passed to the
+    # compiler, e.g. --del
+    client = ["host", "port", "timeout"]
+    flags = [arg[2:] for arg in sys.argv[1:] if arg.startswith("--")]
+    opts = dict(flag.split("=", 1)
+                for flag in flags if flag.split("=", 1)[0] in client)
+    compiler_opts = [flag for flag in flags if flag.split("=", 1)[0]
+                     not in client]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    # Make sure we are given exactly one input file
+    if len(args) != 1:
+        print("Usage: python -m teaal.serve [--host=host] [--port=n] " +
+              "[--timeout=seconds] [compiler flags] [input file]")
+        sys.exit(1)
+
+    with open(args[0], "r") as f:
+        spec = f.read()
+
+    try:
+        result = compile_remote(
+            spec,
+            compiler_opts,
+            host=opts.get("host", "localhost"),
+            port=int(opts.get("port", PORT)),
+            timeout=float(opts["timeout"]) if "timeout" in opts else None)
+
+    except (urllib.error.URLError, TimeoutError):
+        from teaal.serve.server import compile_job
+        result = compile_job(spec, compiler_opts, None)
+
+    if result["error"] is not None:
+        print(result["error"], file=sys.stderr)
+        sys.exit(1)
+
+    print(result["hifiber"])
+
+    # Report the estimated peak number of live tensors
+    if result["peak_live"] is not None:
+        print(
+            "Peak live tensors: " + str(result["peak_live"]),
+            file=sys.stderr)
@@ -0,0 +1,58 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Thin client of the compile server
+"""
+
+import json
+from typing import List, Optional
+import urllib.error
+import urllib.request
+
+# The default port of the compile server
+PORT = 8421
+
+
+def compile_remote(spec: str,
+                   opts: List[str],
+                   host: str = "localhost",
+                   port: int = PORT,
+                   timeout: Optional[float] = None) -> dict:
+    """
+    Compile a specification on a running compile server
+
+    The result holds the generated HiFiber (or the error), the time taken to
+    compile it, and whether it came from the server's cache
+    """
+    data = json.dumps({"spec": spec, "opts": opts}).encode("utf-8")
+    request = urllib.request.Request(
+        "http://" + host + ":" + str(port) + "/compile",
+        data=data,
+        headers={"Content-Type": "application/json"})
+
+    # Failed compilations still carry a result
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as err:
+        return json.loads(err.read().decode("utf-8"))
@@ -0,0 +1,325 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Long-running compile server, which keeps the parsers and the results warm
+between compilations
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from teaal.serve.client import PORT
+from teaal.trans.snapshot import Snapshot
+
+# The snapshots of the specifications most recently compiled by this worker,
+# so that compiling one again with other options skips the analysis
+SNAPSHOTS = 16
+snapshots: OrderedDict[str, Snapshot] = OrderedDict()
+
+
+def compile_job(spec: str, opts: List[str],
+                time_limit: Optional[float]) -> dict:
+    """
+    Compile a specification in a worker process
+
+    Compilations that fail (including by exceeding the time limit) are
+    recorded with their error instead of the HiFiber
+    """
+    def timeout(signum: int, frame: Any) -> None:
+        raise TimeoutError("Time limit exceeded")
+
+    start = time.perf_counter()
+    try:
+        if time_limit is not None:
+            signal.signal(signal.SIGALRM, timeout)
+            signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+        hash_ = hashlib.sha256(spec.encode("utf-8")).hexdigest()
+        snapshot = snapshots.pop(hash_, None)
+        if snapshot is None:
+            snapshot = Snapshot(spec)
+
+        hifiber = snapshot.translate([opt for opt in opts if opt != "live"])
+        snapshots[hash_] = snapshot
+        if len(snapshots) > SNAPSHOTS:
+            snapshots.popitem(last=False)
+
+        code = str(hifiber)
+        peak_live = hifiber.get_peak_live() if "live" in opts else None
+
+        return {
+            "hifiber": code,
+            "peak_live": peak_live,
+            "error": None,
+            "time": time.perf_counter() - start}
+
+    except Exception as err:
+        return {
+            "hifiber": None,
+            "peak_live": None,
+            "error": str(err),
+            "time": time.perf_counter() - start}
+
+    finally:
+        # The worker outlives the job, so the alarm must not
+        if time_limit is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def warm_job() -> None:
+    """
+    Start a worker process; importing this module builds the parsers
+    """
+
+
+class CompileServer:
+    """
+    Serve compilations over localhost HTTP
+
+    Compilations run in a bounded pool of worker processes, which stay alive
+    (with their parsers built) between requests, and successful results are
+    kept in a cache of bounded size
+    """
+
+    # The error of requests rejected because the queue is full
+    BUSY = "Server busy"
+
+    def __init__(self,
+                 host: str = "localhost",
+                 port: int = PORT,
+                 workers: Optional[int] = None,
+                 time_limit: Optional[float] = None,
+                 cache_size: int = 256,
+                 queue_size: int = 64) -> None:
+        """
+        Construct a new CompileServer
+
+        Requests beyond the queue size (including the ones running) are
+        rejected, rather than waiting for a worker
+        """
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.cache_size = cache_size
+
+        self.cache: OrderedDict[str, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.queue = threading.BoundedSemaphore(queue_size)
+
+        self.executor = self.__make_executor()
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        setattr(self.httpd, "compiler", self)
+
+    def compile(self, spec: str, opts: List[str]) -> dict:
+        """
+        Compile a specification, using the cache if possible
+        """
+        key = "\n".join(sorted(opts)) + "\n" + spec
+        hash_ = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        with self.lock:
+            if hash_ in self.cache.keys():
+                self.cache.move_to_end(hash_)
+                self.hits += 1
+                return dict(self.cache[hash_], time=0.0, cached=True)
+            self.misses += 1
+
+        if not self.queue.acquire(blocking=False):
+            return {
+                "hifiber": None,
+                "peak_live": None,
+                "error": CompileServer.BUSY,
+                "time": 0.0,
+                "cached": False}
+
+        try:
+            with self.lock:
+                executor = self.executor
+            future = executor.submit(compile_job, spec, opts, self.time_limit)
+
+            # Give the worker a chance to report its own timeout first
+            wait = None if self.time_limit is None else self.time_limit + 1
+            try:
+                result = future.result(timeout=wait)
+            except FutureTimeout:
+                # The worker did not stop itself (e.g., it is stuck where the
+                # alarm cannot interrupt it), so replace it
+                self.__recycle(executor)
+                result = {
+                    "hifiber": None,
+                    "peak_live": None,
+                    "error": "Time limit exceeded",
+                    "time": wait}
+            except BrokenProcessPool:
+                result = {
+                    "hifiber": None,
+                    "peak_live": None,
+                    "error": "Worker process terminated abruptly",
+                    "time": 0.0}
+
+        finally:
+            self.queue.release()
+
+        if result["error"] is None:
+            with self.lock:
+                self.cache[hash_] = result
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        return dict(result, cached=False)
+
+    def get_address(self) -> Tuple[str, int]:
+        """
+        Get the address the server is listening on
+        """
+        host, port = self.httpd.server_address[:2]
+        return str(host), int(port)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the statistics of the cache
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.cache)}
+
+    def serve_forever(self) -> None:
+        """
+        Start the workers and serve requests until shut down
+        """
+        futures = [self.executor.submit(warm_job)
+                   for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.executor.shutdown(cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """
+        Stop serving requests (from another thread)
+        """
+        self.httpd.shutdown()
+
+    def __make_executor(self) -> ProcessPoolExecutor:
+        """
+        Make a new pool of workers
+        """
+        # The workers must not inherit the threads of the server
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"))
+
+    def __recycle(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Replace a pool of workers, killing its workers
+        """
+        with self.lock:
+            # Another request may have already replaced it
+            if self.executor is not executor:
+                return
+            self.executor = self.__make_executor()
+
+        # The jobs still running on the old pool fail with BrokenProcessPool
+        processes = list(getattr(executor, "_processes", {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Handle the requests to a CompileServer
+    """
+
+    def do_GET(self) -> None:
+        """
+        Report the statistics of the cache
+        """
+        if self.path != "/stats":
+            self.__reply(404, {"error": "Unknown path: " + self.path})
+            return
+
+        self.__reply(200, self.__get_compiler().get_stats())
+
+    def do_POST(self) -> None:
+        """
+        Compile the specification in the body of the request
+        """
+        if self.path != "/compile":
+            self.__reply(404, {"error": "Unknown path: " + self.path})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length).decode("utf-8"))
+            spec = body["spec"]
+            opts = body.get("opts", [])
+        except (ValueError, KeyError, TypeError) as err:
+            self.__reply(400, {"error": "Bad request: " + str(err)})
+            return
+
+        result = self.__get_compiler().compile(spec, opts)
+        if result["error"] == CompileServer.BUSY:
+            self.__reply(503, result)
+        else:
+            self.__reply(200, result)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Do not log every request
+        """
+
+    def __get_compiler(self) -> CompileServer:
+        """
+        Get the CompileServer of this request
+        """
+        return getattr(self.server, "compiler")
+
+    def __reply(self, code: int, result: dict) -> None:
+        """
+        Send a JSON reply
+        """
+        data = json.dumps(result).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -31,6 +31,7 @@ from typing import List, Optional
 from teaal.hifiber import *
 from teaal.ir.program import Program
 from teaal.ir.tensor import Tensor
+from teaal.parse.utils import ParseUtils
 from teaal.trans.coord_access import CoordAccess
 
 
@@ -87,6 +88,29 @@ class Canvas:
         # Create the corresponding statement
         return SExpr(add)
 
+    def add_frame_activity(self) -> Statement:
+        """
+        Count an activity in the current frame of the streamed canvas
+        """
+        spacetime = self.program.get_spacetime()
+        if spacetime is None:
+            raise ValueError("SpaceTime information unspecified")
+
+        space = self.get_space_tuple()
+        if spacetime.get_slip():
+            add = EMethod(EVar("canvas"), "add_slip", [AJust(space)])
+        else:
+            add = EMethod(EVar("canvas"), "add", [
+                          AJust(space), AJust(self.get_time_tuple())])
+
+        return SExpr(add)
+
+    def close_frame_canvas(self) -> Statement:
+        """
+        Write the last frames of the streamed canvas
+        """
+        return SExpr(EMethod(EVar("canvas"), "close", []))
+
     def create_canvas(self) -> Statement:
         """
         Create a canvas
@@ -108,6 +132,30 @@ class Canvas:
         # Build the assignment
         return SAssign(AVar("canvas"), create)
 
+    def create_frame_canvas(self) -> Statement:
+        """
+        Create a canvas that streams the activity to disk, aggregated into
+        frames
+        """
+        spacetime = self.program.get_spacetime()
+        if spacetime is None:
+            raise ValueError("SpaceTime information unspecified")
+
+        frames = spacetime.get_frames()
+        if frames is None:
+            raise ValueError("SpaceTime frames unspecified")
+
+        every, file_ = frames
+        args: List[Argument] = [AJust(EString(file_)), AJust(EInt(every))]
+        if spacetime.get_slip():
+            args.append(AParam("slip", EBool(True)))
+
+            # The timestamps are only tracked with slip
+            if spacetime.is_dense():
+                args.append(AParam("dense", EBool(True)))
+
+        return SAssign(AVar("canvas"), EFunc("FrameCanvas", args))
+
     def display_canvas(self) -> Statement:
         """
         Display the canvas
@@ -119,6 +167,42 @@ class Canvas:
         # Create call displayCanvas(canvas)
         return SExpr(EFunc("displayCanvas", [AJust(EVar("canvas"))]))
 
+    def get_space_extents(self) -> Optional[Expression]:
+        """
+        Get the number of PEs along each space rank (None for the ranks
+        where it is not known statically), or None if it is never known
+        """
+        spacetime = self.program.get_spacetime()
+        if spacetime is None:
+            raise ValueError("SpaceTime information unspecified")
+
+        part_ir = self.program.get_partitioning()
+        extents: List[Expression] = []
+        for rank in spacetime.get_space():
+            # Only the bottom rank of a uniform partitioning is bounded
+            root, suffix = part_ir.split_rank_name(rank)
+            part = None
+            if suffix == "0":
+                part = part_ir.get_part_spec((root,))[-1]
+
+            # The coordinates of an occupancy-based partition are not dense
+            if part is None or part.data not in [
+                    "uniform_occupancy", "uniform_shape"]:
+                extents.append(EVar("None"))
+            elif part.data == "uniform_occupancy" and \
+                    spacetime.get_style(rank) == "coord":
+                extents.append(EVar("None"))
+            elif list(part.find_data("int_sz")):
+                extents.append(EInt(ParseUtils.find_int(part, "int_sz")))
+            else:
+                extents.append(EVar(ParseUtils.find_str(part, "str_sz")))
+
+        if all(isinstance(extent, EVar) and extent.name == "None"
+               for extent in extents):
+            return None
+
+        return EList(extents)
+
     def get_space_tuple(self) -> Expression:
         """
         Get the space stamp tuple for this mapping
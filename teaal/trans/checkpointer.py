@@ -0,0 +1,165 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Translate the checkpointing of the generated program
+"""
+
+from typing import List, Optional, Tuple
+
+from teaal.hifiber import *
+from teaal.ir.tensor import Tensor
+from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
+
+
+class Checkpointer:
+    """
+    Generate the HiFiber code for checkpointing the output of each Einsum at
+    its outer loop rank, so that a rerun resumes where it stopped
+    """
+
+    def __init__(
+            self,
+            options: Options,
+            mapping: Mapping,
+            metrics: bool) -> None:
+        """
+        Construct a new Checkpointer; metrics is True if the metrics are
+        collected
+        """
+        self.checkpoint = options.get_checkpoint()
+
+        # The traces and the graphics cannot be restored mid-Einsum
+        if self.checkpoint is not None and metrics:
+            raise ValueError(
+                "Checkpointing cannot be combined with metrics collection")
+
+        if self.checkpoint is not None and mapping.get_spacetime():
+            raise ValueError(
+                "Checkpointing cannot be combined with spacetime")
+
+        # The Einsum being resumed, stored as (Einsum, rank), and its output
+        self.resume: Optional[Tuple[str, str]] = None
+        self.output = ""
+
+    def end_einsum(self) -> None:
+        """
+        Finish checkpointing the current Einsum
+        """
+        self.resume = None
+
+    def is_enabled(self) -> bool:
+        """
+        Returns True if the program is checkpointed
+        """
+        return self.checkpoint is not None
+
+    def is_resumed(self, rank: str) -> bool:
+        """
+        Returns True if the current Einsum resumes at the given rank
+        """
+        return self.resume is not None and self.resume[1] == rank
+
+    def make_checkpointed(
+            self,
+            payload: Payload,
+            body: Statement) -> Statement:
+        """
+        Skip the outer loop iterations finished before the checkpoint, and
+        checkpoint after each iteration
+        """
+        if self.resume is None:
+            raise ValueError(
+                "No Einsum to checkpoint. Make sure to first call start_einsum()")
+
+        coord = payload.payloads[0] if isinstance(payload, PTuple) else payload
+        pos = EVar(coord.gen(True))
+        einsum = AJust(EString(self.resume[0]))
+
+        checkpoint = EVar("checkpoint")
+        step = EMethod(checkpoint, "step", [
+                       einsum, AJust(pos), AJust(EVar(self.output))])
+        todo = EMethod(checkpoint, "todo", [einsum, AJust(pos)])
+        return SIf((todo, SBlock([body, SExpr(step)])), [], None)
+
+    def make_restore(self, output: Tensor) -> Statement:
+        """
+        Continue populating the output of the current Einsum from the
+        checkpoint
+        """
+        if self.resume is None:
+            return SBlock([])
+
+        self.output = output.tensor_name()
+        restore = EMethod(
+            EVar("checkpoint"), "restore", [
+                AJust(EString(self.resume[0])), AJust(EVar(self.output))])
+        return SAssign(AVar(self.output), restore)
+
+    @staticmethod
+    def make_resumable(
+            einsum: str,
+            values: List[str],
+            stmt: Statement) -> Statement:
+        """
+        Skip the statement translating the Einsums up to the given Einsum if a
+        checkpoint shows they were already finished, restoring their values
+        instead
+        """
+        checkpoint = EVar("checkpoint")
+        name = EString(einsum)
+
+        restore = SBlock([])
+        for value in values:
+            load = EMethod(checkpoint, "load", [AJust(EString(value))])
+            restore.add(SAssign(AVar(value), load))
+
+        saved = EDict({EString(value): EVar(value) for value in values})
+        finish = EMethod(checkpoint, "finish", [AJust(name), AJust(saved)])
+        run = SBlock([stmt, SExpr(finish)])
+
+        done = EMethod(checkpoint, "done", [AJust(name)])
+        return SIf((done, restore), [], run)
+
+    def make_start(self) -> Statement:
+        """
+        Create the checkpoint
+        """
+        if self.checkpoint is None:
+            return SBlock([])
+
+        args: List[Argument] = [AJust(EString(self.checkpoint["file"]))]
+        if self.checkpoint.get("every") is not None:
+            args.append(AParam("every", EInt(self.checkpoint["every"])))
+        if self.checkpoint.get("seconds") is not None:
+            args.append(AParam("seconds", EFloat(
+                float(self.checkpoint["seconds"]))))
+
+        return SAssign(AVar("checkpoint"), EFunc("Checkpoint", args))
+
+    def start_einsum(self, einsum: str, ranks: List[str]) -> None:
+        """
+        Start checkpointing the given Einsum at its outer loop rank
+        """
+        if self.checkpoint is not None and ranks:
+            self.resume = (einsum, ranks[0])
@@ -24,6 +24,8 @@ SOFTWARE.
 Translate the metrics collection
 """
 
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
 from teaal.hifiber import *
 from teaal.ir.component import *
 from teaal.ir.fusion import Fusion
@@ -53,6 +55,9 @@ class Collector:
         # tree_traces: Optional[Dict[rank, Dict[is_read, Set[tensor]]]]
         self.tree_traces: Optional[Dict[str, Dict[bool, Set[str]]]] = None
 
+        # The traces read by more than one consumer in the metrics dump
+        self.shared: Dict[str, int] = {}
+
     def create_component(self, component: Component, rank: str) -> Statement:
         """
         Create a component to track metrics
@@ -60,15 +65,24 @@ class Collector:
         name = component.get_name()
         if isinstance(component, LeaderFollowerComponent):
             constructor = "LeaderFollowerIntersector"
+            style = "leader-follower"
         elif isinstance(component, SkipAheadComponent):
             constructor = "SkipAheadIntersector"
+            style = "skip-ahead"
         elif isinstance(component, TwoFingerComponent):
             constructor = "TwoFingerIntersector"
+            style = "two-finger"
         else:
             raise ValueError(
                 "Unable to create consumable metrics component for " +
                 name + " of type " + type(component).__name__)
 
+        # Online intersectors count their steps as the loop intersects the
+        # fibers
+        if self.program.get_options().is_set("online-intersect"):
+            online = EFunc("OnlineIntersector", [AJust(EString(style))])
+            return SAssign(AVar(name + "_" + rank), online)
+
         return SAssign(AVar(name + "_" + rank), EFunc(constructor, []))
 
     def consume_traces(self, component: str, rank: str) -> Statement:
@@ -110,14 +124,58 @@ class Collector:
                     EVar("metrics"), EString(einsum)), EDict(
                     {})))
 
+        hardware = self.metrics.get_hardware()
+
+        # Pack the collected traces, which the consumers then read through
+        # the trace cache
+        options = self.program.get_options()
+        if options.get_trace_format() == "binary":
+            args: List[Argument] = [
+                AJust(EString(hardware.get_prefix(einsum)))]
+            if options.is_set("compress-traces"):
+                args.append(AParam("compress", EBool(True)))
+            block.add(SExpr(EMethod(EVar("TraceFile"), "pack_all", args)))
+
         # Create the formats
         block.add(self.__build_formats())
 
-        # Track the traffic
-        block.add(self.__build_traffic())
-
-        # Track the merges
-        block.add(self.__build_merges())
+        # Read each trace shared by multiple consumers from disk only once
+        self.shared = self.__plan_reads()
+        if self.shared or self.__is_packed():
+            cache = EFunc("TraceCache", [
+                          AJust(TransUtils.build_expr(self.shared))])
+            block.add(SAssign(AVar("trace_cache"), cache))
+
+        # Track the traffic and the merges, first starting all of the
+        # computations and then collecting their results if they are
+        # performed in parallel
+        workers = options.get_dump_workers()
+        if workers is not None:
+            # The workers inherit the formats and the merged tensors rather
+            # than receiving a copy with each call
+            inputs: List[Expression] = [EVar("formats")]
+            for merger in hardware.get_components(einsum, MergerComponent):
+                for binding in merger.get_bindings()[einsum]:
+                    inputs.append(
+                        EVar(
+                            binding["tensor"] +
+                            "_" +
+                            "".join(
+                                binding["init-ranks"])))
+
+            pool = EFunc("DumpPool", [AJust(EInt(workers)),
+                                      AJust(EList(inputs))])
+            block.add(SAssign(AVar("dump_pool"), pool))
+
+        traffic_start, traffic_end = self.__build_traffic()
+        merges_start, merges_end = self.__build_merges()
+        block.add(traffic_start)
+        block.add(merges_start)
+        block.add(traffic_end)
+        block.add(merges_end)
+
+        if workers is not None:
+            block.add(SExpr(EMethod(EVar("dump_pool"), "shutdown", [])))
 
         # Track the compute
         block.add(self.__build_compute())
@@ -161,9 +219,11 @@ class Collector:
         # Collect the iteration number if necessary
         block.add(self.__make_iter_num(rank))
 
-        # Consume a trace if necessary
+        # Consume a trace if necessary (online intersectors are updated
+        # during the iteration instead)
+        online = self.program.get_options().is_set("online-intersect")
         coiter = self.metrics.get_coiter(rank)
-        if coiter is not None:
+        if coiter is not None and not online:
             block.add(self.consume_traces(coiter.get_name(), rank))
 
         # Eagerly store subtrees as necessary
@@ -373,16 +433,66 @@ class Collector:
 
         return SBlock([])
 
+    def __consume(self, obj: str, func: str, args: List[Argument],
+                  traces: Iterable[str]) -> Expression:
+        """
+        Call a metrics consumer, through the trace cache if it reads a shared
+        trace
+        """
+        if self.__is_packed() or any(
+                trace in self.shared.keys() for trace in traces):
+            consumer: List[Argument] = [AJust(EField(obj, func))]
+            return EMethod(EVar("trace_cache"), "call", consumer + args)
+
+        return EMethod(EVar(obj), func, args)
+
+    def __get_active_bindings(self) -> Dict[str, List[dict]]:
+        """
+        Get the bindings of each buffer that correspond to traffic
+        """
+        einsum = self.program.get_equation().get_output().root_name()
+        active_bindings: Dict[str, List[dict]] = {}
+
+        # Filter out the bindings to ignore
+        for buffer_ in self.metrics.get_hardware().get_components(einsum, BufferComponent):
+            active_bindings[buffer_.get_name()] = []
+            for binding in buffer_.get_bindings()[einsum]:
+                format_ = self.metrics.get_format().get_spec(
+                    binding["tensor"])[binding["format"]]
+                rank = binding["rank"]
+                type_ = binding["type"]
+
+                # First make sure that this binding actually corresponds to
+                # traffic
+                check_cbits = type_ == "coord" or type_ == "elem"
+                check_pbits = type_ == "payload" or type_ == "elem"
+                if check_cbits and (
+                        "cbits" not in format_[rank] or format_[rank]["cbits"] == 0):
+                    # Inconsequential line to make the coverage test go in here
+                    x = 1
+                    continue
+                if check_pbits and (
+                        "pbits" not in format_[rank] or format_[rank]["pbits"] == 0):
+                    # Inconsequential line to make the coverage test go in here
+                    x = 1
+                    continue
+
+                active_bindings[buffer_.get_name()].append(binding)
+
+        return active_bindings
+
     def __get_trace(self, binding: dict,
-                    is_read: bool) -> Tuple[str, Statement]:
+                    is_read: bool) -> Tuple[str, List[str], Statement]:
         """
-        Get the (trace, HiFiber to produce the trace)
+        Get the (trace, traces read to produce it, HiFiber to produce the
+        trace)
         """
         einsum = self.program.get_equation().get_output().root_name()
         prefix = self.metrics.get_hardware().get_prefix(einsum) + \
             "-" + binding["rank"] + "-"
 
         block = SBlock([])
+        reads: List[str] = []
         if "style" in binding and binding["style"] == "eager":
             trace_fn = prefix + "eager_" + \
                 binding["tensor"].lower() + "_" + binding["root"].lower()
@@ -403,14 +513,20 @@ class Collector:
                 filter_fn = prefix + "iter.csv"
                 trace_fn = prefix + fiber_trace + "_payload.csv"
 
-                args = [AJust(EString(fn))
-                        for fn in [input_fn, filter_fn, trace_fn]]
-                block.add(SExpr(EMethod(EVar("Traffic"), "filterTrace", args)))
+                reads = [input_fn, filter_fn]
+                args: List[Argument] = [
+                    AJust(
+                        EString(fn)) for fn in [
+                        input_fn,
+                        filter_fn,
+                        trace_fn]]
+                block.add(SExpr(self.__consume(
+                    "Traffic", "filterTrace", args, reads)))
 
             else:
                 trace_fn = prefix + fiber_trace + ".csv"
 
-        return trace_fn, block
+        return trace_fn, reads, block
 
     def __build_components(self) -> Statement:
         """
@@ -617,12 +733,17 @@ class Collector:
 
         return block
 
-    def __build_merges(self) -> Statement:
+    def __build_merges(self) -> Tuple[Statement, Statement]:
         """
-        Add the code to compute the merge operations
+        Add the code to compute the merge operations, returned as (code to
+        start the computation, code to collect the results)
         """
         block = SBlock([])
         einsum = self.program.get_equation().get_output().root_name()
+        parallel = self.program.get_options().get_dump_workers() is not None
+
+        # Without a pool, the results are computed as soon as they are needed
+        results = SBlock([]) if parallel else block
 
         metrics_einsum = EAccess(EVar("metrics"), EString(einsum))
         for merger in self.metrics.get_hardware().get_components(einsum, MergerComponent):
@@ -656,19 +777,35 @@ class Collector:
                 else:
                     next_latency = EString("N")
 
-                args = [
+                args: List[Argument] = [
                     AJust(expr) for expr in [
                         tensor_name,
                         depth,
                         radix,
                         next_latency]]
-                swaps_call = EMethod(EVar("Compute"), "numSwaps", args)
-                block.add(
-                    SAssign(
-                        AAccess(
-                            metrics_merger,
-                            EString(input_)),
-                        swaps_call))
+                swaps_assn = AAccess(metrics_merger, EString(input_))
+                if parallel:
+                    future = "swaps_" + merger_name + "_" + input_
+                    submit_args: List[Argument] = [
+                        AJust(EField("Compute", "numSwaps"))]
+                    block.add(
+                        SAssign(
+                            AVar(future),
+                            EMethod(
+                                EVar("dump_pool"),
+                                "submit",
+                                submit_args + args)))
+                    results.add(
+                        SAssign(
+                            swaps_assn,
+                            EMethod(
+                                EVar(future),
+                                "result",
+                                [])))
+
+                else:
+                    swaps_call = EMethod(EVar("Compute"), "numSwaps", args)
+                    results.add(SAssign(swaps_assn, swaps_call))
 
             # Compute the time required
             # TODO: Support more than one tensor per merger
@@ -685,10 +822,13 @@ class Collector:
                 EInt(op_freq))
 
             metrics_time = AAccess(metrics_merger, EString("time"))
-            block.add(SAssign(metrics_time, time))
+            results.add(SAssign(metrics_time, time))
             self.fusion.add_component(einsum, merger.get_name())
 
-        return block
+        if parallel:
+            return block, results
+
+        return block, SBlock([])
 
     def __build_sequencers(self) -> Statement:
         """
@@ -699,6 +839,7 @@ class Collector:
         einsum = self.program.get_equation().get_output().root_name()
         metrics_einsum = EAccess(EVar("metrics"), EString(einsum))
 
+        counted: Dict[str, Expression] = {}
         for seq in self.metrics.get_hardware().get_components(einsum, SequencerComponent):
             seq_assn = AAccess(metrics_einsum, EString(seq.get_name()))
             block.add(SAssign(seq_assn, EDict({})))
@@ -707,14 +848,18 @@ class Collector:
             ranks = []
             for rank in seq.get_ranks(einsum):
                 ranks.append(rank)
-                trace = self.metrics.get_hardware().get_prefix(einsum) + \
-                    "-" + rank + "-iter.csv"
-                num_iters = EMethod(
-                    EVar("Compute"), "numIters", [
-                        AJust(
-                            EString(trace))])
+                trace = self.__iter_trace(rank)
                 seq_rank = AAccess(seq_expr, EString(rank))
+
+                # Only count the iterations of each trace once
+                if trace in counted:
+                    block.add(SAssign(seq_rank, counted[trace]))
+                    continue
+
+                num_iters = self.__consume(
+                    "Compute", "numIters", [AJust(EString(trace))], [trace])
                 block.add(SAssign(seq_rank, num_iters))
+                counted[trace] = EAccess(seq_expr, EString(rank))
 
             # Compute time
             steps: Optional[Expression] = None
@@ -892,42 +1037,23 @@ class Collector:
 
         return block, register
 
-    def __build_traffic(self) -> Statement:
+    def __build_traffic(self) -> Tuple[Statement, Statement]:
         """
-        Add the code to compute traffic
+        Add the code to compute traffic, returned as (code to start the
+        computation, code to collect the results)
         """
         block = SBlock([])
         einsum = self.program.get_equation().get_output().root_name()
+        parallel = self.program.get_options().get_dump_workers() is not None
 
-        active_bindings: Dict[str, List[dict]] = {}
-        # Filter out the bindings to ignore
-        for buffer_ in self.metrics.get_hardware().get_components(einsum, BufferComponent):
-            active_bindings[buffer_.get_name()] = []
-            for binding in buffer_.get_bindings()[einsum]:
-                format_ = self.metrics.get_format().get_spec(
-                    binding["tensor"])[binding["format"]]
-                rank = binding["rank"]
-                type_ = binding["type"]
+        # Without a pool, the results are computed as soon as they are needed
+        results = SBlock([]) if parallel else block
 
-                # First make sure that this binding actually corresponds to
-                # traffic
-                check_cbits = type_ == "coord" or type_ == "elem"
-                check_pbits = type_ == "payload" or type_ == "elem"
-                if check_cbits and (
-                        "cbits" not in format_[rank] or format_[rank]["cbits"] == 0):
-                    # Inconsequential line to make the coverage test go in here
-                    x = 1
-                    continue
-                if check_pbits and (
-                        "pbits" not in format_[rank] or format_[rank]["pbits"] == 0):
-                    # Inconsequential line to make the coverage test go in here
-                    x = 1
-                    continue
-
-                active_bindings[buffer_.get_name()].append(binding)
+        active_bindings = self.__get_active_bindings()
 
         metrics_einsum = EAccess(EVar("metrics"), EString(einsum))
         traffic_dict: Dict[str, Set[str]] = {}
+        filtered: Set[str] = set()
         for buffer_ in self.metrics.get_hardware().get_components(einsum, BufferComponent):
             bindings = TransUtils.build_expr(
                 active_bindings[buffer_.get_name()])
@@ -946,15 +1072,20 @@ class Collector:
                 ranks.add(rank)
                 type_ = binding["type"]
 
-                # Now add the trace
-                trace, create_trace = self.__get_trace(binding, True)
-                block.add(create_trace)
+                # Now add the trace, only filtering each trace once
+                trace, _, create_trace = self.__get_trace(binding, True)
+                if trace not in filtered:
+                    filtered.add(trace)
+                    block.add(create_trace)
                 traces[(binding["tensor"], rank, type_, "read")] = trace
                 tensor_ir = self.program.get_equation(
                 ).get_tensor(binding["tensor"])
                 if tensor_ir.get_is_output():
-                    trace, create_trace = self.__get_trace(binding, False)
-                    block.add(create_trace)
+                    trace, _, create_trace = self.__get_trace(
+                        binding, False)
+                    if trace not in filtered:
+                        filtered.add(trace)
+                        block.add(create_trace)
                     traces[(binding["tensor"], rank, type_, "write")] = trace
 
                 # Also need to add the evict-on rank to the set of ranks if one
@@ -965,7 +1096,7 @@ class Collector:
             traces_dict = TransUtils.build_expr(traces)
             block.add(SAssign(AVar("traces"), traces_dict))
 
-            args = [
+            args: List[Argument] = [
                 AJust(
                     EVar("bindings")),
                 AJust(
@@ -1001,13 +1132,38 @@ class Collector:
             else:
                 traffic_func = "cacheTraffic"
 
-            block.add(
-                SAssign(
-                    AVar("traffic"),
-                    EMethod(
-                        EVar("Traffic"),
-                        traffic_func,
-                        args)))
+            if parallel:
+                future = "traffic_" + buffer_.get_name()
+                submit_args: List[Argument] = [
+                    AJust(EField("Traffic", traffic_func))]
+                if self.__is_packed():
+                    submit_args.insert(
+                        0, AJust(EField("trace_cache", "call")))
+                block.add(
+                    SAssign(
+                        AVar(future),
+                        EMethod(
+                            EVar("dump_pool"),
+                            "submit",
+                            submit_args + args)))
+
+                results.add(
+                    SAssign(
+                        AVar("traffic"),
+                        EMethod(
+                            EVar(future),
+                            "result",
+                            [])))
+
+            else:
+                block.add(
+                    SAssign(
+                        AVar("traffic"),
+                        self.__consume(
+                            "Traffic",
+                            traffic_func,
+                            args,
+                            traces.values())))
 
             # Now add it to the metrics dictionary
             added = set()
@@ -1027,7 +1183,7 @@ class Collector:
 
                 if src not in traffic_dict:
                     traffic_dict[src] = set()
-                    block.add(
+                    results.add(
                         SAssign(
                             AAccess(
                                 metrics_einsum, EString(src)), EDict(
@@ -1037,12 +1193,12 @@ class Collector:
                 metrics_tensor = EAccess(metrics_src, EString(tensor))
                 if tensor not in traffic_dict[src]:
                     traffic_dict[src].add(tensor)
-                    block.add(
+                    results.add(
                         SAssign(
                             AAccess(
                                 metrics_src, EString(tensor)), EDict(
                                 {})))
-                    block.add(
+                    results.add(
                         SAssign(
                             AAccess(
                                 metrics_tensor,
@@ -1050,7 +1206,7 @@ class Collector:
                             EInt(0)))
 
                     if tensor_ir.get_is_output():
-                        block.add(
+                        results.add(
                             SAssign(
                                 AAccess(
                                     metrics_tensor,
@@ -1063,7 +1219,7 @@ class Collector:
                             EVar("traffic"),
                             EInt(0)),
                         EString(tensor))
-                    block.add(
+                    results.add(
                         SIAssign(
                             AAccess(
                                 metrics_tensor,
@@ -1074,7 +1230,7 @@ class Collector:
                                 EString("read"))))
 
                     if tensor_ir.get_is_output():
-                        block.add(
+                        results.add(
                             SIAssign(
                                 AAccess(
                                     metrics_tensor, EString("write")),
@@ -1122,10 +1278,13 @@ class Collector:
                     component.get_bandwidth() *
                     component.get_num_instances()))
 
-            block.add(SAssign(metrics_time, time))
+            results.add(SAssign(metrics_time, time))
             self.fusion.add_component(einsum, src)
 
-        return block
+        if parallel:
+            return block, results
+
+        return block, SBlock([])
 
     def __make_iter_num(self, rank: str) -> Statement:
         """
@@ -1157,3 +1316,67 @@ class Collector:
         iter_num = EMethod(EMethod(EVar("Metrics"), "getIter", []), "copy", [])
 
         return SAssign(iter_var, iter_num)
+
+    def __is_packed(self) -> bool:
+        """
+        Returns True if the traces are packed into binary traces before the
+        metrics dump
+        """
+        return self.program.get_options().get_trace_format() == "binary"
+
+    def __iter_trace(self, rank: str) -> str:
+        """
+        Get the iteration trace of a rank
+        """
+        einsum = self.program.get_equation().get_output().root_name()
+        return self.metrics.get_hardware().get_prefix(einsum) + \
+            "-" + rank + "-iter.csv"
+
+    def __plan_reads(self) -> Dict[str, int]:
+        """
+        Count the reads of each trace read more than once by the consumers in
+        the metrics dump; the traffic computed by a pool is read elsewhere
+        """
+        einsum = self.program.get_equation().get_output().root_name()
+        hardware = self.metrics.get_hardware()
+        parallel = self.program.get_options().get_dump_workers() is not None
+
+        reads: Dict[str, int] = {}
+
+        def read(traces: Iterable[str]) -> None:
+            for trace in traces:
+                reads[trace] = reads.get(trace, 0) + 1
+
+        # Traffic.filterTrace() and Traffic.buffetTraffic() or
+        # Traffic.cacheTraffic()
+        active_bindings = self.__get_active_bindings()
+        filtered: Set[str] = set()
+        for buffer_ in hardware.get_components(einsum, BufferComponent):
+            traces: Set[str] = set()
+            for binding in active_bindings[buffer_.get_name()]:
+                tensor_ir = self.program.get_equation().get_tensor(
+                    binding["tensor"])
+                for is_read in [True, False]:
+                    if not is_read and not tensor_ir.get_is_output():
+                        continue
+
+                    trace, filter_reads, _ = self.__get_trace(
+                        binding, is_read)
+                    if trace not in filtered:
+                        filtered.add(trace)
+                        read(filter_reads)
+                    traces.add(trace)
+
+            if not parallel:
+                read(sorted(traces))
+
+        # Compute.numIters()
+        counted: Set[str] = set()
+        for seq in hardware.get_components(einsum, SequencerComponent):
+            for rank in seq.get_ranks(einsum):
+                trace = self.__iter_trace(rank)
+                if trace not in counted:
+                    counted.add(trace)
+                    read([trace])
+
+        return {trace: num for trace, num in reads.items() if num > 1}
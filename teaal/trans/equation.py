@@ -25,13 +25,14 @@ Translation for how tensors and variables are combined
 """
 
 from sympy import Add, Basic, Integer, Mul, Rational, solve, Symbol  # type: ignore
-from typing import cast, Dict, List, Optional, Type
+from typing import cast, Dict, List, Optional, Tuple, Type
 
 from teaal.hifiber import *
 from teaal.ir.component import *
 from teaal.ir.metrics import Metrics
 from teaal.ir.program import Program
 from teaal.ir.tensor import Tensor
+from teaal.parse.format import Format
 from teaal.parse.utils import ParseUtils
 from teaal.trans.coord_access import CoordAccess
 
@@ -42,12 +43,178 @@ class Equation:
     equation at the bottom of the loop nest
     """
 
-    def __init__(self, program: Program, metrics: Optional[Metrics]) -> None:
+    def __init__(
+            self,
+            program: Program,
+            metrics: Optional[Metrics],
+            format_: Optional[Format] = None,
+            batching: bool = False) -> None:
         """
         Construct a new Equation
         """
         self.program = program
         self.metrics = metrics
+        self.format = format_
+        self.batching = batching
+
+        # The rank whose output fiber is currently being built in one batch
+        self.batch: Optional[str] = None
+
+        # The rank currently being iterated with a range() over dense payloads
+        self.dense: Optional[str] = None
+
+        # Inputs produced in the same loop nest, stored as the rank mapped to
+        # (tensor, producer's iteration expression, producer's payload)
+        self.fused: Dict[str, Tuple[str, Expression, Payload]] = {}
+
+    def fuse(
+            self,
+            rank: str,
+            tensor: str,
+            expr: Expression,
+            payload: Payload) -> None:
+        """
+        Iterate over the producer of the given input tensor at this rank
+        instead of the tensor itself
+        """
+        self.fused[rank] = (tensor, expr, payload)
+
+    def can_batch(self, rank: str, tensors: List[Tensor]) -> bool:
+        """
+        Returns True if the output fiber at this rank is written append-only
+        in coordinate order, and can therefore be built in one batch
+        """
+        if not self.batching or self.metrics is not None or \
+                self.program.get_spacetime() is not None:
+            return False
+
+        # Every loop rank must be an output rank, so each coordinate is
+        # written exactly once in order
+        if not self.__no_reduction():
+            return False
+
+        if rank != self.program.get_loop_order().get_ranks()[-1]:
+            return False
+
+        if self.program.get_partitioning().is_flattened(rank):
+            return False
+
+        output, inputs = self.program.get_equation().get_iter(tensors)
+        return output is not None and output.peek_clean() == rank and len(
+            inputs) > 0
+
+    def is_dense(self, rank: str, tensors: List[Tensor]) -> bool:
+        """
+        Returns True if every tensor at this rank stores it uncompressed and
+        there is no intersection, so the loop can index the payloads directly
+        """
+        if self.format is None or self.metrics is not None or \
+                self.program.get_spacetime() is not None:
+            return False
+
+        part = self.program.get_partitioning()
+        if part.split_rank_name(rank)[1] != "" or part.is_flattened(rank):
+            return False
+
+        output, inputs = self.program.get_equation().get_iter(tensors)
+        if len(inputs) != 1 or len(inputs[0]) != 1:
+            return False
+
+        dense = inputs[0]
+        if output:
+            dense = [output] + dense
+
+        for tensor in dense:
+            if tensor.peek_clean() != rank or not self.format.is_uncompressed(
+                    tensor.root_name(), rank):
+                return False
+
+        return True
+
+    def make_batch_end(self) -> Statement:
+        """
+        Build the output fiber from the batched coordinates and payloads
+        """
+        if self.batch is None:
+            raise ValueError("No output batch started")
+
+        name = self.__batch_name(self.batch)
+        fiber = EFunc("Fiber", [AJust(EVar(name + "_coords")),
+                                AJust(EVar(name + "_payloads"))])
+        self.batch = None
+
+        return SExpr(EMethod(EVar(name), "extend", [AJust(fiber)]))
+
+    def make_batch_start(self, rank: str) -> Statement:
+        """
+        Start batching the writes to the output fiber at this rank
+        """
+        self.batch = rank
+        name = self.__batch_name(rank)
+
+        return SBlock([SAssign(AVar(name + "_coords"), EList([])),
+                       SAssign(AVar(name + "_payloads"), EList([]))])
+
+    def make_dense_access(self, tensors: List[Tensor]) -> Statement:
+        """
+        Index the payloads of the dense rank for this iteration; the tensors
+        must already be popped
+        """
+        if self.dense is None:
+            raise ValueError("No dense rank started")
+
+        block = SBlock([])
+        coord = EVar(self.dense.lower())
+        output, inputs = self.program.get_equation().get_iter(tensors)
+        if output:
+            fiber = EVar(self.__fiber_name(output, self.dense))
+            ref = EMethod(fiber, "getPayloadRef", [AJust(coord)])
+            block.add(SAssign(AVar(output.fiber_name()), ref))
+
+        for term in inputs:
+            for tensor in term:
+                payloads = EVar(
+                    self.__fiber_name(
+                        tensor, self.dense) + "_payloads")
+                block.add(
+                    SAssign(
+                        AVar(
+                            tensor.fiber_name()),
+                        EAccess(
+                            payloads,
+                            coord)))
+
+        self.dense = None
+        return block
+
+    def make_dense_start(self, rank: str, tensors: List[Tensor]) -> Statement:
+        """
+        Start iterating a dense rank by extracting the payload arrays of the
+        inputs
+
+        Fibers built from uncompressed data may still omit the zeros, in which
+        case the payloads are looked up by coordinate instead
+        """
+        self.dense = rank
+
+        block = SBlock([])
+        _, inputs = self.program.get_equation().get_iter(tensors)
+        for term in inputs:
+            for tensor in term:
+                fiber = EVar(tensor.fiber_name())
+                payloads = AVar(tensor.fiber_name() + "_payloads")
+                block.add(
+                    SAssign(payloads, EMethod(fiber, "getPayloads", [])))
+
+                length = EFunc("len", [AJust(EVar(payloads.name))])
+                lookup = EMethod(fiber, "getPayload",
+                                 [AJust(EVar(rank.lower()))])
+                shape = EFunc("range", [AJust(EVar(rank))])
+                every = EComp(lookup, rank.lower(), shape)
+                block.add(SIf((EBinOp(length, OLt(), EVar(rank)),
+                               SAssign(payloads, every)), [], None))
+
+        return block
 
     def make_eager_inputs(self, rank: str, inputs: List[str]) -> Statement:
         """
@@ -64,6 +231,31 @@ class Equation:
         method_call = EMethod(EVar("Fiber"), "fromLazy", [AJust(iter_expr)])
         return SAssign(AVar("inputs_" + rank.lower()), method_call)
 
+    def make_halo_views(self, rank: str) -> Statement:
+        """
+        Make the views of the follower ranks limited to this tile of their
+        leader plus its halo
+        """
+        views = SBlock([])
+        for follower in self.program.get_halo_views():
+            window = self.__halo_window(follower)
+            if window is None or window[0] != rank:
+                continue
+
+            for tensor in self.program.get_equation().get_tensors():
+                if tensor.peek_clean() != follower:
+                    continue
+
+                fiber = tensor.fiber_name()
+                get_range = EMethod(
+                    EVar(fiber), "getRange", [
+                        AJust(
+                            window[1]), AJust(
+                            window[2])])
+                views.add(SAssign(AVar(fiber + "_view"), get_range))
+
+        return views
+
     def make_interval(self, rank: str) -> Statement:
         """
         Make the interval to project over: [rank_start, rank_end)
@@ -112,6 +304,14 @@ class Equation:
 
         output, inputs = self.program.get_equation().get_iter(tensors)
 
+        # A dense rank iterates over its shape
+        if rank == self.dense:
+            return EFunc("range", [AJust(EVar(rank))])
+
+        # A batched output is built after the loop instead of populated
+        if rank == self.batch:
+            output = None
+
         # If there are no input tensors, we need to iterRangeShapeRef on the
         # output
         if len(tensors) == 1 and output:
@@ -194,23 +394,19 @@ class Equation:
             raise ValueError(
                 "Must have at least one tensor to make the payload")
 
+        # A dense rank only binds the coordinate; the payloads are indexed
+        # in the body
+        if rank == self.dense:
+            return PVar(rank.lower())
+
         # Separate the tensors into terms
         output, inputs = self.program.get_equation().get_iter(tensors)
+        if rank == self.batch:
+            output = None
 
         payload: Payload
         if inputs:
-            # Construct the term payloads
-            term_payloads = []
-            for term in inputs:
-                payload = PVar(term[-1].fiber_name())
-                for factor in reversed(term[:-1]):
-                    payload = PTuple([PVar(factor.fiber_name()), payload])
-                term_payloads.append(payload)
-
-            # Construct the entire expression payload
-            payload = term_payloads[-1]
-            for term_payload in reversed(term_payloads[:-1]):
-                payload = PTuple([PVar("_"), term_payload, payload])
+            payload = self.__make_input_payload(rank, inputs)
 
             # Put the output on the outside
             if output:
@@ -240,6 +436,17 @@ class Equation:
 
         return payload
 
+    def make_input_payload(self, rank: str, tensors: List[Tensor]) -> Payload:
+        """
+        Construct the payload of only the input tensors, without the rank
+        variable
+        """
+        _, inputs = self.program.get_equation().get_iter(tensors)
+        if not inputs:
+            raise ValueError("Must have at least one input tensor")
+
+        return self.__make_input_payload(rank, inputs)
+
     def make_update(self) -> Statement:
         """
         Construct the statement that will actually update the output tensor
@@ -261,6 +468,18 @@ class Equation:
         for product in products[1:]:
             sum_ = EBinOp(sum_, OAdd(), product)
 
+        # Append to the batch if the output is built after the loop
+        if self.batch is not None:
+            name = self.__batch_name(self.batch)
+            coord = AJust(EVar(self.batch.lower()))
+
+            # Copy an input's value, so the output does not share its payload
+            if isinstance(sum_, EVar):
+                sum_ = EMethod(EVar("Payload"), "get", [AJust(sum_)])
+
+            return SBlock([SExpr(EMethod(EVar(name + "_coords"), "append", [coord])),
+                           SExpr(EMethod(EVar(name + "_payloads"), "append", [AJust(sum_)]))])
+
         # Create the final statement
         out_name = self.program.get_equation().get_output().root_name().lower() + "_ref"
 
@@ -292,6 +511,51 @@ class Equation:
             expr = EFunc("enumerate", [AJust(expr)])
         return expr
 
+    def __batch_name(self, rank: str) -> str:
+        """
+        Get the name of the output fiber being built at this rank
+        """
+        return Equation.__fiber_name(
+            self.program.get_equation().get_output(), rank)
+
+    def __make_input_payload(
+            self, rank: str, inputs: List[List[Tensor]]) -> Payload:
+        """
+        Construct the payload of the input terms
+        """
+        # Construct the term payloads
+        term_payloads = []
+        for term in inputs:
+            payload = self.__input_payload(rank, term[-1])
+            for factor in reversed(term[:-1]):
+                payload = PTuple(
+                    [self.__input_payload(rank, factor), payload])
+            term_payloads.append(payload)
+
+        # Construct the entire expression payload
+        payload = term_payloads[-1]
+        for term_payload in reversed(term_payloads[:-1]):
+            payload = PTuple([PVar("_"), term_payload, payload])
+
+        return payload
+
+    def __input_payload(self, rank: str, tensor: Tensor) -> Payload:
+        """
+        Get the payload of an input tensor (or of its fused producer)
+        """
+        if rank in self.fused.keys(
+        ) and self.fused[rank][0] == tensor.root_name():
+            return self.fused[rank][2]
+
+        return PVar(tensor.fiber_name())
+
+    @staticmethod
+    def __fiber_name(tensor: Tensor, rank: str) -> str:
+        """
+        Get the name of the tensor's fiber at the given (unpartitioned) rank
+        """
+        return tensor.root_name().lower() + "_" + rank.lower()
+
     def __no_reduction(self) -> bool:
         out_ranks = self.program.get_equation().get_output().get_ranks()
         all_ranks = self.program.get_loop_order().get_ranks()
@@ -341,6 +605,56 @@ class Equation:
 
         return any(Equation.__frac_coords(arg) for arg in sexpr.args)
 
+    def __halo_window(
+            self, troot: str) -> Optional[Tuple[str, Expression, Expression]]:
+        """
+        Get the leader tile rank and the (start, size) of the window of a
+        viewed follower rank that covers the leader's tile and its halo,
+        should one exist
+        """
+        leader = self.program.get_halo_views().get(troot.upper())
+        if leader is None:
+            return None
+
+        # The window is only bounded by uniform_shape tiles of the leader
+        partitioning = self.program.get_partitioning()
+        spec = partitioning.get_part_spec((leader,))
+        if not spec or spec[-1].data != "uniform_shape":
+            return None
+
+        shape, tile = partitioning.partition_names((leader,), True)[:2]
+
+        # The follower must move one-to-one with the leader
+        lsym = Symbol(leader.lower())
+        sexpr = self.program.get_coord_math().get_cond_expr(
+            troot.lower(), lambda expr: lsym in expr.atoms(Symbol))
+        offset = sexpr - lsym
+        if lsym in offset.atoms(Symbol):
+            return None
+
+        # Bound the offset by the shapes of the other ranks
+        low: Basic = Integer(0)
+        high: Basic = Integer(0)
+        for term in Add.make_args(offset):
+            if term.is_number:
+                low += term
+                high += term
+                continue
+
+            coeff, sym = term.as_coeff_Mul()
+            if not isinstance(sym, Symbol):
+                return None
+
+            bound = coeff * (Symbol(str(sym).upper()) - 1)
+            if coeff > 0:
+                high += bound
+            else:
+                low += bound
+
+        start = CoordAccess.build_expr(Symbol(tile.lower()) + low)
+        size = CoordAccess.build_expr(Symbol(shape) + high - low)
+        return tile, start, size
+
     def __in_update(self, factor: str) -> bool:
         """
         Returns true if the factor should be included in the update
@@ -348,6 +662,16 @@ class Equation:
         i, j = self.program.get_equation().get_factor_order()[factor]
         return self.program.get_equation().get_in_update()[i][j]
 
+    def __input_fiber(self, rank: str, tensor: Tensor) -> Expression:
+        """
+        Get the fiber for iterating an input tensor (or its fused producer)
+        """
+        if rank in self.fused.keys(
+        ) and self.fused[rank][0] == tensor.root_name():
+            return self.fused[rank][1]
+
+        return self.__iter_fiber(rank, tensor)
+
     def __iter_fiber(self, rank: str, tensor: Tensor) -> Expression:
         """
         Get fiber for iteration (may involve projection)
@@ -397,7 +721,16 @@ class Equation:
                               EVar(rank.lower() + "_end")])
             args.append(AParam("interval", interval))
 
-        project = EMethod(EVar(tensor.fiber_name()), "project", args)
+        # If the tensor is viewed through the leader's tile, project the view
+        fiber = tensor.fiber_name()
+        window = self.__halo_window(troot)
+        if window is not None and bottom_rank:
+            ranks = self.program.get_loop_order().get_ranks()
+            if rank in ranks and ranks.index(
+                    window[0]) < ranks.index(rank):
+                fiber += "_view"
+
+        project = EMethod(EVar(fiber), "project", args)
 
         # If there are no fractional coordinates or this is not the bottom
         # rank, we are done
@@ -420,9 +753,16 @@ class Equation:
         """
         leader_follower = False
         leader = ""
+        tracker: Optional[str] = None
         if self.metrics is not None:
             intersector = self.metrics.get_coiter(rank)
 
+            # If the intersector is updated as the loop runs, it performs the
+            # intersection itself
+            if intersector is not None and self.program.get_options().is_set(
+                    "online-intersect"):
+                tracker = intersector.get_name() + "_" + rank
+
             # If this uses leader-follower intersection
             if isinstance(intersector, LeaderFollowerComponent):
                 leader_follower = True
@@ -453,13 +793,21 @@ class Equation:
                     fiber_args.append(self.__iter_fiber(rank, factor))
 
                 args: List[Argument] = [AJust(fiber) for fiber in fiber_args]
-                args.append(AParam("style", EString("leader-follower")))
-                expr = EMethod(EVar("Fiber"), "intersection", args)
+                if tracker is None:
+                    args.append(AParam("style", EString("leader-follower")))
+                    expr = EMethod(EVar("Fiber"), "intersection", args)
+                else:
+                    expr = EMethod(EVar(tracker), "intersect", args)
+
+            elif tracker is not None and len(term) > 1:
+                fibers = [AJust(self.__input_fiber(rank, factor))
+                          for factor in term]
+                expr = EMethod(EVar(tracker), "intersect", fibers)
 
             else:
-                expr = self.__iter_fiber(rank, term[-1])
+                expr = self.__input_fiber(rank, term[-1])
                 for factor in reversed(term[:-1]):
-                    fiber = self.__iter_fiber(rank, factor)
+                    fiber = self.__input_fiber(rank, factor)
                     expr = Equation.__add_operator(fiber, OAnd(), expr)
             intersections.append(expr)
 
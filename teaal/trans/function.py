@@ -0,0 +1,84 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Translate the kernel() function wrapping the program
+"""
+
+import re
+import symtable
+from typing import List
+
+from teaal.hifiber import *
+from teaal.trans.liveness import Liveness
+
+
+class Function:
+    """
+    Generate the HiFiber code for the kernel() function, which takes the
+    inputs and sizes of the program and returns its outputs
+    """
+
+    def __init__(self, liveness: Liveness, metrics: bool) -> None:
+        """
+        Construct a new Function; if metrics is True, the function also
+        returns the collected metrics
+        """
+        self.liveness = liveness
+        self.metrics = metrics
+        self.params: List[str] = []
+
+    def get_params(self) -> List[str]:
+        """
+        Get the parameters of the function: the input tensors, the scalar
+        variables, and the sizes used by the program
+        """
+        return self.params
+
+    def make_kernel(self, program: Statement) -> Statement:
+        """
+        Wrap the program in the function
+        """
+        outputs: List[Expression] = [
+            EVar(name) for name in self.liveness.get_outputs()]
+
+        if self.metrics:
+            outputs.append(EVar("metrics"))
+
+        ret: Expression
+        if len(outputs) == 1:
+            ret = outputs[0]
+        else:
+            ret = ETuple(outputs)
+
+        body = SBlock([program, SReturn(ret)])
+
+        # Any other rank name read but never assigned is a size (e.g., K or K0)
+        func = SFunc("kernel", [], body).gen(0)
+        table = symtable.symtable(func, "kernel", "exec").get_children()[0]
+        sizes = sorted(name for name in table.get_identifiers()
+                       if table.lookup(name).is_global() and
+                       re.fullmatch(r"[A-Z][A-Z0-9]*", name))
+
+        self.params = self.liveness.get_inputs() + self.liveness.get_variables() + \
+            sizes
+        return SFunc("kernel", [EVar(param) for param in self.params], body)
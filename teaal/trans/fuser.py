@@ -0,0 +1,174 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Fuse the loop nests of a producer and a consumer Einsum
+"""
+
+from typing import List, Set, Tuple
+
+from teaal.ir.flow_graph import FlowGraph
+from teaal.ir.flow_nodes import *
+from teaal.ir.iter_graph import IterationGraph
+from teaal.ir.node import Node
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
+
+
+class Fuser:
+    """
+    Find the Einsums whose loop nests can be fused with the next Einsum,
+    which consumes their output, so that the intermediate tensor is only ever
+    built one tile at a time
+    """
+
+    def __init__(
+            self,
+            einsum: Einsum,
+            mapping: Mapping,
+            options: Options) -> None:
+        """
+        Construct a new Fuser
+        """
+        self.einsum = einsum
+        self.mapping = mapping
+        self.options = options
+
+    @staticmethod
+    def first_loop(nodes: List[Node]) -> int:
+        """
+        Get the position of the first loop
+        """
+        for i, node in enumerate(nodes):
+            if isinstance(node, LoopNode):
+                return i
+
+        return len(nodes)
+
+    def get_fused_ranks(self, i: int) -> List[str]:
+        """
+        Get the top loop ranks over which the i'th Einsum can be fused with
+        the next Einsum, empty if they cannot be fused
+        """
+        num_einsums = len(self.einsum.get_expressions())
+        if i + 1 >= num_einsums:
+            return []
+
+        def configure(j: int) -> Program:
+            program = Program(self.einsum, self.mapping, self.options)
+            program.add_einsum(j)
+            return program
+
+        prod = configure(i)
+        cons = configure(i + 1)
+        tensor = prod.get_equation().get_output().root_name()
+
+        # The consumer must be the only Einsum reading the intermediate, and
+        # the two Einsums cannot otherwise share tensors
+        def read(program: Program) -> Set[str]:
+            return {name for term in program.get_equation().get_term_tensors()
+                    for name in term}
+
+        prod_reads = read(prod)
+        cons_reads = read(cons)
+        cons_output = cons.get_equation().get_output().root_name()
+        if tensor not in cons_reads or tensor in prod_reads or cons_output in prod_reads or \
+                prod_reads.intersection(cons_reads) or cons_output == tensor:
+            return []
+
+        for j in range(i + 2, num_einsums):
+            if tensor in read(configure(j)):
+                return []
+
+        # Neither Einsum can be partitioned or displayed
+        for program in [prod, cons]:
+            if program.get_partitioning().get_all_parts() or program.get_spacetime():
+                return []
+
+        # The intermediate must be built and read in its own rank order
+        for program in [prod, cons]:
+            tensor_ir = program.get_equation().get_tensor(tensor)
+            ranks = tensor_ir.get_ranks().copy()
+            program.get_loop_order().apply(tensor_ir)
+            if tensor_ir.get_ranks() != ranks:
+                return []
+
+        fused = []
+        for prod_rank, cons_rank, tensor_rank in zip(
+                prod.get_loop_order().get_ranks(), cons.get_loop_order().get_ranks(), ranks):
+            if not prod_rank == cons_rank == tensor_rank:
+                break
+            fused.append(prod_rank)
+
+        # The fused loops must be directly nested in both Einsums
+        for program in [configure(i), configure(i + 1)]:
+            nodes = FlowGraph(program, None, ["hoist"]).get_sorted()
+            start = Fuser.first_loop(nodes)
+            for j, rank in enumerate(fused):
+                node = nodes[start + j]
+                if not isinstance(node, LoopNode) or node.get_rank() != rank:
+                    fused = fused[:j]
+                    break
+
+        # The producer must iterate over inputs at each fused rank, and the
+        # consumer must read the intermediate. If the consumer takes a union,
+        # the producer must iterate over a single input, so that coordinates
+        # only in the other terms give it an empty fiber
+        def swizzled(j: int) -> Tuple[Program, IterationGraph]:
+            program = configure(j)
+            for tensor_ir in program.get_equation().get_tensors():
+                program.get_loop_order().apply(tensor_ir)
+            return program, IterationGraph(program)
+
+        prod, prod_graph = swizzled(i)
+        cons, cons_graph = swizzled(i + 1)
+        for j, rank in enumerate(fused):
+            _, prod_inputs = prod.get_equation().get_iter(
+                prod_graph.pop_concord()[1])
+            _, cons_inputs = cons.get_equation().get_iter(
+                cons_graph.pop_concord()[1])
+            if not prod_inputs or tensor not in [
+                    tensor_ir.root_name() for term in cons_inputs for tensor_ir in term]:
+                return fused[:j]
+
+            if len(cons_inputs) > 1 and (
+                    len(prod_inputs) != 1 or len(prod_inputs[0]) != 1):
+                return fused[:j]
+
+        return fused
+
+    @staticmethod
+    def materializes(program: Program, node: Node, tensor: str) -> bool:
+        """
+        Returns True if the node builds or reads the whole tensor
+        """
+        if isinstance(node, OtherNode):
+            output = program.get_equation().get_output()
+            return output.root_name() == tensor and node.get_type() in [
+                "Footer", "Output"]
+
+        if isinstance(node, (GetRootNode, PartNode, SwizzleNode)):
+            return node.get_tensor() == tensor
+
+        return False
@@ -36,12 +36,18 @@ class Graphics:
     Generate the HiFiber code for displaying tensors
     """
 
-    def __init__(self, program: Program, metrics: Optional[Metrics]) -> None:
+    def __init__(
+            self,
+            program: Program,
+            metrics: Optional[Metrics],
+            load: bool = False) -> None:
         """
-        Construct a graphics object
+        Construct a graphics object; if load is True, only count the work per
+        space coordinate and time step instead of drawing the canvas
         """
         self.program = program
         self.metrics = metrics
+        self.load = load
         self.canvas = Canvas(program)
 
     def make_body(self) -> Statement:
@@ -51,7 +57,11 @@ class Graphics:
         body = SBlock([])
         spacetime = self.program.get_spacetime()
 
-        if spacetime is not None and self.metrics is None:
+        # The streamed canvas tracks the slip timestamps itself
+        if self.__streams():
+            body.add(self.canvas.add_frame_activity())
+
+        elif spacetime is not None and (self.load or self.metrics is None):
             # If we are using slip, increment the timestamp
             if spacetime.get_slip():
 
@@ -70,16 +80,41 @@ class Graphics:
                 if_ = SIf((cond, then), [], else_)
                 body.add(if_)
 
-            body.add(self.canvas.add_activity())
+            if self.load:
+                body.add(self.__add_load(spacetime.get_slip()))
+            else:
+                body.add(self.canvas.add_activity())
 
         return body
 
+    def make_dump(self) -> Statement:
+        """
+        Create the code for storing the load counts with the metrics
+        """
+        spacetime = self.program.get_spacetime()
+        if spacetime is None or not self.load or self.metrics is None:
+            return SBlock([])
+
+        einsum = self.program.get_equation().get_output().root_name()
+        metrics = AAccess(
+            EAccess(
+                EVar("metrics"),
+                EString(einsum)),
+            EString("load"))
+        return SAssign(metrics, EMethod(EVar("counters"), "report", []))
+
     def make_footer(self) -> Statement:
         """
         Create the loop footer for graphics
         """
         spacetime = self.program.get_spacetime()
-        if spacetime is not None and self.metrics is None:
+        if spacetime is not None and self.load:
+            einsum = self.program.get_equation().get_output().root_name()
+            return SExpr(
+                EMethod(EVar("counters"), "display", [AJust(EString(einsum))]))
+        elif self.__streams():
+            return self.canvas.close_frame_canvas()
+        elif spacetime is not None and self.metrics is None:
             return self.canvas.display_canvas()
         else:
             return SBlock([])
@@ -92,12 +127,51 @@ class Graphics:
 
         # If displayable, add the graphics information
         spacetime = self.program.get_spacetime()
-        if spacetime is not None and self.metrics is None:
+        if spacetime is not None and self.load:
+            args = [AJust(EList([EString(rank)
+                                 for rank in spacetime.get_space()]))]
+            extents = self.canvas.get_space_extents()
+            if extents is not None:
+                args.append(AJust(extents))
+            header.add(SAssign(AVar("counters"), EFunc("LoadCounters", args)))
+
+        elif self.__streams():
+            header.add(self.canvas.create_frame_canvas())
+
+        elif spacetime is not None and self.metrics is None:
             header.add(self.canvas.create_canvas())
 
-            # Create the timestamp dictionary if we want slip
+        # Create the timestamp dictionary if we want slip (the streamed canvas
+        # tracks its own timestamps)
+        if spacetime is not None and not self.__streams() and (
+                self.load or self.metrics is None):
             if spacetime.get_slip():
                 assign = SAssign(AVar("timestamps"), EDict({}))
                 header.add(assign)
 
         return header
+
+    def __streams(self) -> bool:
+        """
+        Returns True if the activity is streamed to disk in frames
+        """
+        spacetime = self.program.get_spacetime()
+        return spacetime is not None and not self.load and \
+            self.metrics is None and spacetime.get_frames() is not None
+
+    def __add_load(self, slip: bool) -> Statement:
+        """
+        Count an activity at the current space-time stamp
+        """
+        space = self.canvas.get_space_tuple()
+
+        # If slip, the timestamp is actually (timestamps[space] - 1,)
+        time: Expression
+        if slip:
+            bop = EBinOp(EAccess(EVar("timestamps"), space), OSub(), EInt(1))
+            time = ETuple([bop])
+        else:
+            time = self.canvas.get_time_tuple()
+
+        add = EMethod(EVar("counters"), "add", [AJust(space), AJust(time)])
+        return SExpr(add)
@@ -25,7 +25,7 @@ Translate the header above the HiFiber loop nest
 """
 
 from sympy import Symbol  # type: ignore
-from typing import Iterable, Optional, Set
+from typing import Iterable, List, Optional, Set
 
 from teaal.hifiber import *
 from teaal.ir.metrics import Metrics
@@ -104,6 +104,23 @@ class Header:
         constr = EFunc("Tensor", args)
         return SAssign(AVar(tensor.tensor_name()), constr)
 
+    def make_output_tile(self, tensor: Tensor) -> Statement:
+        """
+        Given an output tensor, generate a tile over its ranks that have not
+        yet been iterated over
+        """
+        tensor.from_fiber()
+
+        arg0 = TransUtils.build_rank_ids(tensor)
+        arg1 = AParam("name", EString(tensor.root_name()))
+        args = [arg0, arg1]
+        if self.__needs_shape():
+            args.append(TransUtils.build_shape(tensor.peek_rest()))
+
+        constr = EFunc("Tensor", args)
+        tile = SAssign(AVar(tensor.tensor_name()), constr)
+        return SBlock([tile, Header.make_get_root(tensor)])
+
     def make_swizzle(
             self,
             tensor: Tensor,
@@ -139,8 +156,7 @@ class Header:
         """
         tensor.from_fiber()
 
-        ranks = [EString(rank) for rank in tensor.get_ranks()]
-        args = [AParam("rank_ids", EList(ranks)),
+        args = [TransUtils.build_rank_ids(tensor),
                 AParam("fiber", EVar(tensor.fiber_name())),
                 AParam("name", EString(tensor.root_name()))]
 
@@ -150,8 +166,22 @@ class Header:
 
     def __make_shape(self, args: List[Argument]) -> List[Argument]:
         """
-        Add the shape argument to a tensor if necessary (i.e. no input tensor
-        has at least one rank of the output)
+        Add the shape argument to a tensor if necessary
+        """
+        if self.__needs_shape():
+            # TODO: Test that this removes the partitioning
+            output = self.program.get_equation().get_output()
+            part = self.program.get_partitioning()
+            unpart_ranks = [part.get_root_name(
+                rank) for rank in output.get_ranks()]
+            args.append(TransUtils.build_shape(unpart_ranks))
+
+        return args
+
+    def __needs_shape(self) -> bool:
+        """
+        Returns True if the output needs an explicit shape (i.e. no input
+        tensor has at least one rank of the output)
         """
         output = self.program.get_equation().get_output()
         part = self.program.get_partitioning()
@@ -190,10 +220,4 @@ class Header:
                         avail[i] = True
 
         # If at least one rank is not available, we need an explicit shape
-        if not all(avail) or self.metrics is not None:
-            # TODO: Test that this removes the partitioning
-            unpart_ranks = [part.get_root_name(
-                rank) for rank in output.get_ranks()]
-            args.append(TransUtils.build_shape(unpart_ranks))
-
-        return args
+        return not all(avail) or self.metrics is not None
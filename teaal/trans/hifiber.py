@@ -24,7 +24,7 @@ SOFTWARE.
 Translate an Einsum to the corresponding HiFiber code
 """
 
-from typing import cast, List, Optional
+from typing import Any, cast, Dict, List, Optional, Tuple
 
 from teaal.hifiber import *
 from teaal.ir.flow_graph import FlowGraph
@@ -36,12 +36,19 @@ from teaal.ir.metrics import Metrics
 from teaal.ir.node import Node
 from teaal.ir.program import Program
 from teaal.parse import *
+from teaal.trans.checkpointer import Checkpointer
 from teaal.trans.collector import Collector
 from teaal.trans.graphics import Graphics
 from teaal.trans.equation import Equation
 from teaal.trans.footer import Footer
+from teaal.trans.function import Function
+from teaal.trans.fuser import Fuser
 from teaal.trans.header import Header
+from teaal.trans.liveness import Liveness
+from teaal.trans.optimizer import Optimizer
 from teaal.trans.partitioner import Partitioner
+from teaal.trans.reporter import Reporter
+from teaal.trans.reuser import Reuser
 from teaal.trans.utils import TransUtils
 
 
@@ -56,11 +63,30 @@ class HiFiber:
             mapping: Mapping,
             arch: Optional[Architecture] = None,
             bindings: Optional[Bindings] = None,
-            format_: Optional[Format] = None) -> None:
+            format_: Optional[Format] = None,
+            opts: Optional[List[str]] = None,
+            nodes: Optional[Dict[int, List[Node]]] = None) -> None:
         """
         Perform the Einsum to HiFiber translation
+
+        The sorted flow graph nodes of each Einsum (e.g., from a Snapshot) may
+        be given, so that the flow graphs are not rebuilt
+
+        The options are described by Options
         """
-        self.program = Program(einsum, mapping)
+        self.einsum = einsum
+        self.mapping = mapping
+        self.options = Options(opts)
+        self.program = Program(einsum, mapping, self.options)
+
+        if nodes is None:
+            self.nodes: Dict[int, List[Node]] = {}
+        else:
+            self.nodes = nodes.copy()
+
+        self.liveness = Liveness()
+        self.names: Dict[int, str] = {}
+        self.params: List[str] = []
 
         self.hardware: Optional[Hardware] = None
         self.format = format_
@@ -69,17 +95,232 @@ class HiFiber:
             self.fusion = Fusion(self.hardware)
 
         self.trans_utils = TransUtils(self.program)
+        metrics = self.hardware is not None and self.format is not None
+
+        self.checkpointer = Checkpointer(self.options, mapping, metrics)
+
+        # Einsums skipped on resume from a checkpoint do not define their
+        # transformed inputs, so they cannot be shared
+        self.reuser = Reuser(
+            self.trans_utils,
+            self.liveness,
+            not self.checkpointer.is_enabled())
+
+        self.reporter = Reporter(self.options)
 
         self.hifiber = SBlock([])
-        for i in range(len(einsum.get_expressions())):
-            self.hifiber.add(self.__translate(i))
+
+        # Emit the constants for the selected tile sizes
+        for name, size in mapping.get_tile_sizes().items():
+            if not isinstance(size, int):
+                raise ValueError("Unresolved tile size: " + name)
+
+            self.hifiber.add(SAssign(AVar(name), EInt(size)))
+
+        self.hifiber.add(self.checkpointer.make_start())
+
+        self.hifiber.add(self.reporter.make_start())
+
+        # The metrics cannot be collected for fused Einsums
+        self.fuser: Optional[Fuser] = None
+        if self.options.is_set("fuse") and not metrics:
+            self.fuser = Fuser(einsum, mapping, self.options)
+
+        # Translate the Einsums, stored as (first Einsum, last Einsum, code)
+        num_einsums = len(einsum.get_expressions())
+        stmts: List[Tuple[int, int, Statement]] = []
+        i = 0
+        while i < num_einsums:
+            fused = self.fuser.get_fused_ranks(i) if self.fuser else []
+            if fused:
+                stmts.append((i, i + 1, self.__translate_fused(i, fused)))
+                i += 2
+            else:
+                stmts.append((i, i, self.__translate(i)))
+                i += 1
+
+        # Without sharing, the transformed inputs die with the Einsum that
+        # created them
+        all_dead = self.liveness.get_dead(
+            [(first, last_ind) for first, last_ind, _ in stmts],
+            self.options.is_set("del"),
+            not self.checkpointer.is_enabled())
+
+        for (first, last_ind, stmt), dead in zip(stmts, all_dead):
+            code = SBlock([stmt])
+            if dead:
+                code.add(SDel([EVar(name) for name in dead]))
+
+            if self.checkpointer.is_enabled():
+                self.hifiber.add(
+                    Checkpointer.make_resumable(
+                        self.names[last_ind],
+                        self.liveness.get_produced(first, last_ind),
+                        code))
+            else:
+                self.hifiber.add(code)
+
+        if self.options.is_set("func"):
+            function = Function(self.liveness, metrics)
+            self.hifiber = SBlock([function.make_kernel(self.hifiber)])
+            self.params = function.get_params()
+
+        passes = self.options.get_passes()
+        if passes == []:
+            passes = Optimizer.PASSES
+
+        if passes is not None:
+            self.hifiber = Optimizer(passes).optimize(self.hifiber)
+
+    def get_nodes(self) -> Dict[int, List[Node]]:
+        """
+        Get the sorted flow graph nodes of each Einsum
+        """
+        return self.nodes
+
+    def get_params(self) -> List[str]:
+        """
+        Get the parameters of the kernel() function: the input tensors, the
+        scalar variables, and the sizes used by the program
+        """
+        return self.params
+
+    def get_peak_live(self) -> int:
+        """
+        Get the estimated peak number of tensors live at once in the
+        generated program
+        """
+        return self.liveness.get_peak_live()
 
     def __translate(self, i: int) -> Statement:
         """
         Generate a single loop nest
         """
-        # Generate for the given einsum
+        nodes = self.__setup(self.program, i)
+
+        self.checkpointer.start_einsum(
+            self.names[i], self.program.get_loop_order().get_ranks())
+        stmt = self.__trans_nodes(nodes, True)[1]
+        self.checkpointer.end_einsum()
+
+        self.program.reset()
+        return stmt
+
+    def __translate_fused(self, i: int, fused: List[str]) -> Statement:
+        """
+        Generate the loop nests of the i'th Einsum (the producer) and the next
+        Einsum (the consumer) as one loop nest over the fused ranks, so that
+        the intermediate tensor is only ever built one tile at a time
+        """
+        prod_nodes = self.__setup(self.program, i)
+        prod = self.__save()
+        tensor = self.program.get_equation().get_output().root_name()
+
+        cons_nodes = self.__setup(
+            Program(
+                self.einsum,
+                self.mapping,
+                self.options),
+            i + 1)
+        cons = self.__save()
+
+        # The intermediate tensor is never built as a whole
+        name = prod["program"].get_equation().get_tensor(tensor).tensor_name()
+        self.liveness.remove_output(i, name)
+
+        code = SBlock([])
+
+        # Emit the headers, without materializing the intermediate tensor
+        prod_start = Fuser.first_loop(prod_nodes)
+        cons_start = Fuser.first_loop(cons_nodes)
+        for saved, nodes, start in [
+                (prod, prod_nodes, prod_start), (cons, cons_nodes, cons_start)]:
+            self.__load(saved)
+            header = [node for node in nodes[:start]
+                      if not Fuser.materializes(self.program, node, tensor)]
+            code.add(self.__trans_nodes(header, True)[1])
+
+        # Build the fused loops, where the consumer iterates over the
+        # producer's inputs instead of the intermediate
+        loops: List[Tuple[Payload, Expression]] = []
+        extent = ""
+        for rank in fused:
+            self.__load(prod)
+            _, tensors = self.graph.peek_concord()
+            inputs = [
+                tensor_ir for tensor_ir in tensors if not tensor_ir.get_is_output()]
+            if not extent:
+                extent = Reporter.get_extent(self.program, tensors)
+            prod_expr = self.eqn.make_iter_expr(rank, inputs)
+            _, tensors = self.graph.pop_concord()
+            prod_payload = self.eqn.make_input_payload(rank, tensors)
+
+            self.__load(cons)
+            self.eqn.fuse(rank, tensor, prod_expr, prod_payload)
+            _, tensors = self.graph.peek_concord()
+            expr = self.eqn.make_iter_expr(rank, tensors)
+            _, tensors = self.graph.pop_concord()
+            loops.append((self.eqn.make_payload(rank, tensors), expr))
+
+        # In the body, the producer builds a tile of the intermediate, which
+        # the consumer then uses
+        body = SBlock([])
+        self.__load(prod)
+        prod_tensor = self.program.get_equation().get_tensor(tensor)
+        body.add(self.header.make_output_tile(prod_tensor))
+        tile_name = prod_tensor.fiber_name()
+        prod_len, prod_body = self.__trans_nodes(
+            prod_nodes[prod_start + len(fused):], False)
+        body.add(prod_body)
+
+        self.__load(cons)
+        cons_tensor = self.program.get_equation().get_tensor(tensor)
+        if cons_tensor.fiber_name() != tile_name:
+            body.add(SAssign(AVar(cons_tensor.fiber_name()), EVar(tile_name)))
+        cons_len, cons_body = self.__trans_nodes(
+            cons_nodes[cons_start + len(fused):], False)
+        body.add(cons_body)
+
+        stmt: Statement = body
+        for j, (payload, expr) in reversed(list(enumerate(loops))):
+            if j == 0 and self.reporter.is_enabled():
+                name = self.names[i] + "+" + self.names[i + 1]
+                stmt = SBlock(
+                    [stmt, Reporter.make_step(self.program, fused[0])])
+                stmt = Reporter.make_loop(
+                    name, extent, SFor(payload, expr, stmt))
+            else:
+                stmt = SFor(payload, expr, stmt)
+        code.add(stmt)
+
+        # Emit the footers, skipping the ends of the remaining fused loops
+        for saved, nodes, end in [
+                (prod, prod_nodes, prod_start + prod_len), (cons, cons_nodes, cons_start + cons_len)]:
+            self.__load(saved)
+            end += 2 * len(fused) - 1
+            footer = [node for node in nodes[end:]
+                      if not Fuser.materializes(self.program, node, tensor)]
+            code.add(self.__trans_nodes(footer, True)[1])
+            self.program.reset()
+
+        self.__load(prod)
+        return code
+
+    def __setup(self, program: Program, i: int) -> List[Node]:
+        """
+        Configure the translators for the i'th Einsum of the given program
+        and get the nodes to translate
+        """
+        self.program = program
         self.program.add_einsum(i)
+        self.einsum_ind = i
+
+        # Track the tensors read and written by this Einsum
+        self.liveness.add_einsum(self.program, i)
+        self.names[i] = self.program.get_equation().get_output().root_name()
+
+        # This Einsum overwrites anything derived from its output
+        self.reuser.add_einsum(self.program)
 
         # Build metrics if there is hardware
         self.metrics: Optional[Metrics] = None
@@ -88,25 +329,56 @@ class HiFiber:
             self.fusion.add_einsum(self.program)
 
         # Create the flow graph and get the relevant nodes
-        flow_graph = FlowGraph(self.program, self.metrics, ["hoist"])
-        nodes = flow_graph.get_sorted()
+        if i not in self.nodes.keys():
+            flow_graph = FlowGraph(self.program, self.metrics, ["hoist"])
+            self.nodes[i] = flow_graph.get_sorted()
+        nodes = self.nodes[i]
 
         # Create all relevant translator objects
-        self.graphics = Graphics(self.program, self.metrics)
+        self.graphics = Graphics(
+            self.program, self.metrics, self.options.is_set("load"))
         self.partitioner = Partitioner(self.program, self.trans_utils)
-        self.header = Header(self.program, self.metrics, self.partitioner)
+        self.header = Header(
+            self.program,
+            self.metrics,
+            self.partitioner)
         self.graph = IterationGraph(self.program)
-        self.eqn = Equation(self.program, self.metrics)
+        self.eqn = Equation(
+            self.program,
+            self.metrics,
+            self.format,
+            self.options.is_set("batch"))
 
         if self.metrics:
             self.collector = Collector(self.program, self.metrics, self.fusion)
 
-        stmt = self.__trans_nodes(nodes)[1]
+        return nodes
 
-        self.program.reset()
-        return stmt
+    def __save(self) -> Dict[str, Any]:
+        """
+        Save the translators configured for the current Einsum
+        """
+        return {
+            name: getattr(
+                self,
+                name) for name in [
+                "program",
+                "einsum_ind",
+                "graphics",
+                "partitioner",
+                "header",
+                "graph",
+                "eqn"]}
+
+    def __load(self, saved: Dict[str, Any]) -> None:
+        """
+        Restore a set of saved translators
+        """
+        for name, val in saved.items():
+            setattr(self, name, val)
 
-    def __trans_nodes(self, nodes: List[Node]) -> Tuple[int, Statement]:
+    def __trans_nodes(self, nodes: List[Node],
+                      top: bool) -> Tuple[int, Statement]:
         """
         Recursive function to generate the actual HiFiber program
         """
@@ -138,6 +410,9 @@ class HiFiber:
             elif isinstance(node, GetRootNode):
                 tensor = self.program.get_equation().get_tensor(node.get_tensor())
                 code.add(Header.make_get_root(tensor))
+                if top:
+                    self.liveness.add_root(
+                        self.einsum_ind, tensor.fiber_name())
 
             elif isinstance(node, IntervalNode):
                 code.add(self.eqn.make_interval(node.get_rank()))
@@ -145,21 +420,58 @@ class HiFiber:
             elif isinstance(node, LoopNode):
                 # Generate the for loop
                 rank, tensors = self.graph.peek_concord()
+                dense = self.eqn.is_dense(cast(str, rank), tensors)
+                batch = not dense and self.eqn.can_batch(
+                    cast(str, rank), tensors)
+                if dense:
+                    code.add(
+                        self.eqn.make_dense_start(
+                            cast(str, rank), tensors))
+                elif batch:
+                    code.add(self.eqn.make_batch_start(cast(str, rank)))
+
                 expr = self.eqn.make_iter_expr(cast(str, rank), tensors)
+                extent = Reporter.get_extent(self.program, tensors)
                 _, tensors = self.graph.pop_concord()
                 payload = self.eqn.make_payload(cast(str, rank), tensors)
 
+                loop_body = SBlock([])
+                if dense:
+                    loop_body.add(self.eqn.make_dense_access(tensors))
+                loop_body.add(self.eqn.make_halo_views(cast(str, rank)))
+
                 # Recurse for the for loop body
-                j, body = self.__trans_nodes(nodes[(i + 1):])
-                code.add(SFor(payload, expr, body))
+                j, body = self.__trans_nodes(nodes[(i + 1):], False)
+                loop_body.add(body)
+
+                if top and self.reporter.is_enabled():
+                    report = Reporter.make_step(self.program, cast(str, rank))
+                    loop_body.add(report)
+
+                # Batched outputs are only complete once the loop is done
+                loop: Statement = loop_body
+                if top and not batch and self.checkpointer.is_resumed(
+                        cast(str, rank)):
+                    loop = self.checkpointer.make_checkpointed(
+                        payload, loop_body)
+
+                if top and self.reporter.is_enabled():
+                    code.add(Reporter.make_loop(
+                        self.names[self.einsum_ind], extent, SFor(payload, expr, loop)))
+                else:
+                    code.add(SFor(payload, expr, loop))
                 i += j
 
+                if batch:
+                    code.add(self.eqn.make_batch_end())
+
             elif isinstance(node, MetricsNode):
                 if node.get_type() == "Body":
                     code.add(self.collector.make_body())
 
                 elif node.get_type() == "Dump":
                     code.add(self.collector.dump())
+                    code.add(self.graphics.make_dump())
 
                 elif node.get_type() == "End":
                     code.add(self.collector.end())
@@ -196,6 +508,9 @@ class HiFiber:
                 elif node.get_type() == "Output":
                     code.add(self.header.make_output())
 
+                    code.add(self.checkpointer.make_restore(
+                        self.program.get_equation().get_output()))
+
                 else:
                     raise ValueError(
                         "Unknown node: " +
@@ -206,15 +521,37 @@ class HiFiber:
                 ranks = node.get_ranks()
 
                 tensor.from_fiber()
-                code.add(self.partitioner.partition(tensor, ranks))
+                old_name = tensor.tensor_name()
+                step = Reuser.make_part_step(self.program, ranks)
+                count = self.trans_utils.count
+                part = self.partitioner.partition(tensor, ranks)
+                code.add(
+                    self.reuser.reuse(
+                        self.einsum_ind,
+                        tensor,
+                        old_name,
+                        step,
+                        count,
+                        part,
+                        top))
 
             elif isinstance(node, SwizzleNode):
                 tensor = self.program.get_equation().get_tensor(node.get_tensor())
+                old_name = tensor.tensor_name()
+                step = Reuser.make_swizzle_step(
+                    node.get_ranks(), node.get_type())
+                count = self.trans_utils.count
+                swizzle = self.header.make_swizzle(
+                    tensor, node.get_ranks(), node.get_type())
                 code.add(
-                    self.header.make_swizzle(
+                    self.reuser.reuse(
+                        self.einsum_ind,
                         tensor,
-                        node.get_ranks(),
-                        node.get_type()))
+                        old_name,
+                        step,
+                        count,
+                        swizzle,
+                        top))
 
             else:
                 raise ValueError(
@@ -0,0 +1,163 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Compile an input file into an importable module, cached on disk
+"""
+
+import hashlib
+import importlib.util
+import os
+import tempfile
+from typing import Any, Callable, List, Optional
+
+from teaal.dse import resolve
+from teaal.parse import *
+from teaal.parse.yaml import YamlParser
+from teaal.trans.hifiber import HiFiber
+from teaal.trans.snapshot import Snapshot
+
+
+class Kernel:
+    """
+    A generated HiFiber program, compiled into a module defining a callable
+    kernel() and cached on disk under the hash of its specification
+    """
+
+    # The statements needed to run the generated code outside of fibertree's
+    # notebook environment
+    PRELUDE = "from fibertree import *\n" + \
+        "from teaal.run import Checkpoint, DumpPool, FrameCanvas, " + \
+        "LazyFlatten, LoadCounters, OnlineIntersector, Progress, " + \
+        "TraceCache, TraceFile\n\n\n"
+
+    def __init__(
+            self,
+            spec: str,
+            cache_dir: str,
+            opts: Optional[List[str]] = None) -> None:
+        """
+        Construct a new Kernel
+        """
+        self.spec = spec
+        self.cache_dir = cache_dir
+
+        if opts is None:
+            self.opts = []
+        else:
+            self.opts = opts
+
+        if "func" not in self.opts:
+            self.opts.append("func")
+
+        # The compiled module also depends on the compiler that wrote it
+        key = "\n".join(sorted(self.opts)) + "\n" + Kernel.PRELUDE + \
+            Snapshot.get_source() + "\n" + self.spec
+        self.hash = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        self.func: Optional[Callable[..., Any]] = None
+
+    @classmethod
+    def from_file(
+            cls,
+            filename: str,
+            cache_dir: str,
+            opts: Optional[List[str]] = None) -> "Kernel":
+        """
+        Construct a new Kernel from a YAML file
+        """
+        with open(filename, "r") as f:
+            return cls(f.read(), cache_dir, opts)
+
+    def get_hash(self) -> str:
+        """
+        Get the hash of the specification (and options) of this kernel, and
+        of the compiler
+        """
+        return self.hash
+
+    def get_path(self) -> str:
+        """
+        Get the path to the compiled module, compiling it if it is not yet
+        cached
+        """
+        path = os.path.join(self.cache_dir, "kernel_" + self.hash + ".py")
+        if os.path.exists(path):
+            return path
+
+        hifiber = Kernel.translate(self.spec, self.opts)
+
+        # Write atomically, since many runs may share the cache
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(Kernel.PRELUDE + str(hifiber) + "\n")
+        os.replace(tmp, path)
+
+        return path
+
+    def get_tensors(self) -> List[str]:
+        """
+        Get the names of the tensors declared by the specification
+        """
+        yaml = YamlParser.parse_str(self.spec)
+        return list(Einsum(yaml).get_declaration().keys())
+
+    def load(self) -> Callable[..., Any]:
+        """
+        Import the compiled module and get its kernel() function
+
+        Note: Python caches the bytecode of the module next to it, so later
+        loads skip both the compilation and the parsing
+        """
+        if self.func is not None:
+            return self.func
+
+        path = self.get_path()
+        spec = importlib.util.spec_from_file_location(
+            "kernel_" + self.hash, path)
+        if spec is None or spec.loader is None:
+            raise ValueError("Unable to load kernel " + path)
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        self.func = module.kernel
+        return self.func
+
+    @staticmethod
+    def translate(spec: str, opts: List[str]) -> HiFiber:
+        """
+        Translate a specification into HiFiber
+        """
+        yaml = YamlParser.parse_str(spec)
+
+        # Select any loop orders and tile sizes left to the compiler
+        yaml = resolve(yaml)
+
+        return HiFiber(
+            Einsum(yaml),
+            Mapping(yaml),
+            Architecture(yaml),
+            Bindings(yaml),
+            Format(yaml),
+            opts)
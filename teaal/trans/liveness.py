@@ -0,0 +1,192 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Track the liveness of the tensors of the generated program
+"""
+
+from itertools import chain
+from typing import Dict, List, Set, Tuple
+
+from teaal.ir.program import Program
+
+
+class Liveness:
+    """
+    Track the tensors created and read by each Einsum, to free them once no
+    later Einsum uses them and to estimate the peak number of live tensors
+    """
+
+    def __init__(self) -> None:
+        """
+        Construct a new liveness tracker
+        """
+        self.inputs: List[str] = []
+        self.variables: List[str] = []
+        self.produced: Set[str] = set()
+        self.created: Dict[int, List[str]] = {}
+        self.created_temps: Dict[int, List[str]] = {}
+        self.roots: Dict[int, List[str]] = {}
+        self.last_use: Dict[str, int] = {}
+
+        # The temporaries that also hold references to each transformed input
+        self.temps: Dict[str, List[str]] = {}
+        self.transformed: Set[str] = set()
+
+        self.peak_live = 0
+
+    def add_einsum(self, program: Program, i: int) -> None:
+        """
+        Track the tensors read and written by the i'th Einsum, for which the
+        program is configured
+        """
+        self.created[i] = []
+        self.created_temps[i] = []
+        self.roots[i] = []
+        for tensor in program.get_equation().get_tensors():
+            name = tensor.tensor_name()
+            if tensor.get_is_output():
+                self.produced.add(name)
+                self.created[i].append(name)
+            elif name in self.produced:
+                self.last_use[name] = i
+            elif name not in self.inputs:
+                self.inputs.append(name)
+
+        for name in chain.from_iterable(
+                program.get_equation().get_term_vars()):
+            if name not in self.variables:
+                self.variables.append(name)
+
+    def add_root(self, i: int, name: str) -> None:
+        """
+        Track a root fiber of the i'th Einsum
+        """
+        self.roots[i].append(name)
+
+    def add_transform(self, i: int, name: str, temps: List[str]) -> None:
+        """
+        Track an input transformed (swizzled or partitioned) by the i'th
+        Einsum, and the temporaries used to build it
+        """
+        self.created[i].append(name)
+        self.created_temps[i].extend(temps)
+        self.transformed.add(name)
+
+        if name not in self.temps.keys():
+            self.temps[name] = []
+        self.temps[name].extend(
+            temp for temp in temps if temp not in self.temps[name])
+
+    def add_use(self, i: int, name: str) -> None:
+        """
+        Track a read of the tensor by the i'th Einsum
+        """
+        self.last_use[name] = i
+
+    def get_dead(self, blocks: List[Tuple[int, int]], delete: bool,
+                 shared: bool) -> List[List[str]]:
+        """
+        Get the tensors to free after each block of Einsums, given as (first
+        Einsum, last Einsum), if delete is True; unless shared is True, the
+        transformed inputs die with the Einsum that created them
+
+        Also estimates the peak number of live tensors
+        """
+        live = set(self.inputs)
+        self.peak_live = len(live)
+
+        all_dead = []
+        for first, last_ind in blocks:
+            for j in range(first, last_ind + 1):
+                live.update(self.created.get(j, []))
+            self.peak_live = max(self.peak_live, len(live))
+
+            # The outputs of the last block are never freed
+            dead: List[str] = []
+            if delete and last_ind < blocks[-1][1]:
+                for j in range(first, last_ind + 1):
+                    dead.extend(self.roots.get(j, []))
+
+                for name, last in sorted(self.last_use.items()):
+                    if name in self.transformed and not shared:
+                        continue
+
+                    if first <= last <= last_ind:
+                        dead.append(name)
+                        dead.extend(self.temps.get(name, []))
+                        live.discard(name)
+
+                if not shared:
+                    for j in range(first, last_ind + 1):
+                        transforms = [name for name in self.created[j]
+                                      if name not in self.produced]
+                        dead.extend(transforms + self.created_temps[j])
+                        live.difference_update(transforms)
+
+                dead = [name for j, name in enumerate(dead)
+                        if name not in dead[:j]]
+
+            all_dead.append(dead)
+
+        return all_dead
+
+    def get_inputs(self) -> List[str]:
+        """
+        Get the input tensors of the program
+        """
+        return self.inputs
+
+    def get_outputs(self) -> List[str]:
+        """
+        Get the output tensors of the program: those produced but never read
+        """
+        return [self.created[i][0] for i in sorted(self.created.keys())
+                if self.created[i] and self.created[i][0] in self.produced and
+                self.created[i][0] not in self.last_use.keys()]
+
+    def get_peak_live(self) -> int:
+        """
+        Get the estimated peak number of tensors live at once
+        """
+        return self.peak_live
+
+    def get_produced(self, first: int, last: int) -> List[str]:
+        """
+        Get the tensors produced by Einsums first through last
+        """
+        return [self.created[j][0] for j in range(first, last + 1)
+                if self.created[j] and self.created[j][0] in self.produced]
+
+    def get_variables(self) -> List[str]:
+        """
+        Get the scalar variables read by the program
+        """
+        return self.variables
+
+    def remove_output(self, i: int, name: str) -> None:
+        """
+        Stop tracking the output of the i'th Einsum, which is never built as
+        a whole
+        """
+        self.created[i].remove(name)
+        del self.last_use[name]
@@ -0,0 +1,820 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Peephole and dead-code optimizations over the generated HiFiber code
+"""
+
+import ast
+from itertools import chain
+import re
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from teaal.hifiber import *
+
+
+class Optimizer:
+    """
+    Optimize a HiFiber program with a set of passes:
+    - "copy": copy propagation of the temporaries (tmpN) created while
+      partitioning, swizzling, and unpartitioning tensors
+    - "dead": elimination of the temporaries that are assigned but never used
+    - "dup": elimination of repeated Metrics configuration calls, setRankIds()
+      calls that do not change the rank IDs, and swizzles to the current rank
+      order
+    - "fold": constant folding of arithmetic on literals, and of duplicate
+      arguments to max() and min()
+    """
+
+    PASSES = ["copy", "dead", "dup", "fold"]
+
+    # Metrics calls that only configure the collection, so repeating them has
+    # no effect
+    IDEMPOTENT = ["associateShape", "matchRanks", "registerRank", "trace"]
+
+    # Calls that build a new object without any side effects
+    PURE_FUNCS = ["LazyFlatten", "Tensor"]
+    PURE_METHODS = [
+        "flattenRanks",
+        "fromFiber",
+        "getRankIds",
+        "getRoot",
+        "mergeRanks",
+        "splitEqual",
+        "splitNonUniform",
+        "splitUniform",
+        "swizzleRanks",
+        "unflattenRanks"]
+
+    TEMP = re.compile(r"tmp[0-9]+")
+
+    def __init__(self, passes: Iterable[str]) -> None:
+        """
+        Construct a new Optimizer, running the given passes
+        """
+        self.passes = list(passes)
+        for pass_ in self.passes:
+            if pass_ not in Optimizer.PASSES:
+                raise ValueError("Unknown optimization: " + pass_)
+
+    def optimize(self, stmt: Statement) -> SBlock:
+        """
+        Optimize the statement; the input statement is not modified
+        """
+        prog = SBlock([Optimizer.__clone(stmt)])
+        Optimizer.__flatten(prog)
+
+        if "fold" in self.passes:
+            Optimizer.__fold_stmt(prog)
+
+        if "dup" in self.passes:
+            self.__dup(prog)
+
+        if ("copy" in self.passes or "dead" in self.passes) and \
+                Optimizer.__unique_temps(prog):
+            if "copy" in self.passes:
+                while Optimizer.__propagate(
+                        prog) or Optimizer.__coalesce(prog):
+                    pass
+
+            if "dead" in self.passes:
+                while Optimizer.__eliminate(prog):
+                    pass
+
+            Optimizer.__renumber(prog)
+
+        Optimizer.__fill(prog)
+        return prog
+
+    @staticmethod
+    def __blocks(node: Any) -> List[SBlock]:
+        """
+        Get all blocks nested in the node, outermost first
+        """
+        blocks = []
+        for child in Optimizer.__nodes(node):
+            if isinstance(child, SBlock):
+                blocks.append(child)
+        return blocks
+
+    @staticmethod
+    def __bodies(stmt: Statement) -> List[Statement]:
+        """
+        Get the statements directly nested in a compound statement
+        """
+        if isinstance(stmt, SBlock):
+            return list(stmt.stmts)
+        elif isinstance(stmt, SFor):
+            return [stmt.stmt]
+        elif isinstance(stmt, SFunc):
+            return [stmt.body]
+        elif isinstance(stmt, SIf):
+            bodies = [stmt.if_[1]] + [body for _, body in stmt.elifs]
+            if stmt.else_ is not None:
+                bodies.append(stmt.else_)
+            return bodies
+        return []
+
+    @staticmethod
+    def __clone(node: Any) -> Any:
+        """
+        Copy the node, without sharing any subtrees (unlike deepcopy)
+        """
+        if isinstance(node, list):
+            return [Optimizer.__clone(elem) for elem in node]
+        elif isinstance(node, tuple):
+            return tuple(Optimizer.__clone(elem) for elem in node)
+        elif isinstance(node, dict):
+            return {Optimizer.__clone(key): Optimizer.__clone(val)
+                    for key, val in node.items()}
+        elif isinstance(node, Base):
+            new = object.__new__(type(node))
+            for key, val in vars(node).items():
+                setattr(new, key, Optimizer.__clone(val))
+            return new
+        return node
+
+    @staticmethod
+    def __coalesce(prog: SBlock) -> bool:
+        """
+        Replace a temporary that is only used before being copied into another
+        variable, e.g. tmp1 = A.splitEqual(5); A_K1K0 = tmp1, with that
+        variable
+        """
+        uses = Optimizer.__count_uses(prog)
+        for block in Optimizer.__blocks(prog):
+            for j, stmt in enumerate(block.stmts):
+                copy = Optimizer.__copy(stmt)
+                if copy is None or not Optimizer.__is_temp(copy[1]):
+                    continue
+
+                var, temp = copy
+                for i in range(j - 1, -1, -1):
+                    if Optimizer.__target(block.stmts[i]) == temp:
+                        break
+                else:
+                    continue
+
+                # All uses of the temporary must be before the copy
+                local = Optimizer.__count_uses(
+                    SBlock(block.stmts[i + 1:j + 1]))
+                if local.get(temp, 0) != uses.get(temp, 0):
+                    continue
+
+                def_ = block.stmts[i]
+                assert isinstance(def_, SAssign)
+                between = block.stmts[i + 1:j] + [def_.expr]
+                if any(var in Optimizer.__names(other) for other in between):
+                    continue
+
+                block.stmts[i] = SAssign(AVar(var), def_.expr)
+                del block.stmts[j]
+                for other in block.stmts[i + 1:j]:
+                    Optimizer.__rename(other, temp, var)
+                Optimizer.__undel(prog, temp)
+                return True
+
+        return False
+
+    @staticmethod
+    def __copy(stmt: Statement) -> Optional[Tuple[str, str]]:
+        """
+        Get (destination, source) if the statement is a copy between
+        variables
+        """
+        if isinstance(stmt, SAssign) and isinstance(stmt.assn, AVar) and \
+                isinstance(stmt.expr, EVar) and \
+                stmt.expr.name.isidentifier():
+            return stmt.assn.name, stmt.expr.name
+        return None
+
+    @staticmethod
+    def __count_uses(prog: SBlock) -> Dict[str, int]:
+        """
+        Count the statements using each name (del does not count as a use)
+        """
+        uses: Dict[str, int] = {}
+        for _, _, used, _ in Optimizer.__linearize(prog):
+            for name in used:
+                uses[name] = uses.get(name, 0) + 1
+        return uses
+
+    def __dup(self, prog: SBlock) -> None:
+        """
+        Eliminate duplicate calls
+        """
+        text = prog.gen(0)
+        for block in Optimizer.__blocks(prog):
+            seen: Set[str] = set()
+            ranks: Dict[str, List[str]] = {}
+            stmts = []
+            for stmt in block.stmts:
+                call = stmt.expr if isinstance(stmt, SExpr) else None
+                if isinstance(call, EMethod) and isinstance(call.obj, EVar):
+                    obj = call.obj.name
+                    rank_ids = Optimizer.__rank_ids(call)
+                    if obj == "Metrics" and call.name in Optimizer.IDEMPOTENT:
+                        if stmt.gen(0) in seen:
+                            continue
+                        seen.add(stmt.gen(0))
+
+                    elif obj == "Metrics":
+                        # A new collection must be configured again
+                        seen = set()
+
+                    elif call.name == "setRankIds" and rank_ids is not None:
+                        if ranks.get(obj) == rank_ids:
+                            continue
+
+                        # Other names may refer to the same tensor
+                        ranks = {obj: rank_ids}
+
+                    else:
+                        ranks = {}
+
+                elif isinstance(stmt, SAssign) and isinstance(stmt.assn, AVar):
+                    var = stmt.assn.name
+                    stmt.expr = self.__dup_swizzle(var, stmt.expr, ranks, text)
+                    copy = Optimizer.__copy(stmt)
+                    new_ranks = Optimizer.__rank_ids(stmt.expr)
+                    if copy is not None and copy[1] in ranks.keys():
+                        ranks[var] = ranks[copy[1]]
+                    elif new_ranks is not None:
+                        ranks[var] = new_ranks
+                    else:
+                        ranks.pop(var, None)
+
+                elif isinstance(stmt, SDel):
+                    for del_var in stmt.vars_:
+                        ranks.pop(del_var.name, None)
+
+                else:
+                    seen = set()
+                    ranks = {}
+
+                stmts.append(stmt)
+
+            block.stmts = stmts
+
+    @staticmethod
+    def __dup_swizzle(var: str, expr: Expression,
+                      ranks: Dict[str, List[str]], text: str) -> Expression:
+        """
+        Replace a swizzle of a tensor to its current rank order with the
+        tensor itself, if neither name is renamed later
+        """
+        if not isinstance(expr, EMethod) or expr.name != "swizzleRanks" or \
+                not isinstance(expr.obj, EVar):
+            return expr
+
+        obj = expr.obj.name
+        if not Optimizer.__is_temp(var) or ranks.get(
+                obj) != Optimizer.__rank_ids(expr):
+            return expr
+
+        for name in [obj, var]:
+            if re.search(r"\b" + name + r"\.setRankIds\(", text):
+                return expr
+
+        return EVar(obj)
+
+    @staticmethod
+    def __eliminate(prog: SBlock) -> bool:
+        """
+        Eliminate assignments to temporaries that are never used, and
+        assignments of a variable to itself
+        """
+        uses = Optimizer.__count_uses(prog)
+        for block in Optimizer.__blocks(prog):
+            for i, stmt in enumerate(block.stmts):
+                copy = Optimizer.__copy(stmt)
+                if copy is not None and copy[0] == copy[1]:
+                    del block.stmts[i]
+                    return True
+
+                target = Optimizer.__target(stmt)
+                if target is None or not Optimizer.__is_temp(target) or \
+                        uses.get(target, 0) > 0:
+                    continue
+
+                assert isinstance(stmt, SAssign)
+                if not Optimizer.__is_pure(stmt.expr):
+                    continue
+
+                del block.stmts[i]
+                Optimizer.__undel(prog, target)
+                return True
+
+        return False
+
+    @staticmethod
+    def __fill(prog: SBlock) -> None:
+        """
+        Ensure no compound statement is left with an empty body
+        """
+        for node in Optimizer.__nodes(prog):
+            if isinstance(node, SBlock) or not isinstance(node, Statement):
+                continue
+
+            for body in Optimizer.__bodies(node):
+                if isinstance(body, SBlock) and not body.stmts:
+                    body.stmts.append(SExpr(EVar("pass")))
+
+    @staticmethod
+    def __flatten(block: SBlock) -> None:
+        """
+        Inline the blocks nested directly in other blocks
+        """
+        stmts: List[Statement] = []
+        for stmt in block.stmts:
+            if isinstance(stmt, SBlock):
+                Optimizer.__flatten(stmt)
+                stmts.extend(stmt.stmts)
+                continue
+
+            for body in Optimizer.__bodies(stmt):
+                if isinstance(body, SBlock):
+                    Optimizer.__flatten(body)
+            stmts.append(stmt)
+
+        block.stmts = stmts
+
+    @staticmethod
+    def __fold(expr: Any, isolated: bool) -> Any:
+        """
+        Fold the constants in the expression; isolated is False if the
+        expression is an operand of a binary operation, whose generated code
+        may be parsed differently once folded
+        """
+        if isinstance(expr, EBinOp):
+            if isolated:
+                value = Optimizer.__literal(expr.gen())
+                if isinstance(value, bool):
+                    return EBool(value)
+                elif isinstance(value, int):
+                    return EInt(value)
+                elif isinstance(value, float):
+                    return EFloat(value)
+
+            expr.expr1 = Optimizer.__fold(expr.expr1, False)
+            expr.expr2 = Optimizer.__fold(expr.expr2, False)
+            return expr
+
+        elif isinstance(expr, EFunc):
+            expr.args = [Optimizer.__fold(arg, True) for arg in expr.args]
+            if expr.name in ["max", "min"] and \
+                    all(isinstance(arg, AJust) for arg in expr.args):
+                args: List[Argument] = []
+                for arg in expr.args:
+                    if all(arg.gen() != prev.gen() for prev in args):
+                        args.append(arg)
+
+                if len(args) == 1 and len(expr.args) > 1:
+                    assert isinstance(args[0], AJust)
+                    if isolated or not isinstance(args[0].expr, EBinOp):
+                        return args[0].expr
+                    return EParens(args[0].expr)
+
+                expr.args = args
+
+            return expr
+
+        elif isinstance(expr, (AJust, AParam)):
+            expr.expr = Optimizer.__fold(expr.expr, True)
+
+        elif isinstance(expr, EAccess):
+            expr.obj = Optimizer.__fold(expr.obj, False)
+            expr.ind = Optimizer.__fold(expr.ind, True)
+
+        elif isinstance(expr, EComp):
+            expr.elem = Optimizer.__fold(expr.elem, True)
+            expr.iter = Optimizer.__fold(expr.iter, True)
+
+        elif isinstance(expr, EDict):
+            expr.dict = {Optimizer.__fold(key, True): Optimizer.__fold(
+                val, True) for key, val in expr.dict.items()}
+
+        elif isinstance(expr, ELambda):
+            expr.body = Optimizer.__fold(expr.body, True)
+
+        elif isinstance(expr, EList):
+            expr.list = [Optimizer.__fold(elem, True) for elem in expr.list]
+
+        elif isinstance(expr, EMethod):
+            expr.obj = Optimizer.__fold(expr.obj, False)
+            expr.args = [Optimizer.__fold(arg, True) for arg in expr.args]
+
+        elif isinstance(expr, EParens):
+            expr.expr = Optimizer.__fold(expr.expr, True)
+
+        elif isinstance(expr, ETuple):
+            expr.elems = [Optimizer.__fold(elem, True) for elem in expr.elems]
+
+        return expr
+
+    @staticmethod
+    def __fold_stmt(stmt: Statement) -> None:
+        """
+        Fold the constants in all expressions of the statement
+        """
+        for node in Optimizer.__nodes(stmt):
+            if isinstance(node, (SAssign, SExpr, SFor, SIAssign, SReturn)):
+                node.expr = Optimizer.__fold(node.expr, True)
+
+            if isinstance(node, (SAssign, SIAssign)) and \
+                    isinstance(node.assn, AAccess):
+                node.assn.ind = Optimizer.__fold(node.assn.ind, True)
+
+            if isinstance(node, SIf):
+                node.if_ = (Optimizer.__fold(node.if_[0], True), node.if_[1])
+                node.elifs = [(Optimizer.__fold(cond, True), body)
+                              for cond, body in node.elifs]
+
+    @staticmethod
+    def __is_pure(expr: Any) -> bool:
+        """
+        Returns True if evaluating the expression has no side effects
+        """
+        if isinstance(expr, (EBool, EField, EFloat, EInt, EString, EVar)):
+            return True
+        elif isinstance(expr, (AJust, AParam, EParens)):
+            return Optimizer.__is_pure(expr.expr)
+        elif isinstance(expr, EBinOp):
+            return Optimizer.__is_pure(expr.expr1) and \
+                Optimizer.__is_pure(expr.expr2)
+        elif isinstance(expr, (EList, ETuple)):
+            elems = expr.list if isinstance(expr, EList) else expr.elems
+            return all(Optimizer.__is_pure(elem) for elem in elems)
+        elif isinstance(expr, EFunc):
+            return expr.name in Optimizer.PURE_FUNCS and \
+                all(Optimizer.__is_pure(arg) for arg in expr.args)
+        elif isinstance(expr, EMethod):
+            return expr.name in Optimizer.PURE_METHODS and \
+                Optimizer.__is_pure(expr.obj) and \
+                all(Optimizer.__is_pure(arg) for arg in expr.args)
+        return False
+
+    @staticmethod
+    def __is_temp(name: str) -> bool:
+        """
+        Returns True if the name is a temporary
+        """
+        return Optimizer.TEMP.fullmatch(name) is not None
+
+    @staticmethod
+    def __linearize(
+            prog: SBlock) -> List[Tuple[Statement, Set[str], Set[str], int]]:
+        """
+        List the statements in program order as (statement, names defined,
+        names used, index of the end of its body)
+        """
+        order: List[Tuple[Statement, Set[str], Set[str], int]] = []
+
+        def visit(stmt: Statement) -> None:
+            i = len(order)
+            order.append((stmt, set(), set(), i))
+            defs, uses = Optimizer.__own(stmt)
+            for body in Optimizer.__bodies(stmt):
+                visit(body)
+            order[i] = (stmt, defs, uses, len(order) - 1)
+
+        visit(prog)
+        return order
+
+    @staticmethod
+    def __literal(code: str) -> Union[bool, int, float, None]:
+        """
+        Evaluate the code if it is arithmetic on numeric literals
+        """
+        def eval_(node: ast.AST) -> Any:
+            if isinstance(node, ast.Constant) and \
+                    isinstance(node.value, (int, float)):
+                return node.value
+            elif isinstance(node, ast.UnaryOp) and \
+                    isinstance(node.op, (ast.UAdd, ast.USub)):
+                value = eval_(node.operand)
+                return +value if isinstance(node.op, ast.UAdd) else -value
+            elif isinstance(node, ast.BinOp) and isinstance(
+                    node.op, (ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod)):
+                left = eval_(node.left)
+                right = eval_(node.right)
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                elif isinstance(node.op, ast.Sub):
+                    return left - right
+                elif isinstance(node.op, ast.Mult):
+                    return left * right
+                elif isinstance(node.op, ast.FloorDiv):
+                    return left // right
+                return left % right
+            raise ValueError("Not a literal")
+
+        try:
+            return eval_(ast.parse(code, mode="eval").body)
+        except (ArithmeticError, SyntaxError, ValueError):
+            return None
+
+    @staticmethod
+    def __names(node: Any) -> Set[str]:
+        """
+        Get all names referred to in the node
+        """
+        names = set()
+        for child in Optimizer.__nodes(node):
+            for name in Optimizer.__node_names(child):
+                names.update(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", name))
+        return names
+
+    @staticmethod
+    def __node_names(node: Any) -> List[str]:
+        """
+        Get the names stored directly in the node
+        """
+        if isinstance(node, (AVar, EVar)):
+            return [node.name]
+        elif isinstance(node, (AField, EField)):
+            return [node.obj]
+        elif isinstance(node, PVar):
+            return [node.var]
+        elif isinstance(node, ELambda):
+            return list(node.args)
+        elif isinstance(node, EComp):
+            return [node.var]
+        return []
+
+    @staticmethod
+    def __nodes(node: Any) -> List[Any]:
+        """
+        Get all nodes in the tree, in program order
+        """
+        nodes = []
+        if isinstance(node, Base):
+            nodes.append(node)
+            node = list(vars(node).values())
+
+        if isinstance(node, dict):
+            node = list(chain.from_iterable(node.items()))
+
+        if isinstance(node, (list, tuple)):
+            for elem in node:
+                nodes.extend(Optimizer.__nodes(elem))
+
+        return nodes
+
+    @staticmethod
+    def __own(stmt: Statement) -> Tuple[Set[str], Set[str]]:
+        """
+        Get the (names defined, names used) by the statement itself,
+        excluding any statements nested in it
+        """
+        if isinstance(stmt, SAssign):
+            if isinstance(stmt.assn, AVar):
+                return {stmt.assn.name}, Optimizer.__names(stmt.expr)
+            return set(), Optimizer.__names([stmt.assn, stmt.expr])
+        elif isinstance(stmt, SIAssign):
+            defs = {stmt.assn.name} if isinstance(stmt.assn, AVar) else set()
+            return defs, Optimizer.__names([stmt.assn, stmt.expr])
+        elif isinstance(stmt, (SExpr, SReturn)):
+            return set(), Optimizer.__names(stmt.expr)
+        elif isinstance(stmt, SDel):
+            return Optimizer.__names(stmt.vars_), set()
+        elif isinstance(stmt, SFor):
+            return Optimizer.__names(
+                stmt.payload), Optimizer.__names(stmt.expr)
+        elif isinstance(stmt, SFunc):
+            return {stmt.name} | Optimizer.__names(stmt.args), set()
+        elif isinstance(stmt, SIf):
+            conds = [stmt.if_[0]] + [cond for cond, _ in stmt.elifs]
+            return set(), Optimizer.__names(conds)
+        elif isinstance(stmt, SImport):
+            return set(stmt.names), set()
+        return set(), set()
+
+    @staticmethod
+    def __propagate(prog: SBlock) -> bool:
+        """
+        Replace the uses of a temporary that is a copy of another variable,
+        e.g. tmp0 = A, with that variable
+        """
+        order = Optimizer.__linearize(prog)
+        for i, (stmt, _, _, _) in enumerate(order):
+            copy = Optimizer.__copy(stmt)
+            if copy is None or not Optimizer.__is_temp(
+                    copy[0]) or copy[0] == copy[1]:
+                continue
+
+            temp, var = copy
+            uses = [j for j, (_, _, used, _) in enumerate(order)
+                    if temp in used]
+            if not uses:
+                continue
+
+            # A use in a loop the copy is not in may happen after any later
+            # statement of the loop
+            end = max(uses)
+            for j, (loop, _, _, last) in enumerate(order):
+                if isinstance(loop, SFor) and not j <= i <= last and \
+                        any(j < use <= last for use in uses):
+                    end = max(end, last)
+
+            if any(var in defs for _, defs, _, _ in order[i + 1:end + 1]):
+                continue
+
+            Optimizer.__rename(prog, temp, var, stmt)
+            return True
+
+        return False
+
+    @staticmethod
+    def __rank_ids(expr: Expression) -> Optional[List[str]]:
+        """
+        Get the literal rank_ids argument of the call, if any
+        """
+        if not isinstance(expr, (EFunc, EMethod)):
+            return None
+
+        for arg in expr.args:
+            if isinstance(arg, AParam) and arg.name == "rank_ids" and \
+                    isinstance(arg.expr, EList) and \
+                    all(isinstance(elem, EString) for elem in arg.expr.list):
+                return [cast(EString, elem).string for elem in arg.expr.list]
+
+        return None
+
+    @staticmethod
+    def __rename(node: Any, old: str, new: str, skip: Any = None) -> None:
+        """
+        Rename all uses of a variable, except those in del statements and in
+        the skipped statement
+        """
+        if node is skip or isinstance(node, SDel):
+            return
+
+        if isinstance(node, (AVar, EVar)) and node.name == old:
+            node.name = new
+        elif isinstance(node, (AField, EField)) and node.obj == old:
+            node.obj = new
+        elif isinstance(node, PVar) and node.var == old:
+            node.var = new
+
+        if isinstance(node, Base):
+            node = list(vars(node).values())
+
+        if isinstance(node, dict):
+            node = list(chain.from_iterable(node.items()))
+
+        if isinstance(node, (list, tuple)):
+            for elem in node:
+                Optimizer.__rename(elem, old, new, skip)
+
+    @staticmethod
+    def __renumber(prog: SBlock) -> None:
+        """
+        Renumber the remaining temporaries in program order
+        """
+        names: Dict[str, str] = {}
+        for node in Optimizer.__nodes(prog):
+            for name in Optimizer.__node_names(node):
+                if Optimizer.__is_temp(name) and name not in names.keys():
+                    names[name] = "tmp" + str(len(names))
+
+        for node in Optimizer.__nodes(prog):
+            if isinstance(node, (AVar, EVar)) and node.name in names.keys():
+                node.name = names[node.name]
+            elif isinstance(node, (AField, EField)) and node.obj in names.keys():
+                node.obj = names[node.obj]
+            elif isinstance(node, PVar) and node.var in names.keys():
+                node.var = names[node.var]
+
+    @staticmethod
+    def __target(stmt: Statement) -> Optional[str]:
+        """
+        Get the variable assigned by the statement, if it is a simple
+        assignment
+        """
+        if isinstance(stmt, SAssign) and isinstance(stmt.assn, AVar):
+            return stmt.assn.name
+        return None
+
+    @staticmethod
+    def __undel(prog: SBlock, name: str) -> None:
+        """
+        Remove a variable that is no longer assigned from the del statements
+        """
+        for block in Optimizer.__blocks(prog):
+            stmts: List[Statement] = []
+            for stmt in block.stmts:
+                if isinstance(stmt, SDel):
+                    stmt.vars_ = [
+                        var for var in stmt.vars_ if var.name != name]
+                    if not stmt.vars_:
+                        continue
+                stmts.append(stmt)
+            block.stmts = stmts
+
+    @staticmethod
+    def __unique_temps(prog: SBlock) -> bool:
+        """
+        Give every assignment to a temporary its own name, since the
+        temporaries are renumbered in every Einsum; returns False (and
+        leaves the program unchanged) if it is not safe to do so
+        """
+        # Temporaries must only appear as plain names
+        for node in Optimizer.__nodes(prog):
+            for name in Optimizer.__node_names(node):
+                if re.search(r"\btmp[0-9]+\b", name) and \
+                        not (Optimizer.__is_temp(name) and
+                             isinstance(node, (AVar, EVar))):
+                    return False
+
+        count = max([int(name[3:]) for name in Optimizer.__names(prog)
+                     if Optimizer.__is_temp(name)], default=-1) + 1
+        current: Dict[str, str] = {}
+        renames: List[Tuple[Any, str]] = []
+
+        # Temporaries assigned in each loop, and those assigned so far
+        loops: List[Tuple[Set[str], Set[str]]] = []
+
+        def use(node: Any) -> bool:
+            for var in Optimizer.__nodes(node):
+                if not isinstance(var, (AVar, EVar)) or \
+                        not Optimizer.__is_temp(var.name):
+                    continue
+
+                # The value could come from the previous iteration
+                if any(var.name in assigned and var.name not in so_far
+                       for assigned, so_far in loops):
+                    return False
+
+                if var.name in current.keys():
+                    renames.append((var, current[var.name]))
+            return True
+
+        def visit(stmt: Statement) -> bool:
+            nonlocal count
+            if isinstance(stmt, SAssign):
+                if not use(stmt.expr):
+                    return False
+
+                if not isinstance(stmt.assn, AVar):
+                    return use(stmt.assn)
+
+                name = stmt.assn.name
+                if Optimizer.__is_temp(name):
+                    current[name] = "tmp" + str(count)
+                    renames.append((stmt.assn, current[name]))
+                    count += 1
+                    for _, so_far in loops:
+                        so_far.add(name)
+                return True
+
+            elif isinstance(stmt, SFor):
+                if not use(stmt.expr):
+                    return False
+
+                assigned = {
+                    Optimizer.__target(node) for node in Optimizer.__nodes(
+                        stmt.stmt) if isinstance(
+                        node, Statement)}
+                loops.append((cast(Set[str], assigned), set()))
+                safe = visit(stmt.stmt)
+                loops.pop()
+                return safe
+
+            elif isinstance(stmt, SIf):
+                conds = [stmt.if_[0]] + [cond for cond, _ in stmt.elifs]
+                if not use(conds):
+                    return False
+
+            elif isinstance(stmt, (SDel, SExpr, SIAssign, SReturn)):
+                if not use(stmt):
+                    return False
+
+            return all(visit(body) for body in Optimizer.__bodies(stmt))
+
+        if not visit(prog):
+            return False
+
+        for var, name in renames:
+            var.name = name
+        return True
@@ -204,10 +204,15 @@ class Partitioner:
                                  " on tensor with ranks " +
                                  str(tensor.get_ranks()))
 
-        assign = self.__build_flatten("flatten", i, len(ranks) - 1, "tuple")
+        # Lazily flattened ranks are only flattened when they are split
+        flat: Statement
+        if tensor.get_lazy("".join(ranks)) is None:
+            flat = self.__build_flatten("flatten", i, len(ranks) - 1, "tuple")
+        else:
+            flat = SBlock([])
 
         self.program.apply_partitioning(tensor, ranks)
-        return assign
+        return flat
 
     def __apply_split(
             self,
@@ -371,7 +376,7 @@ class Partitioner:
         # Build the splitUniform
         return self.__split_uniform(rank, part_rank, step, depth)
 
-    def __split_equal(self, rank: str, part_rank: str,
+    def __split_equal(self, tensor: Tensor, rank: str, part_rank: str,
                       size: Expression) -> Statement:
         """
         Build call to splitEqual
@@ -384,14 +389,14 @@ class Partitioner:
         if post_halo:
             args.append(AParam("post_halo", post_halo))
 
-        curr_tmp = self.trans_utils.curr_tmp()
-        part_call = EMethod(EVar(curr_tmp), "splitEqual", args)
+        part_call = EMethod(self.__split_obj(tensor, rank), "splitEqual", args)
 
         next_tmp = AVar(self.trans_utils.next_tmp())
         return SAssign(next_tmp, part_call)
 
     def __split_follower(
             self,
+            tensor: Tensor,
             rank: str,
             part_rank: str,
             leader: str) -> Statement:
@@ -421,12 +426,29 @@ class Partitioner:
         if post_halo:
             args.append(AParam("post_halo", post_halo))
 
-        curr_tmp = self.trans_utils.curr_tmp()
-        part_call = EMethod(EVar(curr_tmp), "splitNonUniform", args)
+        part_call = EMethod(
+            self.__split_obj(
+                tensor,
+                rank),
+            "splitNonUniform",
+            args)
 
         next_tmp = AVar(self.trans_utils.next_tmp())
         return SAssign(next_tmp, part_call)
 
+    def __split_obj(self, tensor: Tensor, rank: str) -> Expression:
+        """
+        Build the object to split by occupancy: the current temporary, or a
+        LazyFlatten of it if the rank has not been flattened yet
+        """
+        curr_tmp = EVar(self.trans_utils.curr_tmp())
+        flat_ranks = tensor.get_lazy(rank)
+        if flat_ranks is None:
+            return curr_tmp
+
+        levels = AJust(EInt(len(flat_ranks) - 1))
+        return EFunc("LazyFlatten", [AJust(curr_tmp), levels])
+
     def __split_uniform(
             self,
             rank: str,
@@ -483,9 +505,9 @@ class Partitioner:
             size = EVar(ParseUtils.find_str(part, "str_sz"))
 
         if tensor.root_name() == leader:
-            return self.__split_equal(rank, src_rank, size)
+            return self.__split_equal(tensor, rank, src_rank, size)
         else:
-            return self.__split_follower(rank, src_rank, leader)
+            return self.__split_follower(tensor, rank, src_rank, leader)
 
     def __uniform_shape(
             self,
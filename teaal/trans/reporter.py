@@ -0,0 +1,103 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Translate the progress reports of the generated program
+"""
+
+from typing import List
+
+from teaal.hifiber import *
+from teaal.ir.program import Program
+from teaal.ir.tensor import Tensor
+from teaal.parse.options import Options
+
+
+class Reporter:
+    """
+    Generate the HiFiber code for reporting the progress of the outer loop
+    of each Einsum
+    """
+
+    def __init__(self, options: Options) -> None:
+        """
+        Construct a new Reporter
+        """
+        # The status file, or stderr if the path is empty
+        self.progress = options.get_progress()
+
+    @staticmethod
+    def get_extent(program: Program, tensors: List[Tensor]) -> str:
+        """
+        Get the name of a tensor whose top rank has the extent of the loop
+        over these tensors
+        """
+        output, inputs = program.get_equation().get_iter(tensors)
+        if inputs:
+            return inputs[0][0].tensor_name()
+
+        if output:
+            return output.tensor_name()
+
+        return ""  # pragma: no cover
+
+    def is_enabled(self) -> bool:
+        """
+        Returns True if the progress is reported
+        """
+        return self.progress is not None
+
+    @staticmethod
+    def make_loop(name: str, extent: str, loop: Statement) -> Statement:
+        """
+        Count the iterations of the outer loop of the Einsum; nothing is added
+        to the inner loops
+        """
+        progress = EVar("progress")
+        start_args = [AJust(EString(name))]
+        if extent:
+            start_args.append(AJust(EVar(extent)))
+
+        start = EMethod(progress, "start", start_args)
+        end = EMethod(progress, "end", [])
+        return SBlock([SExpr(start), loop, SExpr(end)])
+
+    def make_start(self) -> Statement:
+        """
+        Create the progress report
+        """
+        if self.progress is None:
+            return SBlock([])
+
+        args: List[Argument] = []
+        if self.progress:
+            args.append(AJust(EString(self.progress)))
+
+        return SAssign(AVar("progress"), EFunc("Progress", args))
+
+    @staticmethod
+    def make_step(program: Program, rank: str) -> Statement:
+        """
+        Count an iteration of the outer loop at the given rank
+        """
+        coord = program.get_loop_order().get_iter_ranks(rank)[0].lower()
+        return SExpr(EMethod(EVar("progress"), "step", [AJust(EVar(coord))]))
@@ -0,0 +1,149 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Reuse the swizzled and partitioned inputs across Einsums
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from teaal.hifiber import *
+from teaal.ir.program import Program
+from teaal.ir.tensor import Tensor
+from teaal.trans.liveness import Liveness
+from teaal.trans.utils import TransUtils
+
+
+class Reuser:
+    """
+    Elide the swizzling or partitioning of an input tensor if an earlier
+    Einsum already performed the identical transformation
+    """
+
+    def __init__(
+            self,
+            trans_utils: TransUtils,
+            liveness: Liveness,
+            share: bool = True) -> None:
+        """
+        Construct a new Reuser; if share is False, the transformations are
+        tracked but never elided
+        """
+        self.trans_utils = trans_utils
+        self.liveness = liveness
+        self.share = share
+
+        # Swizzled and partitioned inputs, stored as the tensor name mapped to
+        # (root tensor, source tensor name, transforms applied to the root)
+        self.transforms: Dict[str, Tuple[str, str, Tuple[Any, ...]]] = {}
+
+    def add_einsum(self, program: Program) -> None:
+        """
+        Forget the transformations of the output of the Einsum for which the
+        program is configured, which it overwrites
+        """
+        output = program.get_equation().get_output().root_name()
+        for name in [name for name, (root, _, _) in self.transforms.items()
+                     if root == output]:
+            self.__invalidate(name)
+
+    @staticmethod
+    def make_part_step(program: Program,
+                       ranks: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """
+        Describe the partitioning of the given ranks: its specification and
+        the index math that determines its halos
+        """
+        part_ir = program.get_partitioning()
+        part_ranks = part_ir.partition_rank(ranks)
+
+        specs = [tuple(part_ir.get_part_spec(ranks))]
+        if part_ranks is not None and part_ranks != ranks:
+            specs.append(tuple(part_ir.get_part_spec(part_ranks)))
+
+        roots = {part_ir.get_root_name(rank)
+                 for rank in ranks + (part_ranks or ())}
+        coord_math = program.get_coord_math()
+        exprs = sorted(str(expr) for root in roots
+                       for expr in coord_math.get_all_exprs(root.lower()))
+
+        return ("partition", ranks, tuple(specs), tuple(exprs))
+
+    @staticmethod
+    def make_swizzle_step(ranks: List[str], type_: str) -> Tuple[Any, ...]:
+        """
+        Describe the swizzling of a tensor to the given ranks
+        """
+        return ("swizzle", tuple(ranks), type_)
+
+    def reuse(
+            self,
+            i: int,
+            tensor: Tensor,
+            old_name: str,
+            step: Tuple[Any, ...],
+            count: int,
+            stmt: Statement,
+            top: bool) -> Statement:
+        """
+        Get the statement transforming the tensor (formerly old_name) in the
+        i'th Einsum, which is empty if the transformation can be reused
+
+        The statement used the temporaries after the first count
+        """
+        new_name = tensor.tensor_name()
+        if not top or tensor.get_is_output() or old_name == new_name:
+            return stmt
+
+        # The transformation is identified by the transformations that lead
+        # to it from the root tensor
+        chain: Tuple[Any, ...] = (step,)
+        if old_name in self.transforms.keys():
+            chain = self.transforms[old_name][2] + chain
+
+        transform = (tensor.root_name(), old_name, chain)
+        temps = ["tmp" + str(j)
+                 for j in range(count + 1, self.trans_utils.count + 1)]
+        self.liveness.add_use(i, new_name)
+
+        if self.share and self.transforms.get(new_name) == transform:
+            return SBlock([])
+
+        # The temporaries also hold references to the transformed tensor, so
+        # they die with it
+        self.liveness.add_transform(i, new_name, temps)
+
+        self.__invalidate(new_name)
+        self.transforms[new_name] = transform
+        return stmt
+
+    def __invalidate(self, name: str) -> None:
+        """
+        Forget a transformed tensor and everything derived from it
+        """
+        if name not in self.transforms.keys():
+            return
+
+        del self.transforms[name]
+        for other, (_, source, _) in list(self.transforms.items()):
+            if source == name:
+                self.__invalidate(other)
@@ -0,0 +1,239 @@
+"""
+MIT License
+
+Copyright (c) 2021 University of Illinois
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Versioned snapshots of the resolved specification and the analyzed flow graphs,
+so that later compilations can skip both
+"""
+
+import copy
+import hashlib
+import inspect
+import json
+import os
+from typing import Any, Dict, get_origin, List, Optional
+
+from teaal.dse import resolve
+from teaal.ir import flow_nodes
+from teaal.ir.node import Node
+from teaal.parse import *
+from teaal.parse.yaml import YamlParser
+from teaal.trans.hifiber import HiFiber
+
+
+class Snapshot:
+    """
+    The resolved specification and the sorted flow graph nodes of each Einsum
+
+    A snapshot is stored as JSON. Since the flow graphs are only meaningful
+    to the compiler that analyzed them, it records the format version and a
+    hash of the compiler's sources, and a mismatched snapshot is rejected
+
+    A snapshot skips the selection of the loop orders and tile sizes and the
+    analysis of the flow graphs; the translation still rebuilds the Program
+    and the Partitioning, Hardware, and Metrics of each Einsum
+    """
+
+    FORMAT = "teaal-snapshot"
+    VERSION = 2
+
+    # The hash of the compiler's sources, computed on first use
+    source: Optional[str] = None
+
+    def __init__(self, spec: str) -> None:
+        """
+        Construct a new Snapshot from the specification
+
+        The flow graphs are analyzed by the first translation
+        """
+        self.hash = Snapshot.__hash(spec)
+
+        # Select any loop orders and tile sizes left to the compiler
+        self.spec = resolve(YamlParser.parse_str(spec))
+        self.nodes: Optional[Dict[str, List[List[Any]]]] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        """
+        Load a Snapshot from its serialization
+        """
+        try:
+            info = json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError("Not a snapshot")
+
+        if not isinstance(info, dict) or info.get("format") != Snapshot.FORMAT:
+            raise ValueError("Not a snapshot")
+
+        if info.get("version") != Snapshot.VERSION:
+            raise ValueError(
+                "Unsupported snapshot version: " + str(info.get("version")))
+
+        if info.get("source") != Snapshot.get_source():
+            raise ValueError("Snapshot written by a different compiler")
+
+        snapshot = cls.__new__(cls)
+        try:
+            snapshot.hash = info["hash"]
+            snapshot.spec = info["spec"]
+            snapshot.nodes = info["nodes"]
+            if snapshot.nodes is not None:
+                Snapshot.__decode(snapshot.nodes)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Corrupted snapshot")
+
+        return snapshot
+
+    @classmethod
+    def from_cache(cls, filename: str, spec: str) -> "Snapshot":
+        """
+        Load the Snapshot of the specification from a file, or construct a
+        new one if the file does not hold a current snapshot of it
+        """
+        if os.path.exists(filename):
+            try:
+                snapshot = cls.from_file(filename)
+                if snapshot.get_hash() == Snapshot.__hash(spec):
+                    return snapshot
+            except ValueError:
+                pass
+
+        return cls(spec)
+
+    @classmethod
+    def from_file(cls, filename: str) -> "Snapshot":
+        """
+        Load a Snapshot from a file
+        """
+        with open(filename, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def get_hash(self) -> str:
+        """
+        Get the hash of the specification of this snapshot
+        """
+        return self.hash
+
+    @staticmethod
+    def get_source() -> str:
+        """
+        Get the hash of the compiler's sources
+        """
+        if Snapshot.source is None:
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            hash_ = hashlib.sha256()
+            for dirpath, _, filenames in sorted(os.walk(root)):
+                for filename in sorted(filenames):
+                    if filename.endswith(".py"):
+                        with open(os.path.join(dirpath, filename), "rb") as f:
+                            hash_.update(f.read())
+            Snapshot.source = hash_.hexdigest()
+
+        return Snapshot.source
+
+    def is_analyzed(self) -> bool:
+        """
+        Return True if the flow graphs have been analyzed
+        """
+        return self.nodes is not None
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the Snapshot
+        """
+        info = {
+            "format": Snapshot.FORMAT,
+            "version": Snapshot.VERSION,
+            "source": Snapshot.get_source(),
+            "hash": self.hash,
+            "spec": self.spec,
+            "nodes": self.nodes}
+        return json.dumps(info).encode("utf-8")
+
+    def to_file(self, filename: str) -> None:
+        """
+        Write the Snapshot to a file
+        """
+        with open(filename, "wb") as f:
+            f.write(self.to_bytes())
+
+    def translate(self, opts: Optional[List[str]] = None) -> HiFiber:
+        """
+        Translate the snapshot into HiFiber, analyzing the flow graphs if it
+        has not yet been done
+        """
+        # Parsing and translation may modify the specification, so parse a
+        # copy of it for every translation
+        spec = copy.deepcopy(self.spec)
+        parsed = (Einsum(spec), Mapping(spec), Architecture(
+            spec), Bindings(spec), Format(spec))
+        if self.nodes is None:
+            hifiber = HiFiber(*parsed, opts)
+            self.nodes = {str(i): [Snapshot.__encode(node) for node in nodes]
+                          for i, nodes in hifiber.get_nodes().items()}
+            return hifiber
+
+        return HiFiber(*parsed, opts, Snapshot.__decode(self.nodes))
+
+    @staticmethod
+    def __decode(
+            nodes: Dict[str, List[List[Any]]]) -> Dict[int, List[Node]]:
+        """
+        Rebuild the flow graph nodes of each Einsum, only allowing the flow
+        graph node classes
+        """
+        decoded: Dict[int, List[Node]] = {}
+        for i, encoded in nodes.items():
+            decoded[int(i)] = []
+            for name, *args in encoded:
+                class_ = getattr(flow_nodes, name, None)
+                if not isinstance(class_, type) or not issubclass(
+                        class_, Node) or class_ is Node:
+                    raise ValueError("Unknown node: " + str(name))
+
+                params = list(inspect.signature(
+                    class_.__init__).parameters.values())[1:]
+                if len(args) != len(params):
+                    raise ValueError("Bad arguments to node: " + name)
+
+                args = [tuple(arg) if get_origin(param.annotation) is tuple
+                        else arg for arg, param in zip(args, params)]
+                decoded[int(i)].append(class_(*args))
+
+        return decoded
+
+    @staticmethod
+    def __encode(node: Node) -> List[Any]:
+        """
+        Encode a flow graph node as its class name and constructor arguments
+        """
+        params = list(inspect.signature(
+            type(node).__init__).parameters)[1:]
+        return [type(node).__name__] + [getattr(node, param.rstrip("_"))
+                                        for param in params]
+
+    @staticmethod
+    def __hash(spec: str) -> str:
+        """
+        Hash a specification
+        """
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()
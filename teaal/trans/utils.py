@@ -78,7 +78,7 @@ class TransUtils:
         """
         Build the rank_ids argument
         """
-        ranks = [EString(rank) for rank in tensor.get_ranks()]
+        ranks = [EString(rank) for rank in tensor.get_rank_ids()]
         return AParam("rank_ids", EList(ranks))
 
     @staticmethod
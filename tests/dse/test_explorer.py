@@ -0,0 +1,249 @@
+import json
+import pytest
+
+from teaal.dse import *
+from teaal.parse.yaml import YamlParser
+
+YAML = """
+einsum:
+  declaration:
+    A: [K, M]
+    B: [K, N]
+    Z: [M, N]
+  expressions:
+  - Z[m, n] = A[k, m] * B[k, n]
+mapping:
+  rank-order:
+    A: [K, M]
+    B: [K, N]
+    Z: [M, N]
+format:
+  A:
+    default:
+      rank-order: [K, M]
+      K:
+        format: C
+        cbits: 32
+      M:
+        format: C
+        cbits: 32
+        pbits: 64
+  B:
+    default:
+      rank-order: [K, N]
+      K:
+        format: C
+        cbits: 32
+      N:
+        format: C
+        cbits: 32
+        pbits: 64
+architecture:
+  accel:
+  - name: System
+    attributes:
+      clock_frequency: 1000000000
+    local:
+    - name: MainMemory
+      class: DRAM
+      attributes:
+        bandwidth: 1000000000
+    subtree:
+    - name: PE
+      local:
+      - name: Buffer
+        class: Buffet
+        attributes:
+          width: 64
+          depth: 64
+      - name: FPMul
+        class: compute
+        attributes:
+          type: mul
+bindings:
+  Z:
+  - config: accel
+    prefix: tmp/Z
+  - component: MainMemory
+    bindings:
+    - tensor: A
+      rank: M
+      type: elem
+      format: default
+    - tensor: B
+      rank: N
+      type: elem
+      format: default
+  - component: Buffer
+    bindings:
+    - tensor: A
+      rank: M
+      type: elem
+      evict-on: root
+      format: default
+    - tensor: B
+      rank: N
+      type: elem
+      evict-on: root
+      format: default
+  - component: FPMul
+    bindings:
+    - op: mul
+stats:
+  shape:
+    K: 128
+    M: 128
+    N: 128
+  occupancy:
+    A:
+      K: 100
+      M: 10
+    B:
+      K: 100
+      N: 10
+dse:
+  loop-order:
+    Z:
+    - [K, M, N]
+    - [M, N, K]
+    - [K, M, Q]
+  spacetime:
+    Z:
+    - space: []
+"""
+
+
+def count_cost(yaml):
+    return len(json.dumps(yaml["mapping"]["loop-order"]))
+
+
+def fail_cost(yaml):
+    raise AssertionError("Should not be re-evaluated")
+
+
+def key_error_cost(yaml):
+    if yaml["mapping"]["loop-order"]["Z"] == ["M", "N", "K"]:
+        raise KeyError("Z")
+    return 1.0
+
+
+def build_explorer(**kwargs):
+    yaml = YamlParser.parse_str(YAML)
+    return Explorer(yaml, SearchSpace(yaml), **kwargs)
+
+
+def test_model_cost():
+    yaml = SearchSpace.apply(YamlParser.parse_str(YAML), {
+        "spacetime": {"Z": {"space": []}}})
+    assert model_cost(yaml) > 0
+
+
+def test_evaluate_illegal():
+    yaml = YamlParser.parse_str(YAML)
+    candidate = {"loop-order": {"Z": ["K", "M", "Q"]},
+                 "spacetime": {"Z": {"space": []}}}
+    result = evaluate(yaml, candidate, model_cost)
+
+    assert result["candidate"] == candidate
+    assert result["cost"] is None
+    assert result["error"] == "Illegal loop order ['K', 'M', 'Q'] for Einsum Z"
+
+
+def test_evaluate_crash():
+    yaml = YamlParser.parse_str(YAML)
+    candidate = {"loop-order": {"Z": ["M", "N", "K"]},
+                 "spacetime": {"Z": {"space": []}}}
+    result = evaluate(yaml, candidate, key_error_cost)
+
+    assert result["cost"] is None
+    assert result["error"] == "KeyError: 'Z'"
+
+
+def test_run():
+    results = build_explorer(workers=1).run()
+
+    # The legal candidates are ranked by cost
+    assert len(results) == 3
+    assert results[0]["cost"] <= results[1]["cost"]
+    assert results[2]["cost"] is None
+    assert results[2]["candidate"]["loop-order"]["Z"] == ["K", "M", "Q"]
+
+
+def test_run_custom_cost():
+    results = build_explorer(workers=1, cost=count_cost).run()
+    assert [res["cost"] for res in results] == [
+        len(json.dumps({"Z": ["K", "M", "N"]})),
+        len(json.dumps({"Z": ["M", "N", "K"]})),
+        None]
+
+
+def test_run_crash(tmp_path):
+    checkpoint = str(tmp_path / "dse.jsonl")
+    results = build_explorer(
+        workers=1,
+        cost=key_error_cost,
+        checkpoint=checkpoint).run()
+
+    # The crashing candidate is recorded as failed, and the run continues
+    assert [res["cost"] for res in results] == [1.0, None, None]
+    assert results[2]["error"] == "KeyError: 'Z'"
+
+    with open(checkpoint, "r") as stream:
+        assert len(stream.readlines()) == 3
+
+
+def test_run_auto_loop_order():
+    yaml = YamlParser.parse_str(YAML)
+    yaml["mapping"]["loop-order"] = {"Z": "auto"}
+    del yaml["dse"]["loop-order"]
+
+    results = Explorer(yaml, SearchSpace(yaml), workers=1).run()
+    assert len(results) == 1
+    assert results[0]["error"] is None
+
+
+def test_run_pool():
+    serial = build_explorer(workers=1).run()
+    parallel = build_explorer(workers=2).run()
+    assert parallel == serial
+
+
+def test_resume(tmp_path):
+    checkpoint = str(tmp_path / "dse.jsonl")
+    results = build_explorer(workers=1, checkpoint=checkpoint).run()
+
+    with open(checkpoint, "r") as stream:
+        assert len(stream.readlines()) == 3
+
+    # Nothing needs to be re-evaluated
+    explorer = build_explorer(
+        workers=1,
+        cost=fail_cost,
+        checkpoint=checkpoint)
+    assert explorer.get_results() == results
+    assert explorer.run() == results
+
+
+def test_resume_truncated(tmp_path):
+    checkpoint = str(tmp_path / "dse.jsonl")
+    results = build_explorer(workers=1, checkpoint=checkpoint).run()
+
+    # Simulate an interruption in the middle of writing the last result
+    with open(checkpoint, "r") as stream:
+        lines = stream.readlines()
+    with open(checkpoint, "w") as stream:
+        stream.writelines(lines[:-1])
+        stream.write(lines[-1][:10])
+
+    assert build_explorer(workers=1, checkpoint=checkpoint).run() == results
+
+    with open(checkpoint, "r") as stream:
+        assert len([json.loads(line) for line in stream]) == 3
+
+
+def test_from_file(tmp_path):
+    filename = tmp_path / "input.yaml"
+    filename.write_text(YAML)
+
+    results = Explorer.from_file(str(filename), workers=1).run()
+    assert len(results) == 3
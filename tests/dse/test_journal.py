@@ -0,0 +1,48 @@
+import json
+
+from teaal.dse.journal import Journal
+
+
+def key(result):
+    return result["name"]
+
+
+def test_record():
+    journal = Journal(None, key)
+    journal.record({"name": "a", "value": 1})
+    journal.record({"name": "b", "value": 2})
+    journal.record({"name": "a", "value": 3})
+
+    assert journal.get_results() == {
+        "a": {"name": "a", "value": 3}, "b": {"name": "b", "value": 2}}
+
+
+def test_load(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    journal = Journal(path, key)
+    journal.record({"name": "a", "value": 1})
+    journal.record({"name": "a", "value": 2})
+
+    assert Journal(path, key).get_results() == {"a": {"name": "a", "value": 2}}
+
+
+def test_load_truncated(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    journal = Journal(path, key)
+    journal.record({"name": "a", "value": 1})
+    journal.record({"name": "b", "value": 2})
+
+    # Simulate an interruption in the middle of writing the last result
+    with open(path, "r") as stream:
+        lines = stream.readlines()
+    with open(path, "w") as stream:
+        stream.write(lines[0])
+        stream.write(lines[1][:5])
+
+    journal = Journal(path, key)
+    assert journal.get_results() == {"a": {"name": "a", "value": 1}}
+
+    journal.record({"name": "b", "value": 3})
+    with open(path, "r") as stream:
+        assert [json.loads(line) for line in stream] == [
+            {"name": "a", "value": 1}, {"name": "b", "value": 3}]
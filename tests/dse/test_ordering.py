@@ -0,0 +1,95 @@
+import pytest
+
+from teaal.dse.ordering import Orderer, resolve
+from teaal.parse.yaml import YamlParser
+
+
+def build_yaml(loop_order, partitioning=""):
+    return YamlParser.parse_str("""
+    einsum:
+      declaration:
+        A: [K, M]
+        B: [K, N]
+        Z: [M, N]
+      expressions:
+      - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+      loop-order:
+        Z: """ + loop_order + """
+      partitioning:
+        Z:
+    """ + partitioning)
+
+
+def test_get_loop_orders():
+    yaml = YamlParser.parse_str("""
+    einsum:
+      declaration:
+        A: [N, M]
+        B: [N, M]
+        Z: [M, N]
+      expressions:
+      - Z[m, n] = A[n, m] + B[n, m]
+    mapping:
+      loop-order:
+        Z: auto
+    """)
+
+    assert Orderer(yaml).get_loop_orders() == {"Z": ["N", "M"]}
+
+
+def test_get_loop_orders_tie():
+    orderer = Orderer(build_yaml("auto"))
+    assert orderer.get_loop_orders() == {"Z": ["M", "N", "K"]}
+
+
+def test_get_loop_orders_partitioning():
+    yaml = build_yaml("auto", """
+          K: [uniform_shape(4)]
+    """)
+    assert Orderer(yaml).get_loop_orders() == {"Z": ["M", "N", "K1", "K0"]}
+
+
+def test_get_loop_orders_conv():
+    orderer = Orderer.from_str("""
+    einsum:
+      declaration:
+        F: [S]
+        I: [W]
+        O: [Q]
+      expressions:
+      - O[q] = I[q + s] * F[s]
+    mapping:
+      loop-order:
+        O: auto
+    """)
+    assert orderer.get_loop_orders() == {"O": ["Q", "S"]}
+
+
+def test_get_loop_orders_cap(monkeypatch):
+    monkeypatch.setattr(Orderer, "MAX_CANDIDATES", 2)
+
+    with pytest.raises(ValueError) as excinfo:
+        Orderer(build_yaml("auto")).get_loop_orders()
+    assert str(
+        excinfo.value) == "Loop order search for Einsum Z exceeds 2 candidates; specify its loop order instead"
+
+
+def test_get_loop_orders_none():
+    assert Orderer(build_yaml("[K, M, N]")).get_loop_orders() == {}
+
+
+def test_apply():
+    yaml = build_yaml("auto")
+    spec = Orderer(yaml).apply()
+
+    assert spec["mapping"]["loop-order"]["Z"] == ["M", "N", "K"]
+    assert yaml["mapping"]["loop-order"]["Z"] == "auto"
+
+
+def test_resolve():
+    yaml = build_yaml("auto")
+    assert resolve(yaml)["mapping"]["loop-order"]["Z"] == ["M", "N", "K"]
+
+    yaml = build_yaml("[K, M, N]")
+    assert resolve(yaml) is yaml
@@ -0,0 +1,170 @@
+import pytest
+
+from teaal.dse.space import SearchSpace
+from teaal.parse.yaml import YamlParser
+
+
+def build_yaml(dse):
+    return YamlParser.parse_str("""
+    einsum:
+      declaration:
+        A: [K, M]
+        B: [K, N]
+        Z: [M, N]
+      expressions:
+      - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+      partitioning:
+        Z:
+          K: [uniform_shape(K0)]
+      loop-order:
+        Z: [K1, M, N, K0]
+    """ + dse)
+
+
+def test_no_dse():
+    space = SearchSpace.from_str("")
+    assert list(space.get_candidates(build_yaml(""))) == [{}]
+
+
+def test_bad_loop_orders():
+    yaml = build_yaml("""
+    dse:
+      loop-order:
+        Z: foo
+    """)
+
+    with pytest.raises(ValueError) as excinfo:
+        SearchSpace(yaml)
+    assert str(
+        excinfo.value) == "Loop orders for Einsum Z must be a list or all, given foo"
+
+
+def test_bad_spacetime():
+    yaml = build_yaml("""
+    dse:
+      spacetime:
+        Z:
+        - time: [K1, M, N, K0]
+    """)
+
+    with pytest.raises(ValueError) as excinfo:
+        SearchSpace(yaml)
+    assert str(
+        excinfo.value) == "Space unspecified in spacetime for Einsum Z"
+
+
+def test_unknown_einsum():
+    yaml = build_yaml("""
+    dse:
+      loop-order:
+        T: all
+    """)
+
+    with pytest.raises(ValueError) as excinfo:
+        list(SearchSpace(yaml).get_candidates(yaml))
+    assert str(excinfo.value) == "Unknown Einsum T in search space"
+
+
+def test_all_loop_orders():
+    yaml = build_yaml("""
+    dse:
+      loop-order:
+        Z: all
+    """)
+
+    candidates = list(SearchSpace(yaml).get_candidates(yaml))
+
+    # K1 must always come before K0
+    assert len(candidates) == 12
+    for candidate in candidates:
+        order = candidate["loop-order"]["Z"]
+        assert order.index("K1") < order.index("K0")
+
+
+def test_get_candidates():
+    yaml = build_yaml("""
+    dse:
+      loop-order:
+        Z:
+        - [K1, M, N, K0]
+        - [M, K1, N, K0]
+      spacetime:
+        Z:
+        - space: [M]
+      params:
+        K0: [16, 32]
+    """)
+
+    candidates = list(SearchSpace(yaml).get_candidates(yaml))
+    assert candidates == [
+        {"loop-order": {"Z": ["K1", "M", "N", "K0"]},
+         "spacetime": {"Z": {"space": ["M"]}}, "params": {"K0": 16}},
+        {"loop-order": {"Z": ["K1", "M", "N", "K0"]},
+         "spacetime": {"Z": {"space": ["M"]}}, "params": {"K0": 32}},
+        {"loop-order": {"Z": ["M", "K1", "N", "K0"]},
+         "spacetime": {"Z": {"space": ["M"]}}, "params": {"K0": 16}},
+        {"loop-order": {"Z": ["M", "K1", "N", "K0"]},
+         "spacetime": {"Z": {"space": ["M"]}}, "params": {"K0": 32}}]
+
+
+def test_apply():
+    yaml = build_yaml("")
+    candidate = {
+        "loop-order": {"Z": ["M", "K1", "N", "K0"]},
+        "spacetime": {"Z": {"space": ["N.coord"]}},
+        "params": {"K0": 16}}
+
+    spec = SearchSpace.apply(yaml, candidate)
+    assert spec["mapping"]["loop-order"] == {"Z": ["M", "K1", "N", "K0"]}
+    assert spec["mapping"]["spacetime"] == {
+        "Z": {"space": ["N.coord"], "time": ["M", "K1", "K0"]}}
+    assert spec["stats"] == {"shape": {"K0": 16}}
+
+    # The original specification is unchanged
+    assert yaml["mapping"]["loop-order"] == {"Z": ["K1", "M", "N", "K0"]}
+    assert "stats" not in yaml.keys()
+
+
+def test_apply_tile_sizes():
+    yaml = build_yaml("")
+    yaml["mapping"]["tile-sizes"] = {"K0": 8, "M0": 4}
+
+    spec = SearchSpace.apply(yaml, {"params": {"K0": 16, "N": 32}})
+    assert spec["mapping"]["tile-sizes"] == {"K0": 16, "M0": 4}
+    assert spec["stats"] == {"shape": {"K0": 16, "N": 32}}
+    assert yaml["mapping"]["tile-sizes"] == {"K0": 8, "M0": 4}
+
+
+def test_apply_no_mapping():
+    yaml = YamlParser.parse_str("""
+    einsum:
+      declaration:
+        A: [K]
+        Z: [K]
+      expressions:
+      - Z[k] = A[k]
+    """)
+
+    spec = SearchSpace.apply(yaml, {"spacetime": {"Z": {"space": []}}})
+    assert spec["mapping"] == {
+        "spacetime": {
+            "Z": {
+                "space": [],
+                "time": ["K"]}}}
+
+
+def test_check():
+    yaml = build_yaml("")
+    SearchSpace.check(yaml, {})
+    SearchSpace.check(yaml, {"loop-order": {"Z": ["M", "K1", "N", "K0"]}})
+
+    with pytest.raises(ValueError) as excinfo:
+        SearchSpace.check(yaml, {"loop-order": {"Z": ["K0", "M", "N", "K1"]}})
+    assert str(
+        excinfo.value) == "Illegal loop order ['K0', 'M', 'N', 'K1'] for Einsum Z"
+
+    with pytest.raises(ValueError) as excinfo:
+        SearchSpace.check(yaml, {"loop-order": {"Z": ["K1", "M", "K0"]}})
+    assert str(
+        excinfo.value) == "Illegal loop order ['K1', 'M', 'K0'] for Einsum Z"
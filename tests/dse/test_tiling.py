@@ -0,0 +1,58 @@
+import pytest
+
+from teaal.dse.tiling import Tiler
+from teaal.parse.yaml import YamlParser
+
+
+def build_yaml():
+    return YamlParser.parse_file("tests/integration/test_tiling.yaml")
+
+
+def test_get_tile_sizes():
+    tiler = Tiler.from_file("tests/integration/test_tiling.yaml")
+
+    # The largest tile of B that fits in the buffer
+    assert tiler.get_tile_sizes() == {"K0": 16}
+
+
+def test_get_tile_sizes_nested():
+    yaml = build_yaml()
+    yaml["mapping"]["partitioning"]["Z"]["K"] = [
+        "uniform_shape(K1)", "uniform_shape(K0)"]
+    yaml["mapping"]["loop-order"]["Z"] = ["K2", "K1", "M", "K0"]
+    yaml["mapping"]["spacetime"]["Z"]["time"] = ["K2", "K1", "M", "K0"]
+    yaml["mapping"]["tile-sizes"]["K1"] = "auto"
+
+    yaml["format"]["A"]["default"]["rank-order"] = ["K2", "K1", "M", "K0"]
+    yaml["format"]["B"]["default"]["rank-order"] = ["K2", "K1", "K0"]
+    for tensor in ["A", "B"]:
+        yaml["format"][tensor]["default"]["K2"] = {"format": "U"}
+
+    sizes = Tiler(yaml).get_tile_sizes()
+    assert sizes["K1"] > sizes["K0"]
+
+
+def test_get_tile_sizes_no_fit():
+    yaml = build_yaml()
+    yaml["architecture"]["accel"][0]["subtree"][0]["local"][0]["attributes"]["depth"] = 1
+
+    with pytest.raises(ValueError) as excinfo:
+        Tiler(yaml).get_tile_sizes()
+    assert str(excinfo.value) == "No tile sizes fit in the buffers"
+
+
+def test_unused():
+    yaml = build_yaml()
+    yaml["mapping"]["tile-sizes"]["N0"] = "auto"
+
+    with pytest.raises(ValueError) as excinfo:
+        Tiler(yaml)
+    assert str(excinfo.value) == "Tile size N0 is unused"
+
+
+def test_apply():
+    yaml = build_yaml()
+    spec = Tiler(yaml).apply()
+
+    assert spec["mapping"]["tile-sizes"] == {"K0": 16}
+    assert yaml["mapping"]["tile-sizes"] == {"K0": "auto"}
@@ -29,6 +29,11 @@ def test_sblock_add_other():
     assert block.gen(0) == "x = y\na = b\nz = w"
 
 
+def test_sdel():
+    del_ = SDel([EVar("a"), EVar("b")])
+    assert del_.gen(1) == "    del a, b"
+
+
 def test_sexpr():
     expr = SExpr(EVar("c"))
     assert expr.gen(2) == "        c"
@@ -102,6 +107,12 @@ def test_sif_just_if():
     assert if_.gen(2) == code
 
 
+def test_simport():
+    stmt = SImport("concurrent.futures", ["ProcessPoolExecutor", "wait"])
+    assert stmt.gen(1) == \
+        "    from concurrent.futures import ProcessPoolExecutor, wait"
+
+
 def tst_sreturn():
     return_ = SReturn(EVar("foo"))
     assert return_.gen(2) == "        return foo"
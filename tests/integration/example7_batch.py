@@ -0,0 +1,22 @@
+Z_MN = Tensor(rank_ids=["M", "N"], name="Z")
+z_m = Z_MN.getRoot()
+a_m = A_MN.getRoot()
+b_m = B_MN.getRoot()
+for m, (z_n, (_, a_n, b_n)) in z_m << (a_m | b_m):
+    z_n_coords = []
+    z_n_payloads = []
+    for n, (_, a_val, b_val) in a_n | b_n:
+        z_n_coords.append(n)
+        z_n_payloads.append(a_val + b_val)
+    z_n.extend(Fiber(z_n_coords, z_n_payloads))
+Z_MN = Tensor(rank_ids=["M", "N"], name="Z")
+z_m = Z_MN.getRoot()
+a_m = A_MN.getRoot()
+b_m = B_MN.getRoot()
+for m, (z_n, (a_n, b_n)) in z_m << (a_m & b_m):
+    z_n_coords = []
+    z_n_payloads = []
+    for n, (a_val, b_val) in a_n & b_n:
+        z_n_coords.append(n)
+        z_n_payloads.append(a_val * b_val)
+    z_n.extend(Fiber(z_n_coords, z_n_payloads))
\ No newline at end of file
@@ -0,0 +1,15 @@
+A_MK = A_KM.swizzleRanks(rank_ids=["M", "K"])
+B_NK = B_KN.swizzleRanks(rank_ids=["N", "K"])
+a_m = A_MK.getRoot()
+b_n = B_NK.getRoot()
+Z_MN = Tensor(rank_ids=["M", "N"], name="Z")
+z_m = Z_MN.getRoot()
+c_m = C_MN.getRoot()
+for m, (z_n, (_, a_k, c_n)) in z_m << (a_m | c_m):
+    for n, (z_ref, (_, b_k, c_val)) in z_n << (b_n | c_n):
+        T1_ = Tensor(rank_ids=[], name="T1")
+        t1_ref = T1_.getRoot()
+        for k, (a_val, b_val) in a_k & b_k:
+            t1_ref += a_val * b_val
+        t1_val = t1_ref
+        z_ref <<= a * t1_val + b * c_val
\ No newline at end of file
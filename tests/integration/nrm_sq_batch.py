@@ -0,0 +1,21 @@
+T_ABIJ = Tensor(rank_ids=["A", "B", "I", "J"], name="T")
+t_a = T_ABIJ.getRoot()
+v_a = V_ABIJ.getRoot()
+for a, (t_b, v_b) in t_a << v_a:
+    for b, (t_i, v_i) in t_b << v_b:
+        for i, (t_j, v_j) in t_i << v_i:
+            t_j_coords = []
+            t_j_payloads = []
+            for j, v_val in v_j:
+                t_j_coords.append(j)
+                t_j_payloads.append(Payload.get(v_val))
+            t_j.extend(Fiber(t_j_coords, t_j_payloads))
+Q_ = Tensor(rank_ids=[], name="Q")
+q_ref = Q_.getRoot()
+v_a = V_ABIJ.getRoot()
+t_a = T_ABIJ.getRoot()
+for a, (v_b, t_b) in v_a & t_a:
+    for b, (v_i, t_i) in v_b & t_b:
+        for i, (v_j, t_j) in v_i & t_i:
+            for j, (v_val, t_val) in v_j & t_j:
+                q_ref += v_val * t_val
\ No newline at end of file
@@ -5,3 +5,12 @@ do
     echo $TEST
     ./compile.sh tests/integration/$TEST.yaml > tests/integration/$TEST.py
 done
+
+for TEST in example7 nrm_sq
+do
+    echo ${TEST}_batch
+    python -m teaal --batch tests/integration/$TEST.yaml > tests/integration/${TEST}_batch.py
+done
+
+echo gemm_fuse
+python -m teaal --fuse tests/integration/gemm.yaml > tests/integration/gemm_fuse.py
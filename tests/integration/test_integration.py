@@ -46,4 +46,27 @@ def test_integration():
             print(output)
             errors.append(test_name)
 
-    assert not errors, "Integration tests " + str(errors) + " failed!"
\ No newline at end of file
+    assert not errors, "Integration tests " + str(errors) + " failed!"
+
+
+opt_test_names = [
+    ('example7', ['batch'], 'example7_batch'),
+    ('gemm', ['fuse'], 'gemm_fuse'),
+    ('nrm_sq', ['batch'], 'nrm_sq_batch')]
+
+
+def test_integration_opts():
+    errors = []
+    for test_name, opts, expected in opt_test_names:
+        filename = 'tests/integration/' + test_name
+
+        einsum = Einsum.from_file(filename + ".yaml")
+        mapping = Mapping.from_file(filename + ".yaml")
+        output = str(HiFiber(einsum, mapping, opts=opts))
+
+        hifiber = read_hifiber('tests/integration/' + expected + ".py")
+        if output != hifiber:
+            print(output)
+            errors.append(expected)
+
+    assert not errors, "Integration tests " + str(errors) + " failed!"
@@ -109,6 +109,30 @@ def test_add_specified_partitioning():
     assert loop_order.get_ranks() == order
 
 
+def test_add_unknown_str():
+    loop_order = build_loop_order()
+
+    coord_math = build_coord_math()
+    partitioning = build_partitioning("", coord_math)
+
+    with pytest.raises(ValueError) as excinfo:
+        loop_order.add("foo", coord_math, partitioning)
+
+    assert str(excinfo.value) == "Unknown loop order: foo"
+
+
+def test_add_auto():
+    loop_order = build_loop_order()
+
+    coord_math = build_coord_math()
+    partitioning = build_partitioning("", coord_math)
+
+    with pytest.raises(ValueError) as excinfo:
+        loop_order.add("auto", coord_math, partitioning)
+
+    assert str(excinfo.value) == "Unresolved loop order: auto"
+
+
 def test_apply_unconfigured():
     loop_order = build_loop_order()
     A = Tensor("A", ["M", "K", "N"])
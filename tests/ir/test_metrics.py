@@ -28,10 +28,10 @@ def build_sigma_yaml():
         return f.read()
 
 
-def parse_yamls(yaml):
+def parse_yamls(yaml, opts=None):
     einsum = Einsum.from_str(yaml)
     mapping = Mapping.from_str(yaml)
-    program = Program(einsum, mapping)
+    program = Program(einsum, mapping, Options(opts))
     program.add_einsum(0)
 
     arch = Architecture.from_str(yaml)
@@ -333,6 +333,16 @@ def test_get_collected_tensor_info():
         "M", "iter", False), ("N", "iter", False), ("M", "fiber", False), ("N", "fiber", False)}
 
 
+def test_get_collected_tensor_info_online_intersect():
+    program, arch, bindings, format_ = parse_yamls(
+        build_gamma_yaml(), ["online-intersect"])
+    hardware = Hardware(arch, bindings, program)
+    metrics = Metrics(program, hardware, format_)
+
+    assert metrics.get_collected_tensor_info("A") == {(
+        "K", "fiber", False), ("M", "iter", False), ("M", "fiber", False), ("K", "iter", False)}
+
+
 def test_get_collected_tensor_info_eager():
     program, arch, bindings, format_ = parse_yamls(build_extensor_yaml())
     hardware = Hardware(arch, bindings, program)
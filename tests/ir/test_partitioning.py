@@ -653,6 +653,19 @@ def test_is_flattened():
     assert partitioning.is_flattened("MK01I")
 
 
+def test_is_ordered():
+    all_parts = """
+                K: [uniform_shape(6), uniform_shape(3)]
+                M: [uniform_shape(4)]
+    """
+    partitioning = build_partitioning(all_parts)
+
+    assert partitioning.is_ordered(["K2", "M1", "K1", "N", "M0", "K0"])
+    assert partitioning.is_ordered(["N", "J"])
+    assert not partitioning.is_ordered(["K2", "K0", "K1"])
+    assert not partitioning.is_ordered(["M0", "K2", "M1"])
+
+
 def test_partition_names_empty():
     all_parts = """
                 M: [uniform_occupancy(A.6), uniform_occupancy(A.3)]
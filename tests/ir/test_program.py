@@ -13,6 +13,7 @@ from teaal.parse.spacetime import SpaceTimeParser
 from teaal.parse.equation import EquationParser
 from teaal.parse.einsum import Einsum
 from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
 from tests.utils.parse_tree import *
 
 
@@ -127,6 +128,29 @@ def create_conv():
     return Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
 
 
+def create_conv_halo(halo, loop_order):
+    yaml = """
+    einsum:
+        declaration:
+            F: [S]
+            I: [W]
+            J: [W]
+            O: [Q]
+        expressions:
+            - O[q] = I[q + s] * J[q] * F[s]
+    mapping:
+        partitioning:
+            O:
+                Q: [uniform_shape(10)]
+                W: [follow(Q)]
+        loop-order:
+            O: """ + loop_order
+    return Program(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        Options(["halo=" + halo]))
+
+
 def test_apply_all_partitioning_unconfigured():
     program = create_default()
 
@@ -335,6 +359,13 @@ def test_get_loop_order():
     assert program.get_loop_order() == loop_order
 
 
+def test_get_loop_order_override():
+    program = create_loop_ordered()
+    program.add_einsum(0, ["M", "N", "K"])
+
+    assert program.get_loop_order().get_ranks() == ["M", "N", "K"]
+
+
 def test_get_partitioning_unconfigured():
     program = create_partitioned()
 
@@ -352,6 +383,92 @@ def test_get_partitioning():
         {}, ["M", "N", "K"], program.get_coord_math())
 
 
+def test_add_einsum_lazy_flattening():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            B: [K, N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        partitioning:
+            Z:
+                (M, K): [flatten()]
+                MK: [uniform_occupancy(A.5)]
+    """
+    program = Program(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        Options(["flattening=lazy"]))
+    program.add_einsum(0)
+
+    assert program.get_equation().get_tensor("A").get_lazy("MK") == ["M", "K"]
+    assert program.get_equation().get_tensor("A").get_lazy("M") is None
+    assert program.get_equation().get_tensor("Z").get_lazy("MK") is None
+
+
+def test_add_einsum_eager_flattening():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            B: [K, N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        partitioning:
+            Z:
+                (M, K): [flatten()]
+                MK: [uniform_occupancy(A.5)]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+
+    assert program.get_equation().get_tensor("A").get_lazy("MK") is None
+
+
+def test_get_partitioning_halo_copy():
+    program = create_conv_halo("copy", "[Q1, Q0, S]")
+    program.add_einsum(0)
+
+    assert program.get_partitioning().get_all_parts() == {("Q",), ("W",)}
+
+
+def test_get_partitioning_halo_view():
+    program = create_conv_halo("view", "[Q1, Q0, S]")
+    program.add_einsum(0)
+
+    assert program.get_partitioning().get_all_parts() == {("Q",)}
+    assert program.get_halo_views() == {"W": "Q"}
+
+
+def test_get_partitioning_halo_view_iterated():
+    program = create_conv_halo("view", "[Q1, W0, Q0]")
+    program.add_einsum(0)
+
+    assert program.get_partitioning().get_all_parts() == {("Q",), ("W",)}
+    assert program.get_halo_views() == {}
+
+
+def test_get_options():
+    assert not create_default().get_options().is_set("del")
+
+    yaml = """
+    einsum:
+        declaration:
+            Z: [M]
+            A: [M]
+        expressions:
+            - Z[m] = A[m]
+    """
+    options = Options(["del"])
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml), options)
+    assert program.get_options() is options
+
+
 def test_get_spacetime_unconfigured():
     program = create_default()
 
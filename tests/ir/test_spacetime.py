@@ -81,6 +81,26 @@ def test_bad_opt():
     assert str(excinfo.value) == "Unknown spacetime optimization foo on output Z"
 
 
+def test_bad_frames():
+    yaml = {"space": [], "time": [], "frames": {"every": 10}}
+    eqn_exprs = create_eqn_exprs()
+
+    with pytest.raises(ValueError) as excinfo:
+        SpaceTime(yaml, Partitioning({}, [], eqn_exprs), "Z")
+    assert str(
+        excinfo.value) == "SpaceTime frames must specify a file on output Z"
+
+
+def test_bad_frames_every():
+    yaml = {"space": [], "time": [], "frames": {"every": 0, "file": "f"}}
+    eqn_exprs = create_eqn_exprs()
+
+    with pytest.raises(ValueError) as excinfo:
+        SpaceTime(yaml, Partitioning({}, [], eqn_exprs), "Z")
+    assert str(
+        excinfo.value) == "SpaceTime frame interval must be a positive integer, given 0 on output Z"
+
+
 def test_emit_pos_coord():
     yaml = create_yaml([], ["M.coord"])
     eqn_exprs = create_eqn_exprs()
@@ -113,6 +133,18 @@ def test_emit_pos_slip_space():
     assert spacetime.emit_pos("M")
 
 
+def test_get_frames():
+    yaml = create_yaml([], ["M.pos"])
+    eqn_exprs = create_eqn_exprs()
+
+    spacetime = SpaceTime(yaml, Partitioning({}, ["M"], eqn_exprs), "Z")
+    assert spacetime.get_frames() is None
+
+    yaml["frames"] = {"every": 10, "file": "tmp/frames.jsonl"}
+    spacetime = SpaceTime(yaml, Partitioning({}, ["M"], eqn_exprs), "Z")
+    assert spacetime.get_frames() == (10, "tmp/frames.jsonl")
+
+
 def test_get_offset():
     yaml = create_yaml(["N", "M"], ["K"])
     eqn_exprs = create_eqn_exprs()
@@ -265,3 +297,39 @@ def test_neq_obj():
     obj = "foo"
 
     assert spacetime != obj
+
+
+def test_is_dense():
+    yaml = create_yaml(["N.coord", "M.pos"], ["K"])
+    eqn_exprs = create_eqn_exprs()
+
+    part_yaml = """
+    mapping:
+        partitioning:
+            Z:
+                N: [uniform_shape(5)]
+    """
+    parts = Mapping.from_str(part_yaml).get_partitioning()["Z"]
+
+    yaml = create_yaml(["N0.coord", "M.pos"], ["K"])
+    spacetime = SpaceTime(
+        yaml, Partitioning(parts, ["M", "N", "K"], eqn_exprs), "Z")
+    assert spacetime.is_dense()
+
+    yaml = create_yaml(["N1.coord", "M.pos"], ["K"])
+    spacetime = SpaceTime(
+        yaml, Partitioning(parts, ["M", "N", "K"], eqn_exprs), "Z")
+    assert not spacetime.is_dense()
+
+
+def test_neq_frames():
+    yaml = create_yaml(["N", "M"], ["K"])
+    eqn_exprs = create_eqn_exprs()
+    spacetime1 = SpaceTime(yaml, Partitioning(
+        {}, ["M", "N", "K"], eqn_exprs), "Z")
+
+    yaml["frames"] = {"every": 10, "file": "tmp/frames.jsonl"}
+    spacetime2 = SpaceTime(yaml, Partitioning(
+        {}, ["M", "N", "K"], eqn_exprs), "Z")
+
+    assert spacetime1 != spacetime2
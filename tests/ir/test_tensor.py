@@ -59,6 +59,14 @@ def test_get_is_output():
     assert tensor.get_is_output()
 
 
+def test_get_lazy():
+    tensor = Tensor("A", ["I", "J", "K"])
+    assert tensor.get_lazy("JK") is None
+
+    tensor.set_lazy({"JK": ["J", "K"]})
+    assert tensor.get_lazy("JK") == ["J", "K"]
+
+
 def test_get_prefix():
     tensor = Tensor("A", ["I", "J"])
 
@@ -67,6 +75,18 @@ def test_get_prefix():
     assert tensor.get_prefix("J") == ["I", "J"]
 
 
+def test_get_rank_ids():
+    tensor = Tensor("A", ["I", "J", "K"])
+    tensor.set_lazy({"JK": ["J", "K"]})
+    assert tensor.get_rank_ids() == ["I", "J", "K"]
+
+    tensor.update_ranks(["I", "JK"])
+    assert tensor.get_rank_ids() == ["I", "J", "K"]
+
+    tensor.update_ranks(["I", "JK1", "JK0"])
+    assert tensor.get_rank_ids() == ["I", "JK1", "JK0"]
+
+
 def test_get_ranks():
     tensor = Tensor("A", ["I", "J"])
     assert tensor.get_ranks() == ["I", "J"]
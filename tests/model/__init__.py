@@ -0,0 +1 @@
+# __init__.py for the analytical model tests
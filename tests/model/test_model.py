@@ -0,0 +1,373 @@
+import pytest
+
+from teaal.model import *
+from teaal.parse import *
+
+STATS = """
+stats:
+  shape:
+    K: 1024
+    M: 1024
+    N: 1024
+    K1: 256
+    K0: 64
+    M1: 256
+    M0: 64
+    N1: 256
+    N0: 64
+  occupancy:
+    A:
+      K: 1000
+      M: 10
+    B:
+      K: 1000
+      N: 10
+"""
+
+
+def build_yaml(type_, depth):
+    return """
+    einsum:
+      declaration:
+        A: [K]
+        B: [K]
+        Z: [K]
+      expressions:
+      - Z[k] = A[k] * B[k]
+    mapping:
+      spacetime:
+        Z:
+          space: []
+          time: [K]
+    format:
+      A:
+        default:
+          rank-order: [K]
+          K:
+            format: C
+            cbits: 32
+            pbits: 64
+      B:
+        default:
+          rank-order: [K]
+          K:
+            format: C
+            cbits: 32
+            pbits: 64
+      Z:
+        default:
+          rank-order: [K]
+          K:
+            format: C
+            cbits: 32
+            pbits: 64
+    architecture:
+      accel:
+      - name: System
+        attributes:
+          clock_frequency: 1
+        local:
+        - name: MainMemory
+          class: DRAM
+          attributes:
+            bandwidth: 64
+        subtree:
+        - name: PE[0..1]
+          local:
+          - name: Buffer
+            class: Buffet
+            attributes:
+              width: 8
+              depth: """ + str(depth) + """
+          - name: Intersect
+            class: Intersector
+            attributes:
+              type: """ + type_ + """
+          - name: FPMul
+            class: compute
+            attributes:
+              type: mul
+    bindings:
+      Z:
+      - config: accel
+        prefix: tmp/Z
+      - component: MainMemory
+        bindings:
+        - tensor: A
+          rank: K
+          type: elem
+          format: default
+        - tensor: B
+          rank: K
+          type: coord
+          format: default
+        - tensor: Z
+          rank: K
+          type: elem
+          format: default
+      - component: Buffer
+        bindings:
+        - tensor: A
+          rank: K
+          type: elem
+          evict-on: root
+          format: default
+        - tensor: B
+          rank: K
+          type: coord
+          evict-on: root
+          format: default
+        - tensor: Z
+          rank: K
+          type: elem
+          evict-on: root
+          format: default
+      - component: Intersect
+        bindings:
+        - rank: K
+          leader: A
+      - component: FPMul
+        bindings:
+        - op: mul
+    stats:
+      shape:
+        K: 100
+      occupancy:
+        A:
+          K: 20
+        B:
+          K: 50
+    """
+
+
+def build_model(yaml, stats=None):
+    if stats is None:
+        stats = yaml
+
+    return Model(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        Architecture.from_str(yaml),
+        Bindings.from_str(yaml),
+        Format.from_str(yaml),
+        Stats.from_str(stats))
+
+
+def build_model_file(filename):
+    return Model(
+        Einsum.from_file(filename),
+        Mapping.from_file(filename),
+        Architecture.from_file(filename),
+        Bindings.from_file(filename),
+        Format.from_file(filename),
+        Stats.from_str(STATS))
+
+
+def test_no_arch():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K]
+        Z: [K]
+      expressions:
+      - Z[k] = A[k]
+    """
+
+    with pytest.raises(ValueError) as excinfo:
+        build_model(yaml)
+    assert str(
+        excinfo.value) == "Architecture required for the analytical model"
+
+
+def test_missing_occupancy():
+    yaml = build_yaml("two-finger", 1024)
+    stats = """
+    stats:
+      shape:
+        K: 100
+      occupancy:
+        A:
+          K: 20
+    """
+
+    with pytest.raises(ValueError) as excinfo:
+        build_model(yaml, stats)
+    assert str(excinfo.value) == "Occupancy unspecified for tensor B"
+
+
+def test_two_finger():
+    metrics = build_model(build_yaml("two-finger", 1024)).get_metrics()
+
+    # 100 * 0.2 * 0.5 = 10 expected matches
+    assert metrics["Z"]["FPMul"]["mul"] == pytest.approx(10)
+    assert metrics["Z"]["FPMul"]["time"] == pytest.approx(5)
+
+    # Both fibers are traversed in full
+    assert metrics["Z"]["Intersect"]["intersect"] == pytest.approx(70)
+
+    # A is read in full (96 bits per element), B's coordinates are read in
+    # full, Z is written once
+    traffic = metrics["Z"]["MainMemory"]
+    assert traffic["A"]["read"] == pytest.approx(20 * 96)
+    assert traffic["B"]["read"] == pytest.approx(50 * 32)
+    assert traffic["Z"]["read"] == pytest.approx(0)
+    assert traffic["Z"]["write"] == pytest.approx(10 * 96)
+    assert traffic["time"] == pytest.approx((1920 + 1600 + 960) / 64)
+
+    assert metrics["blocks"] == [["Z"]]
+    assert metrics["time"] == pytest.approx(70)
+
+
+def test_skip_ahead():
+    metrics = build_model(build_yaml("skip-ahead", 1024)).get_metrics()
+    assert metrics["Z"]["Intersect"]["intersect"] == pytest.approx(40)
+
+
+def test_leader_follower():
+    metrics = build_model(build_yaml("leader-follower", 1024)).get_metrics()
+    assert metrics["Z"]["Intersect"]["intersect"] == pytest.approx(20)
+
+
+def build_reuse_yaml(depth):
+    return """
+    einsum:
+      declaration:
+        A: [M, K]
+        B: [K]
+        Z: [M]
+      expressions:
+      - Z[m] = A[m, k] * B[k]
+    mapping:
+      spacetime:
+        Z:
+          space: []
+          time: [M, K]
+    format:
+      B:
+        default:
+          rank-order: [K]
+          K:
+            format: C
+            cbits: 32
+    architecture:
+      accel:
+      - name: System
+        attributes:
+          clock_frequency: 1
+        local:
+        - name: MainMemory
+          class: DRAM
+          attributes:
+            bandwidth: 64
+        subtree:
+        - name: PE
+          local:
+          - name: Buffer
+            class: Buffet
+            attributes:
+              width: 8
+              depth: """ + str(depth) + """
+    bindings:
+      Z:
+      - config: accel
+        prefix: tmp/Z
+      - component: MainMemory
+        bindings:
+        - tensor: B
+          rank: K
+          type: coord
+          format: default
+      - component: Buffer
+        bindings:
+        - tensor: B
+          rank: K
+          type: coord
+          evict-on: root
+          format: default
+    stats:
+      shape:
+        M: 4
+        K: 100
+      occupancy:
+        A:
+          M: 4
+          K: 20
+        B:
+          K: 50
+    """
+
+
+def test_reuse():
+    # B is reused across all four rows of A
+    metrics = build_model(build_reuse_yaml(1024)).get_metrics()
+    assert metrics["Z"]["MainMemory"]["B"]["read"] == pytest.approx(50 * 32)
+
+
+def test_capacity():
+    # The footprint (50 * 32 = 1600 bits) is twice the capacity, so half of
+    # the 200 accesses miss
+    metrics = build_model(build_reuse_yaml(100)).get_metrics()
+    assert metrics["Z"]["MainMemory"]["B"]["read"] == pytest.approx(
+        (50 + 150 * 0.5) * 32)
+
+
+def test_footprints():
+    model = build_model(build_reuse_yaml(100))
+    assert model.get_footprints() == {"Z": {"Buffer": (1600., 800)}}
+
+
+def test_traffic():
+    model = build_model(build_reuse_yaml(1024))
+    metrics = model.get_metrics()
+
+    traffic = sum(sum(tensor_traffic.values())
+                  for tensor, tensor_traffic in metrics["Z"]["MainMemory"].items()
+                  if tensor != "time")
+    assert model.get_traffic() == pytest.approx(traffic)
+
+
+def test_tile_sizes():
+    filename = "tests/integration/test_tiling.yaml"
+    yaml = open(filename).read().replace("K0: auto", "K0: 16")
+    model = build_model(yaml)
+
+    assert model.get_footprints() == {"Z": {"Buffer": (2048., 2048)}}
+
+
+def test_extensor():
+    metrics = build_model_file("tests/integration/extensor.yaml").get_metrics()
+
+    assert set(metrics["Z"].keys()) == {
+        "MainMemory",
+        "FPMul",
+        "FPAdd",
+        "K2Intersect",
+        "K1Intersect",
+        "K0Intersection"}
+    assert metrics["Z"]["FPMul"]["mul"] == pytest.approx(100000, rel=0.05)
+    assert metrics["time"] == max(metrics["Z"][comp]["time"]
+                                  for comp in metrics["Z"].keys())
+
+
+def test_extensor_energy():
+    metrics = build_model_file(
+        "tests/integration/extensor-energy.yaml").get_metrics()
+
+    assert metrics["Z"]["BottomSequencer"]["K0"] == pytest.approx(
+        metrics["Z"]["FPMul"]["mul"])
+
+
+def test_outerspace():
+    metrics = build_model_file(
+        "tests/integration/outerspace.yaml").get_metrics()
+
+    assert metrics["blocks"] == [["T0"], ["T1", "Z"]]
+
+    # The intermediates are sized by the earlier Einsums
+    assert metrics["T0"]["FPMul"]["mul"] == pytest.approx(97656.25)
+    assert metrics["Z"]["SortHW"]["T1_MKN"] == pytest.approx(97656.25)
+
+
+def test_sigma():
+    metrics = build_model_file("tests/integration/sigma.yaml").get_metrics()
+    assert metrics["Z"]["Multiplier"]["mul"] == pytest.approx(100000)
@@ -0,0 +1,92 @@
+import pytest
+
+from teaal.model.stats import Stats
+
+
+def build_stats():
+    yaml = """
+    stats:
+      shape:
+        K: 8
+        M: 4
+        K0: 2
+      occupancy:
+        A:
+          K: {1: 2, 3: 2}
+          M: 2
+        B:
+          K: 5
+    """
+    return Stats.from_str(yaml)
+
+
+def test_no_stats():
+    stats = Stats.from_str("")
+    assert not stats.has_tensor("A")
+
+
+def test_bad_occupancy():
+    yaml = """
+    stats:
+      occupancy:
+        A:
+          K: [1, 2]
+    """
+
+    with pytest.raises(ValueError) as excinfo:
+        Stats.from_str(yaml)
+    assert str(
+        excinfo.value) == "Unknown occupancy specification for rank K of tensor A: [1, 2]"
+
+
+def test_get_nnz():
+    stats = build_stats()
+
+    assert stats.get_nnz("A", "K") == 8
+    assert stats.get_nnz("A", "M") == 16
+    assert stats.get_nnz("B", "K") == 5
+
+
+def test_get_nnz_unspecified():
+    stats = build_stats()
+
+    with pytest.raises(ValueError) as excinfo:
+        stats.get_nnz("A", "N")
+    assert str(excinfo.value) == "Occupancy unspecified for rank N of tensor A"
+
+
+def test_get_occupancy():
+    stats = build_stats()
+
+    assert stats.get_occupancy("A", "K") == 2
+    assert stats.get_occupancy("A", "M") == 2
+    assert stats.get_occupancy("B", "K") == 5
+
+
+def test_get_ranks():
+    stats = build_stats()
+
+    assert stats.get_ranks("A") == ["K", "M"]
+
+    with pytest.raises(ValueError) as excinfo:
+        stats.get_ranks("Z")
+    assert str(excinfo.value) == "Occupancy unspecified for tensor Z"
+
+
+def test_get_shape():
+    stats = build_stats()
+
+    assert stats.get_shape("K") == 8
+    assert stats.get_shape("K0") == 2
+
+    with pytest.raises(ValueError) as excinfo:
+        stats.get_shape("N")
+    assert str(excinfo.value) == "Shape unspecified for rank N"
+
+
+def test_has_occupancy():
+    stats = build_stats()
+
+    assert stats.has_occupancy("A", "M")
+    assert not stats.has_occupancy("B", "M")
+    assert not stats.has_occupancy("Z", "M")
@@ -76,3 +76,28 @@ def test_format():
 
     assert format_.get_spec("A") == spec
     assert format_.get_spec("B") == {}
+
+
+def test_is_uncompressed():
+    yaml = """
+    format:
+      A:
+        default:
+          rank-order: [M, K]
+          M:
+            format: U
+          K:
+            format: C
+      B:
+        default:
+          rank-order: [K]
+    """
+    format_ = Format.from_str(yaml)
+
+    assert format_.is_uncompressed("A", "M")
+    assert not format_.is_uncompressed("A", "K")
+    assert not format_.is_uncompressed("B", "K")
+    assert not format_.is_uncompressed("C", "K")
+
+    # Every format must store the rank uncompressed
+    assert not build_format().is_uncompressed("A", "M")
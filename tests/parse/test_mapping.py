@@ -1,3 +1,5 @@
+import pytest
+
 from teaal.parse.mapping import Mapping
 from teaal.parse.spacetime import SpaceTimeParser
 from tests.utils.parse_tree import *
@@ -11,6 +13,7 @@ def test_empty():
     assert mapping.get_rank_orders() == {}
     assert mapping.get_rank_orders() == {}
     assert mapping.get_spacetime() == {}
+    assert mapping.get_tile_sizes() == {}
 
 
 def test_eq():
@@ -131,3 +134,26 @@ def test_spacetime_missing():
     mapping = Mapping.from_file(
         "tests/integration/test_input_no_spacetime.yaml")
     assert mapping.get_spacetime() == {}
+
+
+def test_tile_sizes():
+    yaml = """
+    mapping:
+        tile-sizes:
+            K0: 16
+            K1: auto
+    """
+    mapping = Mapping.from_str(yaml)
+    assert mapping.get_tile_sizes() == {"K0": 16, "K1": "auto"}
+
+
+def test_tile_sizes_bad():
+    yaml = """
+    mapping:
+        tile-sizes:
+            K0: foo
+    """
+    with pytest.raises(ValueError) as excinfo:
+        Mapping.from_str(yaml)
+    assert str(
+        excinfo.value) == "Tile size K0 must be an integer or auto, given foo"
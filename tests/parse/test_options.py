@@ -0,0 +1,141 @@
+import pytest
+
+from teaal.parse.options import Options
+
+
+def test_empty():
+    options = Options()
+
+    assert options.get_checkpoint() is None
+    assert options.get_dump_workers() is None
+    assert options.get_flattening() == "eager"
+    assert options.get_halo() == "copy"
+    assert options.get_passes() is None
+    assert options.get_progress() is None
+    assert options.get_trace_format() == "csv"
+    for flag in Options.FLAGS:
+        assert not options.is_set(flag)
+
+
+def test_flags():
+    options = Options(["del", "fuse"])
+
+    assert options.is_set("del")
+    assert options.is_set("fuse")
+    assert not options.is_set("func")
+
+
+def test_flag_bad():
+    with pytest.raises(ValueError) as excinfo:
+        Options().is_set("foo")
+    assert str(excinfo.value) == "Unknown flag: foo"
+
+
+def test_unknown():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["foo"])
+    assert str(excinfo.value) == "Unknown option: foo"
+
+
+def test_flag_value():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["del=1"])
+    assert str(excinfo.value) == "Unknown option: del=1"
+
+
+def test_value_missing():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["checkpoint"])
+    assert str(excinfo.value) == "Option checkpoint requires a value"
+
+
+def test_passes():
+    assert Options(["opt"]).get_passes() == []
+    assert Options(["opt=copy,dead"]).get_passes() == ["copy", "dead"]
+
+
+def test_progress():
+    assert Options(["progress"]).get_progress() == ""
+    assert Options(["progress=tmp/status"]).get_progress() == "tmp/status"
+
+
+def test_checkpoint():
+    options = Options(["checkpoint=tmp/run.ckpt",
+                       "checkpoint-every=100", "checkpoint-seconds=0.5"])
+    assert options.get_checkpoint() == {
+        "file": "tmp/run.ckpt", "every": 100, "seconds": 0.5}
+
+
+def test_checkpoint_no_file():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["checkpoint-every=100"])
+    assert str(excinfo.value) == "Checkpoint must specify a file"
+
+
+def test_checkpoint_bad_every():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["checkpoint=tmp/run.ckpt", "checkpoint-every=0"])
+    assert str(
+        excinfo.value) == "Checkpoint interval must be a positive integer, given 0"
+
+
+def test_checkpoint_bad_seconds():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["checkpoint=tmp/run.ckpt", "checkpoint-seconds=foo"])
+    assert str(
+        excinfo.value) == "Checkpoint time must be a positive number, given foo"
+
+    with pytest.raises(ValueError) as excinfo:
+        Options(["checkpoint=tmp/run.ckpt", "checkpoint-seconds=nan"])
+    assert str(
+        excinfo.value) == "Checkpoint time must be a positive number, given nan"
+
+
+def test_dump_workers():
+    assert Options(["dump-workers=8"]).get_dump_workers() == 8
+
+
+def test_dump_workers_bad():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["dump-workers=0"])
+    assert str(
+        excinfo.value) == "Dump workers must be a positive integer, given 0"
+
+
+def test_flattening():
+    assert Options(["flattening=lazy"]).get_flattening() == "lazy"
+
+
+def test_flattening_bad():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["flattening=never"])
+    assert str(excinfo.value) == "Unknown flattening style: never"
+
+
+def test_halo():
+    assert Options(["halo=view"]).get_halo() == "view"
+
+
+def test_halo_bad():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["halo=share"])
+    assert str(excinfo.value) == "Unknown halo style: share"
+
+
+def test_trace_format():
+    options = Options(["trace-format=binary", "compress-traces"])
+    assert options.get_trace_format() == "binary"
+    assert options.is_set("compress-traces")
+
+
+def test_trace_format_unknown():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["trace-format=foo"])
+    assert str(excinfo.value) == "Unknown trace format: foo"
+
+
+def test_trace_compression_csv():
+    with pytest.raises(ValueError) as excinfo:
+        Options(["compress-traces"])
+    assert str(
+        excinfo.value) == "Only binary traces can be compressed, given csv"
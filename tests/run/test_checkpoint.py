@@ -0,0 +1,63 @@
+import os
+
+from teaal.run import Checkpoint
+
+
+def test_fresh(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt"))
+
+    assert not checkpoint.done("Z")
+    assert checkpoint.todo("Z", 0)
+    assert checkpoint.restore("Z", "empty") == "empty"
+    assert not os.path.exists(tmp_path / "run.ckpt")
+
+
+def test_finish(tmp_path):
+    path = str(tmp_path / "ckpt" / "run.ckpt")
+    Checkpoint(path).finish("T", {"T_MN": [1, 2], "metrics_T": {"time": 3}})
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.done("T")
+    assert not checkpoint.done("Z")
+    assert checkpoint.load("T_MN") == [1, 2]
+    assert checkpoint.load("metrics_T") == {"time": 3}
+    assert os.listdir(tmp_path / "ckpt") == ["run.ckpt"]
+
+
+def test_step_every(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, every=2)
+
+    checkpoint.step("Z", 3, [3])
+    assert not os.path.exists(path)
+
+    checkpoint.step("Z", 5, [3, 5])
+    resumed = Checkpoint(path)
+    assert resumed.restore("Z", []) == [3, 5]
+    assert resumed.restore("T", []) == []
+    assert not resumed.todo("Z", 5)
+    assert resumed.todo("Z", 6)
+    assert resumed.todo("T", 0)
+
+
+def test_step_seconds(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, seconds=1000)
+
+    checkpoint.step("Z", 3, [3])
+    assert not os.path.exists(path)
+
+    checkpoint.last -= 1000
+    checkpoint.step("Z", 4, [3, 4])
+    assert Checkpoint(path).restore("Z", []) == [3, 4]
+
+
+def test_finish_clears_position(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, every=1)
+    checkpoint.step("Z", 3, [3])
+    checkpoint.finish("Z", {"Z_M": [3]})
+
+    resumed = Checkpoint(path)
+    assert resumed.done("Z")
+    assert resumed.restore("Z", []) == []
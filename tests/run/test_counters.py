@@ -0,0 +1,87 @@
+import pytest
+
+from teaal.run import LoadCounters
+
+
+def build():
+    counters = LoadCounters(["M", "N"])
+    for m in range(2):
+        for n in range(2):
+            for t in range(m + n + 1):
+                counters.add((m, n), (t,))
+
+    return counters
+
+
+def test_histogram():
+    coords, counts = build().histogram("M")
+    assert coords == [0, 1]
+    assert counts.tolist() == [3, 5]
+
+
+def test_histogram_bad_rank():
+    with pytest.raises(ValueError) as excinfo:
+        build().histogram("K")
+    assert str(excinfo.value) == "Unknown space rank: K"
+
+
+def test_report():
+    report = build().report()
+
+    assert report["activities"] == 8
+    assert report["pes"] == 4
+    assert report["steps"] == 3
+    assert report["utilization"] == 8 / 12
+    assert report["peak"] == 4
+    assert report["N"] == {
+        "coords": [0, 1],
+        "counts": [3, 5],
+        "imbalance": 1.25,
+        "utilization": 0.8}
+
+
+def test_histogram_extents():
+    counters = LoadCounters(["M", "N"], [4, None])
+    counters.add((1, 0), (0,))
+    counters.add((1, 5), (1,))
+
+    coords, counts = counters.histogram("M")
+    assert coords == [0, 1, 2, 3]
+    assert counts.tolist() == [0, 2, 0, 0]
+
+    coords, counts = counters.histogram("N")
+    assert coords == [0, 5]
+
+
+def test_report_extents():
+    counters = LoadCounters(["M", "N"], [3, 2])
+    for m in range(2):
+        for n in range(2):
+            for t in range(m + n + 1):
+                counters.add((m, n), (t,))
+
+    report = counters.report()
+    assert report["pes"] == 6
+    assert report["utilization"] == 8 / 18
+    assert report["M"] == {
+        "coords": [0, 1, 2],
+        "counts": [3, 5, 0],
+        "imbalance": 1.875,
+        "utilization": 8 / 3 / 5}
+    assert report["N"] == build().report()["N"]
+
+
+def test_report_empty():
+    report = LoadCounters(["M"]).report()
+
+    assert report["activities"] == 0
+    assert report["utilization"] == 0.0
+    assert report["M"]["imbalance"] == 0.0
+
+
+def test_display(capsys):
+    build().display("Z")
+    assert capsys.readouterr().err == \
+        "Z: 8 activities on 4 PEs over 3 time steps, utilization 0.67\n" + \
+        "  M: imbalance 1.25, utilization 0.80\n" + \
+        "  N: imbalance 1.25, utilization 0.80\n"
@@ -0,0 +1,92 @@
+from teaal.run import LazyFlatten
+
+
+class Root:
+    def __init__(self, root):
+        self.root = root
+
+    def getRoot(self):
+        return self.root
+
+
+def test_flatten():
+    fiber = [(0, [(1, "a"), (3, "b")]), (2, [(0, "c")])]
+    assert list(LazyFlatten.flatten(fiber, 1)) == [
+        ((0, 1), "a"), ((0, 3), "b"), ((2, 0), "c")]
+
+
+def test_flatten_levels():
+    fiber = [(0, [(1, [(2, "a")]), (3, [(4, "b"), (5, "c")])])]
+    assert list(LazyFlatten.flatten(fiber, 2)) == [
+        ((0, 1, 2), "a"), ((0, 3, 4), "b"), ((0, 3, 5), "c")]
+
+
+def test_flatten_lazy():
+    def fiber():
+        yield 0, [(1, "a")]
+        raise AssertionError("Flattened eagerly")
+
+    elems = LazyFlatten.flatten(fiber(), 1)
+    assert next(elems) == ((0, 1), "a")
+
+
+def test_iter():
+    tensor = Root([(0, [(1, "a")]), (2, [(0, "b")])])
+    assert list(LazyFlatten(tensor, 1)) == [((0, 1), "a"), ((2, 0), "b")]
+
+
+def test_group_equal():
+    elems = iter([(i, str(i)) for i in range(5)])
+    assert list(LazyFlatten.group_equal(elems, 2)) == [
+        [(0, "0"), (1, "1")], [(2, "2"), (3, "3")], [(4, "4")]]
+
+
+def test_group_equal_empty():
+    assert list(LazyFlatten.group_equal(iter([]), 2)) == []
+
+
+def test_group_split():
+    elems = iter([((0, 1), "a"), ((0, 3), "b"), ((2, 0), "c"),
+                  ((4, 1), "d")])
+    splits = [(0, 2), (1, 0), (2, 0)]
+    assert list(LazyFlatten.group_split(elems, splits)) == [
+        ((0, 2), [((0, 1), "a"), ((0, 3), "b")]),
+        ((2, 0), [((2, 0), "c"), ((4, 1), "d")])]
+
+
+class Eager:
+    def __init__(self):
+        self.calls = []
+
+    def flattenRanks(self, **kwargs):
+        self.calls.append(("flattenRanks", kwargs))
+        return self
+
+    def splitEqual(self, *args, **kwargs):
+        self.calls.append(("splitEqual", args, kwargs))
+        return "split"
+
+    def splitNonUniform(self, *args, **kwargs):
+        self.calls.append(("splitNonUniform", args, kwargs))
+        return "split"
+
+    def getRoot(self):
+        raise AssertionError("Flattened lazily")
+
+
+def test_split_equal_halo():
+    tensor = Eager()
+    assert LazyFlatten(tensor, 1).splitEqual(4, post_halo=2) == "split"
+    assert tensor.calls == [
+        ("flattenRanks", {"depth": 0, "levels": 1, "coord_style": "tuple"}),
+        ("splitEqual", (4,), {"pre_halo": 0, "post_halo": 2})]
+
+
+def test_split_non_uniform_halo():
+    tensor = Eager()
+    splits = [(0, 2), (1, 0)]
+    assert LazyFlatten(tensor, 2).splitNonUniform(
+        splits, pre_halo=1) == "split"
+    assert tensor.calls == [
+        ("flattenRanks", {"depth": 0, "levels": 2, "coord_style": "tuple"}),
+        ("splitNonUniform", (splits,), {"pre_halo": 1, "post_halo": 0})]
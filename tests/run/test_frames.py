@@ -0,0 +1,64 @@
+from teaal.run import FrameCanvas
+
+
+def read(path):
+    return [(frame["frame"], frame["start"], frame["activity"])
+            for frame in FrameCanvas.load(path)]
+
+
+def test_add(tmp_path):
+    path = str(tmp_path / "frames" / "z.jsonl")
+    canvas = FrameCanvas(path, 2)
+    for k in range(3):
+        for m in range(2):
+            for n in range(k + 1):
+                canvas.add((n,), (k, m))
+
+    # Frames are written as soon as they are complete
+    assert read(path) == [(0, 0, {(0,): 2}), (1, 2, {(0,): 2, (1,): 2})]
+
+    canvas.close()
+    assert read(path) == [
+        (0, 0, {(0,): 2}),
+        (1, 2, {(0,): 2, (1,): 2}),
+        (2, 4, {(0,): 2, (1,): 2, (2,): 2})]
+
+
+def test_add_slip(tmp_path):
+    path = str(tmp_path / "z.jsonl")
+    canvas = FrameCanvas(path, 2, slip=True)
+    for n in range(3):
+        for _ in range(n + 2):
+            canvas.add_slip(("n" + str(n),))
+    canvas.close()
+
+    assert read(path) == [
+        (0, 0, {("n0",): 2, ("n1",): 2, ("n2",): 2}),
+        (1, 2, {("n1",): 1, ("n2",): 2})]
+
+
+def test_add_slip_dense(tmp_path):
+    path = str(tmp_path / "z.jsonl")
+    canvas = FrameCanvas(path, 2, slip=True, dense=True)
+    for i in [0, 3, 3, 0, 3, 1]:
+        canvas.add_slip((i, 1))
+    canvas.close()
+
+    assert canvas.array.shape == (4, 2)
+    assert canvas.array[:, 1].tolist() == [2, 1, 0, 3]
+    assert read(path) == [
+        (0, 0, {(0, 1): 2, (3, 1): 2, (1, 1): 1}),
+        (1, 2, {(3, 1): 1})]
+
+
+def test_load_truncated(tmp_path):
+    path = str(tmp_path / "z.jsonl")
+    canvas = FrameCanvas(path, 1)
+    canvas.add((0,), (0,))
+    canvas.add((0,), (1,))
+    canvas.close()
+
+    with open(path, "a") as f:
+        f.write("{\"frame\": 2, \"sta")
+
+    assert read(path) == [(0, 0, {(0,): 1}), (1, 1, {(0,): 1})]
@@ -0,0 +1,132 @@
+import pytest
+import random
+
+from teaal.run import OnlineIntersector
+
+
+class Fiber:
+    """
+    A fiber that records the coordinates each operand visits during an
+    intersection, like the coiteration traces of fibertree's Metrics
+    """
+    traces = []
+
+    def __init__(self, coords):
+        self.coords = coords
+
+    def __and__(self, other):
+        a = self.coords
+        b = other.coords
+        trace_a = []
+        trace_b = []
+        coords = []
+        i = 0
+        j = 0
+        while i < len(a) and j < len(b):
+            trace_a.append(a[i])
+            trace_b.append(b[j])
+            if a[i] == b[j]:
+                coords.append(a[i])
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+
+        Fiber.traces = [trace_a, trace_b]
+        return Fiber(coords)
+
+    def getCoords(self):
+        return self.coords
+
+    @staticmethod
+    def intersection(*fibers, style):
+        assert style == "leader-follower"
+        Fiber.traces = [list(fibers[0].coords)]
+
+        coords = fibers[0].coords
+        for fiber in fibers[1:]:
+            coords = [coord for coord in coords if coord in fiber.coords]
+        return Fiber(coords)
+
+
+def consume_traces(style, traces):
+    """
+    Count the steps of an intersector from the coiteration traces
+    """
+    if style == "leader-follower":
+        return len(traces[0])
+
+    # Each operand lists a coordinate once for every comparison it is part of
+    a = sorted(set(traces[0]))
+    b = sorted(set(traces[1]))
+    steps = 0
+    i = 0
+    j = 0
+    while i < len(a) and j < len(b):
+        steps += 1
+        if a[i] == b[j]:
+            i += 1
+            j += 1
+        elif style == "two-finger":
+            if a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        elif a[i] < b[j]:
+            while i < len(a) and a[i] < b[j]:
+                i += 1
+        else:
+            while j < len(b) and b[j] < a[i]:
+                j += 1
+
+    return steps
+
+
+def random_fiber(rng):
+    return Fiber(sorted(rng.sample(range(64), rng.randrange(0, 20))))
+
+
+def test_unknown_style():
+    with pytest.raises(ValueError) as excinfo:
+        OnlineIntersector("foo")
+    assert str(excinfo.value) == "Unknown intersection style: foo"
+
+
+def test_intersect_too_many():
+    isect = OnlineIntersector("two-finger")
+    with pytest.raises(ValueError) as excinfo:
+        isect.intersect(Fiber([1]), Fiber([1]), Fiber([1]))
+    assert str(
+        excinfo.value) == "Unable to intersect 3 fibers two-finger"
+
+
+def test_intersect():
+    isect = OnlineIntersector("two-finger")
+    result = isect.intersect(Fiber([1, 3, 5, 7]), Fiber([2, 3, 4]))
+
+    assert result.getCoords() == [3]
+    assert isect.getNumIntersects() == 4
+
+    result = isect.intersect(Fiber([]), Fiber([2, 3, 4]))
+    assert result.getCoords() == []
+    assert isect.getNumIntersects() == 4
+
+
+@pytest.mark.parametrize(
+    "style", ["leader-follower", "skip-ahead", "two-finger"])
+def test_intersect_matches_traces(style):
+    rng = random.Random(0)
+    isect = OnlineIntersector(style)
+
+    expected = 0
+    for _ in range(200):
+        a = random_fiber(rng)
+        b = random_fiber(rng)
+
+        result = isect.intersect(a, b)
+        assert result.getCoords() == sorted(set(a.coords) & set(b.coords))
+
+        expected += consume_traces(style, Fiber.traces)
+        assert isect.getNumIntersects() == expected
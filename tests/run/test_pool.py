@@ -0,0 +1,39 @@
+import multiprocessing
+import pytest
+
+from teaal.run import DumpPool
+
+
+class Tensor:
+    """
+    A tensor that cannot be sent to another process
+    """
+
+    def __init__(self, coords):
+        self.coords = coords
+
+    def __reduce__(self):
+        raise AssertionError("Tensor pickled")
+
+
+def num_coords(tensor, scale):
+    return len(tensor.coords) * scale
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires fork")
+def test_submit_shared():
+    tensor = Tensor([0, 1, 2])
+    pool = DumpPool(2, [tensor])
+
+    futures = [pool.submit(num_coords, tensor, scale) for scale in [1, 2]]
+    assert [future.result() for future in futures] == [3, 6]
+
+    pool.shutdown()
+
+
+def test_submit_unshared():
+    pool = DumpPool(2, [])
+    assert pool.submit(len, "abc").result() == 3
+    pool.shutdown()
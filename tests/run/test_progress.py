@@ -0,0 +1,83 @@
+from teaal.run import Progress
+
+
+class Vector:
+    def __init__(self, shape):
+        self.shape = shape
+
+    def getShape(self):
+        return self.shape
+
+
+def test_fraction_unknown():
+    progress = Progress()
+    progress.start("Z")
+    progress.step(3)
+
+    assert progress.fraction() is None
+
+
+def test_fraction():
+    progress = Progress()
+    progress.start("Z", Vector([10, 4]))
+    assert progress.fraction() is None
+
+    progress.step(0)
+    assert progress.fraction() == 0.1
+
+    progress.step(1)
+    assert progress.fraction() == 0.2
+
+
+def test_fraction_tiled():
+    progress = Progress()
+    progress.start("Z", Vector([100, 4]))
+    progress.step(0)
+    progress.step(25)
+    assert progress.fraction() == 0.5
+
+    progress.step(75)
+    progress.step(100)
+    assert progress.fraction() == 1.0
+
+
+def test_fraction_flattened():
+    progress = Progress()
+    progress.start("Z", Vector([(10, 4)]))
+    progress.step((4, 1))
+    progress.step((6, 3))
+
+    assert progress.fraction() == 0.8
+
+
+def test_status():
+    progress = Progress()
+    progress.start("Z", Vector([4]))
+    progress.step(0)
+    progress.start_time -= 10
+
+    assert progress.status() == "Z: 1 iterations, 0.10 it/s, 25.0%, ETA 0:00:30"
+
+
+def test_step_throttled(capsys):
+    progress = Progress(seconds=1000)
+    progress.start("Z", Vector([4]))
+    progress.step(0)
+    assert capsys.readouterr().err == ""
+
+    progress.last -= 1000
+    progress.step(1)
+    assert capsys.readouterr().err.startswith("Z: 2 iterations, ")
+
+
+def test_end_file(tmp_path):
+    path = str(tmp_path / "status")
+    progress = Progress(path, seconds=0)
+    progress.start("Z", Vector([4]))
+    progress.step(0)
+    with open(path, "r") as f:
+        assert f.read().startswith("Z: 1 iterations, ")
+
+    progress.end()
+    with open(path, "r") as f:
+        assert f.read() == "Z: done, 1 iterations in 0:00:00\n"
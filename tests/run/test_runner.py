@@ -0,0 +1,206 @@
+import json
+import pytest
+import time
+
+from teaal.run import *
+from teaal.trans.kernel import Kernel
+
+YAML = """
+einsum:
+  declaration:
+    A: [K, M]
+    Z: [M]
+  expressions:
+  - Z[m] = a * A[k, m]
+"""
+
+KERNEL = """
+import os
+import time
+
+def kernel(A_KM, a, K, M):
+    if A_KM.value == -2:
+        os._exit(1)
+    if A_KM.value < 0:
+        time.sleep(10)
+    return (A_KM.value * a, {"Z": {"K": K, "M": M}, "time": A_KM.value})
+"""
+
+
+class Matrix:
+    def __init__(self, value):
+        self.value = value
+
+    def getRankIds(self):
+        return ["K", "M"]
+
+    def getShape(self):
+        return [self.value + 1, self.value + 2]
+
+
+def load(dataset, name):
+    if dataset == "bad":
+        raise ValueError("Unknown dataset " + dataset)
+    return Matrix(int(dataset))
+
+
+class Named:
+    def __init__(self, name):
+        self.name = name
+
+    def getRankIds(self):
+        return []
+
+    def getShape(self):
+        return []
+
+
+def name_load(dataset, name):
+    return Named(name)
+
+
+def fail_load(dataset, name):
+    raise ValueError("Should not be loaded")
+
+
+def build_kernel(tmp_path):
+    kernel = Kernel(YAML, str(tmp_path / "cache"))
+    with open(kernel.get_path(), "w") as f:
+        f.write(KERNEL)
+
+    return kernel
+
+
+def test_load_tensor_missing(tmp_path):
+    pytest.importorskip("fibertree")
+    with pytest.raises(FileNotFoundError):
+        load_tensor(str(tmp_path), "A")
+
+
+def test_bind():
+    def kernel(A_KM, a, K, M):
+        pass
+
+    args = Runner.bind(kernel, "3", {"a": 2, "M": 10}, load, ["A", "Z"])
+    assert args["A_KM"].value == 3
+    assert {name: args[name] for name in ["a", "K", "M"]} == {
+        "a": 2, "K": 4, "M": 10}
+
+
+def test_bind_unbound():
+    def kernel(A_KM, a, K):
+        pass
+
+    with pytest.raises(ValueError) as excinfo:
+        Runner.bind(kernel, "3", {}, load, ["A", "Z"])
+    assert str(excinfo.value) == "Unbound kernel parameter: a"
+
+
+def test_bind_tensor_names():
+    def kernel(A_B_K, A_K, b_c):
+        pass
+
+    args = Runner.bind(kernel, "3", {"b_c": 1}, name_load, ["A", "A_B"])
+    assert {name: args[name].name for name in ["A_B_K", "A_K"]} == {
+        "A_B_K": "A_B", "A_K": "A"}
+    assert args["b_c"] == 1
+
+
+def test_flatten():
+    metrics = {"Z": {"MainMemory": {"time": 1.}}, "time": 2.}
+    assert Runner.flatten(metrics) == {"Z.MainMemory.time": 1., "time": 2.}
+
+
+def test_run_job(tmp_path):
+    result = run_job(build_kernel(tmp_path), "1", {"a": 3}, load, None, None)
+    assert result == {"dataset": "1", "metrics": {
+        "Z.K": 2, "Z.M": 3, "time": 1}, "error": None}
+
+
+def test_run_job_error(tmp_path):
+    result = run_job(build_kernel(tmp_path), "bad", {"a": 3}, load, None, None)
+    assert result == {"dataset": "bad", "metrics": {},
+                      "error": "Unknown dataset bad"}
+
+
+def test_run_job_timeout(tmp_path):
+    start = time.time()
+    result = run_job(
+        build_kernel(tmp_path), "-1", {"a": 3}, load, 0.1, None)
+    assert time.time() - start < 5
+    assert result["error"] == "Time limit exceeded"
+
+
+def test_run(tmp_path):
+    runner = Runner(build_kernel(tmp_path), ["2", "bad", "1"], {
+                    "a": 3}, load, workers=2)
+
+    table = {"dataset": ["2", "bad", "1"],
+             "error": [None, "Unknown dataset bad", None],
+             "Z.K": [3, None, 2],
+             "Z.M": [4, None, 3],
+             "time": [2, None, 1]}
+    assert runner.run() == table
+
+
+def test_resume(tmp_path):
+    kernel = build_kernel(tmp_path)
+    checkpoint = str(tmp_path / "run.jsonl")
+    table = Runner(kernel, ["1", "2"], {"a": 3}, load,
+                   workers=1, checkpoint=checkpoint).run()
+
+    # Simulate an interruption in the middle of writing the last result
+    with open(checkpoint, "r") as stream:
+        lines = stream.readlines()
+    with open(checkpoint, "w") as stream:
+        stream.writelines(lines[:-1])
+        stream.write(lines[-1][:10])
+
+    runner = Runner(kernel, ["1", "2"], {"a": 3}, load,
+                    workers=1, checkpoint=checkpoint)
+    assert runner.run() == table
+
+    # Nothing needs to be re-run
+    runner = Runner(kernel, ["1", "2"], {"a": 3}, fail_load,
+                    workers=1, checkpoint=checkpoint)
+    assert runner.run() == table
+
+    with open(checkpoint, "r") as stream:
+        assert len([json.loads(line) for line in stream]) == 2
+
+
+def test_run_crash(tmp_path):
+    runner = Runner(build_kernel(tmp_path), ["-2"], {"a": 3}, load, workers=1)
+
+    table = runner.run()
+    assert table["dataset"] == ["-2"]
+    assert table["error"] == ["Worker process terminated abruptly"]
+
+
+def test_resume_failed(tmp_path):
+    kernel = build_kernel(tmp_path)
+    checkpoint = str(tmp_path / "run.jsonl")
+    Runner(kernel, ["1", "bad"], {"a": 3}, load,
+           workers=1, checkpoint=checkpoint).run()
+
+    # Only the failed dataset is re-run
+    runner = Runner(kernel, ["1", "bad"], {"a": 3}, load,
+                    workers=1, checkpoint=checkpoint)
+    runner.load = fail_load
+    table = runner.run()
+    assert table["error"] == [None, "Should not be loaded"]
+
+    with open(checkpoint, "r") as stream:
+        assert len([json.loads(line) for line in stream]) == 3
+
+    runner = Runner(kernel, ["1", "bad"], {"a": 3}, load,
+                    workers=1, checkpoint=checkpoint)
+    assert runner.get_table()["error"] == [None, "Should not be loaded"]
+
+
+def test_from_file(tmp_path):
+    filename = tmp_path / "input.yaml"
+    filename.write_text(YAML)
+
+    runner = Runner.from_file(str(filename), str(tmp_path), ["1"])
+    assert runner.kernel.get_hash() == Kernel(YAML, str(tmp_path)).get_hash()
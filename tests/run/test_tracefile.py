@@ -0,0 +1,99 @@
+import numpy as np
+import os
+import pytest
+
+from teaal.run import TraceCache, TraceFile
+
+CSV = b"M,K,fiber_pos\r\n0,1,0\r\n0,300,1\r\n2,-1,70000\r\n"
+
+
+def write_csv(tmp_path, name, data):
+    path = str(tmp_path / name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def num_rows(path):
+    with open(path, "r") as f:
+        return len(f.readlines()) - 1
+
+
+def test_pack(tmp_path):
+    csv_path = write_csv(tmp_path, "Z-K-iter.csv", CSV)
+
+    path = TraceFile.pack(csv_path)
+    assert path == str(tmp_path / "Z-K-iter.bin")
+    assert not os.path.exists(csv_path)
+    assert TraceFile.find(csv_path) == path
+
+    # Uncompressed traces are memory-mapped
+    columns = TraceFile.read(path)
+    assert list(columns.keys()) == ["M", "K", "fiber_pos"]
+    assert isinstance(columns["K"], np.memmap)
+    assert columns["M"].dtype == np.int8
+    assert columns["K"].dtype == np.int16
+    assert columns["fiber_pos"].dtype == np.int32
+    assert columns["K"].tolist() == [1, 300, -1]
+
+    assert TraceFile.to_csv(path) == CSV
+
+
+def test_pack_compressed(tmp_path):
+    csv_path = write_csv(tmp_path, "Z-K-iter.csv", CSV.replace(b"\r\n", b"\n"))
+
+    path = TraceFile.pack(csv_path, True)
+    assert path == str(tmp_path / "Z-K-iter.bin.gz")
+    assert TraceFile.read(path)["fiber_pos"].tolist() == [0, 1, 70000]
+    assert TraceFile.to_csv(path) == CSV.replace(b"\r\n", b"\n")
+
+
+def test_pack_empty(tmp_path):
+    csv_path = write_csv(tmp_path, "Z-K-iter.csv", b"M,K\r\n")
+
+    path = TraceFile.pack(csv_path)
+    assert TraceFile.read(path)["M"].tolist() == []
+    assert TraceFile.to_csv(path) == b"M,K\r\n"
+
+
+def test_pack_inexact(tmp_path):
+    for i, data in enumerate([b"M,K\r\n0,1.5\r\n", b"M,K\r\n0,01\r\n",
+                              b"M,K\r\n0,1", b"M,K\r\n0\r\n", b""]):
+        csv_path = write_csv(tmp_path, "Z-K-" + str(i) + ".csv", data)
+        assert TraceFile.pack(csv_path) is None
+        assert os.path.exists(csv_path)
+
+
+def test_pack_all(tmp_path):
+    prefix = str(tmp_path / "Z")
+    write_csv(tmp_path, "Z-K-iter.csv", CSV)
+    write_csv(tmp_path, "Z-M-iter.csv", CSV)
+    write_csv(tmp_path, "Z-M-fiber.csv", b"M\r\nfoo\r\n")
+    write_csv(tmp_path, "T-M-iter.csv", CSV)
+
+    assert TraceFile.pack_all(prefix) == [
+        prefix + "-K-iter.bin", prefix + "-M-iter.bin"]
+    assert sorted(os.listdir(tmp_path)) == [
+        "T-M-iter.csv", "Z-K-iter.bin", "Z-M-fiber.csv", "Z-M-iter.bin"]
+
+
+def test_read_version(tmp_path):
+    path = str(tmp_path / "Z-K-iter.bin")
+    with open(path, "w") as f:
+        f.write("{\"version\": 2}\n")
+
+    with pytest.raises(ValueError) as excinfo:
+        TraceFile.read(path)
+    assert str(excinfo.value) == "Unknown trace version: 2"
+
+
+def test_trace_cache(tmp_path):
+    csv_path = write_csv(tmp_path, "Z-K-iter.csv", CSV)
+    TraceFile.pack(csv_path, True)
+
+    # The consumers read the CSV trace that was packed
+    cache = TraceCache({csv_path: 2})
+    assert cache.call(num_rows, csv_path) == 3
+    assert cache.call(num_rows, csv_path) == 3
+    assert cache.call(num_rows, csv_path) == 3
+    assert cache.get_disk_reads() == 2
@@ -0,0 +1,116 @@
+import csv
+import gzip
+import pickle
+import pytest
+
+from teaal.run import TraceCache
+
+
+def write_trace(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["M", "K", "fiber_pos"])
+        writer.writerows(rows)
+
+
+def num_iters(path):
+    with open(path, "r", newline="") as f:
+        return len(list(csv.reader(f))) - 1
+
+
+def filter_trace(in_path, filter_path, out_path):
+    with open(filter_path, "r") as f:
+        keep = {line for line in f.read().splitlines()[1:]}
+
+    with open(in_path, "r") as f_in, open(out_path, "w") as f_out:
+        for line in f_in:
+            if line.rstrip("\r\n") in keep:
+                f_out.write(line)
+
+
+def test_call(tmp_path):
+    path = str(tmp_path / "Z-K-iter.csv")
+    write_trace(path, [[0, 1, 0], [0, 2, 1]])
+
+    cache = TraceCache({path: 2})
+    assert cache.call(num_iters, path) == 2
+    assert cache.call(num_iters, path) == 2
+    assert cache.get_disk_reads() == 1
+
+
+def test_call_evicts(tmp_path):
+    path = str(tmp_path / "Z-K-iter.csv")
+    write_trace(path, [[0, 1, 0]])
+
+    cache = TraceCache({path: 1})
+    assert cache.call(num_iters, path) == 1
+
+    # Unplanned reads go to disk again
+    write_trace(path, [[0, 1, 0], [0, 2, 1]])
+    assert cache.call(num_iters, path) == 2
+    assert cache.get_disk_reads() == 2
+
+
+def test_call_unshared(tmp_path):
+    path = str(tmp_path / "Z-K-iter.csv")
+    write_trace(path, [[0, 1, 0]])
+
+    cache = TraceCache({})
+    assert cache.call(num_iters, path) == 1
+    assert cache.get_disk_reads() == 0
+
+
+def test_call_write(tmp_path):
+    in_path = str(tmp_path / "Z-K-populate.csv")
+    filter_path = str(tmp_path / "Z-K-iter.csv")
+    out_path = str(tmp_path / "Z-K-populate_payload.csv")
+    write_trace(in_path, [[0, 1, 0], [0, 2, 1]])
+    write_trace(filter_path, [[0, 2, 1]])
+
+    cache = TraceCache({filter_path: 2, out_path: 2})
+    cache.call(filter_trace, in_path, filter_path, out_path)
+    assert cache.call(num_iters, filter_path) == 1
+
+    # The output is written in the first call and then read
+    with open(out_path, "r") as f:
+        assert f.read() == "0,2,1\n"
+    assert cache.call(num_iters, out_path) == 0
+    assert cache.get_disk_reads() == 2
+
+
+def test_call_gzip(tmp_path):
+    path = str(tmp_path / "Z-K-iter.csv.gz")
+    with gzip.open(path, "wt") as f:
+        f.write("M,K\n0,1\n")
+
+    def read(path):
+        with gzip.open(path, "rt") as f:
+            return f.read()
+
+    cache = TraceCache({path: 2})
+    assert cache.call(read, path) == "M,K\n0,1\n"
+    assert cache.call(read, path) == "M,K\n0,1\n"
+    assert cache.get_disk_reads() == 1
+
+
+def test_call_restores_open(tmp_path):
+    def fail():
+        raise ValueError("Failed")
+
+    open_ = open
+    with pytest.raises(ValueError):
+        TraceCache({}).call(fail)
+
+    assert open is open_
+
+
+def test_pickle(tmp_path):
+    path = str(tmp_path / "Z-K-iter.csv")
+    write_trace(path, [[0, 1, 0]])
+
+    cache = TraceCache({path: 3})
+    cache.call(num_iters, path)
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.call(num_iters, path) == 1
+    assert copy.get_disk_reads() == 2
@@ -0,0 +1 @@
+# __init__.py for the compile server tests
@@ -0,0 +1,151 @@
+import hashlib
+import pytest
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from teaal.serve import compile_remote
+from teaal.serve.server import *
+from teaal.trans.kernel import Kernel
+
+YAML = """
+einsum:
+  declaration:
+    A: [K, M]
+    B: [K, N]
+    Z: [M, N]
+  expressions:
+  - Z[m, n] = A[k, m] * B[k, n]
+"""
+
+
+@pytest.fixture
+def server():
+    server = CompileServer(port=0, workers=1, time_limit=30, cache_size=1)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    thread.join()
+
+
+def test_compile_job():
+    result = compile_job(YAML, ["del", "live"], None)
+
+    hifiber = Kernel.translate(YAML, ["del"])
+    assert result["hifiber"] == str(hifiber)
+    assert result["peak_live"] == hifiber.get_peak_live()
+    assert result["error"] is None
+    assert result["time"] > 0
+
+
+def test_compile_job_snapshot():
+    compile_job(YAML, [], None)
+    result = compile_job(YAML, ["del"], None)
+
+    assert result["hifiber"] == str(Kernel.translate(YAML, ["del"]))
+    assert [snapshot.is_analyzed()
+            for snapshot in snapshots.values()] == [True]
+
+
+def test_compile_job_error():
+    result = compile_job("einsum: {}", [], None)
+
+    assert result["hifiber"] is None
+    assert result["error"] == "'declaration'"
+
+
+def test_compile_job_time_limit():
+    result = compile_job(YAML, [], 1e-6)
+
+    assert result["hifiber"] is None
+    assert result["error"] == "Time limit exceeded"
+
+
+def test_compile(server):
+    host, port = server.get_address()
+    result = compile_remote(YAML, ["del"], host=host, port=port)
+
+    assert result["hifiber"] == str(Kernel.translate(YAML, ["del"]))
+    assert result["peak_live"] is None
+    assert result["error"] is None
+    assert not result["cached"]
+
+
+def test_compile_cached(server):
+    host, port = server.get_address()
+    first = compile_remote(YAML, ["del", "fuse"], host=host, port=port)
+    second = compile_remote(YAML, ["fuse", "del"], host=host, port=port)
+
+    assert second["hifiber"] == first["hifiber"]
+    assert second["cached"]
+    assert second["time"] == 0.0
+
+    # Only the most recent result is kept
+    compile_remote(YAML, [], host=host, port=port)
+    third = compile_remote(YAML, ["del", "fuse"], host=host, port=port)
+    assert not third["cached"]
+
+    assert server.get_stats() == {"hits": 1, "misses": 3, "size": 1}
+
+
+def test_compile_error(server):
+    host, port = server.get_address()
+    result = compile_remote("einsum: {}", [], host=host, port=port)
+    compile_remote("einsum: {}", [], host=host, port=port)
+
+    assert result["error"] == "'declaration'"
+    assert server.get_stats()["size"] == 0
+
+
+def test_compile_busy():
+    server = CompileServer(port=0, workers=1, queue_size=0)
+    result = server.compile(YAML, [])
+    server.executor.shutdown()
+    server.httpd.server_close()
+
+    assert result["error"] == CompileServer.BUSY
+
+
+def test_compile_recycle():
+    server = CompileServer(port=0, workers=1, time_limit=2)
+
+    # Block the only worker where its own alarm cannot stop the job
+    stuck = server.executor
+    stuck.submit(time.sleep, 60)
+    result = server.compile(YAML, [])
+    assert result["error"] == "Time limit exceeded"
+
+    # The stuck worker was replaced, so the next compilation does not wait
+    assert server.executor is not stuck
+    start = time.time()
+    result = server.compile(YAML, ["del"])
+    assert result["hifiber"] == str(Kernel.translate(YAML, ["del"]))
+    assert time.time() - start < 30
+
+    server.executor.shutdown()
+    server.httpd.server_close()
+
+
+def test_stats(server):
+    host, port = server.get_address()
+    url = "http://" + host + ":" + str(port)
+    with urllib.request.urlopen(url + "/stats") as response:
+        assert response.read() == b'{"hits": 0, "misses": 0, "size": 0}'
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(url + "/foo")
+    assert excinfo.value.code == 404
+
+
+def test_bad_request(server):
+    host, port = server.get_address()
+    request = urllib.request.Request(
+        "http://" + host + ":" + str(port) + "/compile", data=b"{}")
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(request)
+    assert excinfo.value.code == 400
@@ -147,6 +147,32 @@ def create_conv_step():
     return Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
 
 
+def create_frames(opt):
+    yaml = """
+    einsum:
+        declaration:
+            Z: [M, N]
+            A: [K, M]
+            B: [K, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        loop-order:
+            Z: [K, M, N]
+        spacetime:
+            Z:
+                space: [N]
+                time: [K.pos, M.coord]
+                opt: """ + opt + """
+                frames:
+                    every: 100
+                    file: tmp/frames.jsonl
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    return program
+
+
 def test_create_canvas():
     program = create_spacetime()
     program.add_einsum(0)
@@ -172,6 +198,69 @@ def test_create_canvas_partitioned():
     assert canvas.create_canvas().gen(0) == hifiber
 
 
+def test_create_frame_canvas():
+    canvas = Canvas(create_frames(""))
+
+    hifiber = "canvas = FrameCanvas(\"tmp/frames.jsonl\", 100)"
+    assert canvas.create_frame_canvas().gen(0) == hifiber
+
+
+def test_create_frame_canvas_slip():
+    canvas = Canvas(create_frames("slip"))
+
+    hifiber = "canvas = FrameCanvas(\"tmp/frames.jsonl\", 100, slip=True, dense=True)"
+    assert canvas.create_frame_canvas().gen(0) == hifiber
+
+
+def test_create_frame_canvas_no_spacetime():
+    program = create_default()
+    program.add_einsum(0)
+    canvas = Canvas(program)
+
+    with pytest.raises(ValueError) as excinfo:
+        canvas.create_frame_canvas()
+    assert str(excinfo.value) == "SpaceTime information unspecified"
+
+
+def test_create_frame_canvas_no_frames():
+    program = create_spacetime()
+    program.add_einsum(0)
+    canvas = Canvas(program)
+
+    with pytest.raises(ValueError) as excinfo:
+        canvas.create_frame_canvas()
+    assert str(excinfo.value) == "SpaceTime frames unspecified"
+
+
+def test_add_frame_activity():
+    canvas = Canvas(create_frames(""))
+
+    hifiber = "canvas.add((n_pos,), (k_pos, m))"
+    assert canvas.add_frame_activity().gen(0) == hifiber
+
+
+def test_add_frame_activity_slip():
+    canvas = Canvas(create_frames("slip"))
+
+    hifiber = "canvas.add_slip((n_pos,))"
+    assert canvas.add_frame_activity().gen(0) == hifiber
+
+
+def test_add_frame_activity_no_spacetime():
+    program = create_default()
+    program.add_einsum(0)
+    canvas = Canvas(program)
+
+    with pytest.raises(ValueError) as excinfo:
+        canvas.add_frame_activity()
+    assert str(excinfo.value) == "SpaceTime information unspecified"
+
+
+def test_close_frame_canvas():
+    canvas = Canvas(create_frames(""))
+    assert canvas.close_frame_canvas().gen(0) == "canvas.close()"
+
+
 def test_add_activity_no_canvas():
     program = create_default()
     program.add_einsum(0)
@@ -350,6 +439,83 @@ def test_display_canvas():
     assert canvas.display_canvas().gen(0) == hifiber
 
 
+def test_get_space_extents():
+    yaml = """
+    einsum:
+        declaration:
+            A: [M, N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[m, n]
+    mapping:
+        partitioning:
+            Z:
+                M: [uniform_shape(M0)]
+                N: [uniform_shape(6), uniform_shape(3)]
+        loop-order:
+            Z: [M1, N2, N1, M0, N0]
+        spacetime:
+            Z:
+                space: [M0, N1, N0.pos]
+                time: [M1, N2]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    canvas = Canvas(program)
+
+    assert canvas.get_space_extents().gen() == "[M0, None, 3]"
+
+
+def test_get_space_extents_occupancy():
+    yaml = """
+    einsum:
+        declaration:
+            A: [M, N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[m, n]
+    mapping:
+        partitioning:
+            Z:
+                (M, N): [flatten()]
+                MN: [uniform_occupancy(A.5)]
+        loop-order:
+            Z: [MN1, MN0]
+        spacetime:
+            Z:
+                space: [MN0.STYLE]
+                time: [MN1]
+    """
+    program = Program(Einsum.from_str(yaml.replace("STYLE", "pos")),
+                      Mapping.from_str(yaml.replace("STYLE", "pos")))
+    program.add_einsum(0)
+    assert Canvas(program).get_space_extents().gen() == "[5]"
+
+    # The coordinates of the partition are not dense
+    program = Program(Einsum.from_str(yaml.replace("STYLE", "coord")),
+                      Mapping.from_str(yaml.replace("STYLE", "coord")))
+    program.add_einsum(0)
+    assert Canvas(program).get_space_extents() is None
+
+
+def test_get_space_extents_unknown():
+    program = create_spacetime()
+    program.add_einsum(0)
+    assert Canvas(program).get_space_extents() is None
+
+
+def test_get_space_extents_no_spacetime():
+    program = create_default()
+    program.add_einsum(0)
+    canvas = Canvas(program)
+
+    with pytest.raises(ValueError) as excinfo:
+        canvas.get_space_extents()
+
+    assert str(
+        excinfo.value) == "SpaceTime information unspecified"
+
+
 def test_get_space_tuple():
     program = create_spacetime()
     program.add_einsum(0)
@@ -0,0 +1,99 @@
+import pytest
+
+from teaal.hifiber import *
+from teaal.ir.tensor import Tensor
+from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
+from teaal.trans.checkpointer import Checkpointer
+
+
+def build_checkpointer(opts):
+    return Checkpointer(Options(opts), Mapping.from_str(""), False)
+
+
+def test_metrics():
+    with pytest.raises(ValueError) as excinfo:
+        Checkpointer(
+            Options(["checkpoint=tmp/ck.ckpt"]), Mapping.from_str(""), True)
+    assert str(
+        excinfo.value) == "Checkpointing cannot be combined with metrics collection"
+
+
+def test_spacetime():
+    yaml = """
+    mapping:
+        spacetime:
+            Z:
+                space: [M]
+                time: [K]
+    """
+    with pytest.raises(ValueError) as excinfo:
+        Checkpointer(
+            Options(["checkpoint=tmp/ck.ckpt"]), Mapping.from_str(yaml), False)
+    assert str(
+        excinfo.value) == "Checkpointing cannot be combined with spacetime"
+
+
+def test_make_start():
+    assert build_checkpointer([]).make_start().gen(0) == ""
+
+    checkpointer = build_checkpointer(
+        ["checkpoint=tmp/ck.ckpt", "checkpoint-every=10", "checkpoint-seconds=2"])
+    assert checkpointer.make_start().gen(
+        0) == "checkpoint = Checkpoint(\"tmp/ck.ckpt\", every=10, seconds=2.0)"
+
+
+def test_is_enabled():
+    assert not build_checkpointer([]).is_enabled()
+    assert build_checkpointer(["checkpoint=tmp/ck.ckpt"]).is_enabled()
+
+
+def test_start_einsum():
+    checkpointer = build_checkpointer([])
+    checkpointer.start_einsum("Z", ["M", "K"])
+    assert not checkpointer.is_resumed("M")
+
+    checkpointer = build_checkpointer(["checkpoint=tmp/ck.ckpt"])
+    checkpointer.start_einsum("Z", ["M", "K"])
+    assert checkpointer.is_resumed("M")
+    assert not checkpointer.is_resumed("K")
+
+    checkpointer.end_einsum()
+    assert not checkpointer.is_resumed("M")
+
+
+def test_make_checkpointed_unconfigured():
+    checkpointer = build_checkpointer(["checkpoint=tmp/ck.ckpt"])
+
+    with pytest.raises(ValueError) as excinfo:
+        checkpointer.make_checkpointed(PVar("m"), SBlock([]))
+    assert str(
+        excinfo.value) == "No Einsum to checkpoint. Make sure to first call start_einsum()"
+
+
+def test_make_checkpointed():
+    checkpointer = build_checkpointer(["checkpoint=tmp/ck.ckpt"])
+    assert checkpointer.make_restore(Tensor("Z", ["M"])).gen(0) == ""
+
+    checkpointer.start_einsum("Z", ["M"])
+    assert checkpointer.make_restore(Tensor("Z", ["M"])).gen(
+        0) == "Z_M = checkpoint.restore(\"Z\", Z_M)"
+
+    payload = PTuple([PVar("m"), PVar("z_ref")])
+    body = SExpr(EVar("body"))
+    hifiber = "if checkpoint.todo(\"Z\", m):\n" + \
+        "    body\n" + \
+        "    checkpoint.step(\"Z\", m, Z_M)"
+    assert checkpointer.make_checkpointed(payload, body).gen(0) == hifiber
+
+
+def test_make_resumable():
+    hifiber = "if checkpoint.done(\"Z\"):\n" + \
+        "    T_M = checkpoint.load(\"T_M\")\n" + \
+        "    Z_M = checkpoint.load(\"Z_M\")\n" + \
+        "else:\n" + \
+        "    body\n" + \
+        "    checkpoint.finish(\"Z\", {\"T_M\": T_M, \"Z_M\": Z_M})"
+
+    assert Checkpointer.make_resumable(
+        "Z", ["T_M", "Z_M"], SExpr(EVar("body"))).gen(0) == hifiber
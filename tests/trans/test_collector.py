@@ -33,10 +33,10 @@ def build_sigma_yaml():
         return f.read()
 
 
-def build_collector(yaml, i):
+def build_collector(yaml, i, opts=None):
     einsum = Einsum.from_str(yaml)
     mapping = Mapping.from_str(yaml)
-    program = Program(einsum, mapping)
+    program = Program(einsum, mapping, Options(opts))
 
     arch = Architecture.from_str(yaml)
     bindings = Bindings.from_str(yaml)
@@ -120,8 +120,8 @@ def test_create_component_unknown():
         excinfo.value) == "Unable to create consumable metrics component for DRAM of type DRAMComponent"
 
 
-def test_create_component():
-    yaml = """
+def build_intersectors_yaml():
+    return """
     einsum:
       declaration:
         Z: []
@@ -170,7 +170,10 @@ def test_create_component():
         default:
           rank-order: []
     """
-    collector = build_collector(yaml, 0)
+
+
+def test_create_component():
+    collector = build_collector(build_intersectors_yaml(), 0)
     get_comp = collector.metrics.get_hardware().get_component
 
     assert collector.create_component(get_comp("LF"), "I").gen(
@@ -181,6 +184,19 @@ def test_create_component():
         0) == "TF_K = TwoFingerIntersector()"
 
 
+def test_create_component_online():
+    collector = build_collector(
+        build_intersectors_yaml(), 0, ["online-intersect"])
+    get_comp = collector.metrics.get_hardware().get_component
+
+    assert collector.create_component(get_comp("LF"), "I").gen(
+        0) == "LF_I = OnlineIntersector(\"leader-follower\")"
+    assert collector.create_component(get_comp("SA"), "J").gen(
+        0) == "SA_J = OnlineIntersector(\"skip-ahead\")"
+    assert collector.create_component(get_comp("TF"), "K").gen(
+        0) == "TF_K = OnlineIntersector(\"two-finger\")"
+
+
 def test_consume_traces_unknown():
     yaml = """
     einsum:
@@ -286,20 +302,21 @@ def test_dump_gamma_T():
     hifiber = "metrics = {}\n" + \
         "metrics[\"T\"] = {}\n" + \
         "formats = {\"A\": Format(A_MK, {\"rank-order\": [\"M\", \"K\"], \"M\": {\"format\": \"U\", \"pbits\": 32}, \"K\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}}), \"B\": Format(B_KN, {\"rank-order\": [\"K\", \"N\"], \"K\": {\"format\": \"U\", \"pbits\": 32}, \"N\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/gamma_T-K-iter.csv\": 2, \"tmp/gamma_T-N-populate_1.csv\": 2, \"tmp/gamma_T-K-intersect_2.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"B\", \"rank\": \"K\", \"type\": \"payload\", \"format\": \"default\"}, {\"tensor\": \"B\", \"rank\": \"N\", \"type\": \"coord\", \"format\": \"default\"}, {\"tensor\": \"B\", \"rank\": \"N\", \"type\": \"payload\", \"format\": \"default\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_T-K-intersect_3.csv\", \"tmp/gamma_T-K-iter.csv\", \"tmp/gamma_T-K-intersect_3_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_T-N-populate_1.csv\", \"tmp/gamma_T-N-iter.csv\", \"tmp/gamma_T-N-populate_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_T-K-intersect_3.csv\", \"tmp/gamma_T-K-iter.csv\", \"tmp/gamma_T-K-intersect_3_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_T-N-populate_1.csv\", \"tmp/gamma_T-N-iter.csv\", \"tmp/gamma_T-N-populate_1_payload.csv\")\n" + \
         "traces = {(\"B\", \"K\", \"payload\", \"read\"): \"tmp/gamma_T-K-intersect_3_payload.csv\", (\"B\", \"N\", \"coord\", \"read\"): \"tmp/gamma_T-N-populate_1.csv\", (\"B\", \"N\", \"payload\", \"read\"): \"tmp/gamma_T-N-populate_1_payload.csv\"}\n" + \
-        "traffic = Traffic.cacheTraffic(bindings, formats, traces, 25165824, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.cacheTraffic, bindings, formats, traces, 25165824, 64)\n" + \
         "metrics[\"T\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"B\"] = {}\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"B\"][\"read\"] = 0\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"B\"][\"read\"] += traffic[0][\"B\"][\"read\"]\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"M\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"root\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"K\", \"type\": \"coord\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"K\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}]\n" + \
         "Traffic.filterTrace(\"tmp/gamma_T-M-populate_1.csv\", \"tmp/gamma_T-M-iter.csv\", \"tmp/gamma_T-M-populate_1_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_T-K-intersect_2.csv\", \"tmp/gamma_T-K-iter.csv\", \"tmp/gamma_T-K-intersect_2_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_T-K-intersect_2.csv\", \"tmp/gamma_T-K-iter.csv\", \"tmp/gamma_T-K-intersect_2_payload.csv\")\n" + \
         "traces = {(\"A\", \"M\", \"payload\", \"read\"): \"tmp/gamma_T-M-populate_1_payload.csv\", (\"A\", \"K\", \"coord\", \"read\"): \"tmp/gamma_T-K-intersect_2.csv\", (\"A\", \"K\", \"payload\", \"read\"): \"tmp/gamma_T-K-intersect_2_payload.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, float(\"inf\"), 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, float(\"inf\"), 64)\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"A\"] = {}\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"A\"][\"read\"] = 0\n" + \
         "metrics[\"T\"][\"MainMemory\"][\"A\"][\"read\"] += traffic[0][\"A\"][\"read\"]\n" + \
@@ -321,18 +338,19 @@ def test_dump_gamma_Z():
 
     hifiber = "metrics[\"Z\"] = {}\n" + \
         "formats = {\"Z\": Format(Z_MN, {\"rank-order\": [\"M\", \"N\"], \"M\": {\"format\": \"U\", \"pbits\": 32}, \"N\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}}), \"A\": Format(A_MK, {\"rank-order\": [\"M\", \"K\"], \"M\": {\"format\": \"U\", \"pbits\": 32}, \"K\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/gamma_Z-M-iter.csv\": 3, \"tmp/gamma_Z-K-intersect_1.csv\": 2, \"tmp/gamma_Z-N-populate_read_0.csv\": 2, \"tmp/gamma_Z-N-iter.csv\": 2, \"tmp/gamma_Z-N-populate_write_0.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"M\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"root\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"K\", \"type\": \"coord\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"K\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-M-intersect_3.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-intersect_3_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-K-intersect_1.csv\", \"tmp/gamma_Z-K-iter.csv\", \"tmp/gamma_Z-K-intersect_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-M-intersect_3.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-intersect_3_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-K-intersect_1.csv\", \"tmp/gamma_Z-K-iter.csv\", \"tmp/gamma_Z-K-intersect_1_payload.csv\")\n" + \
         "traces = {(\"A\", \"M\", \"payload\", \"read\"): \"tmp/gamma_Z-M-intersect_3_payload.csv\", (\"A\", \"K\", \"coord\", \"read\"): \"tmp/gamma_Z-K-intersect_1.csv\", (\"A\", \"K\", \"payload\", \"read\"): \"tmp/gamma_Z-K-intersect_1_payload.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, float(\"inf\"), 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, float(\"inf\"), 64)\n" + \
         "bindings = [{\"tensor\": \"Z\", \"rank\": \"M\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"root\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"coord\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-M-populate_read_0.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-populate_read_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-M-populate_write_0.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-populate_write_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-N-populate_read_0.csv\", \"tmp/gamma_Z-N-iter.csv\", \"tmp/gamma_Z-N-populate_read_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/gamma_Z-N-populate_write_0.csv\", \"tmp/gamma_Z-N-iter.csv\", \"tmp/gamma_Z-N-populate_write_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-M-populate_read_0.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-M-populate_write_0.csv\", \"tmp/gamma_Z-M-iter.csv\", \"tmp/gamma_Z-M-populate_write_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-N-populate_read_0.csv\", \"tmp/gamma_Z-N-iter.csv\", \"tmp/gamma_Z-N-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/gamma_Z-N-populate_write_0.csv\", \"tmp/gamma_Z-N-iter.csv\", \"tmp/gamma_Z-N-populate_write_0_payload.csv\")\n" + \
         "traces = {(\"Z\", \"M\", \"payload\", \"read\"): \"tmp/gamma_Z-M-populate_read_0_payload.csv\", (\"Z\", \"M\", \"payload\", \"write\"): \"tmp/gamma_Z-M-populate_write_0_payload.csv\", (\"Z\", \"N\", \"coord\", \"read\"): \"tmp/gamma_Z-N-populate_read_0.csv\", (\"Z\", \"N\", \"coord\", \"write\"): \"tmp/gamma_Z-N-populate_write_0.csv\", (\"Z\", \"N\", \"payload\", \"read\"): \"tmp/gamma_Z-N-populate_read_0_payload.csv\", (\"Z\", \"N\", \"payload\", \"write\"): \"tmp/gamma_Z-N-populate_write_0_payload.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, float(\"inf\"), 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, float(\"inf\"), 64)\n" + \
         "metrics[\"Z\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"Z\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"read\"] = 0\n" + \
@@ -365,20 +383,21 @@ def test_dump_outerspace_T0():
     hifiber = "metrics = {}\n" + \
         "metrics[\"T0\"] = {}\n" + \
         "formats = {\"A\": Format(A_KM, {\"rank-order\": [\"K\", \"M\"], \"K\": {\"format\": \"U\", \"pbits\": 32}, \"M\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}}), \"B\": Format(B_KN, {\"rank-order\": [\"K\", \"N\"], \"K\": {\"format\": \"U\", \"pbits\": 32}, \"N\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/outerspace_T0-N-populate_1.csv\": 2, \"tmp/outerspace_T0-K-iter.csv\": 2, \"tmp/outerspace_T0-M-populate_1.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"B\", \"rank\": \"N\", \"type\": \"coord\", \"format\": \"default\"}, {\"tensor\": \"B\", \"rank\": \"N\", \"type\": \"payload\", \"format\": \"default\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_T0-N-populate_1.csv\", \"tmp/outerspace_T0-N-iter.csv\", \"tmp/outerspace_T0-N-populate_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_T0-N-populate_1.csv\", \"tmp/outerspace_T0-N-iter.csv\", \"tmp/outerspace_T0-N-populate_1_payload.csv\")\n" + \
         "traces = {(\"B\", \"N\", \"coord\", \"read\"): \"tmp/outerspace_T0-N-populate_1.csv\", (\"B\", \"N\", \"payload\", \"read\"): \"tmp/outerspace_T0-N-populate_1_payload.csv\"}\n" + \
-        "traffic = Traffic.cacheTraffic(bindings, formats, traces, 131072, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.cacheTraffic, bindings, formats, traces, 131072, 64)\n" + \
         "metrics[\"T0\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"B\"] = {}\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"B\"][\"read\"] = 0\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"B\"][\"read\"] += traffic[0][\"B\"][\"read\"]\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"K\", \"type\": \"payload\", \"evict-on\": \"root\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"M\", \"type\": \"coord\", \"evict-on\": \"K\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"M\", \"type\": \"payload\", \"evict-on\": \"K\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"K\", \"type\": \"payload\", \"evict-on\": \"root\", \"format\": \"default\", \"style\": \"lazy\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_T0-K-intersect_2.csv\", \"tmp/outerspace_T0-K-iter.csv\", \"tmp/outerspace_T0-K-intersect_2_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_T0-M-populate_1.csv\", \"tmp/outerspace_T0-M-iter.csv\", \"tmp/outerspace_T0-M-populate_1_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_T0-K-intersect_3.csv\", \"tmp/outerspace_T0-K-iter.csv\", \"tmp/outerspace_T0-K-intersect_3_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_T0-K-intersect_2.csv\", \"tmp/outerspace_T0-K-iter.csv\", \"tmp/outerspace_T0-K-intersect_2_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_T0-M-populate_1.csv\", \"tmp/outerspace_T0-M-iter.csv\", \"tmp/outerspace_T0-M-populate_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_T0-K-intersect_3.csv\", \"tmp/outerspace_T0-K-iter.csv\", \"tmp/outerspace_T0-K-intersect_3_payload.csv\")\n" + \
         "traces = {(\"A\", \"K\", \"payload\", \"read\"): \"tmp/outerspace_T0-K-intersect_2_payload.csv\", (\"A\", \"M\", \"coord\", \"read\"): \"tmp/outerspace_T0-M-populate_1.csv\", (\"A\", \"M\", \"payload\", \"read\"): \"tmp/outerspace_T0-M-populate_1_payload.csv\", (\"B\", \"K\", \"payload\", \"read\"): \"tmp/outerspace_T0-K-intersect_3_payload.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 8192, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 8192, 64)\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"A\"] = {}\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"A\"][\"read\"] = 0\n" + \
         "metrics[\"T0\"][\"MainMemory\"][\"A\"][\"read\"] += traffic[0][\"A\"][\"read\"]\n" + \
@@ -406,13 +425,14 @@ def test_dump_outerspace_Z():
 
     hifiber = "metrics[\"Z\"] = {}\n" + \
         "formats = {\"Z\": Format(Z_MN, {\"rank-order\": [\"M\", \"N\"], \"M\": {\"format\": \"U\", \"pbits\": 32}, \"N\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/outerspace_Z-M-iter.csv\": 2, \"tmp/outerspace_Z-N-populate_read_0.csv\": 2, \"tmp/outerspace_Z-N-iter.csv\": 2, \"tmp/outerspace_Z-N-populate_write_0.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"Z\", \"rank\": \"M\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"root\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"coord\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_Z-M-populate_read_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_read_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_Z-M-populate_write_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_write_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_Z-N-populate_read_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_read_0_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/outerspace_Z-N-populate_write_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_write_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-M-populate_read_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-M-populate_write_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_write_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-N-populate_read_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-N-populate_write_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_write_0_payload.csv\")\n" + \
         "traces = {(\"Z\", \"M\", \"payload\", \"read\"): \"tmp/outerspace_Z-M-populate_read_0_payload.csv\", (\"Z\", \"M\", \"payload\", \"write\"): \"tmp/outerspace_Z-M-populate_write_0_payload.csv\", (\"Z\", \"N\", \"coord\", \"read\"): \"tmp/outerspace_Z-N-populate_read_0.csv\", (\"Z\", \"N\", \"coord\", \"write\"): \"tmp/outerspace_Z-N-populate_write_0.csv\", (\"Z\", \"N\", \"payload\", \"read\"): \"tmp/outerspace_Z-N-populate_read_0_payload.csv\", (\"Z\", \"N\", \"payload\", \"write\"): \"tmp/outerspace_Z-N-populate_write_0_payload.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 8192, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 8192, 64)\n" + \
         "metrics[\"Z\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"Z\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"read\"] = 0\n" + \
@@ -432,6 +452,45 @@ def test_dump_outerspace_Z():
     assert collector.dump().gen(0) == hifiber
 
 
+def test_dump_parallel():
+    collector = build_collector(
+        build_outerspace_yaml(), 0, ["dump-workers=4"])
+    collector = add_einsum(collector, 1)
+    collector = add_einsum(collector, 2)
+
+    hifiber = "metrics[\"Z\"] = {}\n" + \
+        "formats = {\"Z\": Format(Z_MN, {\"rank-order\": [\"M\", \"N\"], \"M\": {\"format\": \"U\", \"pbits\": 32}, \"N\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/outerspace_Z-M-iter.csv\": 2, \"tmp/outerspace_Z-N-iter.csv\": 2})\n" + \
+        "dump_pool = DumpPool(4, [formats, T1_MKN])\n" + \
+        "bindings = [{\"tensor\": \"Z\", \"rank\": \"M\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"root\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"coord\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}, {\"tensor\": \"Z\", \"rank\": \"N\", \"type\": \"payload\", \"format\": \"default\", \"evict-on\": \"M\", \"style\": \"lazy\"}]\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-M-populate_read_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-M-populate_write_0.csv\", \"tmp/outerspace_Z-M-iter.csv\", \"tmp/outerspace_Z-M-populate_write_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-N-populate_read_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_read_0_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/outerspace_Z-N-populate_write_0.csv\", \"tmp/outerspace_Z-N-iter.csv\", \"tmp/outerspace_Z-N-populate_write_0_payload.csv\")\n" + \
+        "traces = {(\"Z\", \"M\", \"payload\", \"read\"): \"tmp/outerspace_Z-M-populate_read_0_payload.csv\", (\"Z\", \"M\", \"payload\", \"write\"): \"tmp/outerspace_Z-M-populate_write_0_payload.csv\", (\"Z\", \"N\", \"coord\", \"read\"): \"tmp/outerspace_Z-N-populate_read_0.csv\", (\"Z\", \"N\", \"coord\", \"write\"): \"tmp/outerspace_Z-N-populate_write_0.csv\", (\"Z\", \"N\", \"payload\", \"read\"): \"tmp/outerspace_Z-N-populate_read_0_payload.csv\", (\"Z\", \"N\", \"payload\", \"write\"): \"tmp/outerspace_Z-N-populate_write_0_payload.csv\"}\n" + \
+        "traffic_RegFile = dump_pool.submit(Traffic.buffetTraffic, bindings, formats, traces, 8192, 64)\n" + \
+        "metrics[\"Z\"][\"SortHW\"] = {}\n" + \
+        "swaps_SortHW_T1_MKN = dump_pool.submit(Compute.numSwaps, T1_MKN, 1, float(\"inf\"), \"N\")\n" + \
+        "traffic = traffic_RegFile.result()\n" + \
+        "metrics[\"Z\"][\"MainMemory\"] = {}\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"Z\"] = {}\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"read\"] = 0\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"write\"] = 0\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"read\"] += traffic[0][\"Z\"][\"read\"]\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"write\"] += traffic[0][\"Z\"][\"write\"]\n" + \
+        "metrics[\"Z\"][\"MainMemory\"][\"time\"] = (metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"read\"] + metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"write\"]) / 1099511627776\n" + \
+        "metrics[\"Z\"][\"SortHW\"][\"T1_MKN\"] = swaps_SortHW_T1_MKN.result()\n" + \
+        "metrics[\"Z\"][\"SortHW\"][\"time\"] = metrics[\"Z\"][\"SortHW\"][\"T1_MKN\"] / 193500000000\n" + \
+        "dump_pool.shutdown()\n" + \
+        "metrics[\"Z\"][\"FPAdd\"] = {}\n" + \
+        "metrics[\"Z\"][\"FPAdd\"][\"add\"] = Metrics.dump()[\"Compute\"][\"payload_add\"]\n" + \
+        "metrics[\"Z\"][\"FPAdd\"][\"time\"] = metrics[\"Z\"][\"FPAdd\"][\"add\"] / 193500000000\n" + \
+        "metrics[\"blocks\"] = [[\"T0\"], [\"T1\", \"Z\"]]\n" + \
+        "metrics[\"time\"] = 0 + max(metrics[\"Z\"][\"FPAdd\"][\"time\"], metrics[\"Z\"][\"MainMemory\"][\"time\"], metrics[\"Z\"][\"SortHW\"][\"time\"])"
+
+    assert collector.dump().gen(0) == hifiber
+
+
 def test_dump_extensor():
     yaml = build_extensor_yaml()
     collector = build_collector(yaml, 0)
@@ -439,11 +498,12 @@ def test_dump_extensor():
     hifiber = "metrics = {}\n" + \
         "metrics[\"Z\"] = {}\n" + \
         "formats = {\"Z\": Format(Z_N2M2M1N1M0N0, {\"rank-order\": [\"N2\", \"M2\", \"M1\", \"N1\", \"M0\", \"N0\"], \"N2\": {\"format\": \"U\"}, \"M2\": {\"format\": \"U\"}, \"M1\": {\"format\": \"U\"}, \"N1\": {\"format\": \"U\"}, \"M0\": {\"format\": \"U\"}, \"N0\": {\"format\": \"C\", \"cbits\": 64, \"pbits\": 64}}), \"A\": Format(A_K2M2M1K1M0K0, {\"rank-order\": [\"K2\", \"M2\", \"M1\", \"K1\", \"M0\", \"K0\"], \"K2\": {\"format\": \"C\"}, \"M2\": {\"format\": \"C\"}, \"M1\": {\"format\": \"C\"}, \"K1\": {\"format\": \"C\", \"cbits\": 64}, \"M0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}}), \"B\": Format(B_N2K2N1K1N0K0, {\"rank-order\": [\"N2\", \"K2\", \"N1\", \"K1\", \"N0\", \"K0\"], \"N2\": {\"format\": \"C\"}, \"K2\": {\"format\": \"C\"}, \"N1\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K1\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"N0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/extensor-N1-populate_1.csv\": 2, \"tmp/extensor-K1-intersect_1.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"K1\", \"type\": \"coord\", \"evict-on\": \"M2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"M0\", \"type\": \"coord\", \"evict-on\": \"M2\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"M0\"}, {\"tensor\": \"B\", \"rank\": \"N1\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"N1\", \"type\": \"payload\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"K1\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"K1\", \"type\": \"payload\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"N0\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"N0\"}, {\"tensor\": \"Z\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"coord\"}, {\"tensor\": \"Z\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"M0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"payload\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/extensor-N1-populate_1.csv\", \"tmp/extensor-N1-iter.csv\", \"tmp/extensor-N1-populate_1_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/extensor-K1-intersect_1.csv\", \"tmp/extensor-K1-iter.csv\", \"tmp/extensor-K1-intersect_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/extensor-N1-populate_1.csv\", \"tmp/extensor-N1-iter.csv\", \"tmp/extensor-N1-populate_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/extensor-K1-intersect_1.csv\", \"tmp/extensor-K1-iter.csv\", \"tmp/extensor-K1-intersect_1_payload.csv\")\n" + \
         "traces = {(\"A\", \"K1\", \"coord\", \"read\"): \"tmp/extensor-K1-intersect_0.csv\", (\"A\", \"M0\", \"coord\", \"read\"): \"tmp/extensor-M0-eager_a_m0_read.csv\", (\"B\", \"N1\", \"coord\", \"read\"): \"tmp/extensor-N1-populate_1.csv\", (\"B\", \"N1\", \"payload\", \"read\"): \"tmp/extensor-N1-populate_1_payload.csv\", (\"B\", \"K1\", \"coord\", \"read\"): \"tmp/extensor-K1-intersect_1.csv\", (\"B\", \"K1\", \"payload\", \"read\"): \"tmp/extensor-K1-intersect_1_payload.csv\", (\"B\", \"N0\", \"coord\", \"read\"): \"tmp/extensor-N0-eager_b_n0_read.csv\", (\"Z\", \"N0\", \"coord\", \"read\"): \"tmp/extensor-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"coord\", \"write\"): \"tmp/extensor-N0-eager_z_m0_write.csv\", (\"Z\", \"N0\", \"payload\", \"read\"): \"tmp/extensor-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"payload\", \"write\"): \"tmp/extensor-N0-eager_z_m0_write.csv\", (\"A\", \"M0\", \"payload\", \"read\"): \"tmp/extensor-M0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"coord\", \"read\"): \"tmp/extensor-K0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"payload\", \"read\"): \"tmp/extensor-K0-eager_a_m0_read.csv\", (\"B\", \"N0\", \"payload\", \"read\"): \"tmp/extensor-N0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"coord\", \"read\"): \"tmp/extensor-K0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"payload\", \"read\"): \"tmp/extensor-K0-eager_b_n0_read.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 251658240, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 251658240, 64)\n" + \
         "metrics[\"Z\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"A\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"A\"][\"read\"] = 0\n" + \
@@ -481,6 +541,32 @@ def test_dump_extensor():
     assert collector.dump().gen(0) == hifiber
 
 
+def test_dump_shared_traces():
+    yaml = build_extensor_yaml().replace("""  - component: K1Intersect
+""", """  - component: PEB
+    bindings:
+    - tensor: B
+      rank: N1
+      type: payload
+      evict-on: K1
+      format: default
+      style: lazy
+  - component: K1Intersect
+""").replace("depth: 3932160", "depth: 3932160\n          bandwidth: 1024")
+    collector = build_collector(yaml, 0)
+
+    generated = collector.dump().gen(0).split("\n")
+
+    # The payload trace is only filtered once, even though two buffers use it
+    filter_ = "trace_cache.call(Traffic.filterTrace, \"tmp/extensor-N1-populate_1.csv\", \"tmp/extensor-N1-iter.csv\", \"tmp/extensor-N1-populate_1_payload.csv\")"
+    assert generated.count(filter_) == 1
+    assert len([line for line in generated if line.startswith(
+        "traffic = trace_cache.call(Traffic.buffetTraffic, ")]) == 2
+
+    # The traces read by both buffers are only read from disk once
+    assert generated[3] == "trace_cache = TraceCache({\"tmp/extensor-N1-populate_1.csv\": 2, \"tmp/extensor-K1-intersect_1.csv\": 2, \"tmp/extensor-N1-populate_1_payload.csv\": 2})"
+
+
 def test_dump_extensor_energy():
     yaml = build_extensor_energy_yaml()
     collector = build_collector(yaml, 0)
@@ -488,11 +574,12 @@ def test_dump_extensor_energy():
     hifiber = "metrics = {}\n" + \
         "metrics[\"Z\"] = {}\n" + \
         "formats = {\"Z\": Format(Z_N2M2M1N1M0N0, {\"rank-order\": [\"N2\", \"M2\", \"M1\", \"N1\", \"M0\", \"N0\"], \"N2\": {\"format\": \"U\"}, \"M2\": {\"format\": \"U\"}, \"M1\": {\"format\": \"U\"}, \"N1\": {\"format\": \"U\"}, \"M0\": {\"format\": \"U\"}, \"N0\": {\"format\": \"C\", \"cbits\": 64, \"pbits\": 64}}), \"A\": Format(A_K2M2M1K1M0K0, {\"rank-order\": [\"K2\", \"M2\", \"M1\", \"K1\", \"M0\", \"K0\"], \"K2\": {\"format\": \"C\"}, \"M2\": {\"format\": \"C\"}, \"M1\": {\"format\": \"C\"}, \"K1\": {\"format\": \"C\", \"cbits\": 64}, \"M0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}}), \"B\": Format(B_N2K2N1K1N0K0, {\"rank-order\": [\"N2\", \"K2\", \"N1\", \"K1\", \"N0\", \"K0\"], \"N2\": {\"format\": \"C\"}, \"K2\": {\"format\": \"C\"}, \"N1\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K1\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"N0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 32}, \"K0\": {\"format\": \"C\", \"cbits\": 32, \"pbits\": 64}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/extensor_energy-N1-populate_1.csv\": 2, \"tmp/extensor_energy-N1-iter.csv\": 2, \"tmp/extensor_energy-K1-intersect_1.csv\": 2, \"tmp/extensor_energy-K1-iter.csv\": 2, \"tmp/extensor_energy-K0-eager_a_m0_read.csv\": 2, \"tmp/extensor_energy-K0-eager_b_n0_read.csv\": 2, \"tmp/extensor_energy-M0-eager_a_m0_read.csv\": 2, \"tmp/extensor_energy-N0-eager_b_n0_read.csv\": 2, \"tmp/extensor_energy-N0-eager_z_m0_read.csv\": 2, \"tmp/extensor_energy-N0-eager_z_m0_write.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"K1\", \"type\": \"coord\", \"evict-on\": \"M2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"A\", \"rank\": \"M0\", \"type\": \"coord\", \"evict-on\": \"M2\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"M0\"}, {\"tensor\": \"B\", \"rank\": \"N1\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"N1\", \"type\": \"payload\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"K1\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"K1\", \"type\": \"payload\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"lazy\"}, {\"tensor\": \"B\", \"rank\": \"N0\", \"type\": \"coord\", \"evict-on\": \"K2\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"N0\"}, {\"tensor\": \"Z\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"coord\"}, {\"tensor\": \"Z\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"M0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"A\", \"evict-on\": \"M2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"B\", \"evict-on\": \"K2\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"payload\"}]\n" + \
-        "Traffic.filterTrace(\"tmp/extensor_energy-N1-populate_1.csv\", \"tmp/extensor_energy-N1-iter.csv\", \"tmp/extensor_energy-N1-populate_1_payload.csv\")\n" + \
-        "Traffic.filterTrace(\"tmp/extensor_energy-K1-intersect_1.csv\", \"tmp/extensor_energy-K1-iter.csv\", \"tmp/extensor_energy-K1-intersect_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/extensor_energy-N1-populate_1.csv\", \"tmp/extensor_energy-N1-iter.csv\", \"tmp/extensor_energy-N1-populate_1_payload.csv\")\n" + \
+        "trace_cache.call(Traffic.filterTrace, \"tmp/extensor_energy-K1-intersect_1.csv\", \"tmp/extensor_energy-K1-iter.csv\", \"tmp/extensor_energy-K1-intersect_1_payload.csv\")\n" + \
         "traces = {(\"A\", \"K1\", \"coord\", \"read\"): \"tmp/extensor_energy-K1-intersect_0.csv\", (\"A\", \"M0\", \"coord\", \"read\"): \"tmp/extensor_energy-M0-eager_a_m0_read.csv\", (\"B\", \"N1\", \"coord\", \"read\"): \"tmp/extensor_energy-N1-populate_1.csv\", (\"B\", \"N1\", \"payload\", \"read\"): \"tmp/extensor_energy-N1-populate_1_payload.csv\", (\"B\", \"K1\", \"coord\", \"read\"): \"tmp/extensor_energy-K1-intersect_1.csv\", (\"B\", \"K1\", \"payload\", \"read\"): \"tmp/extensor_energy-K1-intersect_1_payload.csv\", (\"B\", \"N0\", \"coord\", \"read\"): \"tmp/extensor_energy-N0-eager_b_n0_read.csv\", (\"Z\", \"N0\", \"coord\", \"read\"): \"tmp/extensor_energy-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"coord\", \"write\"): \"tmp/extensor_energy-N0-eager_z_m0_write.csv\", (\"Z\", \"N0\", \"payload\", \"read\"): \"tmp/extensor_energy-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"payload\", \"write\"): \"tmp/extensor_energy-N0-eager_z_m0_write.csv\", (\"A\", \"M0\", \"payload\", \"read\"): \"tmp/extensor_energy-M0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"coord\", \"read\"): \"tmp/extensor_energy-K0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"payload\", \"read\"): \"tmp/extensor_energy-K0-eager_a_m0_read.csv\", (\"B\", \"N0\", \"payload\", \"read\"): \"tmp/extensor_energy-N0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"coord\", \"read\"): \"tmp/extensor_energy-K0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"payload\", \"read\"): \"tmp/extensor_energy-K0-eager_b_n0_read.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 251658240, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 251658240, 64)\n" + \
         "metrics[\"Z\"][\"MainMemory\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"A\"] = {}\n" + \
         "metrics[\"Z\"][\"MainMemory\"][\"A\"][\"read\"] = 0\n" + \
@@ -507,7 +594,7 @@ def test_dump_extensor_energy():
         "metrics[\"Z\"][\"MainMemory\"][\"Z\"][\"write\"] += traffic[0][\"Z\"][\"write\"]\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"M0\", \"type\": \"coord\", \"evict-on\": \"K1\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"M0\"}, {\"tensor\": \"B\", \"rank\": \"N0\", \"type\": \"coord\", \"evict-on\": \"K1\", \"format\": \"default\", \"style\": \"eager\", \"root\": \"N0\"}, {\"tensor\": \"Z\", \"evict-on\": \"N1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"coord\"}, {\"tensor\": \"Z\", \"evict-on\": \"N1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"M0\", \"type\": \"payload\"}, {\"tensor\": \"A\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"A\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"M0\", \"rank\": \"K0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"N0\", \"type\": \"payload\"}, {\"tensor\": \"B\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"coord\"}, {\"tensor\": \"B\", \"evict-on\": \"K1\", \"style\": \"eager\", \"format\": \"default\", \"root\": \"N0\", \"rank\": \"K0\", \"type\": \"payload\"}]\n" + \
         "traces = {(\"A\", \"M0\", \"coord\", \"read\"): \"tmp/extensor_energy-M0-eager_a_m0_read.csv\", (\"B\", \"N0\", \"coord\", \"read\"): \"tmp/extensor_energy-N0-eager_b_n0_read.csv\", (\"Z\", \"N0\", \"coord\", \"read\"): \"tmp/extensor_energy-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"coord\", \"write\"): \"tmp/extensor_energy-N0-eager_z_m0_write.csv\", (\"Z\", \"N0\", \"payload\", \"read\"): \"tmp/extensor_energy-N0-eager_z_m0_read.csv\", (\"Z\", \"N0\", \"payload\", \"write\"): \"tmp/extensor_energy-N0-eager_z_m0_write.csv\", (\"A\", \"M0\", \"payload\", \"read\"): \"tmp/extensor_energy-M0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"coord\", \"read\"): \"tmp/extensor_energy-K0-eager_a_m0_read.csv\", (\"A\", \"K0\", \"payload\", \"read\"): \"tmp/extensor_energy-K0-eager_a_m0_read.csv\", (\"B\", \"N0\", \"payload\", \"read\"): \"tmp/extensor_energy-N0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"coord\", \"read\"): \"tmp/extensor_energy-K0-eager_b_n0_read.csv\", (\"B\", \"K0\", \"payload\", \"read\"): \"tmp/extensor_energy-K0-eager_b_n0_read.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 524288, 64)\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 524288, 64)\n" + \
         "metrics[\"Z\"][\"LLB\"] = {}\n" + \
         "metrics[\"Z\"][\"LLB\"][\"A\"] = {}\n" + \
         "metrics[\"Z\"][\"LLB\"][\"A\"][\"read\"] = 0\n" + \
@@ -547,8 +634,8 @@ def test_dump_extensor_energy():
         "metrics[\"Z\"][\"TopSequencer\"][\"time\"] = (metrics[\"Z\"][\"TopSequencer\"][\"N2\"] + metrics[\"Z\"][\"TopSequencer\"][\"K2\"] + metrics[\"Z\"][\"TopSequencer\"][\"M2\"]) / 1000000000\n" + \
         "metrics[\"Z\"][\"MiddleSequencer\"] = {}\n" + \
         "metrics[\"Z\"][\"MiddleSequencer\"][\"M1\"] = Compute.numIters(\"tmp/extensor_energy-M1-iter.csv\")\n" + \
-        "metrics[\"Z\"][\"MiddleSequencer\"][\"N1\"] = Compute.numIters(\"tmp/extensor_energy-N1-iter.csv\")\n" + \
-        "metrics[\"Z\"][\"MiddleSequencer\"][\"K1\"] = Compute.numIters(\"tmp/extensor_energy-K1-iter.csv\")\n" + \
+        "metrics[\"Z\"][\"MiddleSequencer\"][\"N1\"] = trace_cache.call(Compute.numIters, \"tmp/extensor_energy-N1-iter.csv\")\n" + \
+        "metrics[\"Z\"][\"MiddleSequencer\"][\"K1\"] = trace_cache.call(Compute.numIters, \"tmp/extensor_energy-K1-iter.csv\")\n" + \
         "metrics[\"Z\"][\"MiddleSequencer\"][\"time\"] = (metrics[\"Z\"][\"MiddleSequencer\"][\"M1\"] + metrics[\"Z\"][\"MiddleSequencer\"][\"N1\"] + metrics[\"Z\"][\"MiddleSequencer\"][\"K1\"]) / 1000000000\n" + \
         "metrics[\"Z\"][\"BottomSequencer\"] = {}\n" + \
         "metrics[\"Z\"][\"BottomSequencer\"][\"M0\"] = Compute.numIters(\"tmp/extensor_energy-M0-iter.csv\")\n" + \
@@ -561,6 +648,34 @@ def test_dump_extensor_energy():
     assert collector.dump().gen(0) == hifiber
 
 
+def test_dump_shared_iters():
+    yaml = build_extensor_energy_yaml().replace(
+        """  - component: MiddleSequencer
+    bindings:
+    - rank: M1
+""", """  - component: MiddleSequencer
+    bindings:
+    - rank: M2
+    - rank: M1
+""").replace("""      - name: MiddleSequencer
+        class: Sequencer
+        attributes:
+          num_ranks: 3""", """      - name: MiddleSequencer
+        class: Sequencer
+        attributes:
+          num_ranks: 4""")
+    collector = build_collector(yaml, 0)
+
+    generated = collector.dump().gen(0).split("\n")
+
+    # The iteration trace of M2 is only counted once
+    corr = [
+        "metrics[\"Z\"][\"TopSequencer\"][\"M2\"] = Compute.numIters(\"tmp/extensor_energy-M2-iter.csv\")",
+        "metrics[\"Z\"][\"MiddleSequencer\"][\"M2\"] = metrics[\"Z\"][\"TopSequencer\"][\"M2\"]"]
+    check_hifiber_lines(
+        [line for line in generated if "[\"M2\"] = " in line], corr)
+
+
 def test_dump_sigma():
     yaml = build_sigma_yaml()
     collector = build_collector(yaml, 0)
@@ -568,12 +683,13 @@ def test_dump_sigma():
     hifiber = "metrics = {}\n" + \
         "metrics[\"Z\"] = {}\n" + \
         "formats = {\"A\": Format(Tensor(rank_ids=[\"K1\", \"MK01\", \"MK00\"], shape=[K, M * K, M * K]), {\"rank-order\": [\"K1\", \"MK01\", \"MK00\"], \"K1\": {\"format\": \"U\"}, \"MK01\": {\"format\": \"U\"}, \"MK00\": {\"format\": \"C\", \"pbits\": 32}}), \"B\": Format(B_K1NK0, {\"rank-order\": [\"K1\", \"N\", \"K0\"], \"K1\": {\"format\": \"U\"}, \"N\": {\"format\": \"U\"}, \"K0\": {\"format\": \"U\", \"pbits\": 32}})}\n" + \
+        "trace_cache = TraceCache({\"tmp/sigma-K0-eager_b_k0_read.csv\": 2, \"tmp/sigma-MK00-eager_a_mk00_read.csv\": 2})\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"MK00\", \"type\": \"payload\", \"evict-on\": \"root\", \"format\": \"flattened\", \"style\": \"eager\", \"root\": \"MK00\"}, {\"tensor\": \"B\", \"rank\": \"K0\", \"type\": \"payload\", \"evict-on\": \"root\", \"format\": \"partitioned\", \"style\": \"eager\", \"root\": \"K0\"}]\n" + \
         "traces = {(\"A\", \"MK00\", \"payload\", \"read\"): \"tmp/sigma-MK00-eager_a_mk00_read.csv\", (\"B\", \"K0\", \"payload\", \"read\"): \"tmp/sigma-K0-eager_b_k0_read.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 268435456, 32, {\"K0\": \"MK00\"})\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 268435456, 32, {\"K0\": \"MK00\"})\n" + \
         "bindings = [{\"tensor\": \"A\", \"rank\": \"MK00\", \"format\": \"flattened\", \"type\": \"payload\", \"evict-on\": \"MK01\", \"style\": \"eager\", \"root\": \"MK00\"}, {\"tensor\": \"B\", \"rank\": \"K0\", \"format\": \"partitioned\", \"type\": \"payload\", \"evict-on\": \"N\", \"style\": \"eager\", \"root\": \"K0\"}]\n" + \
         "traces = {(\"A\", \"MK00\", \"payload\", \"read\"): \"tmp/sigma-MK00-eager_a_mk00_read.csv\", (\"B\", \"K0\", \"payload\", \"read\"): \"tmp/sigma-K0-eager_b_k0_read.csv\"}\n" + \
-        "traffic = Traffic.buffetTraffic(bindings, formats, traces, 1048576, 4096, {\"K0\": \"MK00\"})\n" + \
+        "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 1048576, 4096, {\"K0\": \"MK00\"})\n" + \
         "metrics[\"Z\"][\"DataSRAMBanks\"] = {}\n" + \
         "metrics[\"Z\"][\"DataSRAMBanks\"][\"A\"] = {}\n" + \
         "metrics[\"Z\"][\"DataSRAMBanks\"][\"A\"][\"read\"] = 0\n" + \
@@ -835,6 +951,13 @@ def test_make_loop_footer():
     assert collector.make_loop_footer("K1").gen(0) == hifiber
 
 
+def test_make_loop_footer_online_intersect():
+    collector = build_collector(build_gamma_yaml(), 0, ["online-intersect"])
+    collector.start()
+
+    assert collector.make_loop_footer("K").gen(0) == ""
+
+
 def test_make_loop_header_unconfigured():
     yaml = build_gamma_yaml()
     collector = build_collector(yaml, 0)
@@ -1035,6 +1158,35 @@ def test_start():
     check_hifiber_lines(generated[2:], corr)
 
 
+def test_start_binary_traces():
+    collector = build_collector(
+        build_gamma_yaml(), 0, [
+            "trace-format=binary", "compress-traces"])
+
+    generated = collector.start().gen(0).split("\n")
+
+    # fibertree always collects CSV traces
+    corr = ["Metrics.beginCollect(\"tmp/gamma_T\")"]
+    check_hifiber_lines(generated[:1], corr)
+
+
+def test_dump_binary_traces():
+    collector = build_collector(
+        build_extensor_yaml(), 0, [
+            "trace-format=binary", "compress-traces"])
+
+    generated = collector.dump().gen(0).split("\n")
+
+    # The traces are packed, and every consumer reads them through the cache
+    assert generated[2] == "TraceFile.pack_all(\"tmp/extensor\", compress=True)"
+    assert generated[4] == "trace_cache = TraceCache({\"tmp/extensor-N1-populate_1.csv\": 2, \"tmp/extensor-K1-intersect_1.csv\": 2})"
+    assert "traffic = trace_cache.call(Traffic.buffetTraffic, bindings, formats, traces, 251658240, 64)" in generated
+    consumers = [line for line in generated if "Traffic." in line or
+                 "Compute.numIters" in line]
+    assert consumers
+    assert all("trace_cache.call(" in line for line in consumers)
+
+
 def test_start_sequencer():
     yaml = build_extensor_energy_yaml()
     collector = build_collector(yaml, 0)
@@ -1,6 +1,7 @@
 import pytest
 from sympy import symbols
 
+from teaal.hifiber import *
 from teaal.ir.hardware import Hardware
 from teaal.ir.iter_graph import IterationGraph
 from teaal.ir.metrics import Metrics
@@ -29,7 +30,7 @@ def make_basic():
     return IterationGraph(program), Equation(program, None)
 
 
-def make_output():
+def make_output(batching=False):
     yaml = """
     einsum:
         declaration:
@@ -45,7 +46,7 @@ def make_output():
     program = Program(einsum, mapping)
     program.add_einsum(0)
 
-    return IterationGraph(program), Equation(program, None)
+    return IterationGraph(program), Equation(program, None, batching=batching)
 
 
 def make_mult_terms():
@@ -215,15 +216,17 @@ def make_conv_part(expr, loop_order):
     return IterationGraph(program), Equation(program, None)
 
 
-def make_gamma():
+def make_gamma(online=False):
     fname = "tests/integration/gamma.yaml"
     einsum = Einsum.from_file(fname)
     mapping = Mapping.from_file(fname)
     arch = Architecture.from_file(fname)
-    bindings = Bindings.from_file(fname)
     format_ = Format.from_file(fname)
 
-    program = Program(einsum, mapping)
+    bindings = Bindings.from_file(fname)
+
+    opts = ["online-intersect"] if online else []
+    program = Program(einsum, mapping, Options(opts))
     hardware = Hardware(arch, bindings, program)
 
     program.add_einsum(0)
@@ -359,6 +362,15 @@ def test_make_iter_expr_leader_follower():
     assert eqn.make_iter_expr(*graph.peek_concord()).gen() == iter_expr
 
 
+def test_make_iter_expr_leader_follower_online():
+    graph, eqn = make_gamma(online=True)
+
+    graph.pop_concord()
+    iter_expr = "t_k << Intersect_K.intersect(a_k, b_k)"
+
+    assert eqn.make_iter_expr(*graph.peek_concord()).gen() == iter_expr
+
+
 def test_flattened_output_only_bad():
     mapping = """
         partitioning:
@@ -626,6 +638,242 @@ def test_make_payload_metrics():
     assert eqn.make_payload(*graph.pop_concord()).gen(parens=False) == hifiber
 
 
+def test_can_batch():
+    graph, eqn = make_output(batching=True)
+    assert eqn.can_batch(*graph.peek_concord())
+
+    graph, eqn = make_output()
+    assert not eqn.can_batch(*graph.peek_concord())
+
+    graph, eqn = make_basic()
+    assert not eqn.can_batch(*graph.peek_concord())
+
+    graph, eqn = make_gamma()
+    assert not eqn.can_batch(*graph.peek_concord())
+
+
+def test_can_batch_not_bottom():
+    yaml = """
+    einsum:
+        declaration:
+            A: [M]
+            B: [N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[m] * B[n]
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+    program = Program(einsum, mapping)
+    program.add_einsum(0)
+    graph = IterationGraph(program)
+    eqn = Equation(program, None, batching=True)
+
+    assert not eqn.can_batch(*graph.pop_concord())
+    assert eqn.can_batch(*graph.peek_concord())
+
+
+def test_make_batch_end_unstarted():
+    _, eqn = make_output()
+
+    with pytest.raises(ValueError) as excinfo:
+        eqn.make_batch_end()
+
+    assert str(excinfo.value) == "No output batch started"
+
+
+def test_make_batch():
+    graph, eqn = make_output(batching=True)
+
+    rank, tensors = graph.peek_concord()
+    start = "a_i_coords = []\n" + \
+        "a_i_payloads = []"
+    assert eqn.make_batch_start(rank).gen(0) == start
+
+    assert eqn.make_iter_expr(rank, tensors).gen() == "b_i & (c_i & d_i)"
+
+    rank, tensors = graph.pop_concord()
+    payload = "i, (b_val, (c_val, d_val))"
+    assert eqn.make_payload(rank, tensors).gen(False) == payload
+
+    update = "a_i_coords.append(i)\n" + \
+        "a_i_payloads.append(b_val * c_val * d_val)"
+    assert eqn.make_update().gen(0) == update
+
+    end = "a_i.extend(Fiber(a_i_coords, a_i_payloads))"
+    assert eqn.make_batch_end().gen(0) == end
+    assert eqn.make_update().gen(0) == "a_ref <<= b_val * c_val * d_val"
+
+
+def test_make_batch_copy():
+    yaml = """
+    einsum:
+        declaration:
+            A: [I]
+            B: [I]
+        expressions:
+            - "A[i] = B[i]"
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+    program = Program(einsum, mapping)
+    program.add_einsum(0)
+    graph = IterationGraph(program)
+    eqn = Equation(program, None, batching=True)
+
+    rank, tensors = graph.pop_concord()
+    eqn.make_batch_start(rank)
+
+    update = "a_i_coords.append(i)\n" + \
+        "a_i_payloads.append(Payload.get(b_val))"
+    assert eqn.make_update().gen(0) == update
+
+
+def test_make_input_payload_no_tensors():
+    graph, eqn = make_output()
+
+    with pytest.raises(ValueError) as excinfo:
+        eqn.make_input_payload("I", [])
+    assert str(excinfo.value) == "Must have at least one input tensor"
+
+
+def test_make_input_payload():
+    graph, eqn = make_output()
+
+    rank, tensors = graph.pop_concord()
+    payload = "b_val, (c_val, d_val)"
+    assert eqn.make_input_payload(rank, tensors).gen(False) == payload
+
+
+def test_fuse():
+    graph, eqn = make_output()
+
+    expr = EParens(EBinOp(EVar("e_i"), OAnd(), EVar("f_i")))
+    eqn.fuse("I", "B", expr, PTuple([PVar("e_val"), PVar("f_val")]))
+
+    rank, tensors = graph.peek_concord()
+    iter_expr = "a_i << ((e_i & f_i) & (c_i & d_i))"
+    assert eqn.make_iter_expr(rank, tensors).gen() == iter_expr
+
+    rank, tensors = graph.pop_concord()
+    payload = "i, (a_ref, ((e_val, f_val), (c_val, d_val)))"
+    assert eqn.make_payload(rank, tensors).gen(False) == payload
+
+
+def make_dense(b_format):
+    yaml = """
+    einsum:
+        declaration:
+            A: [M, K]
+            B: [K]
+            Z: [M, K]
+        expressions:
+            - Z[m, k] = A[m, k] * B[k]
+    format:
+        A:
+            default:
+                rank-order: [M, K]
+                M:
+                    format: U
+                K:
+                    format: U
+        B:
+            default:
+                rank-order: [K]
+                K:
+                    format: """ + b_format + """
+        Z:
+            default:
+                rank-order: [M, K]
+                M:
+                    format: U
+                K:
+                    format: U
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+    program = Program(einsum, mapping)
+    program.add_einsum(0)
+
+    return IterationGraph(program), Equation(
+        program, None, Format.from_str(yaml))
+
+
+def test_is_dense():
+    graph, eqn = make_dense("C")
+    assert eqn.is_dense(*graph.peek_concord())
+    graph.pop_concord()
+    assert not eqn.is_dense(*graph.peek_concord())
+
+    graph, eqn = make_dense("U")
+    graph.pop_concord()
+    assert not eqn.is_dense(*graph.peek_concord())
+
+    graph, eqn = make_output()
+    assert not eqn.is_dense(*graph.peek_concord())
+
+    graph, eqn = make_gamma()
+    assert not eqn.is_dense(*graph.peek_concord())
+
+
+def test_make_dense_access_unstarted():
+    _, eqn = make_dense("C")
+
+    with pytest.raises(ValueError) as excinfo:
+        eqn.make_dense_access([])
+
+    assert str(excinfo.value) == "No dense rank started"
+
+
+def test_make_dense():
+    graph, eqn = make_dense("C")
+
+    rank, tensors = graph.peek_concord()
+    start = "a_m_payloads = a_m.getPayloads()\n" + \
+        "if len(a_m_payloads) < M:\n" + \
+        "    a_m_payloads = [a_m.getPayload(m) for m in range(M)]"
+    assert eqn.make_dense_start(rank, tensors).gen(0) == start
+
+    assert eqn.make_iter_expr(rank, tensors).gen() == "range(M)"
+
+    rank, tensors = graph.pop_concord()
+    assert eqn.make_payload(rank, tensors).gen(False) == "m"
+
+    access = "z_k = z_m.getPayloadRef(m)\n" + \
+        "a_k = a_m_payloads[m]"
+    assert eqn.make_dense_access(tensors).gen(0) == access
+
+    rank, tensors = graph.peek_concord()
+    assert eqn.make_iter_expr(rank, tensors).gen() == "z_k << (a_k & b_k)"
+
+
+def test_make_dense_missing_coords():
+    graph, eqn = make_dense("C")
+    rank, tensors = graph.peek_concord()
+
+    class Fiber:
+        def __init__(self, coords, payloads):
+            self.coords = coords
+            self.payloads = payloads
+
+        def getPayload(self, coord):
+            if coord in self.coords:
+                return self.payloads[self.coords.index(coord)]
+            return 0
+
+        def getPayloads(self):
+            return self.payloads
+
+    # fromUncompressed() drops the zeros, so coordinate 1 is missing
+    env = {"a_m": Fiber([0, 2, 3], [5, 6, 7]), "M": 4}
+    exec(eqn.make_dense_start(rank, tensors).gen(0), env)
+    assert env["a_m_payloads"] == [5, 0, 6, 7]
+
+    env = {"a_m": Fiber([0, 1, 2, 3], [5, 0, 6, 7]), "M": 4}
+    exec(eqn.make_dense_start(rank, tensors).gen(0), env)
+    assert env["a_m_payloads"] == [5, 0, 6, 7]
+
+
 def test_make_update():
     _, eqn = make_basic()
     stmt = "a_ref += b_val * c_val * d_val"
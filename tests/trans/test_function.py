@@ -0,0 +1,46 @@
+from teaal.hifiber import *
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.trans.function import Function
+from teaal.trans.liveness import Liveness
+
+
+def build_liveness():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K]
+            Z: [K]
+        expressions:
+            - Z[k] = a * A[k]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+
+    liveness = Liveness()
+    liveness.add_einsum(program, 0)
+    return liveness
+
+
+def test_make_kernel():
+    function = Function(build_liveness(), False)
+    body = SAssign(AVar("Z_K"), EFunc("Tensor", [AJust(EVar("K"))]))
+
+    hifiber = "def kernel(A_K, a, K):\n" + \
+        "    Z_K = Tensor(K)\n" + \
+        "    return Z_K"
+
+    assert function.make_kernel(body).gen(0) == hifiber
+    assert function.get_params() == ["A_K", "a", "K"]
+
+
+def test_make_kernel_metrics():
+    function = Function(build_liveness(), True)
+    body = SAssign(AVar("Z_K"), EVar("A_K"))
+
+    hifiber = "def kernel(A_K, a):\n" + \
+        "    Z_K = A_K\n" + \
+        "    return (Z_K, metrics)"
+
+    assert function.make_kernel(body).gen(0) == hifiber
@@ -0,0 +1,58 @@
+from teaal.ir.flow_graph import FlowGraph
+from teaal.ir.flow_nodes import *
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
+from teaal.trans.fuser import Fuser
+
+
+def build_fuser(t_order, z_order):
+    yaml = """
+    einsum:
+      declaration:
+        A: [M, K]
+        B: [K, N]
+        C: [N]
+        T: [M, N]
+        Z: [M]
+      expressions:
+      - T[m, n] = A[m, k] * B[k, n]
+      - Z[m] = T[m, n] * C[n]
+    mapping:
+      loop-order:
+        T: """ + t_order + """
+        Z: """ + z_order + """
+    """
+    return Fuser(Einsum.from_str(yaml), Mapping.from_str(yaml), Options())
+
+
+def test_first_loop():
+    assert Fuser.first_loop(
+        [OtherNode("Output"), LoopNode("M"), LoopNode("N")]) == 1
+    assert Fuser.first_loop([OtherNode("Output")]) == 1
+
+
+def test_get_fused_ranks():
+    fuser = build_fuser("[M, K, N]", "[M, N]")
+
+    assert fuser.get_fused_ranks(0) == ["M"]
+    assert fuser.get_fused_ranks(1) == []
+
+
+def test_get_fused_ranks_loop_order():
+    fuser = build_fuser("[M, K, N]", "[N, M]")
+
+    assert fuser.get_fused_ranks(0) == []
+
+
+def test_materializes():
+    fuser = build_fuser("[M, K, N]", "[M, N]")
+    program = Program(fuser.einsum, fuser.mapping)
+    program.add_einsum(0)
+
+    assert Fuser.materializes(program, OtherNode("Output"), "T")
+    assert not Fuser.materializes(program, OtherNode("Body"), "T")
+    assert Fuser.materializes(program, GetRootNode("T", ["M", "N"]), "T")
+    assert not Fuser.materializes(program, GetRootNode("A", ["M", "K"]), "T")
+    assert not Fuser.materializes(program, LoopNode("M"), "T")
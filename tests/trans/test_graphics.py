@@ -20,7 +20,7 @@ def create_default():
     return Graphics(program, None)
 
 
-def create_spacetime(opt):
+def create_spacetime(opt, load=False):
     yaml = """
     einsum:
         declaration:
@@ -39,7 +39,33 @@ def create_spacetime(opt):
                 opt: """ + opt
     program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
     program.add_einsum(0)
-    return Graphics(program, None)
+    return Graphics(program, None, load)
+
+
+def create_frames(load=False):
+    yaml = """
+    einsum:
+        declaration:
+            Z: [M, N]
+            A: [K, M]
+            B: [K, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        loop-order:
+            Z: [K, M, N]
+        spacetime:
+            Z:
+                space: [N]
+                time: [K.pos, M.coord]
+                opt: slip
+                frames:
+                    every: 100
+                    file: tmp/frames.jsonl
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    return Graphics(program, None, load)
 
 
 def create_gamma():
@@ -59,6 +85,23 @@ def create_gamma():
     return Graphics(program, metrics)
 
 
+def create_outerspace():
+    fname = "tests/integration/outerspace.yaml"
+    einsum = Einsum.from_file(fname)
+    mapping = Mapping.from_file(fname)
+    arch = Architecture.from_file(fname)
+    bindings = Bindings.from_file(fname)
+    format_ = Format.from_file(fname)
+
+    program = Program(einsum, mapping)
+    hardware = Hardware(arch, bindings, program)
+
+    program.add_einsum(0)
+    metrics = Metrics(program, hardware, format_)
+
+    return Graphics(program, metrics, True)
+
+
 def test_make_body_none():
     graphics = create_default()
     assert graphics.make_body().gen(0) == ""
@@ -82,11 +125,64 @@ def test_make_body_slip():
     assert graphics.make_body().gen(0) == hifiber
 
 
+def test_make_body_frames():
+    graphics = create_frames()
+    graphics.make_header()
+    assert graphics.make_body().gen(0) == "canvas.add_slip((n_pos,))"
+
+
+def test_make_body_frames_load():
+    graphics = create_frames(True)
+    graphics.make_header()
+    hifiber = "if (n_pos,) in timestamps.keys():\n" + \
+        "    timestamps[(n_pos,)] += 1\n" + \
+        "else:\n" + \
+        "    timestamps[(n_pos,)] = 1\n" + \
+        "counters.add((n_pos,), (timestamps[(n_pos,)] - 1,))"
+    assert graphics.make_body().gen(0) == hifiber
+
+
 def test_make_body_metrics():
     graphics = create_gamma()
     assert graphics.make_body().gen(0) == ""
 
 
+def test_make_body_load():
+    graphics = create_spacetime("", True)
+    graphics.make_header()
+    hifiber = "counters.add((n_pos,), (k_pos, m))"
+    assert graphics.make_body().gen(0) == hifiber
+
+
+def test_make_body_load_slip():
+    graphics = create_spacetime("slip", True)
+    graphics.make_header()
+    hifiber = "if (n_pos,) in timestamps.keys():\n" + \
+        "    timestamps[(n_pos,)] += 1\n" + \
+        "else:\n" + \
+        "    timestamps[(n_pos,)] = 1\n" + \
+        "counters.add((n_pos,), (timestamps[(n_pos,)] - 1,))"
+    assert graphics.make_body().gen(0) == hifiber
+
+
+def test_make_body_load_metrics():
+    graphics = create_outerspace()
+    graphics.make_header()
+    hifiber = "counters.add((m_pos,), (k_pos, n_pos))"
+    assert graphics.make_body().gen(0) == hifiber
+
+
+def test_make_dump_none():
+    assert create_default().make_dump().gen(0) == ""
+    assert create_spacetime("", True).make_dump().gen(0) == ""
+
+
+def test_make_dump_load():
+    graphics = create_outerspace()
+    hifiber = "metrics[\"T0\"][\"load\"] = counters.report()"
+    assert graphics.make_dump().gen(0) == hifiber
+
+
 def test_make_footer_none():
     graphics = create_default()
     assert graphics.make_footer().gen(0) == ""
@@ -99,11 +195,24 @@ def test_make_footer():
     assert graphics.make_footer().gen(0) == hifiber
 
 
+def test_make_footer_frames():
+    graphics = create_frames()
+    graphics.make_header()
+    assert graphics.make_footer().gen(0) == "canvas.close()"
+
+
 def test_make_footer_metrics():
     graphics = create_gamma()
     assert graphics.make_footer().gen(0) == ""
 
 
+def test_make_footer_load():
+    graphics = create_outerspace()
+    graphics.make_header()
+    hifiber = "counters.display(\"T0\")"
+    assert graphics.make_footer().gen(0) == hifiber
+
+
 def test_make_header_none():
     graphics = create_default()
     assert graphics.make_header().gen(0) == ""
@@ -125,3 +234,50 @@ def test_make_header_slip():
 def test_make_header_metrics():
     graphics = create_gamma()
     assert graphics.make_header().gen(0) == ""
+
+
+def test_make_header_load():
+    graphics = create_spacetime("slip", True)
+    hifiber = "counters = LoadCounters([\"N\"])\n" + \
+        "timestamps = {}"
+    assert graphics.make_header().gen(0) == hifiber
+
+
+def test_make_header_load_extents():
+    yaml = """
+    einsum:
+        declaration:
+            Z: [M, N]
+            A: [K, M]
+            B: [K, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        partitioning:
+            Z:
+                N: [uniform_shape(4)]
+        loop-order:
+            Z: [N1, K, M, N0]
+        spacetime:
+            Z:
+                space: [N0]
+                time: [N1, K, M]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    graphics = Graphics(program, None, True)
+
+    hifiber = "counters = LoadCounters([\"N0\"], [4])"
+    assert graphics.make_header().gen(0) == hifiber
+
+
+def test_make_header_load_metrics():
+    graphics = create_outerspace()
+    hifiber = "counters = LoadCounters([\"M\"])"
+    assert graphics.make_header().gen(0) == hifiber
+
+
+def test_make_header_frames():
+    graphics = create_frames()
+    hifiber = "canvas = FrameCanvas(\"tmp/frames.jsonl\", 100, slip=True, dense=True)"
+    assert graphics.make_header().gen(0) == hifiber
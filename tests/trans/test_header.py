@@ -178,6 +178,34 @@ def test_make_output_metrics_shape():
     assert header.make_output().gen(0) == hifiber
 
 
+def test_make_output_tile():
+    exprs = """
+            - Z[m, n] = A[k, m] * B[k, n]
+    """
+
+    hifiber = "Z_N = Tensor(rank_ids=[\"N\"], name=\"Z\")\n" + \
+        "z_n = Z_N.getRoot()"
+
+    header = build_header(exprs, "")
+    tensor = header.program.get_equation().get_output()
+    tensor.pop()
+    assert header.make_output_tile(tensor).gen(depth=0) == hifiber
+
+
+def test_make_output_tile_shape():
+    exprs = """
+            - Z[m, n] = A[k, m]
+    """
+
+    hifiber = "Z_N = Tensor(rank_ids=[\"N\"], name=\"Z\", shape=[N])\n" + \
+        "z_n = Z_N.getRoot()"
+
+    header = build_header(exprs, "")
+    tensor = header.program.get_equation().get_output()
+    tensor.pop()
+    assert header.make_output_tile(tensor).gen(depth=0) == hifiber
+
+
 def test_make_swizzle_bad():
     header = build_matmul_header("")
     tensor = Tensor("A", ["K", "M"])
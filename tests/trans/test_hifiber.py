@@ -1,3 +1,5 @@
+import pytest
+
 from teaal.parse import *
 from teaal.trans.hifiber import HiFiber
 
@@ -12,6 +14,538 @@ def test_translate_no_loops():
     assert str(HiFiber(einsum, mapping)) == hifiber
 
 
+def test_translate_tile_sizes():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K]
+        Z: []
+      expressions:
+      - Z[] = A[k]
+    mapping:
+      partitioning:
+        Z:
+          K: [uniform_shape(K0)]
+      tile-sizes:
+        K0: 16
+    """
+    hifiber = HiFiber(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    assert str(hifiber).split("\n")[0] == "K0 = 16"
+
+
+def test_translate_tile_sizes_unresolved():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K]
+        Z: []
+      expressions:
+      - Z[] = A[k]
+    mapping:
+      partitioning:
+        Z:
+          K: [uniform_shape(K0)]
+      tile-sizes:
+        K0: auto
+    """
+    with pytest.raises(ValueError) as excinfo:
+        HiFiber(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    assert str(excinfo.value) == "Unresolved tile size: K0"
+
+
+def test_translate_dense():
+    yaml = """
+    einsum:
+      declaration:
+        A: [M, K]
+        B: [M]
+        Z: [M, K]
+      expressions:
+      - Z[m, k] = A[m, k] * B[m]
+    format:
+      A:
+        default:
+          rank-order: [M, K]
+          M:
+            format: U
+          K:
+            format: U
+      B:
+        default:
+          rank-order: [M]
+          M:
+            format: C
+      Z:
+        default:
+          rank-order: [M, K]
+          M:
+            format: U
+          K:
+            format: U
+    """
+    hifiber = "Z_MK = Tensor(rank_ids=[\"M\", \"K\"], name=\"Z\")\n" + \
+        "z_m = Z_MK.getRoot()\n" + \
+        "a_m = A_MK.getRoot()\n" + \
+        "b_m = B_M.getRoot()\n" + \
+        "for m, (z_k, (a_k, b_val)) in z_m << (a_m & b_m):\n" + \
+        "    a_k_payloads = a_k.getPayloads()\n" + \
+        "    if len(a_k_payloads) < K:\n" + \
+        "        a_k_payloads = [a_k.getPayload(k) for k in range(K)]\n" + \
+        "    for k in range(K):\n" + \
+        "        z_ref = z_k.getPayloadRef(k)\n" + \
+        "        a_val = a_k_payloads[k]\n" + \
+        "        z_ref <<= a_val * b_val"
+
+    translated = HiFiber(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        None,
+        None,
+        Format.from_str(yaml))
+    assert str(translated) == hifiber
+
+
+def build_fuse(t_order, z_order):
+    yaml = """
+    einsum:
+      declaration:
+        A: [M, K]
+        B: [K, N]
+        C: [N]
+        T: [M, N]
+        Z: [M]
+      expressions:
+      - T[m, n] = A[m, k] * B[k, n]
+      - Z[m] = T[m, n] * C[n]
+    mapping:
+      loop-order:
+        T: """ + t_order + """
+        Z: """ + z_order + """
+    """
+    return Einsum.from_str(yaml), Mapping.from_str(yaml)
+
+
+def test_translate_fuse():
+    einsum, mapping = build_fuse("[M, K, N]", "[M, N]")
+    hifiber = "a_m = A_MK.getRoot()\n" + \
+        "b_k = B_KN.getRoot()\n" + \
+        "Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\")\n" + \
+        "z_m = Z_M.getRoot()\n" + \
+        "c_n = C_N.getRoot()\n" + \
+        "for m, (z_ref, a_k) in z_m << a_m:\n" + \
+        "    T_N = Tensor(rank_ids=[\"N\"], name=\"T\")\n" + \
+        "    t_n = T_N.getRoot()\n" + \
+        "    for k, (a_val, b_n) in a_k & b_k:\n" + \
+        "        for n, (t_ref, b_val) in t_n << b_n:\n" + \
+        "            t_ref += a_val * b_val\n" + \
+        "    for n, (t_val, c_val) in t_n & c_n:\n" + \
+        "        z_ref += t_val * c_val"
+
+    assert str(HiFiber(einsum, mapping, opts=["fuse"])) == hifiber
+
+
+def test_translate_fuse_scalar():
+    einsum, mapping = build_fuse("[M, N, K]", "[M, N]")
+    hifiber = "B_NK = B_KN.swizzleRanks(rank_ids=[\"N\", \"K\"])\n" + \
+        "a_m = A_MK.getRoot()\n" + \
+        "b_n = B_NK.getRoot()\n" + \
+        "Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\")\n" + \
+        "z_m = Z_M.getRoot()\n" + \
+        "c_n = C_N.getRoot()\n" + \
+        "for m, (z_ref, a_k) in z_m << a_m:\n" + \
+        "    for n, (b_k, c_val) in b_n & c_n:\n" + \
+        "        T_ = Tensor(rank_ids=[], name=\"T\")\n" + \
+        "        t_ref = T_.getRoot()\n" + \
+        "        for k, (a_val, b_val) in a_k & b_k:\n" + \
+        "            t_ref += a_val * b_val\n" + \
+        "        t_val = t_ref\n" + \
+        "        z_ref += t_val * c_val"
+
+    assert str(HiFiber(einsum, mapping, opts=["fuse"])) == hifiber
+
+
+def test_translate_fuse_loop_order():
+    einsum, mapping = build_fuse("[M, K, N]", "[N, M]")
+    assert str(HiFiber(einsum, mapping, opts=["fuse"])) == str(
+        HiFiber(einsum, mapping))
+
+
+def test_translate_fuse_union_intersected():
+    yaml = """
+    einsum:
+      declaration:
+        A: [M, K]
+        B: [M, K]
+        C: [M]
+        T: [M]
+        Z: [M]
+      expressions:
+      - T[m] = A[m, k] * B[m, k]
+      - Z[m] = T[m] + C[m]
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+
+    # The producer intersects A and B, so the union cannot take its place
+    assert str(HiFiber(einsum, mapping, opts=["fuse"])) == str(
+        HiFiber(einsum, mapping))
+
+
+def test_translate_func():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K]
+        Z: [M]
+      expressions:
+      - Z[m] = a * A[k]
+    """
+    hifiber = "def kernel(A_K, a, M):\n" + \
+        "    Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\", shape=[M])\n" + \
+        "    z_m = Z_M.getRoot()\n" + \
+        "    a_k = A_K.getRoot()\n" + \
+        "    for m, z_ref in z_m.iterRangeShapeRef(0, M, 1):\n" + \
+        "        for k, a_val in a_k:\n" + \
+        "            z_ref += a * a_val\n" + \
+        "    return Z_M"
+
+    translated = HiFiber(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        opts=["func"])
+    assert str(translated) == hifiber
+    assert translated.get_params() == ["A_K", "a", "M"]
+
+
+def test_translate_func_metrics():
+    fname = "tests/integration/gamma.yaml"
+    hifiber = HiFiber(
+        Einsum.from_file(fname),
+        Mapping.from_file(fname),
+        Architecture.from_file(fname),
+        Bindings.from_file(fname),
+        Format.from_file(fname),
+        opts=["func"])
+
+    assert str(hifiber).split("\n")[0] == "def kernel(A_MK, B_KN, K, M, N):"
+    assert str(hifiber).split("\n")[-1] == "    return (Z_MN, metrics)"
+
+
+def test_translate_checkpoint():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K, M]
+        Z: [M]
+      expressions:
+      - Z[m] = A[k, m]
+    mapping:
+      rank-order:
+        A: [M, K]
+    """
+    hifiber = "checkpoint = Checkpoint(\"tmp/ck.ckpt\", every=10)\n" + \
+        "if checkpoint.done(\"Z\"):\n" + \
+        "    Z_M = checkpoint.load(\"Z_M\")\n" + \
+        "else:\n" + \
+        "    Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\")\n" + \
+        "    Z_M = checkpoint.restore(\"Z\", Z_M)\n" + \
+        "    z_m = Z_M.getRoot()\n" + \
+        "    a_m = A_MK.getRoot()\n" + \
+        "    for m, (z_ref, a_k) in z_m << a_m:\n" + \
+        "        if checkpoint.todo(\"Z\", m):\n" + \
+        "            for k, a_val in a_k:\n" + \
+        "                z_ref += a_val\n" + \
+        "            checkpoint.step(\"Z\", m, Z_M)\n" + \
+        "    checkpoint.finish(\"Z\", {\"Z_M\": Z_M})"
+
+    assert str(
+        HiFiber(
+            Einsum.from_str(yaml),
+            Mapping.from_str(yaml),
+            opts=["checkpoint=tmp/ck.ckpt", "checkpoint-every=10"])) == hifiber
+
+
+def test_translate_checkpoint_metrics():
+    fname = "tests/integration/gamma.yaml"
+    with open(fname, "r") as f:
+        yaml = f.read()
+    yaml = yaml[:yaml.index("  spacetime:")] + yaml[yaml.index("format:"):]
+
+    with pytest.raises(ValueError) as excinfo:
+        HiFiber(
+            Einsum.from_str(yaml),
+            Mapping.from_str(yaml),
+            Architecture.from_str(yaml),
+            Bindings.from_str(yaml),
+            Format.from_str(yaml),
+            opts=["checkpoint=tmp/g.ckpt"])
+
+    assert str(
+        excinfo.value) == "Checkpointing cannot be combined with metrics collection"
+
+
+def test_translate_checkpoint_spacetime():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K, M]
+        Z: [M]
+      expressions:
+      - Z[m] = A[k, m]
+    mapping:
+      spacetime:
+        Z:
+          space: [M]
+          time: [K]
+    """
+
+    with pytest.raises(ValueError) as excinfo:
+        HiFiber(
+            Einsum.from_str(yaml),
+            Mapping.from_str(yaml),
+            opts=["checkpoint=tmp/ck.ckpt"])
+
+    assert str(
+        excinfo.value) == "Checkpointing cannot be combined with spacetime"
+
+
+def test_translate_progress():
+    yaml = """
+    einsum:
+      declaration:
+        A: [K, M]
+        Z: [M]
+      expressions:
+      - Z[m] = A[k, m]
+    mapping:
+      rank-order:
+        A: [M, K]
+    """
+    hifiber = "progress = Progress(\"tmp/status\")\n" + \
+        "Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\")\n" + \
+        "z_m = Z_M.getRoot()\n" + \
+        "a_m = A_MK.getRoot()\n" + \
+        "progress.start(\"Z\", A_MK)\n" + \
+        "for m, (z_ref, a_k) in z_m << a_m:\n" + \
+        "    for k, a_val in a_k:\n" + \
+        "        z_ref += a_val\n" + \
+        "    progress.step(m)\n" + \
+        "progress.end()"
+
+    translated = HiFiber(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        opts=["progress=tmp/status"])
+    assert str(translated) == hifiber
+
+
+def test_translate_progress_fuse():
+    einsum, mapping = build_fuse("[M, K, N]", "[M, N]")
+    hifiber = str(HiFiber(einsum, mapping, opts=["fuse", "progress"]))
+
+    assert hifiber.split("\n")[0] == "progress = Progress()"
+    assert "progress.start(\"T+Z\", A_MK)\nfor m, " in hifiber
+    assert hifiber.endswith("    progress.step(m)\nprogress.end()")
+    assert hifiber.count("progress.step") == 1
+
+
+def test_translate_reuse():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+    hifiber = str(HiFiber(einsum, mapping))
+
+    assert hifiber.count("tmp0.splitUniform(4, depth=0)") == 1
+    assert hifiber.count(
+        "A_K1MK0 = A_K1K0M.swizzleRanks(rank_ids=[\"K1\", \"M\", \"K0\"])") == 1
+    assert "C_K1NK0 = C_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])" in hifiber
+    assert "del" not in hifiber
+
+
+def test_translate_reuse_del():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+
+    # A is still needed by Z
+    hifiber = "T_MN = Tensor(rank_ids=[\"M\", \"N\"], name=\"T\")\n" + \
+        "tmp0 = A_KM\n" + \
+        "tmp1 = tmp0.splitUniform(4, depth=0)\n" + \
+        "A_K1K0M = tmp1\n" + \
+        "A_K1K0M.setRankIds(rank_ids=[\"K1\", \"K0\", \"M\"])\n" + \
+        "tmp2 = B_KN\n" + \
+        "tmp3 = tmp2.splitUniform(4, depth=0)\n" + \
+        "B_K1K0N = tmp3\n" + \
+        "B_K1K0N.setRankIds(rank_ids=[\"K1\", \"K0\", \"N\"])\n" + \
+        "t_m = T_MN.getRoot()\n" + \
+        "A_K1MK0 = A_K1K0M.swizzleRanks(rank_ids=[\"K1\", \"M\", \"K0\"])\n" + \
+        "B_K1NK0 = B_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])\n" + \
+        "a_k1 = A_K1MK0.getRoot()\n" + \
+        "b_k1 = B_K1NK0.getRoot()\n" + \
+        "for k1, (a_m, b_n) in a_k1 & b_k1:\n" + \
+        "    for m, (t_n, a_k0) in t_m << a_m:\n" + \
+        "        for n, (t_ref, b_k0) in t_n << b_n:\n" + \
+        "            for k0, (a_val, b_val) in a_k0 & b_k0:\n" + \
+        "                t_ref += a_val * b_val\n" + \
+        "del t_m, a_k1, b_k1, B_K1K0N, tmp2, tmp3, B_K1NK0\n" + \
+        "Z_MN = Tensor(rank_ids=[\"M\", \"N\"], name=\"Z\")\n" + \
+        "tmp6 = C_KN\n" + \
+        "tmp7 = tmp6.splitUniform(4, depth=0)\n" + \
+        "C_K1K0N = tmp7\n" + \
+        "C_K1K0N.setRankIds(rank_ids=[\"K1\", \"K0\", \"N\"])\n" + \
+        "z_m = Z_MN.getRoot()\n" + \
+        "C_K1NK0 = C_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])\n" + \
+        "a_k1 = A_K1MK0.getRoot()\n" + \
+        "c_k1 = C_K1NK0.getRoot()\n" + \
+        "for k1, (a_m, c_n) in a_k1 & c_k1:\n" + \
+        "    for m, (z_n, a_k0) in z_m << a_m:\n" + \
+        "        for n, (z_ref, c_k0) in z_n << c_n:\n" + \
+        "            for k0, (a_val, c_val) in a_k0 & c_k0:\n" + \
+        "                z_ref += a_val * c_val"
+
+    assert str(HiFiber(einsum, mapping, opts=["del"])) == hifiber
+
+
+def test_translate_reuse_opt():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+
+    hifiber = "T_MN = Tensor(rank_ids=[\"M\", \"N\"], name=\"T\")\n" + \
+        "A_K1K0M = A_KM.splitUniform(4, depth=0)\n" + \
+        "A_K1K0M.setRankIds(rank_ids=[\"K1\", \"K0\", \"M\"])\n" + \
+        "B_K1K0N = B_KN.splitUniform(4, depth=0)\n" + \
+        "B_K1K0N.setRankIds(rank_ids=[\"K1\", \"K0\", \"N\"])\n" + \
+        "t_m = T_MN.getRoot()\n" + \
+        "A_K1MK0 = A_K1K0M.swizzleRanks(rank_ids=[\"K1\", \"M\", \"K0\"])\n" + \
+        "B_K1NK0 = B_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])\n" + \
+        "a_k1 = A_K1MK0.getRoot()\n" + \
+        "b_k1 = B_K1NK0.getRoot()\n" + \
+        "for k1, (a_m, b_n) in a_k1 & b_k1:\n" + \
+        "    for m, (t_n, a_k0) in t_m << a_m:\n" + \
+        "        for n, (t_ref, b_k0) in t_n << b_n:\n" + \
+        "            for k0, (a_val, b_val) in a_k0 & b_k0:\n" + \
+        "                t_ref += a_val * b_val\n" + \
+        "del t_m, a_k1, b_k1, B_K1K0N, B_K1NK0\n" + \
+        "Z_MN = Tensor(rank_ids=[\"M\", \"N\"], name=\"Z\")\n" + \
+        "C_K1K0N = C_KN.splitUniform(4, depth=0)\n" + \
+        "C_K1K0N.setRankIds(rank_ids=[\"K1\", \"K0\", \"N\"])\n" + \
+        "z_m = Z_MN.getRoot()\n" + \
+        "C_K1NK0 = C_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])\n" + \
+        "a_k1 = A_K1MK0.getRoot()\n" + \
+        "c_k1 = C_K1NK0.getRoot()\n" + \
+        "for k1, (a_m, c_n) in a_k1 & c_k1:\n" + \
+        "    for m, (z_n, a_k0) in z_m << a_m:\n" + \
+        "        for n, (z_ref, c_k0) in z_n << c_n:\n" + \
+        "            for k0, (a_val, c_val) in a_k0 & c_k0:\n" + \
+        "                z_ref += a_val * c_val"
+
+    assert str(HiFiber(einsum, mapping, opts=["del", "opt"])) == hifiber
+
+
+def test_translate_reuse_opt_passes():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+
+    assert str(HiFiber(einsum, mapping, opts=["opt=fold"])) == str(
+        HiFiber(einsum, mapping))
+
+    with pytest.raises(ValueError) as excinfo:
+        HiFiber(einsum, mapping, opts=["opt=fold,foo"])
+    assert str(excinfo.value) == "Unknown optimization: foo"
+
+
+def test_translate_nodes():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+    hifiber = HiFiber(einsum, mapping)
+
+    nodes = hifiber.get_nodes()
+    assert sorted(nodes.keys()) == [0, 1]
+    assert str(HiFiber(einsum, mapping, opts=["del"], nodes=nodes)) == str(
+        HiFiber(einsum, mapping, opts=["del"]))
+
+
+def test_translate_peak_live():
+    einsum = Einsum.from_file("tests/integration/test_reuse.yaml")
+    mapping = Mapping.from_file("tests/integration/test_reuse.yaml")
+
+    assert HiFiber(einsum, mapping).get_peak_live() == 11
+    assert HiFiber(einsum, mapping, opts=["del"]).get_peak_live() == 9
+
+
+def test_translate_del_intermediate():
+    yaml = """
+    einsum:
+      declaration:
+        A: [M]
+        T: [M]
+        Y: [M]
+        Z: [M]
+      expressions:
+      - T[m] = A[m]
+      - Z[m] = T[m]
+      - Y[m] = Z[m]
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+
+    hifiber = "T_M = Tensor(rank_ids=[\"M\"], name=\"T\")\n" + \
+        "t_m = T_M.getRoot()\n" + \
+        "a_m = A_M.getRoot()\n" + \
+        "for m, (t_ref, a_val) in t_m << a_m:\n" + \
+        "    t_ref <<= a_val\n" + \
+        "del t_m, a_m\n" + \
+        "Z_M = Tensor(rank_ids=[\"M\"], name=\"Z\")\n" + \
+        "z_m = Z_M.getRoot()\n" + \
+        "t_m = T_M.getRoot()\n" + \
+        "for m, (z_ref, t_val) in z_m << t_m:\n" + \
+        "    z_ref <<= t_val\n" + \
+        "del z_m, t_m, T_M\n" + \
+        "Y_M = Tensor(rank_ids=[\"M\"], name=\"Y\")\n" + \
+        "y_m = Y_M.getRoot()\n" + \
+        "z_m = Z_M.getRoot()\n" + \
+        "for m, (y_ref, z_val) in y_m << z_m:\n" + \
+        "    y_ref <<= z_val"
+
+    translated = HiFiber(einsum, mapping, opts=["del"])
+    assert str(translated) == hifiber
+    assert translated.get_peak_live() == 3
+    assert HiFiber(einsum, mapping).get_peak_live() == 4
+
+
+def test_translate_reuse_different_split():
+    with open("tests/integration/test_reuse.yaml", "r") as f:
+        yaml = f.read().replace("uniform_shape(4)]\n  loop-order",
+                                "uniform_shape(8)]\n  loop-order")
+    hifiber = str(HiFiber(Einsum.from_str(yaml), Mapping.from_str(yaml)))
+
+    # A is split into the same ranks, but with a different shape
+    assert hifiber.count("A_K1K0M = tmp") == 2
+    assert hifiber.count("splitUniform(8, depth=0)") == 2
+
+
+def test_translate_reuse_overwritten():
+    yaml = """
+    einsum:
+      declaration:
+        A: [M, N]
+        T: [M, N]
+        Y: [N, M]
+        Z: [N, M]
+      expressions:
+      - Y[n, m] = T[m, n]
+      - T[m, n] = A[m, n]
+      - Z[n, m] = T[m, n]
+    mapping:
+      loop-order:
+        Y: [N, M]
+        Z: [N, M]
+    """
+    hifiber = str(HiFiber(Einsum.from_str(yaml), Mapping.from_str(yaml)))
+
+    # T is rewritten between Y and Z, so it must be swizzled again
+    assert hifiber.count(
+        "T_NM = T_MN.swizzleRanks(rank_ids=[\"N\", \"M\"])") == 2
+
+
 def test_translate_defaults():
     einsum = Einsum.from_file("tests/integration/test_input_no_mapping.yaml")
     mapping = Mapping.from_file(
@@ -440,6 +974,47 @@ def test_hifiber_conv():
     assert str(HiFiber(einsum, mapping)) == hifiber
 
 
+def test_hifiber_conv_halo_view():
+    yaml = """
+    einsum:
+        declaration:
+            F: [S]
+            I: [W]
+            O: [Q]
+        expressions:
+            - O[q] = I[q + s] * F[s]
+    mapping:
+        partitioning:
+            O:
+                Q: [uniform_shape(10)]
+                W: [follow(Q)]
+        loop-order:
+            O: [Q1, Q0, S]
+    """
+
+    # I is never copied into overlapping tiles; each tile of Q views the
+    # window of I it needs
+    hifiber = "O_Q1Q0 = Tensor(rank_ids=[\"Q1\", \"Q0\"], name=\"O\", shape=[Q, Q])\n" + \
+        "o_q1 = O_Q1Q0.getRoot()\n" + \
+        "i_w = I_W.getRoot()\n" + \
+        "f_s = F_S.getRoot()\n" + \
+        "for q1_pos, (q1, o_q0) in enumerate(o_q1.iterRangeShapeRef(0, Q, Q0)):\n" + \
+        "    i_w_view = i_w.getRange(q1, -1 + Q0 + S)\n" + \
+        "    for q0, o_ref in o_q0.iterRangeShapeRef(int(q1 + 1) - 1, int(min(q1 + Q0, Q) + 1) - 1, 1):\n" + \
+        "        for s, (i_val, f_val) in i_w_view.project(trans_fn=lambda w: w + -1 * q0, interval=(0, S)) & f_s:\n" + \
+        "            o_ref += i_val * f_val\n" + \
+        "tmp0 = O_Q1Q0\n" + \
+        "tmp1 = tmp0.mergeRanks(depth=0, levels=1, coord_style=\"absolute\")\n" + \
+        "tmp1.setRankIds(rank_ids=[\"Q\"])\n" + \
+        "O_Q = tmp1"
+
+    assert str(
+        HiFiber(
+            Einsum.from_str(yaml),
+            Mapping.from_str(yaml),
+            opts=["halo=view"])) == hifiber
+
+
 def test_hifiber_static_flattening():
     yaml = """
     einsum:
@@ -571,6 +1146,81 @@ def test_hifiber_dyn_flattening():
     assert str(HiFiber(einsum, mapping)) == hifiber
 
 
+def test_hifiber_dyn_flattening_lazy():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            B: [K, N]
+            Z: [M, N]
+        expressions:
+            - Z[m, n] = A[k, m] * B[k, n]
+    mapping:
+        partitioning:
+            Z:
+                M: [uniform_shape(6)]
+                K: [uniform_occupancy(A.4)]
+                (M0, K0): [flatten()]
+                M0K0: [uniform_occupancy(A.5)]
+        loop-order:
+            Z: [M1, K1, M0K01, N, M0K00]
+    """
+    einsum = Einsum.from_str(yaml)
+    mapping = Mapping.from_str(yaml)
+
+    hifiber = "Z_M1NM0 = Tensor(rank_ids=[\"M1\", \"N\", \"M0\"], name=\"Z\")\n" + \
+        "tmp0 = A_KM\n" + \
+        "tmp1 = tmp0.splitUniform(6, depth=1)\n" + \
+        "A_KM1M0 = tmp1\n" + \
+        "A_KM1M0.setRankIds(rank_ids=[\"K\", \"M1\", \"M0\"])\n" + \
+        "z_m1 = Z_M1NM0.getRoot()\n" + \
+        "A_M1KM0 = A_KM1M0.swizzleRanks(rank_ids=[\"M1\", \"K\", \"M0\"])\n" + \
+        "b_k = B_KN.getRoot()\n" + \
+        "a_m1 = A_M1KM0.getRoot()\n" + \
+        "B_KN = Tensor.fromFiber(rank_ids=[\"K\", \"N\"], fiber=b_k, name=\"B\")\n" + \
+        "for m1, (z_n, a_k) in z_m1 << a_m1:\n" + \
+        "    A_KM0 = Tensor.fromFiber(rank_ids=[\"K\", \"M0\"], fiber=a_k, name=\"A\")\n" + \
+        "    tmp2 = A_KM0\n" + \
+        "    tmp3 = tmp2.splitEqual(4)\n" + \
+        "    A_K1K0M0 = tmp3\n" + \
+        "    A_K1K0M0.setRankIds(rank_ids=[\"K1\", \"K0\", \"M0\"])\n" + \
+        "    A_K1M0K0 = A_K1K0M0.swizzleRanks(rank_ids=[\"K1\", \"M0\", \"K0\"])\n" + \
+        "    tmp4 = A_K1M0K0\n" + \
+        "    A_K1M0K0_flat = tmp4\n" + \
+        "    A_K1M0K0_flat.setRankIds(rank_ids=[\"K1\", \"M0\", \"K0\"])\n" + \
+        "    a_k1 = A_K1M0K0_flat.getRoot()\n" + \
+        "    tmp5 = B_KN\n" + \
+        "    tmp6 = tmp5.splitNonUniform(a_k1)\n" + \
+        "    B_K1K0N = tmp6\n" + \
+        "    B_K1K0N.setRankIds(rank_ids=[\"K1\", \"K0\", \"N\"])\n" + \
+        "    B_K1NK0 = B_K1K0N.swizzleRanks(rank_ids=[\"K1\", \"N\", \"K0\"])\n" + \
+        "    b_k1 = B_K1NK0.getRoot()\n" + \
+        "    for k1, (a_m0k0, b_n) in a_k1 & b_k1:\n" + \
+        "        A_M0K0 = Tensor.fromFiber(rank_ids=[\"M0\", \"K0\"], fiber=a_m0k0, name=\"A\")\n" + \
+        "        tmp7 = A_M0K0\n" + \
+        "        tmp8 = LazyFlatten(tmp7, 1).splitEqual(5)\n" + \
+        "        A_M0K01M0K00 = tmp8\n" + \
+        "        A_M0K01M0K00.setRankIds(rank_ids=[\"M0K01\", \"M0K00\"])\n" + \
+        "        a_m0k01 = A_M0K01M0K00.getRoot()\n" + \
+        "        for m0k01, a_m0k00 in a_m0k01:\n" + \
+        "            for n, (z_m0, b_k0) in z_n << b_n:\n" + \
+        "                for (m0, k0), a_val in a_m0k00:\n" + \
+        "                    z_ref = z_m0.getPayloadRef(m0)\n" + \
+        "                    b_val = b_k0.getPayload(k0)\n" + \
+        "                    z_ref += a_val * b_val\n" + \
+        "tmp9 = Z_M1NM0\n" + \
+        "tmp10 = tmp9.swizzleRanks(rank_ids=[\"M1\", \"M0\", \"N\"])\n" + \
+        "tmp11 = tmp10.mergeRanks(depth=0, levels=1, coord_style=\"absolute\")\n" + \
+        "tmp11.setRankIds(rank_ids=[\"M\", \"N\"])\n" + \
+        "Z_MN = tmp11"
+
+    assert str(
+        HiFiber(
+            einsum,
+            mapping,
+            opts=["flattening=lazy"])) == hifiber
+
+
 def test_hifiber_traffic():
     yaml = """
     einsum:
@@ -0,0 +1,85 @@
+import os
+
+from teaal.trans.kernel import Kernel
+from teaal.trans.snapshot import Snapshot
+
+YAML = """
+einsum:
+  declaration:
+    A: [K, M]
+    B: [K, N]
+    Z: [M, N]
+  expressions:
+  - Z[m, n] = A[k, m] * B[k, n]
+"""
+
+
+def test_hash():
+    kernel = Kernel(YAML, "cache")
+    assert kernel.get_hash() == Kernel(YAML, "cache", ["func"]).get_hash()
+    assert kernel.get_hash() != Kernel(YAML, "cache", ["del"]).get_hash()
+    assert kernel.get_hash() != Kernel(YAML + "\n", "cache").get_hash()
+
+
+def test_hash_compiler(monkeypatch):
+    kernel = Kernel(YAML, "cache")
+
+    monkeypatch.setattr(Kernel, "PRELUDE", Kernel.PRELUDE + "import os\n")
+    assert kernel.get_hash() != Kernel(YAML, "cache").get_hash()
+    monkeypatch.undo()
+
+    monkeypatch.setattr(Snapshot, "source", "foo")
+    assert kernel.get_hash() != Kernel(YAML, "cache").get_hash()
+
+
+def test_get_path(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    kernel = Kernel(YAML, cache_dir)
+
+    path = kernel.get_path()
+    assert path == os.path.join(
+        cache_dir, "kernel_" + kernel.get_hash() + ".py")
+    assert os.listdir(cache_dir) == [os.path.basename(path)]
+
+    with open(path, "r") as f:
+        module = f.read()
+    assert module.startswith(Kernel.PRELUDE)
+    assert "def kernel(A_KM, B_KN):\n" in module
+    assert module.endswith("    return Z_MN\n")
+
+
+def test_get_path_cached(tmp_path):
+    cache_dir = str(tmp_path)
+    path = Kernel(YAML, cache_dir).get_path()
+    with open(path, "w") as f:
+        f.write("cached")
+
+    assert Kernel(YAML, cache_dir).get_path() == path
+    with open(path, "r") as f:
+        assert f.read() == "cached"
+
+
+def test_from_file(tmp_path):
+    filename = tmp_path / "input.yaml"
+    filename.write_text(YAML)
+
+    kernel = Kernel.from_file(str(filename), str(tmp_path))
+    assert kernel.get_hash() == Kernel(YAML, str(tmp_path)).get_hash()
+
+
+def test_load(tmp_path):
+    cache_dir = str(tmp_path)
+    kernel = Kernel(YAML, cache_dir)
+    with open(kernel.get_path(), "w") as f:
+        f.write("def kernel(A_KM, B_KN):\n    return A_KM + B_KN\n")
+
+    func = kernel.load()
+    assert func(1, 2) == 3
+    assert kernel.load() is func
+
+
+def test_translate():
+    hifiber = Kernel.translate(YAML, ["del"])
+    assert str(hifiber).split("\n")[
+        0] == "Z_MN = Tensor(rank_ids=[\"M\", \"N\"], name=\"Z\")"
+    assert str(hifiber).split("\n")[-1] == "            z_ref += a_val * b_val"
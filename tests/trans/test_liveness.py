@@ -0,0 +1,69 @@
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.trans.liveness import Liveness
+
+
+def build_liveness():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K]
+            B: [K]
+            T: [K]
+            Z: [K]
+        expressions:
+            - T[k] = a * A[k]
+            - Z[k] = T[k] * B[k]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    liveness = Liveness()
+    for i in range(2):
+        program.add_einsum(i)
+        liveness.add_einsum(program, i)
+        program.reset()
+
+    return liveness
+
+
+def test_add_einsum():
+    liveness = build_liveness()
+
+    assert liveness.get_inputs() == ["A_K", "B_K"]
+    assert liveness.get_variables() == ["a"]
+    assert liveness.get_outputs() == ["Z_K"]
+    assert liveness.get_produced(0, 1) == ["T_K", "Z_K"]
+
+
+def test_get_dead():
+    liveness = build_liveness()
+    liveness.add_root(0, "a_k")
+
+    assert liveness.get_dead([(0, 0), (1, 1)], False, True) == [[], []]
+    assert liveness.get_peak_live() == 4
+
+    assert liveness.get_dead(
+        [(0, 0), (1, 1)], True, True) == [["a_k"], []]
+    assert liveness.get_dead([(0, 1)], True, True) == [[]]
+
+
+def test_get_dead_transform():
+    liveness = build_liveness()
+    liveness.add_use(0, "A_K_new")
+    liveness.add_transform(0, "A_K_new", ["tmp0"])
+    liveness.add_use(1, "A_K_new")
+
+    # A shared transform dies after its last use
+    assert liveness.get_dead(
+        [(0, 0), (1, 1), (2, 2)], True, True)[1] == ["A_K_new", "tmp0", "T_K"]
+
+    # Otherwise, it dies with the Einsum that created it
+    assert liveness.get_dead(
+        [(0, 0), (1, 1)], True, False) == [["A_K_new", "tmp0"], []]
+
+
+def test_remove_output():
+    liveness = build_liveness()
+    liveness.remove_output(0, "T_K")
+
+    assert liveness.get_produced(0, 1) == ["Z_K"]
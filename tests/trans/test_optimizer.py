@@ -0,0 +1,154 @@
+import pytest
+
+from teaal.hifiber import *
+from teaal.trans.optimizer import Optimizer
+
+
+def build_copy(src, dst):
+    return SAssign(AVar(dst), EVar(src))
+
+
+def build_split(obj, dst):
+    args = [AJust(EInt(4)), AParam("depth", EInt(0))]
+    return SAssign(AVar(dst), EMethod(EVar(obj), "splitUniform", args))
+
+
+def build_metrics(name, arg):
+    return SExpr(EMethod(EVar("Metrics"), name, [AJust(EString(arg))]))
+
+
+def build_set_rank_ids(name, rank_ids):
+    arg = AParam("rank_ids", EList([EString(rank) for rank in rank_ids]))
+    return SExpr(EMethod(EVar(name), "setRankIds", [arg]))
+
+
+def test_bad_pass():
+    with pytest.raises(ValueError) as excinfo:
+        Optimizer(["foo"])
+    assert str(excinfo.value) == "Unknown optimization: foo"
+
+
+def test_copy_dead():
+    stmt = SBlock([build_copy("A_KM", "tmp0"),
+                   build_split("tmp0", "tmp1"),
+                   build_copy("tmp1", "A_K1K0M"),
+                   SDel([EVar("tmp0"), EVar("tmp1"), EVar("A_KM")])])
+
+    hifiber = "A_K1K0M = A_KM.splitUniform(4, depth=0)\n" + \
+        "del A_KM"
+    assert Optimizer(Optimizer.PASSES).optimize(stmt).gen(0) == hifiber
+
+
+def test_input_unchanged():
+    stmt = SBlock([build_copy("A_KM", "tmp0"),
+                   build_split("tmp0", "A_K1K0M")])
+    Optimizer(Optimizer.PASSES).optimize(stmt)
+
+    hifiber = "tmp0 = A_KM\n" + \
+        "A_K1K0M = tmp0.splitUniform(4, depth=0)"
+    assert stmt.gen(0) == hifiber
+
+
+def test_reused_temps():
+    stmt = SBlock([build_copy("A_KM", "tmp0"),
+                   build_split("tmp0", "tmp1"),
+                   build_copy("tmp1", "A_K1K0M"),
+                   build_copy("B_KN", "tmp0"),
+                   build_split("tmp0", "tmp1"),
+                   build_copy("tmp1", "B_K1K0N")])
+
+    hifiber = "A_K1K0M = A_KM.splitUniform(4, depth=0)\n" + \
+        "B_K1K0N = B_KN.splitUniform(4, depth=0)"
+    assert Optimizer(Optimizer.PASSES).optimize(stmt).gen(0) == hifiber
+
+
+def test_copy_loop_redefined():
+    body = SBlock([SExpr(EFunc("f", [AJust(EVar("tmp0"))])),
+                   build_copy("i", "a")])
+    stmt = SBlock([build_copy("a", "tmp0"), SFor(PVar("i"), EVar("xs"), body)])
+
+    hifiber = "tmp0 = a\n" + \
+        "for i in xs:\n" + \
+        "    f(tmp0)\n" + \
+        "    a = i"
+    assert Optimizer(Optimizer.PASSES).optimize(stmt).gen(0) == hifiber
+
+
+def test_copy_import_redefined():
+    stmt = SBlock([build_copy("A", "tmp0"),
+                   SImport("m", ["A"]),
+                   build_copy("tmp0", "B"),
+                   SExpr(EFunc("f", [AJust(EVar("A")), AJust(EVar("B"))]))])
+
+    hifiber = "B = A\n" + \
+        "from m import A\n" + \
+        "f(A, B)"
+    assert Optimizer(Optimizer.PASSES).optimize(stmt).gen(0) == hifiber
+
+
+def test_dead_impure():
+    stmt = SBlock([SAssign(AVar("tmp0"), EMethod(EVar("A_KM"), "getRoot", [])),
+                   SAssign(AVar("tmp1"), EFunc("f", []))])
+    assert Optimizer(["dead"]).optimize(stmt).gen(0) == "tmp0 = f()"
+
+
+def test_dup_metrics():
+    stmt = SBlock([build_metrics("registerRank", "K"),
+                   build_metrics("registerRank", "K"),
+                   build_metrics("beginCollect", "tmp/Z"),
+                   build_metrics("registerRank", "K")])
+
+    hifiber = "Metrics.registerRank(\"K\")\n" + \
+        "Metrics.beginCollect(\"tmp/Z\")\n" + \
+        "Metrics.registerRank(\"K\")"
+    assert Optimizer(["dup"]).optimize(stmt).gen(0) == hifiber
+
+
+def test_dup_set_rank_ids():
+    stmt = SBlock([build_set_rank_ids("Z_MN", ["M", "N"]),
+                   build_set_rank_ids("Z_MN", ["M", "N"]),
+                   build_set_rank_ids("Z_NM", ["N", "M"]),
+                   build_set_rank_ids("Z_MN", ["M", "N"])])
+
+    hifiber = "Z_MN.setRankIds(rank_ids=[\"M\", \"N\"])\n" + \
+        "Z_NM.setRankIds(rank_ids=[\"N\", \"M\"])\n" + \
+        "Z_MN.setRankIds(rank_ids=[\"M\", \"N\"])"
+    assert Optimizer(["dup"]).optimize(stmt).gen(0) == hifiber
+
+
+def test_fold():
+    stmt = SBlock(
+        [
+            SAssign(
+                AVar("x"), EBinOp(
+                    EInt(2), OMul(), EInt(3))), SAssign(
+                AVar("y"), EBinOp(
+                    EVar("a"), OMul(), EBinOp(
+                        EInt(2), OAdd(), EInt(3)))), SAssign(
+                AVar("z"), EFunc(
+                    "max", [
+                        AJust(
+                            EVar("a")), AJust(
+                            EVar("a"))]))])
+
+    hifiber = "x = 6\n" + \
+        "y = a * 2 + 3\n" + \
+        "z = a"
+    assert Optimizer(["fold"]).optimize(stmt).gen(0) == hifiber
+
+
+def test_fold_only():
+    stmt = SBlock([build_copy("A_KM", "tmp0"),
+                   build_split("tmp0", "A_K1K0M")])
+
+    hifiber = "tmp0 = A_KM\n" + \
+        "A_K1K0M = tmp0.splitUniform(4, depth=0)"
+    assert Optimizer(["fold"]).optimize(stmt).gen(0) == hifiber
+
+
+def test_empty_body():
+    stmt = SFor(PVar("i"), EVar("xs"), SBlock([]))
+
+    hifiber = "for i in xs:\n" + \
+        "    pass"
+    assert Optimizer(Optimizer.PASSES).optimize(stmt).gen(0) == hifiber
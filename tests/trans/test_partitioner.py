@@ -4,6 +4,7 @@ from teaal.ir.program import Program
 from teaal.ir.tensor import Tensor
 from teaal.parse.einsum import Einsum
 from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
 from teaal.trans.partitioner import Partitioner
 from teaal.trans.utils import TransUtils
 
@@ -174,6 +175,73 @@ def test_nway_shape_conv():
     assert partitioner.partition(tensor, ("W",)).gen(depth=0) == hifiber
 
 
+def build_partitioner_lazy():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            B: [K, M]
+            Z: [M]
+        expressions:
+            - Z[m] = A[k, m] * B[k, m]
+    mapping:
+        rank-order:
+            A: [M, K]
+            B: [M, K]
+        partitioning:
+            Z:
+                (M, K): [flatten()]
+                MK: [uniform_occupancy(A.5)]
+    """
+    program = Program(
+        Einsum.from_str(yaml),
+        Mapping.from_str(yaml),
+        Options(["flattening=lazy"]))
+    program.add_einsum(0)
+
+    partitioner = Partitioner(program, TransUtils(program))
+    return program, partitioner
+
+
+def test_flatten_lazy():
+    program, partitioner = build_partitioner_lazy()
+    hifiber = "tmp0 = A_MK\n" + \
+        "A_MK_flat = tmp0\n" + \
+        "A_MK_flat.setRankIds(rank_ids=[\"M\", \"K\"])"
+
+    assert partitioner.partition(
+        program.get_equation().get_tensor("A"), ("M", "K")).gen(
+        depth=0) == hifiber
+
+
+def test_uniform_occupancy_leader_lazy():
+    program, partitioner = build_partitioner_lazy()
+    tensor = program.get_equation().get_tensor("A")
+    program.apply_partitioning(tensor, ("M", "K"))
+    hifiber = "tmp0 = A_MK_flat\n" + \
+        "tmp1 = LazyFlatten(tmp0, 1).splitEqual(5)\n" + \
+        "A_MK1MK0 = tmp1\n" + \
+        "A_MK1MK0.setRankIds(rank_ids=[\"MK1\", \"MK0\"])"
+
+    assert partitioner.partition(tensor, ("MK",)).gen(depth=0) == hifiber
+
+
+def test_uniform_occupancy_follower_lazy():
+    program, partitioner = build_partitioner_lazy()
+    leader = program.get_equation().get_tensor("A")
+    program.apply_partitioning(leader, ("M", "K"))
+    program.apply_partitioning(leader, ("MK",))
+
+    tensor = program.get_equation().get_tensor("B")
+    program.apply_partitioning(tensor, ("M", "K"))
+    hifiber = "tmp0 = B_MK_flat\n" + \
+        "tmp1 = LazyFlatten(tmp0, 1).splitNonUniform(a_mk1)\n" + \
+        "B_MK1MK0 = tmp1\n" + \
+        "B_MK1MK0.setRankIds(rank_ids=[\"MK1\", \"MK0\"])"
+
+    assert partitioner.partition(tensor, ("MK",)).gen(depth=0) == hifiber
+
+
 def test_uniform_occupancy_leader():
     tensor = Tensor("A", ["K", "M"])
     spec = """
@@ -0,0 +1,59 @@
+from teaal.hifiber import *
+from teaal.ir.program import Program
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.parse.options import Options
+from teaal.trans.reporter import Reporter
+
+
+def build_program():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            Z: [M]
+        expressions:
+            - Z[m] = A[k, m]
+    mapping:
+        rank-order:
+            A: [M, K]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    return program
+
+
+def test_is_enabled():
+    assert not Reporter(Options()).is_enabled()
+    assert Reporter(Options(["progress"])).is_enabled()
+
+
+def test_make_start():
+    assert Reporter(Options()).make_start().gen(0) == ""
+    assert Reporter(Options(["progress"])).make_start().gen(
+        0) == "progress = Progress()"
+    assert Reporter(Options(["progress=tmp/status"])).make_start().gen(
+        0) == "progress = Progress(\"tmp/status\")"
+
+
+def test_get_extent():
+    program = build_program()
+    tensors = program.get_equation().get_tensors()
+
+    assert Reporter.get_extent(program, tensors) == "A_MK"
+
+
+def test_make_loop():
+    loop = SExpr(EVar("loop"))
+    hifiber = "progress.start(\"Z\", A_MK)\n" + \
+        "loop\n" + \
+        "progress.end()"
+
+    assert Reporter.make_loop("Z", "A_MK", loop).gen(0) == hifiber
+    assert Reporter.make_loop("Z", "", loop).gen(
+        0).split("\n")[0] == "progress.start(\"Z\")"
+
+
+def test_make_step():
+    assert Reporter.make_step(build_program(), "M").gen(
+        0) == "progress.step(m)"
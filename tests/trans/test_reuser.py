@@ -0,0 +1,98 @@
+from teaal.hifiber import *
+from teaal.ir.program import Program
+from teaal.ir.tensor import Tensor
+from teaal.parse.einsum import Einsum
+from teaal.parse.mapping import Mapping
+from teaal.trans.liveness import Liveness
+from teaal.trans.reuser import Reuser
+from teaal.trans.utils import TransUtils
+from tests.utils.parse_tree import *
+
+
+def build_program():
+    yaml = """
+    einsum:
+        declaration:
+            A: [K, M]
+            Z: [M]
+        expressions:
+            - Z[m] = A[k, m]
+    mapping:
+        partitioning:
+            Z:
+                K: [uniform_shape(4)]
+    """
+    program = Program(Einsum.from_str(yaml), Mapping.from_str(yaml))
+    program.add_einsum(0)
+    return program
+
+
+def swizzle(reuser, i):
+    tensor = Tensor("A", ["K", "M"])
+    tensor.swizzle(["M", "K"])
+
+    step = Reuser.make_swizzle_step(["M", "K"], "loop-order")
+    stmt = SExpr(EVar("swizzle"))
+    return reuser.reuse(i, tensor, "A_KM", step, 0, stmt, True)
+
+
+def test_make_part_step():
+    program = build_program()
+
+    assert Reuser.make_part_step(program, ("K",)) == (
+        "partition", ("K",), (tuple(make_uniform_shape([4])),), ("k",))
+
+
+def test_make_swizzle_step():
+    assert Reuser.make_swizzle_step(["M", "K"], "loop-order") == (
+        "swizzle", ("M", "K"), "loop-order")
+
+
+def test_reuse():
+    program = build_program()
+    liveness = Liveness()
+    liveness.add_einsum(program, 0)
+    liveness.add_einsum(program, 1)
+    reuser = Reuser(TransUtils(program), liveness)
+
+    assert swizzle(reuser, 0).gen(0) == "swizzle"
+    assert swizzle(reuser, 1).gen(0) == ""
+    assert liveness.get_dead(
+        [(0, 0), (1, 1), (2, 2)], True, True)[1] == ["A_MK"]
+
+
+def test_reuse_unshared():
+    program = build_program()
+    liveness = Liveness()
+    liveness.add_einsum(program, 0)
+    liveness.add_einsum(program, 1)
+    reuser = Reuser(TransUtils(program), liveness, False)
+
+    assert swizzle(reuser, 0).gen(0) == "swizzle"
+    assert swizzle(reuser, 1).gen(0) == "swizzle"
+
+
+def test_add_einsum():
+    program = build_program()
+    liveness = Liveness()
+    liveness.add_einsum(program, 0)
+    liveness.add_einsum(program, 1)
+    reuser = Reuser(TransUtils(program), liveness)
+
+    assert swizzle(reuser, 0).gen(0) == "swizzle"
+
+    # An Einsum writing A invalidates its transformations
+    program = Program(
+        Einsum.from_str("""
+        einsum:
+            declaration:
+                A: [K, M]
+                B: [K, M]
+            expressions:
+                - A[k, m] = B[k, m]
+        """),
+        Mapping.from_str(""))
+    program.add_einsum(0)
+    reuser.add_einsum(program)
+
+    assert swizzle(reuser, 1).gen(0) == "swizzle"
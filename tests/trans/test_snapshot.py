@@ -0,0 +1,118 @@
+import json
+import pytest
+
+from teaal.parse import *
+from teaal.trans.hifiber import HiFiber
+from teaal.trans.snapshot import Snapshot
+
+
+def read(filename):
+    with open(filename, "r") as f:
+        return f.read()
+
+
+def make_hifiber(filename, opts):
+    einsum = Einsum.from_file(filename)
+    mapping = Mapping.from_file(filename)
+    arch = Architecture.from_file(filename)
+    bindings = Bindings.from_file(filename)
+    format_ = Format.from_file(filename)
+    return str(HiFiber(einsum, mapping, arch, bindings, format_, opts))
+
+
+def test_translate():
+    filename = "tests/integration/outerspace.yaml"
+    snapshot = Snapshot(read(filename))
+    assert not snapshot.is_analyzed()
+
+    assert str(snapshot.translate()) == make_hifiber(filename, [])
+    assert snapshot.is_analyzed()
+
+    assert str(snapshot.translate(["del", "func"])) == make_hifiber(
+        filename, ["del", "func"])
+
+
+def test_translate_fuse():
+    filename = "tests/integration/test_reuse.yaml"
+    snapshot = Snapshot(read(filename))
+    snapshot.translate(["del"])
+
+    assert str(snapshot.translate(["fuse"])) == make_hifiber(
+        filename, ["fuse"])
+
+
+def test_to_bytes():
+    filename = "tests/integration/outerspace.yaml"
+    snapshot = Snapshot(read(filename))
+    snapshot.translate()
+
+    loaded = Snapshot.from_bytes(snapshot.to_bytes())
+    assert loaded.get_hash() == snapshot.get_hash()
+    assert loaded.is_analyzed()
+    assert str(loaded.translate(["del"])) == make_hifiber(filename, ["del"])
+
+
+def test_to_bytes_json():
+    snapshot = Snapshot(read("tests/integration/test_reuse.yaml"))
+    snapshot.translate()
+
+    info = json.loads(snapshot.to_bytes().decode("utf-8"))
+    assert info["format"] == "teaal-snapshot"
+    assert info["version"] == Snapshot.VERSION
+    assert info["source"] == Snapshot.get_source()
+    assert info["spec"]["einsum"]["declaration"]["Z"] == ["M", "N"]
+    assert info["nodes"]["0"][0] == ["OtherNode", "Output"]
+
+
+def test_from_bytes_bad():
+    data = Snapshot(read("tests/integration/test_reuse.yaml")).to_bytes()
+
+    def replace(key, val):
+        info = json.loads(data.decode("utf-8"))
+        info[key] = val
+        return json.dumps(info).encode("utf-8")
+
+    with pytest.raises(ValueError) as excinfo:
+        Snapshot.from_bytes(b"foo\nbar")
+    assert str(excinfo.value) == "Not a snapshot"
+
+    with pytest.raises(ValueError) as excinfo:
+        Snapshot.from_bytes(replace("format", "foo"))
+    assert str(excinfo.value) == "Not a snapshot"
+
+    with pytest.raises(ValueError) as excinfo:
+        Snapshot.from_bytes(replace("version", 0))
+    assert str(excinfo.value) == "Unsupported snapshot version: 0"
+
+    with pytest.raises(ValueError) as excinfo:
+        Snapshot.from_bytes(replace("source", "foo"))
+    assert str(excinfo.value) == "Snapshot written by a different compiler"
+
+    # Only the flow graph nodes can be constructed
+    for nodes in [{"0": [["Node"]]}, {"0": [["Tensor", "A"]]},
+                  {"0": [["LoopNode"]]}, {"0": "foo"}]:
+        with pytest.raises(ValueError) as excinfo:
+            Snapshot.from_bytes(replace("nodes", nodes))
+        assert str(excinfo.value) == "Corrupted snapshot"
+
+
+def test_from_cache(tmp_path):
+    filename = str(tmp_path / "snapshot")
+    spec = read("tests/integration/test_reuse.yaml")
+
+    # No snapshot yet
+    snapshot = Snapshot.from_cache(filename, spec)
+    assert not snapshot.is_analyzed()
+
+    snapshot.translate()
+    snapshot.to_file(filename)
+    assert Snapshot.from_cache(filename, spec).is_analyzed()
+    assert Snapshot.from_file(filename).get_hash() == snapshot.get_hash()
+
+    # The specification changed
+    assert not Snapshot.from_cache(filename, spec + "\n").is_analyzed()
+
+    # The file is not a snapshot
+    with open(filename, "w") as f:
+        f.write("foo")
+    assert not Snapshot.from_cache(filename, spec).is_analyzed()